@@ -0,0 +1,107 @@
+"""
+回测结果缓存模块的单元测试
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.cache import BacktestCache, backtest_key
+from trademind.backtest.engine import NO_DOWNSIDE_SORTINO, calculate_performance_metrics, run_backtest
+
+
+class TestBacktestCache(unittest.TestCase):
+    """测试回测结果缓存"""
+
+    def setUp(self):
+        """生成行情和信号，创建临时缓存目录"""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(8)
+        n = 300
+        dates = pd.date_range(start='2021-01-01', periods=n, freq='B')
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        self.data = pd.DataFrame({
+            'Open': close,
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.uniform(1e5, 1e6, n)
+        }, index=dates)
+        self.signals = pd.DataFrame({
+            'buy_signal': rng.random(n) < 0.05,
+            'sell_signal': rng.random(n) < 0.05
+        }, index=dates)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit_and_persistence(self):
+        """测试相同输入命中缓存，新的缓存实例可以读取本地文件"""
+        run = MagicMock(side_effect=run_backtest)
+        cache = BacktestCache(Path(self.temp_dir))
+        first = cache.get(self.data, self.signals, run)
+        second = cache.get(self.data.copy(), self.signals.copy(), run)
+        self.assertEqual(first, second)
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        # 修改返回结果中的嵌套字典不影响之后的命中
+        first['monte_carlo'].clear()
+        second['monte_carlo']['method'] = None
+        self.assertEqual(cache.get(self.data, self.signals, run)['monte_carlo']['method'], 'bootstrap')
+
+        reloaded = BacktestCache(Path(self.temp_dir))
+        self.assertEqual(reloaded.get(self.data, self.signals, run), cache.get(self.data, self.signals, run))
+        self.assertEqual(run.call_count, 1)
+
+        # 参数、行情或信号改变时重新回测
+        cache.get(self.data, self.signals, run, stop_loss_pct=0.05)
+        changed = self.data.copy()
+        changed.iloc[-1, changed.columns.get_loc('Close')] *= 1.01
+        cache.get(changed, self.signals, run)
+        self.assertEqual(run.call_count, 3)
+
+    def test_key_and_determinism(self):
+        """测试缓存键只取决于内容，指标计算结果确定"""
+        key = backtest_key(self.data, self.signals, {'max_hold_days': 20})
+        self.assertEqual(key, backtest_key(self.data.copy(), self.signals.copy(), {'max_hold_days': 20}))
+        self.assertNotEqual(key, backtest_key(self.data, self.signals, {'max_hold_days': 10}))
+        self.assertEqual(run_backtest(self.data, self.signals), run_backtest(self.data, self.signals))
+
+        # 只有正收益、没有下行波动时Sortino比率为固定值
+        trades = [{'profit': 10.0, 'hold_days': 3}]
+        metrics = calculate_performance_metrics(trades, [100.0, 101.0, 102.0, 103.0], 100.0, self.data.index)
+        self.assertEqual(metrics['sortino_ratio'], NO_DOWNSIDE_SORTINO)
+
+    def test_eviction(self):
+        """测试内存和本地文件超出上限时淘汰最久未使用的条目"""
+        cache = BacktestCache(Path(self.temp_dir), max_entries=2, max_memory_entries=1)
+        run = MagicMock(return_value={'total_trades': 0})
+        for i, days in enumerate((5, 10, 20)):
+            cache.get(self.data, self.signals, run, max_hold_days=days)
+            os.utime(cache.path_for(backtest_key(self.data, self.signals, {'max_hold_days': days})),
+                     (1000 + i, 1000 + i))
+        cache.get(self.data, self.signals, run, max_hold_days=40)
+        self.assertEqual(len(list(Path(self.temp_dir).glob('*.json'))), 2)
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+        cache.get(self.data, self.signals, run, max_hold_days=5)
+        self.assertEqual(run.call_count, 5)
+        self.assertEqual(cache.clear(), 2)
+
+    def test_unhashable_input(self):
+        """测试无法计算缓存键时直接执行回测"""
+        cache = BacktestCache(None)
+        run = MagicMock(return_value={'total_trades': 0})
+        self.assertEqual(cache.get(self.data, MagicMock(), run), {'total_trades': 0})
+        self.assertEqual(cache.stats()['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,7 @@ from trademind.backtest.engine import (
     calculate_performance_metrics,
     generate_trade_summary
 )
+from trademind.backtest.trade_log import TradeLog
 
 
 class TestBacktestEngine(unittest.TestCase):
@@ -103,7 +104,7 @@ class TestBacktestEngine(unittest.TestCase):
         trades, equity = simulate_trades(self.data, self.signals)
         
         # 验证交易记录和权益曲线
-        self.assertIsInstance(trades, list)
+        self.assertIsInstance(trades, TradeLog)
         self.assertIsInstance(equity, list)
         
         # 验证权益曲线长度
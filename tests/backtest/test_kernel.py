@@ -0,0 +1,155 @@
+"""
+回测内核模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.engine import simulate_trades
+from trademind.backtest.kernel import simulate_trades_kernel, signal_mask
+from trademind.backtest.trade_log import TRADE_FIELDS
+
+
+def reference_simulate_trades(data, buy, sell, initial_capital=10000.0, risk_per_trade_pct=0.02,
+                              stop_loss_pct=0.07, take_profit_pct=0.15, max_hold_days=20):
+    """原逐根K线循环的交易模拟，作为内核的对照"""
+    close, high, low, dates = data['Close'], data['High'], data['Low'], data.index
+    volume = data.get('Volume', pd.Series(np.ones(len(close)), index=close.index))
+    position, entry_price, entry_date = 0, 0.0, None
+    capital = initial_capital
+    equity = [initial_capital]
+    trades = []
+    for i in range(50, len(buy)):
+        current_date = dates[i]
+        current_price = close.iloc[i]
+        current_high = high.iloc[i]
+        current_low = low.iloc[i]
+        current_volume = volume.iloc[i]
+        avg_volume = volume.iloc[i-20:i].mean() if 'Volume' in data.columns else 1000
+        if position != 0:
+            days_held = (current_date - entry_date).days
+            stop_triggered = take_profit_triggered = False
+            if position == 1 and current_low <= entry_price * (1 - stop_loss_pct):
+                stop_price, stop_triggered = entry_price * (1 - stop_loss_pct), True
+            elif position == -1 and current_high >= entry_price * (1 + stop_loss_pct):
+                stop_price, stop_triggered = entry_price * (1 + stop_loss_pct), True
+            if position == 1 and current_high >= entry_price * (1 + take_profit_pct):
+                take_profit_price, take_profit_triggered = entry_price * (1 + take_profit_pct), True
+            elif position == -1 and current_low <= entry_price * (1 - take_profit_pct):
+                take_profit_price, take_profit_triggered = entry_price * (1 - take_profit_pct), True
+            max_hold_triggered = days_held >= max_hold_days
+            reverse_signal = (position == 1 and sell[i]) or (position == -1 and buy[i])
+            if stop_triggered or take_profit_triggered or max_hold_triggered or reverse_signal:
+                if stop_triggered:
+                    exit_price, exit_reason = stop_price, "止损"
+                elif take_profit_triggered:
+                    exit_price, exit_reason = take_profit_price, "止盈"
+                elif max_hold_triggered:
+                    exit_price, exit_reason = current_price, "最大持有期限"
+                else:
+                    exit_price, exit_reason = current_price, "反向信号"
+                volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
+                slippage_pct = 0.0005 + (0.1 * volume_ratio / 100)
+                exit_price *= (1 - slippage_pct) if position == 1 else (1 + slippage_pct)
+                position_value = capital * risk_per_trade_pct / stop_loss_pct
+                shares = position_value / entry_price
+                commission = max(1.0, min(shares * 0.005, position_value * 0.01))
+                if position == 1:
+                    profit = shares * (exit_price - entry_price) - commission
+                else:
+                    profit = shares * (entry_price - exit_price) - commission
+                capital += profit
+                trades.append({
+                    'entry_date': entry_date, 'entry_price': entry_price,
+                    'exit_date': current_date, 'exit_price': exit_price,
+                    'position': 'long' if position == 1 else 'short',
+                    'shares': shares, 'profit': profit,
+                    'profit_pct': profit / (shares * entry_price) * 100,
+                    'exit_reason': exit_reason, 'hold_days': days_held
+                })
+                position = 0
+        if position == 0:
+            if buy[i]:
+                position, entry_price, entry_date = 1, current_price * (1 + 0.0005), current_date
+            elif sell[i]:
+                position, entry_price, entry_date = -1, current_price * (1 - 0.0005), current_date
+        equity.append(capital)
+    return trades, equity
+
+
+class TestBacktestKernel(unittest.TestCase):
+    """测试回测内核与原逐根K线模拟结果一致"""
+
+    def make_data(self, seed, n=600, freq='D', with_volume=True):
+        """生成随机行情和信号"""
+        rng = np.random.default_rng(seed)
+        dates = pd.date_range(start='2015-01-01', periods=n, freq=freq)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        data = pd.DataFrame({
+            'Open': close,
+            'High': close * (1 + rng.uniform(0, 0.03, n)),
+            'Low': close * (1 - rng.uniform(0, 0.03, n)),
+            'Close': close
+        }, index=dates)
+        if with_volume:
+            data['Volume'] = rng.uniform(1e5, 1e6, n)
+        buy = rng.random(n) < 0.05
+        sell = rng.random(n) < 0.05
+        return data, buy, sell
+
+    def assert_same(self, data, buy, sell, **kwargs):
+        """比较内核与对照实现的交易记录和权益曲线"""
+        expected_trades, expected_equity = reference_simulate_trades(data, buy, sell, **kwargs)
+        trades, equity = simulate_trades_kernel(
+            data['Close'].to_numpy(), data['High'].to_numpy(), data['Low'].to_numpy(),
+            buy, sell, data.index, volume=data['Volume'] if 'Volume' in data.columns else None, **kwargs
+        )
+        # 成交量缺失时盈亏可能为NaN，按DataFrame比较使NaN视为相等
+        expected_frame = pd.DataFrame(expected_trades, columns=list(TRADE_FIELDS))
+        pd.testing.assert_frame_equal(trades.to_frame(), expected_frame, check_exact=True, check_dtype=bool(expected_trades))
+        np.testing.assert_array_equal(equity, expected_equity)
+        return trades.to_dicts()
+
+    def test_matches_reference(self):
+        """测试多组随机数据的结果完全一致"""
+        total = 0
+        for seed in range(10):
+            data, buy, sell = self.make_data(seed)
+            total += len(self.assert_same(data, buy, sell))
+        self.assertGreater(total, 100)
+
+    def test_matches_reference_variants(self):
+        """测试无成交量、成交量缺失、非交易日间隔和不同参数"""
+        data, buy, sell = self.make_data(42, with_volume=False)
+        self.assert_same(data, buy, sell)
+
+        data, buy, sell = self.make_data(43, freq='B')
+        self.assert_same(data, buy, sell, stop_loss_pct=0.03, take_profit_pct=0.05, max_hold_days=7)
+
+        data, buy, sell = self.make_data(45)
+        data.iloc[::7, data.columns.get_loc('Volume')] = np.nan
+        self.assert_same(data, buy, sell)
+
+        data, buy, sell = self.make_data(44, n=40)
+        self.assertEqual(self.assert_same(data, buy, sell), [])
+
+    def test_simulate_trades_uses_enhanced_signals(self):
+        """测试simulate_trades合并增强信号后得到相同结果"""
+        data, buy, sell = self.make_data(7)
+        rsi = pd.Series(np.random.default_rng(7).uniform(0, 100, len(data)), index=data.index)
+        signals = pd.DataFrame({'buy_signal': buy, 'sell_signal': sell, 'rsi': rsi}, index=data.index)
+
+        trades, equity = simulate_trades(data, signals)
+
+        expected = reference_simulate_trades(data, buy | (rsi < 30).to_numpy(), sell | (rsi > 70).to_numpy())
+        self.assertEqual((trades.to_dicts(), equity), expected)
+
+    def test_signal_mask(self):
+        """测试信号真值判断与bool()一致"""
+        np.testing.assert_array_equal(signal_mask([0.0, 1.0, np.nan]), [False, True, True])
+        np.testing.assert_array_equal(signal_mask(np.array([None, 1, 0], dtype=object)), [False, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
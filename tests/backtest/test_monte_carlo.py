@@ -0,0 +1,68 @@
+"""
+蒙特卡洛回测模块的单元测试
+"""
+
+import unittest
+import numpy as np
+
+from trademind.backtest.monte_carlo import run_monte_carlo, trade_returns
+
+
+def _loop_paths(returns, indices):
+    """逐条路径计算最终收益率和最大回撤，作为参考实现"""
+    finals, drawdowns = [], []
+    for row in indices:
+        capital, peak, worst = 1.0, 1.0, 0.0
+        for i in row:
+            capital *= 1 + returns[i]
+            peak = max(peak, capital)
+            worst = max(worst, 1 - capital / peak)
+        finals.append(capital - 1)
+        drawdowns.append(worst)
+    return np.array(finals), np.array(drawdowns)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """测试蒙特卡洛模拟"""
+
+    def setUp(self):
+        """生成交易记录"""
+        rng = np.random.default_rng(0)
+        self.trades = [{'profit': float(p)} for p in rng.normal(50, 300, 60)]
+
+    def test_trade_returns(self):
+        """测试收益率按开仓前的资金计算"""
+        trades = [{'profit': 1000.0}, {'profit': -1100.0}]
+        np.testing.assert_allclose(trade_returns(trades, 10000.0), [0.1, -0.1])
+
+    def test_bootstrap_matches_loop(self):
+        """测试批量数组计算与逐条路径循环一致"""
+        result = run_monte_carlo(self.trades, 10000.0, n_simulations=500, seed=7)
+        returns = trade_returns(self.trades, 10000.0)
+        indices = np.random.default_rng(7).integers(0, len(returns), size=(500, len(returns)))
+        finals, drawdowns = _loop_paths(returns, indices)
+
+        self.assertEqual(result['trades'], 60)
+        self.assertEqual(result['final_return']['p50'], round(float(np.quantile(finals, 0.5)) * 100, 1))
+        self.assertEqual(result['max_drawdown']['p95'], round(float(np.quantile(drawdowns, 0.95)) * 100, 1))
+        self.assertEqual(result['final_return']['mean'], round(float(finals.mean()) * 100, 1))
+        self.assertEqual(result, run_monte_carlo(self.trades, 10000.0, n_simulations=500, seed=7))
+
+    def test_permutation_and_ruin(self):
+        """测试打乱顺序不改变最终收益率，以及破产概率"""
+        result = run_monte_carlo(self.trades, 10000.0, n_simulations=200, method='permutation')
+        final = result['final_return']
+        self.assertEqual(final['p5'], final['p95'])
+        self.assertLessEqual(result['max_drawdown']['p5'], result['max_drawdown']['p95'])
+
+        losing = [{'profit': -2000.0}] * 4
+        ruin = run_monte_carlo(losing, 10000.0, n_simulations=50, ruin_threshold=0.5)
+        self.assertEqual(ruin['ruin_probability'], 100.0)
+
+        self.assertEqual(run_monte_carlo([], 10000.0), {})
+        with self.assertRaises(ValueError):
+            run_monte_carlo(self.trades, method='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
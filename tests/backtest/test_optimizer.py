@@ -0,0 +1,131 @@
+"""
+参数优化模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.engine import get_empty_results, run_backtest
+from trademind.backtest.optimizer import (
+    DEFAULT_PARAMETER_SPACE,
+    SharedInputs,
+    optimize_parameters,
+    parameter_grid,
+    prepare_inputs,
+    rank_key,
+    sample_parameters
+)
+
+COMPARED_METRICS = list(get_empty_results())
+
+
+class TestOptimizer(unittest.TestCase):
+    """测试参数优化"""
+
+    def setUp(self):
+        """生成两只股票的行情和信号"""
+        self.datasets = {}
+        for seed, symbol in enumerate(['AAA', 'BBB']):
+            rng = np.random.default_rng(seed)
+            n = 400
+            dates = pd.date_range(start='2020-01-01', periods=n, freq='B', tz='America/New_York')
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+            data = pd.DataFrame({
+                'Open': close,
+                'High': close * (1 + rng.uniform(0, 0.03, n)),
+                'Low': close * (1 - rng.uniform(0, 0.03, n)),
+                'Close': close,
+                'Volume': rng.uniform(1e5, 1e6, n)
+            }, index=dates)
+            signals = pd.DataFrame({
+                'buy_signal': rng.random(n) < 0.05,
+                'sell_signal': rng.random(n) < 0.05,
+                'rsi': rng.uniform(0, 100, n)
+            }, index=dates)
+            self.datasets[symbol] = (data, signals)
+        self.space = {
+            'stop_loss_pct': [0.03, 0.07],
+            'take_profit_pct': [0.10, 0.20],
+            'max_hold_days': [5, 20]
+        }
+
+    def test_parameter_grid_and_sampling(self):
+        """测试参数网格和不重复随机抽样"""
+        grid = parameter_grid()
+        self.assertEqual(len(grid), int(np.prod([len(v) for v in DEFAULT_PARAMETER_SPACE.values()])))
+
+        samples = sample_parameters(n_samples=50, seed=1)
+        self.assertEqual(len(samples), 50)
+        self.assertEqual(len({tuple(p.items()) for p in samples}), 50)
+        self.assertTrue(all(p in grid for p in samples))
+        self.assertEqual(samples, sample_parameters(n_samples=50, seed=1))
+        self.assertEqual(len(sample_parameters(self.space, n_samples=100)), 8)
+
+        with self.assertRaises(ValueError):
+            parameter_grid({'leverage': [1, 2]})
+
+    def test_matches_run_backtest(self):
+        """测试每个参数组合的指标与run_backtest一致，结果按指标排序"""
+        calls = []
+        table = optimize_parameters(self.datasets, self.space, metric='net_profit',
+                                    chunk_size=3, progress_callback=lambda *args: calls.append(args[:2]))
+
+        self.assertEqual(len(table), 16)
+        self.assertEqual(calls[-1], (6, 6))
+        self.assertTrue(table['net_profit'].is_monotonic_decreasing)
+        self.assertEqual(list(table.index[:2]), [1, 2])
+
+        for _, row in table.iterrows():
+            data, signals = self.datasets[row['symbol']]
+            params = {name: row[name] for name in self.space}
+            expected = run_backtest(data, signals.copy(), **params)
+            for key in COMPARED_METRICS:
+                self.assertEqual(row[key], expected[key], key)
+
+    def test_parallel_matches_serial(self):
+        """测试共享内存并行结果与串行一致"""
+        keys = ['symbol', *self.space]
+        serial = optimize_parameters(self.datasets, self.space, workers=1)
+        parallel = optimize_parameters(self.datasets, self.space, workers=2, chunk_size=2)
+        # 排名与任务完成顺序无关
+        pd.testing.assert_frame_equal(parallel[keys + COMPARED_METRICS], serial[keys + COMPARED_METRICS])
+
+    def test_ranking_direction(self):
+        """测试越小越好的指标从低到高排序，NaN排在最后，相同指标按股票代码和参数排序"""
+        table = optimize_parameters(self.datasets, self.space, metric='max_drawdown')
+        self.assertTrue(table['max_drawdown'].is_monotonic_increasing)
+        table = optimize_parameters(self.datasets, self.space, metric='max_drawdown', ascending=False)
+        self.assertTrue(table['max_drawdown'].is_monotonic_decreasing)
+        with self.assertRaises(ValueError):
+            optimize_parameters(self.datasets, self.space, metric='confidence_level')
+
+        rows = [{'symbol': symbol, 'stop_loss_pct': stop, 'sharpe_ratio': value}
+                for symbol, stop, value in [('B', 0.05, 1.0), ('A', 0.07, float('nan')),
+                                            ('A', 0.07, 1.0), ('A', 0.03, 1.0), ('C', 0.05, 2.0)]]
+        ranked = sorted(rows, key=rank_key('sharpe_ratio', False, ['stop_loss_pct']))
+        self.assertEqual([(r['symbol'], r['stop_loss_pct']) for r in ranked],
+                         [('C', 0.05), ('A', 0.03), ('A', 0.07), ('B', 0.05), ('A', 0.07)])
+        self.assertTrue(np.isnan(ranked[-1]['sharpe_ratio']))
+
+    def test_shared_inputs(self):
+        """测试共享内存中的数组只读且与原数组相同，数据不足的股票被跳过"""
+        data, signals = self.datasets['AAA']
+        inputs = prepare_inputs(data, signals)
+        with SharedInputs({'AAA': inputs}) as shared:
+            attached, blocks = SharedInputs.attach(shared.layouts)
+            for name in ('close', 'volume', 'buy', 'sell', 'days'):
+                np.testing.assert_array_equal(attached['AAA'][name], inputs[name])
+            self.assertFalse(attached['AAA']['close'].flags.writeable)
+            del attached
+            for block in blocks:
+                block.close()
+
+        short = {'CCC': (data.iloc[:30], signals.iloc[:30])}
+        self.assertTrue(optimize_parameters(short, self.space).empty)
+        with self.assertRaises(ValueError):
+            optimize_parameters(self.datasets, self.space, metric='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+组合回测模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.kernel import simulate_trades_kernel
+from trademind.backtest.portfolio import run_portfolio_backtest
+from trademind.backtest.trade_log import TradeLog
+
+
+def make_data(seed, n=500, start='2018-01-01'):
+    """生成随机行情和信号"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start=start, periods=n, freq='B')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    data = pd.DataFrame({
+        'Open': close,
+        'High': close * (1 + rng.uniform(0, 0.03, n)),
+        'Low': close * (1 - rng.uniform(0, 0.03, n)),
+        'Close': close,
+        'Volume': rng.uniform(1e5, 1e6, n)
+    }, index=dates)
+    signals = pd.DataFrame({
+        'buy_signal': rng.random(n) < 0.05,
+        'sell_signal': rng.random(n) < 0.05
+    }, index=dates)
+    return data, signals
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    """测试组合回测"""
+
+    def test_single_symbol_matches_kernel(self):
+        """测试单只股票且仓位不受限制时与回测内核结果一致"""
+        data, signals = make_data(5)
+        result = run_portfolio_backtest({'A': (data, signals)}, initial_capital=10000.0,
+                                        max_positions=1, max_position_pct=10.0)
+        expected, _ = simulate_trades_kernel(
+            data['Close'].to_numpy(), data['High'].to_numpy(), data['Low'].to_numpy(),
+            signals['buy_signal'].to_numpy(), signals['sell_signal'].to_numpy(), data.index,
+            volume=data['Volume']
+        )
+        self.assertIsInstance(result['trades'], TradeLog)
+        trades = result['trades'].to_frame().drop(columns='symbol')
+        pd.testing.assert_frame_equal(trades, expected.to_frame(), rtol=1e-12)
+
+    def test_shared_capital_and_limits(self):
+        """测试持仓数量限制、现金约束和收益贡献汇总"""
+        datasets = {f'S{i}': make_data(i) for i in range(12)}
+        # 最后一只股票晚开始交易，日期索引为并集
+        datasets['LATE'] = make_data(99, n=300, start='2018-09-03')
+        result = run_portfolio_backtest(datasets, max_positions=4, max_position_pct=0.3)
+
+        self.assertLessEqual(result['metrics']['max_concurrent_positions'], 4)
+        self.assertEqual(len(result['equity']), 500)
+        self.assertEqual(result['metrics']['total_trades'], len(result['trades']))
+
+        # 同一时间持有的股票不超过4只
+        events = sorted([(t['entry_date'], 1) for t in result['trades']] +
+                        [(t['exit_date'], -1) for t in result['trades']], key=lambda e: (e[0], e[1]))
+        self.assertLessEqual(max(np.cumsum([e[1] for e in events])), 4)
+
+        attribution = result['attribution']
+        self.assertEqual(set(attribution.index), set(datasets))
+        self.assertAlmostEqual(attribution['net_profit'].sum(),
+                               sum(t['profit'] for t in result['trades']), places=1)
+        late_entries = [t['entry_date'] for t in result['trades'] if t['symbol'] == 'LATE']
+        self.assertTrue(all(date >= datasets['LATE'][0].index[50] for date in late_entries))
+
+        # 没有持仓时组合市值等于已实现资金
+        realized = 100000.0 + sum(t['profit'] for t in result['trades'])
+        if not result['open_positions']:
+            self.assertAlmostEqual(result['equity'].iloc[-1], realized, places=6)
+
+    def test_empty(self):
+        """测试没有有效数据"""
+        result = run_portfolio_backtest({'A': (pd.DataFrame(), pd.DataFrame())})
+        self.assertIsInstance(result['trades'], TradeLog)
+        self.assertEqual(len(result['trades']), 0)
+        self.assertEqual(result['metrics']['total_trades'], 0)
+        with self.assertRaises(ValueError):
+            run_portfolio_backtest({}, max_positions=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
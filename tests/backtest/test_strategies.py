@@ -0,0 +1,82 @@
+"""
+策略插件模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.engine import get_empty_results, run_backtest
+from trademind.backtest.strategies import (
+    _STRATEGIES,
+    available_strategies,
+    compare_strategies,
+    register_strategy,
+    run_strategy_backtest
+)
+from trademind.core.analyzer import StockAnalyzer
+from trademind.core.dynamic_rsi_strategy import backtest_dynamic_rsi
+
+COMPARED_METRICS = list(get_empty_results())
+
+
+class TestStrategies(unittest.TestCase):
+    """测试策略插件"""
+
+    def setUp(self):
+        """生成行情数据"""
+        rng = np.random.default_rng(5)
+        n = 500
+        dates = pd.date_range(start='2019-01-01', periods=n, freq='B')
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        self.data = pd.DataFrame({
+            'Open': close,
+            'High': close * (1 + rng.uniform(0, 0.03, n)),
+            'Low': close * (1 - rng.uniform(0, 0.03, n)),
+            'Close': close,
+            'Volume': rng.uniform(1e5, 1e6, n)
+        }, index=dates)
+
+    def test_default_matches_analyzer(self):
+        """测试默认策略与分析器生成的回测信号结果一致"""
+        self.assertEqual(available_strategies()[:2], ['default', 'dynamic_rsi'])
+        signals = StockAnalyzer().generate_backtest_signals(self.data)
+        self.assertEqual(run_strategy_backtest(self.data), run_backtest(self.data, signals))
+
+    def test_compare_matches_single_runs(self):
+        """测试一次比较多个策略的指标与逐个回测一致"""
+        results = compare_strategies(self.data, max_hold_days=10)
+        self.assertEqual(list(results), available_strategies())
+        for name, metrics in results.items():
+            expected = run_strategy_backtest(self.data, name, max_hold_days=10)
+            for key in COMPARED_METRICS:
+                self.assertEqual(metrics[key], expected[key], f"{name}: {key}")
+
+        expected = run_strategy_backtest(self.data, 'dynamic_rsi', initial_capital=5000)
+        self.assertEqual(backtest_dynamic_rsi(self.data, initial_capital=5000), expected)
+        self.assertEqual(compare_strategies(self.data.iloc[:30]), {})
+
+    def test_shared_frame(self):
+        """测试所有策略共用同一个指标计算引擎"""
+        frames = []
+
+        @register_strategy('test_momentum')
+        def _momentum(data, frame):
+            frames.append(frame)
+            sma = frame.sma(20).to_numpy()
+            close = data['Close'].to_numpy()
+            return close > sma, close < sma
+
+        try:
+            compare_strategies(self.data, ['test_momentum', 'test_momentum'])
+            self.assertEqual(len(frames), 2)
+            self.assertIs(frames[0], frames[1])
+        finally:
+            del _STRATEGIES['test_momentum']
+
+        with self.assertRaises(KeyError):
+            run_strategy_backtest(self.data, 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
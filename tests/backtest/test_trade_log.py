@@ -0,0 +1,90 @@
+"""
+交易记录模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.engine import calculate_performance_metrics, generate_trade_summary
+from trademind.backtest.trade_log import TradeLog
+
+
+def make_trades(n, seed=0, tz=None):
+    """生成随机交易字典列表"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2021-01-04', tz=tz)
+    trades = []
+    for i in range(n):
+        entry = start + pd.Timedelta(days=7 * i)
+        trades.append({
+            'entry_date': entry,
+            'entry_price': float(rng.uniform(50, 150)),
+            'exit_date': entry + pd.Timedelta(days=int(rng.integers(1, 20))),
+            'exit_price': float(rng.uniform(50, 150)),
+            'position': 'long' if rng.random() < 0.6 else 'short',
+            'shares': float(rng.uniform(10, 100)),
+            'profit': float(rng.normal(20, 150)),
+            'profit_pct': float(rng.normal(0, 5)),
+            'exit_reason': str(rng.choice(['止损', '止盈', '最大持有期限', '反向信号'])),
+            'hold_days': int(rng.integers(1, 20))
+        })
+    return trades
+
+
+def reference_consecutive_losses(trades):
+    """逐笔计算最大连续亏损次数"""
+    current = longest = 0
+    for trade in trades:
+        current = current + 1 if trade['profit'] <= 0 else 0
+        longest = max(longest, current)
+    return longest
+
+
+class TestTradeLog(unittest.TestCase):
+    """测试按列保存的交易记录"""
+
+    def test_round_trip(self):
+        """测试与交易字典列表互相转换"""
+        for tz in (None, 'America/New_York'):
+            trades = make_trades(30, tz=tz)
+            log = TradeLog.from_records(trades)
+            self.assertEqual(len(log), 30)
+            self.assertEqual(log.to_dicts(), trades)
+            self.assertEqual(log[3], trades[3])
+            self.assertEqual(list(log), trades)
+            np.testing.assert_array_equal(log['profit'], [t['profit'] for t in trades])
+            pd.testing.assert_frame_equal(log.to_frame(), pd.DataFrame(trades), check_dtype=False)
+
+        merged = TradeLog.concat([TradeLog.from_records(trades[:10]), TradeLog.from_records(trades[10:])])
+        self.assertEqual(merged.to_dicts(), trades)
+        self.assertEqual(len(TradeLog.concat([])), 0)
+
+        # 组合回测的交易带股票代码
+        with_symbols = [{'symbol': f'S{i % 3}', **trade} for i, trade in enumerate(trades)]
+        log = TradeLog.concat([TradeLog.from_records(with_symbols[:10]), TradeLog.from_records(with_symbols[10:])])
+        self.assertEqual(log.to_dicts(), with_symbols)
+        self.assertEqual(list(log['symbol']), [t['symbol'] for t in with_symbols])
+        pd.testing.assert_frame_equal(log.to_frame(), pd.DataFrame(with_symbols), check_dtype=False)
+
+    def test_metrics_match_dict_input(self):
+        """测试TradeLog与字典列表得到相同的指标和摘要"""
+        trades = make_trades(60, seed=1)
+        dates = pd.date_range('2021-01-01', periods=400, freq='D')
+        equity = list(10000 + np.cumsum([t['profit'] for t in trades]))
+        equity = [10000.0] + equity
+
+        metrics = calculate_performance_metrics(TradeLog.from_records(trades), equity, 10000.0, dates)
+        expected = calculate_performance_metrics(trades, equity, 10000.0, dates)
+        self.assertEqual(metrics, expected)
+        self.assertEqual(metrics['consecutive_losses'], reference_consecutive_losses(trades))
+        self.assertEqual(metrics['win_rate'], round(sum(t['profit'] > 0 for t in trades) / 60 * 100, 1))
+
+        summary = generate_trade_summary(TradeLog.from_records(trades))
+        self.assertEqual(summary, generate_trade_summary(trades))
+        self.assertEqual(sum(s['count'] for s in summary['exit_reason_stats'].values()), 60)
+        self.assertEqual(list(summary['monthly_performance']), sorted(summary['monthly_performance']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+滚动前进回测模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.backtest.optimizer import evaluate_parameters, parameter_grid, prepare_inputs
+from trademind.backtest.walk_forward import run_walk_forward, walk_forward_windows
+
+
+class TestWalkForward(unittest.TestCase):
+    """测试滚动前进回测"""
+
+    def setUp(self):
+        """生成行情和信号"""
+        rng = np.random.default_rng(3)
+        n = 700
+        dates = pd.date_range(start='2019-01-01', periods=n, freq='B')
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        self.data = pd.DataFrame({
+            'Open': close,
+            'High': close * (1 + rng.uniform(0, 0.03, n)),
+            'Low': close * (1 - rng.uniform(0, 0.03, n)),
+            'Close': close,
+            'Volume': rng.uniform(1e5, 1e6, n)
+        }, index=dates)
+        self.signals = pd.DataFrame({
+            'buy_signal': rng.random(n) < 0.06,
+            'sell_signal': rng.random(n) < 0.06
+        }, index=dates)
+        self.space = {'stop_loss_pct': [0.03, 0.07], 'take_profit_pct': [0.08, 0.20], 'max_hold_days': [5, 20]}
+        self.kwargs = {'space': self.space, 'train_size': 200, 'test_size': 100, 'metric': 'net_profit'}
+
+    def test_windows(self):
+        """测试滚动和锚定区间的切分"""
+        self.assertEqual(walk_forward_windows(500, 200, 100),
+                         [(50, 250, 250, 350), (150, 350, 350, 450), (250, 450, 450, 500)])
+        self.assertEqual(walk_forward_windows(500, 200, 100, anchored=True),
+                         [(50, 250, 250, 350), (50, 350, 350, 450), (50, 450, 450, 500)])
+        self.assertEqual(walk_forward_windows(250, 200, 100), [])
+        with self.assertRaises(ValueError):
+            walk_forward_windows(500, 0, 100)
+
+    def test_out_of_sample_results(self):
+        """测试每个区间使用训练区间的最优参数，样本外交易位于测试区间内且资金连续"""
+        result = run_walk_forward(self.data, self.signals, **self.kwargs)
+        windows = walk_forward_windows(len(self.data), 200, 100)
+        self.assertEqual(len(result['windows']), len(windows))
+        self.assertEqual(len(result['equity']), len(self.data) - windows[0][2])
+        self.assertGreater(len(result['trades']), 0)
+
+        inputs = prepare_inputs(self.data, self.signals)
+        for window, summary in zip(windows, result['windows']):
+            rows = evaluate_parameters('X', inputs, parameter_grid(self.space), window=window[:2])
+            self.assertEqual(summary['in_sample']['net_profit'], max(row['net_profit'] for row in rows))
+            self.assertEqual(summary['test_start'], self.data.index[window[2]])
+
+        for trade in result['trades']:
+            window = next(w for w in result['windows'] if w['test_start'] <= trade['entry_date'] <= w['test_end'])
+            self.assertLessEqual(trade['exit_date'], window['test_end'])
+
+        final_capital = 10000.0 + sum(trade['profit'] for trade in result['trades'])
+        self.assertAlmostEqual(result['equity'].iloc[-1], final_capital, places=6)
+        self.assertEqual(result['metrics']['total_trades'], len(result['trades']))
+
+    def test_lower_is_better_metric(self):
+        """测试回撤等越小越好的指标选择训练区间内指标最低的参数"""
+        kwargs = {**self.kwargs, 'metric': 'max_drawdown'}
+        result = run_walk_forward(self.data, self.signals, **kwargs)
+        inputs = prepare_inputs(self.data, self.signals)
+        for window, summary in zip(walk_forward_windows(len(self.data), 200, 100), result['windows']):
+            rows = evaluate_parameters('X', inputs, parameter_grid(self.space), window=window[:2])
+            self.assertEqual(summary['in_sample']['max_drawdown'], min(row['max_drawdown'] for row in rows))
+
+    def test_parallel_matches_serial(self):
+        """测试并行搜索与串行结果一致"""
+        serial = run_walk_forward(self.data, self.signals, anchored=True, **self.kwargs)
+        parallel = run_walk_forward(self.data, self.signals, anchored=True, workers=2, **self.kwargs)
+        self.assertEqual([w['params'] for w in parallel['windows']], [w['params'] for w in serial['windows']])
+        pd.testing.assert_series_equal(parallel['equity'], serial['equity'])
+
+    def test_insufficient_data(self):
+        """测试数据不足时返回空结果"""
+        result = run_walk_forward(self.data.iloc[:200], self.signals.iloc[:200], **self.kwargs)
+        self.assertEqual(result['windows'], [])
+        self.assertEqual(result['metrics']['total_trades'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
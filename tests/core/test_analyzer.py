@@ -13,6 +13,11 @@ import shutil
 import os
 
 from trademind.core.analyzer import StockAnalyzer
+from trademind.data.cache import OHLCVCache
+from trademind.backtest.cache import BacktestCache
+from trademind.core.pattern_stats import PatternStatsCache
+from trademind.core.patterns import PATTERN_LOOKBACK
+from trademind.data.context import MarketDataContext
 
 
 class TestStockAnalyzer(unittest.TestCase):
@@ -44,6 +49,9 @@ class TestStockAnalyzer(unittest.TestCase):
         
         # 修改结果路径为临时目录
         self.analyzer.results_path = Path(self.temp_dir)
+        self.analyzer.data_cache = OHLCVCache(Path(self.temp_dir) / 'cache')
+        self.analyzer.backtest_cache = BacktestCache(Path(self.temp_dir) / 'backtest')
+        self.analyzer.pattern_stats_cache = PatternStatsCache(Path(self.temp_dir) / 'pattern_stats')
     
     def tearDown(self):
         """清理测试环境"""
@@ -196,6 +204,77 @@ class TestStockAnalyzer(unittest.TestCase):
         # 验证generate_html_report被调用
         self.assertTrue(mock_generate_html_report.called)
     
+    @patch('trademind.core.analyzer.run_backtest')
+    def test_analyze_stocks_downloads_once_per_symbol(self, mock_run_backtest):
+        """测试压力位和趋势分析复用同一份数据，每个股票只下载一次"""
+        mock_run_backtest.return_value = {'total_trades': 0}
+        
+        with patch.object(self.analyzer.batch_fetcher, 'fetch', return_value={}), \
+             patch.object(self.analyzer, 'get_stock_data', return_value=self.mock_data) as mock_get:
+            results = self.analyzer.analyze_stocks(['AAPL', 'MSFT'])
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertTrue(results[0].get('has_pressure_trend_analysis'))
+    
+    @patch('trademind.core.analyzer.run_backtest')
+    def test_analyze_stocks_batch_download(self, mock_run_backtest):
+        """测试多只股票通过一次批量请求下载"""
+        mock_run_backtest.return_value = {'total_trades': 0}
+        wide = pd.concat({'AAPL': self.mock_data, 'MSFT': self.mock_data}, axis=1)
+        
+        with patch('yfinance.download', return_value=wide) as mock_download, \
+             patch.object(self.analyzer, 'get_stock_data') as mock_get:
+            results = self.analyzer.analyze_stocks(['AAPL', 'MSFT'])
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(mock_download.call_count, 1)
+        self.assertFalse(mock_get.called)
+
+    @patch('trademind.core.analyzer.run_backtest')
+    def test_analyze_timeframes(self, mock_run_backtest):
+        """测试周线和月线分析结果按周期保存，K线不足的周期跳过"""
+        mock_run_backtest.return_value = {'total_trades': 0}
+
+        result = self.analyzer.analyze_symbol_data('AAPL', '苹果公司', self.mock_data, {})
+        # 252个自然日约37周、9个月，月线K线不足
+        self.assertEqual(list(result['timeframes']), ['weekly'])
+        weekly = result['timeframes']['weekly']
+        self.assertEqual(weekly['bars'], 37)
+        self.assertEqual(weekly['price'], self.mock_data['Close'].iloc[-1])
+        self.assertIn('rsi', weekly['indicators'])
+        self.assertIn('direction', weekly['trend_analysis'])
+        self.assertIn('nearest_support', weekly['pressure_points'])
+
+        result = self.analyzer.analyze_symbol_data('AAPL', '苹果公司', self.mock_data, {}, timeframes=())
+        self.assertNotIn('timeframes', result)
+
+    @patch('trademind.core.analyzer.run_backtest')
+    def test_patterns_see_trend_window(self, mock_run_backtest):
+        """测试形态识别拿到足够的K线，锤子线和吊颈线可以判断前期趋势"""
+        mock_run_backtest.return_value = {'total_trades': 0}
+
+        with patch('trademind.core.patterns.identify_candlestick_patterns', return_value=[]) as mock_identify:
+            self.analyzer.analyze_symbol_data('AAPL', '苹果公司', self.mock_data, {}, timeframes=())
+        self.assertGreaterEqual(len(mock_identify.call_args[0][0]), PATTERN_LOOKBACK)
+
+    def test_analyze_stocks_parallel(self):
+        """测试多进程分析保持输入顺序并隔离单个股票的失败"""
+        context = MarketDataContext(lambda symbol: pd.DataFrame())
+        context.put('AAPL', self.mock_data)
+        context.put('BAD', self.mock_data.drop(columns=['Close']))
+        context.put('MSFT', self.mock_data)
+        progress = []
+
+        results = self.analyzer.analyze_stocks(
+            ['AAPL', 'BAD', 'MSFT'], context=context, workers=2,
+            progress_callback=lambda index, total, symbol, result: progress.append((index, symbol, result is not None))
+        )
+
+        self.assertEqual([r['symbol'] for r in results], ['AAPL', 'MSFT'])
+        self.assertEqual(progress, [(1, 'AAPL', True), (2, 'BAD', False), (3, 'MSFT', True)])
+        self.assertEqual(results[0]['price'], results[1]['price'])
+    
     def test_clean_reports(self):
         """测试清理报告功能"""
         # 创建一些测试报告文件
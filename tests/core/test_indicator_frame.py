@@ -0,0 +1,97 @@
+"""
+TradeMind Lite（轻量版）- 指标计算引擎模块测试
+"""
+
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+from trademind.core import indicator_frame
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.indicators import (
+    calculate_true_range,
+    calculate_dynamic_rsi_thresholds,
+    calculate_indicator_series
+)
+from trademind.core.pressure_points import PressurePointAnalyzer
+from trademind.core.trend_analysis import TrendAnalyzer
+
+
+class TestIndicatorFrame(unittest.TestCase):
+    """测试IndicatorFrame"""
+
+    def setUp(self):
+        """设置测试数据"""
+        np.random.seed(3)
+        dates = pd.date_range(start='2022-01-01', periods=300, freq='D')
+        close = pd.Series(100 + np.random.normal(0, 1, 300).cumsum(), index=dates)
+        self.data = pd.DataFrame({
+            'Open': close.shift(1).fillna(100),
+            'High': close + np.random.uniform(0, 2, 300),
+            'Low': close - np.random.uniform(0, 2, 300),
+            'Close': close,
+            'Volume': np.random.randint(100000, 200000, 300).astype(float)
+        }, index=dates)
+
+    def test_shared_intermediates_computed_once(self):
+        """测试TR在多个指标之间只计算一次"""
+        frame = IndicatorFrame(self.data)
+        with patch.object(indicator_frame, 'calculate_true_range',
+                          wraps=calculate_true_range) as mock_tr:
+            frame.get('atr_pct', 14)
+            frame.get('wilder_atr', 14)
+            frame.get('dynamic_rsi', 14, 14, 252, 15.0)
+            TrendAnalyzer(self.data, frame=frame).calculate_adx()
+        self.assertEqual(mock_tr.call_count, 1)
+
+    def test_resolve(self):
+        """测试按声明计算一组指标"""
+        frame = IndicatorFrame(self.data)
+        results = frame.resolve(['tr', ('sma', 20), ('rolling_max', 'High', 9)])
+
+        self.assertEqual(set(results), {('tr',), ('sma', 20), ('rolling_max', 'High', 9)})
+        pd.testing.assert_series_equal(results[('sma', 20)], self.data['Close'].rolling(20).mean())
+        self.assertIs(frame.sma(20), results[('sma', 20)])
+        with self.assertRaises(KeyError):
+            frame.get('unknown')
+
+    def test_wilder_atr(self):
+        """测试Wilder平滑ATR与逐根K线计算一致"""
+        tr = calculate_true_range(self.data['High'], self.data['Low'], self.data['Close'])
+        expected = tr.rolling(window=14).mean()
+        for i in range(14, len(tr)):
+            expected.iloc[i] = (expected.iloc[i-1] * 13 + tr.iloc[i]) / 14
+
+        pd.testing.assert_series_equal(IndicatorFrame(self.data).get('wilder_atr', 14), expected)
+
+    def test_results_match_standalone_functions(self):
+        """测试通过引擎计算的结果与独立函数一致"""
+        frame = IndicatorFrame(self.data)
+        data = self.data
+
+        self.assertEqual(
+            calculate_dynamic_rsi_thresholds(data['High'], data['Low'], data['Close'], lookback_period=100),
+            calculate_dynamic_rsi_thresholds(data['High'], data['Low'], data['Close'],
+                                             lookback_period=100, frame=frame)
+        )
+        standalone = calculate_indicator_series(data)
+        shared = calculate_indicator_series(data, frame=frame)
+        pd.testing.assert_series_equal(standalone['rsi'], shared['rsi'])
+        pd.testing.assert_series_equal(standalone['kdj']['k'], shared['kdj']['k'])
+
+    def test_analyzers_share_moving_averages(self):
+        """测试压力位和趋势分析共用均线"""
+        frame = IndicatorFrame(self.data)
+        ma_levels = PressurePointAnalyzer(self.data, frame=frame).get_ma_support_resistance()
+        self.assertTrue(frame.is_cached('sma', 20))
+        self.assertAlmostEqual(ma_levels['MA20'], self.data['Close'].rolling(20).mean().iloc[-1])
+
+        sma20 = frame.sma(20)
+        TrendAnalyzer(self.data, frame=frame).analyze_dow_theory()
+        self.assertIs(frame.get('sma', 20), sma20)
+        self.assertTrue(frame.is_cached('sma', 50, 'Close'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,10 +13,42 @@ from trademind.core.indicators import (
     calculate_macd,
     calculate_kdj,
     calculate_rsi,
-    calculate_bollinger_bands
+    calculate_bollinger_bands,
+    calculate_dynamic_rsi_thresholds,
+    calculate_rsi_series,
+    calculate_kdj_series,
+    calculate_dynamic_rsi_thresholds_series,
+    calculate_indicator_series
 )
 
 
+def reference_rsi(prices, period=14):
+    """逐根K线循环实现的RSI，作为向量化实现的对照"""
+    delta = prices.diff().dropna()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    avg_gain = gain.iloc[:period].mean()
+    avg_loss = loss.iloc[:period].mean()
+    for i in range(period, len(delta)):
+        avg_gain = (avg_gain * (period - 1) + gain.iloc[i]) / period
+        avg_loss = (avg_loss * (period - 1) + loss.iloc[i]) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def reference_kdj(high, low, close, n=9):
+    """逐根K线循环实现的KDJ，作为向量化实现的对照"""
+    low_list = low.rolling(window=n).min()
+    high_list = high.rolling(window=n).max()
+    rsv = ((close - low_list) / (high_list - low_list) * 100).fillna(0.0)
+    k = d = 50.0
+    for i in range(n, len(close)):
+        k = 2/3 * k + 1/3 * rsv.iloc[i]
+        d = 2/3 * d + 1/3 * k
+    return min(max(k, 0), 100), min(max(d, 0), 100), min(max(3 * k - 2 * d, 0), 100)
+
+
 class TestIndicators(unittest.TestCase):
     """测试技术指标计算函数"""
 
@@ -122,5 +154,61 @@ class TestIndicators(unittest.TestCase):
         self.assertFalse(math.isnan(percent_b))
 
 
+class TestIndicatorSeries(unittest.TestCase):
+    """测试完整序列指标与单值函数的一致性"""
+
+    def setUp(self):
+        """设置足够长的随机游走数据"""
+        rng = np.random.default_rng(7)
+        n = 320
+        index = pd.date_range('2022-01-03', periods=n, freq='B')
+        self.close = pd.Series(100 + np.cumsum(rng.normal(0, 1, n)), index=index)
+        self.high = self.close + rng.uniform(0.1, 2, n)
+        self.low = self.close - rng.uniform(0.1, 2, n)
+
+    def test_rsi_series_matches_reference_loop(self):
+        """测试RSI序列的每个值等于截断到该K线后循环计算的结果"""
+        rsi = calculate_rsi_series(self.close)
+
+        self.assertTrue(rsi.iloc[:14].isna().all())
+        for end in (15, 16, 40, 200, len(self.close)):
+            self.assertAlmostEqual(rsi.iloc[end - 1], reference_rsi(self.close.iloc[:end]), places=8)
+        self.assertAlmostEqual(calculate_rsi(self.close), reference_rsi(self.close), places=8)
+
+    def test_kdj_series_matches_reference_loop(self):
+        """测试KDJ序列与循环实现一致"""
+        k, d, j = calculate_kdj_series(self.high, self.low, self.close)
+
+        for end in (9, 10, 50, len(self.close)):
+            expected = reference_kdj(self.high.iloc[:end], self.low.iloc[:end], self.close.iloc[:end])
+            self.assertAlmostEqual(k.iloc[end - 1], expected[0], places=8)
+            self.assertAlmostEqual(d.iloc[end - 1], expected[1], places=8)
+            self.assertAlmostEqual(j.iloc[end - 1], expected[2], places=8)
+
+    def test_dynamic_thresholds_series_is_causal(self):
+        """测试动态阈值序列的每个值只依赖该K线之前的数据"""
+        rsi, oversold, overbought, percentile = calculate_dynamic_rsi_thresholds_series(
+            self.high, self.low, self.close
+        )
+
+        for end in (100, 266, 267, 300, len(self.close)):
+            expected = calculate_dynamic_rsi_thresholds(
+                self.high.iloc[:end], self.low.iloc[:end], self.close.iloc[:end]
+            )
+            self.assertAlmostEqual(oversold.iloc[end - 1], expected[1], places=10)
+            self.assertAlmostEqual(overbought.iloc[end - 1], expected[2], places=10)
+            self.assertAlmostEqual(percentile.iloc[end - 1], expected[3], places=10)
+
+    def test_indicator_series_alignment(self):
+        """测试指标序列字典与数据对齐"""
+        data = pd.DataFrame({'High': self.high, 'Low': self.low, 'Close': self.close})
+        indicators = calculate_indicator_series(data)
+
+        self.assertTrue(indicators['rsi'].index.equals(data.index))
+        self.assertTrue(indicators['macd']['hist'].index.equals(data.index))
+        self.assertEqual(len(indicators['bollinger']['upper']), len(data))
+        self.assertAlmostEqual(indicators['macd']['macd'].iloc[-1], calculate_macd(self.close)[0])
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+并行分析模块的单元测试
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from trademind.backtest.cache import BacktestCache
+from trademind.core.analyzer import StockAnalyzer
+from trademind.core.parallel import run_symbol_pipeline, resolve_workers
+
+
+def square_task(analyzer, symbol, value):
+    """测试任务：返回(股票代码, 平方, 进程号)，值为负数时失败"""
+    if value < 0:
+        raise ValueError("负数")
+    return symbol, value * value, os.getpid()
+
+
+def cache_dir_task(analyzer, symbol):
+    """测试任务：返回工作进程分析器的回测缓存目录"""
+    return str(analyzer.backtest_cache.cache_dir)
+
+
+class TestRunSymbolPipeline(unittest.TestCase):
+    """测试run_symbol_pipeline"""
+
+    def setUp(self):
+        """设置测试任务"""
+        self.items = [(f'S{i}', i) for i in range(8)]
+        self.items[3] = ('BAD', -1)
+        self.progress = []
+
+    def record(self, index, total, symbol, result):
+        self.progress.append((index, total, symbol, result is not None))
+
+    def check_results(self, results):
+        """验证结果顺序和失败隔离"""
+        self.assertEqual(len(results), 8)
+        self.assertIsNone(results[3])
+        self.assertEqual([r[0] for r in results if r is not None], ['S0', 'S1', 'S2', 'S4', 'S5', 'S6', 'S7'])
+        self.assertEqual(results[7][1], 49)
+        self.assertEqual([p[0] for p in self.progress], list(range(1, 9)))
+        self.assertEqual(self.progress[3], (4, 8, 'BAD', False))
+
+    def test_serial(self):
+        """测试串行执行"""
+        results = run_symbol_pipeline(None, square_task, self.items, workers=1,
+                                      progress_callback=self.record)
+
+        self.check_results(results)
+        self.assertEqual({r[2] for r in results if r is not None}, {os.getpid()})
+
+    def test_process_pool(self):
+        """测试进程池执行保持输入顺序"""
+        results = run_symbol_pipeline(None, square_task, self.items, workers=2,
+                                      progress_callback=self.record)
+
+        self.check_results(results)
+        self.assertNotIn(os.getpid(), {r[2] for r in results if r is not None})
+
+    def test_should_stop(self):
+        """测试停止信号终止剩余任务"""
+        results = run_symbol_pipeline(None, square_task, self.items, workers=1,
+                                      progress_callback=self.record,
+                                      should_stop=lambda: len(self.progress) >= 2)
+
+        self.assertEqual(len(self.progress), 2)
+        self.assertTrue(all(r is None for r in results[2:]))
+
+    def test_workers_use_parent_caches(self):
+        """测试工作进程的分析器沿用父进程分析器的缓存目录"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        analyzer = StockAnalyzer()
+        analyzer.backtest_cache = BacktestCache(Path(temp_dir) / 'backtest')
+
+        results = run_symbol_pipeline(analyzer, cache_dir_task, [('A',), ('B',)], workers=2)
+        self.assertEqual(results, [str(Path(temp_dir) / 'backtest')] * 2)
+
+    def test_resolve_workers(self):
+        """测试工作进程数量解析"""
+        cpu_count = os.cpu_count() or 1
+        self.assertEqual(resolve_workers(1), 1)
+        self.assertEqual(resolve_workers(0), cpu_count)
+        self.assertEqual(resolve_workers(cpu_count + 100), cpu_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+TradeMind Lite（轻量版）- 形态统计模块测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+from trademind.core.patterns import identify_candlestick_patterns, scan_candlestick_patterns
+from trademind.core.pattern_stats import (
+    FORWARD_HORIZONS,
+    PatternStatsCache,
+    measured_confidence,
+    pattern_return_stats,
+    pool_pattern_stats,
+    summarize_pattern_stats
+)
+
+
+def _make_data(seed, n=400):
+    """生成随机K线数据"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))), 0)
+    open_price = np.round(close * np.exp(rng.normal(0, 0.01, n)), 0)
+    return pd.DataFrame({
+        'Open': open_price,
+        'High': np.maximum(open_price, close) * (1 + rng.uniform(0, 0.02, n)),
+        'Low': np.minimum(open_price, close) * (1 - rng.uniform(0, 0.02, n)),
+        'Close': close
+    }, index=pd.date_range(start='2022-01-03', periods=n, freq='B'))
+
+
+class TestPatternStats(unittest.TestCase):
+    """测试形态前瞻收益统计"""
+
+    def setUp(self):
+        """生成两只股票的数据"""
+        self.data = _make_data(0)
+        self.other = _make_data(1)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """清理临时目录"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_direct_computation(self):
+        """测试矩阵乘法得到的统计量与逐个形态筛选的结果一致"""
+        table = pattern_return_stats(self.data)
+        matches = scan_candlestick_patterns(self.data).matches
+        close = self.data['Close']
+        for horizon in FORWARD_HORIZONS:
+            forward = (close.shift(-horizon) / close - 1)
+            for pattern in matches.columns:
+                returns = forward[matches[pattern]].dropna()
+                row = table.loc[(pattern, horizon)]
+                self.assertEqual(row['count'], len(returns))
+                self.assertAlmostEqual(row['sum'], returns.sum())
+                self.assertEqual(row['up'], (returns > 0).sum())
+
+        summary = summarize_pattern_stats(table)
+        self.assertEqual(list(summary.columns), ['samples', 'mean_return', 'std_return', 'win_rate', 'hit_rate'])
+
+    def test_pooled_confidence(self):
+        """测试多只股票的统计量相加，以及实测置信度替换默认置信度"""
+        first, second = pattern_return_stats(self.data), pattern_return_stats(self.other)
+        pooled = pool_pattern_stats([first, second])
+        pd.testing.assert_series_equal(pooled['count'], first['count'] + second['count'])
+
+        confidence = measured_confidence(pooled, horizon=5, min_samples=10)
+        counts = pooled.xs(5, level='horizon')['count']
+        self.assertEqual(set(confidence), set(counts[counts >= 10].index))
+        self.assertEqual(measured_confidence(pooled, min_samples=10 ** 6), {})
+        # 看跌形态的置信度为前瞻收益率为负的比例
+        if "吊颈线" in confidence:
+            row = pooled.loc[("吊颈线", 5)]
+            self.assertEqual(confidence["吊颈线"], round(row['down'] / row['count'] * 100, 1))
+
+        patterns = identify_candlestick_patterns(self.data, {name: 55.5 for name in confidence})
+        for pattern in patterns:
+            if pattern.name in confidence:
+                self.assertEqual(pattern.confidence, 55.5)
+
+    def test_cache(self):
+        """测试按股票代码和最后一根K线日期缓存"""
+        cache = PatternStatsCache(Path(self.temp_dir))
+        table = cache.get('AAA', self.data)
+        cache.get('AAA', self.data)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 0, 'errors': 0})
+
+        reloaded = PatternStatsCache(Path(self.temp_dir))
+        pd.testing.assert_frame_equal(reloaded.get('AAA', self.data), table, check_dtype=False)
+        self.assertEqual(reloaded.stats()['hits'], 1)
+
+        reloaded.get('AAA', self.data.iloc[:-1])
+        self.assertEqual(reloaded.stats()['misses'], 1)
+
+        # 每个交易日产生一个文件，超出上限时淘汰最久未使用的文件
+        limited = PatternStatsCache(Path(self.temp_dir), max_entries=2)
+        limited.get('BBB', self.data.iloc[:-2])
+        self.assertEqual(len(list(Path(self.temp_dir).glob('*.json'))), 2)
+        self.assertEqual(limited.stats()['evictions'], 1)
+        self.assertEqual(list(Path(self.temp_dir).glob('*.tmp')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
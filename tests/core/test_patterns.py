@@ -7,7 +7,12 @@ TradeMind Lite（轻量版）- 形态识别模块测试
 import unittest
 import pandas as pd
 import numpy as np
-from trademind.core.patterns import TechnicalPattern, identify_candlestick_patterns
+from trademind.core.patterns import (
+    CANDLESTICK_PATTERNS,
+    TechnicalPattern,
+    identify_candlestick_patterns,
+    scan_candlestick_patterns
+)
 
 
 class TestTechnicalPattern(unittest.TestCase):
@@ -170,5 +175,47 @@ class TestCandlestickPatterns(unittest.TestCase):
         pass
 
 
+class TestPatternScan(unittest.TestCase):
+    """测试全部历史的K线形态扫描"""
+    
+    def setUp(self):
+        """生成随机K线数据"""
+        rng = np.random.default_rng(0)
+        n = 200
+        close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))), 0)
+        open_price = np.round(close * np.exp(rng.normal(0, 0.01, n)), 0)
+        self.data = pd.DataFrame({
+            'Open': open_price,
+            'High': np.maximum(open_price, close) * (1 + rng.uniform(0, 0.02, n)),
+            'Low': np.minimum(open_price, close) * (1 - rng.uniform(0, 0.02, n)),
+            'Close': close
+        }, index=pd.date_range(start='2023-01-01', periods=n, freq='B'))
+    
+    def test_rows_match_last_bar_api(self):
+        """测试每一行与只用该K线之前数据识别的结果一致"""
+        scan = scan_candlestick_patterns(self.data)
+        self.assertEqual(scan.matches.shape, (200, len(CANDLESTICK_PATTERNS)))
+        self.assertTrue(scan.matches.any().any())
+        self.assertFalse(scan.matches.iloc[:4].any().any())
+        self.assertTrue(((scan.confidence > 0) == scan.matches).all().all())
+        
+        for i in range(len(self.data)):
+            expected = identify_candlestick_patterns(self.data.iloc[:i + 1])
+            self.assertEqual(scan.patterns_at(i), expected, i)
+    
+    def test_engulfing_rows(self):
+        """测试吞没形态出现在最后一根K线上"""
+        data = pd.DataFrame({
+            'Open': [100, 105, 110, 115, 120, 114, 115, 122],
+            'High': [110, 115, 120, 125, 130, 125, 125, 125],
+            'Low': [95, 100, 105, 110, 115, 110, 110, 110],
+            'Close': [105, 110, 115, 120, 115, 122, 120, 114]
+        })
+        matches = scan_candlestick_patterns(data).matches
+        self.assertTrue(matches.loc[5, "看涨吞没"])
+        self.assertTrue(matches.loc[7, "看跌吞没"])
+        self.assertEqual(scan_candlestick_patterns(data.iloc[:0]).patterns_at(), [])
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+TradeMind Lite（轻量版）- 批量线性回归模块测试
+"""
+
+import unittest
+import numpy as np
+
+from trademind.core.regression import batched_linregress
+
+
+class TestBatchedLinregress(unittest.TestCase):
+    """测试批量线性回归"""
+
+    def test_matches_polyfit(self):
+        """测试每一行的拟合结果与单独拟合一致"""
+        rng = np.random.default_rng(5)
+        x = np.arange(50)
+        y = 2.0 * x + rng.normal(0, 5, (6, 50))
+        mask = rng.random((6, 50)) < 0.3
+        mask[0] = True
+
+        fit = batched_linregress(x, y, mask)
+        for row in range(6):
+            slope, intercept = np.polyfit(x[mask[row]], y[row, mask[row]], 1)
+            r = np.corrcoef(x[mask[row]], y[row, mask[row]])[0, 1]
+            self.assertAlmostEqual(fit['slope'][row], slope, places=8)
+            self.assertAlmostEqual(fit['intercept'][row], intercept, places=6)
+            self.assertAlmostEqual(fit['r_squared'][row], r ** 2, places=10)
+            self.assertEqual(fit['count'][row], mask[row].sum())
+
+    def test_degenerate_rows(self):
+        """测试点数不足和y不变的行"""
+        y = np.array([[1.0, 2.0, 3.0], [5.0, 5.0, 5.0], [1.0, np.nan, 3.0], [1.0, 4.0, 0.0]])
+        mask = np.array([[True, True, True], [True, True, True], [True, False, True], [False, True, False]])
+        fit = batched_linregress(np.arange(3), y, mask)
+
+        np.testing.assert_allclose(fit['slope'][:3], [1.0, 0.0, 1.0])
+        np.testing.assert_allclose(fit['r_squared'][:3], [1.0, 0.0, 1.0])
+        self.assertTrue(np.isnan(fit['slope'][3]))
+        self.assertTrue(np.isnan(fit['r_squared'][3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
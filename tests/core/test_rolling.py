@@ -0,0 +1,64 @@
+"""
+TradeMind Lite（轻量版）- 滚动统计模块测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.core.rolling import rolling_percentile_rank
+from trademind.core.dynamic_rsi_strategy import dynamic_atr_rsi
+
+
+class TestRollingPercentileRank(unittest.TestCase):
+    """测试滚动百分位"""
+
+    def setUp(self):
+        """设置测试数据，包含缺失值和重复值"""
+        np.random.seed(11)
+        values = np.round(np.random.normal(2, 0.5, 400), 1)
+        values[:13] = np.nan
+        values[200] = np.nan
+        self.values = pd.Series(values)
+
+    def test_average_matches_pandas_rank(self):
+        """测试average方式与rolling.apply + rank(pct=True)一致"""
+        expected = self.values.rolling(window=50).apply(
+            lambda x: pd.Series(x).rank(pct=True).iloc[-1]
+        )
+        result = rolling_percentile_rank(self.values, 50)
+        np.testing.assert_allclose(result, expected.to_numpy(), equal_nan=True)
+
+    def test_strict_matches_window_comparison(self):
+        """测试strict方式与逐窗口比较一致"""
+        x = self.values.to_numpy()
+        windows = np.lib.stride_tricks.sliding_window_view(x, 50)
+        expected = (windows < x[49:, None]).mean(axis=1)
+        result = rolling_percentile_rank(x, 50, method='strict')
+        self.assertTrue(np.isnan(result[:49]).all())
+        np.testing.assert_allclose(result[49:], expected)
+
+    def test_short_input_and_invalid_arguments(self):
+        """测试数据不足和无效参数"""
+        self.assertTrue(np.isnan(rolling_percentile_rank([1.0, 2.0], 5)).all())
+        with self.assertRaises(ValueError):
+            rolling_percentile_rank([1.0], 0)
+        with self.assertRaises(ValueError):
+            rolling_percentile_rank([1.0], 1, method='dense')
+
+    def test_dynamic_atr_rsi_percentile(self):
+        """测试动态RSI策略的波动率百分位"""
+        dates = pd.date_range(start='2022-01-01', periods=300, freq='D')
+        close = pd.Series(100 + np.random.normal(0, 1, 300).cumsum(), index=dates)
+        data = pd.DataFrame({'High': close + 1, 'Low': close - 1, 'Close': close}, index=dates)
+
+        result = dynamic_atr_rsi(data, lookback_period=100)
+
+        expected = result['atr_pct'].rolling(window=100).apply(
+            lambda x: pd.Series(x).rank(pct=True).iloc[-1]
+        )
+        pd.testing.assert_series_equal(result['volatility_percentile'], expected, check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+TradeMind Lite（轻量版）- 平滑计算模块测试
+"""
+
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+from trademind.core import smoothing
+from trademind.core.smoothing import ema_filter, wilder_smooth, seeded_smooth
+from trademind.core.trend_analysis import TrendAnalyzer
+
+
+def reference_ema(values, alpha, initial=None):
+    """逐元素循环的指数平滑，作为内核的对照"""
+    result = []
+    prev = initial
+    for x in values:
+        prev = x if prev is None else prev * (1 - alpha) + x * alpha
+        result.append(prev)
+    return np.array(result, dtype=float)
+
+
+def reference_adx(data, period=14):
+    """原逐根K线循环实现的ADX"""
+    high, low, close = data['High'], data['Low'], data['Close']
+    tr = pd.DataFrame({
+        'tr1': (high - low).abs(),
+        'tr2': (high - close.shift(1)).abs(),
+        'tr3': (low - close.shift(1)).abs()
+    }).max(axis=1)
+    plus_dm = pd.Series(0.0, index=high.index)
+    minus_dm = pd.Series(0.0, index=high.index)
+    high_diff = high.diff()
+    low_diff = low.diff()
+    for i in range(1, len(high)):
+        if high_diff.iloc[i] > 0 and high_diff.iloc[i] > abs(low_diff.iloc[i]):
+            plus_dm.iloc[i] = high_diff.iloc[i]
+        if low_diff.iloc[i] < 0 and abs(low_diff.iloc[i]) > abs(high_diff.iloc[i]):
+            minus_dm.iloc[i] = abs(low_diff.iloc[i])
+    smoothing_factor = 2.0 / (period + 1)
+    tr_s = tr.rolling(window=period).mean().fillna(tr.mean())
+    plus_s = plus_dm.rolling(window=period).mean().fillna(plus_dm.mean())
+    minus_s = minus_dm.rolling(window=period).mean().fillna(minus_dm.mean())
+    for i in range(period, len(tr)):
+        tr_s.iloc[i] = tr_s.iloc[i-1] * (1 - smoothing_factor) + tr.iloc[i] * smoothing_factor
+        plus_s.iloc[i] = plus_s.iloc[i-1] * (1 - smoothing_factor) + plus_dm.iloc[i] * smoothing_factor
+        minus_s.iloc[i] = minus_s.iloc[i-1] * (1 - smoothing_factor) + minus_dm.iloc[i] * smoothing_factor
+    tr_s = tr_s.replace(0, 0.001)
+    plus_di = 100 * (plus_s / tr_s)
+    minus_di = 100 * (minus_s / tr_s)
+    dx = 100 * ((plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, 0.001))
+    adx = dx.rolling(window=period).mean().bfill()
+    for i in range(period * 2, len(dx)):
+        adx.iloc[i] = adx.iloc[i-1] * (1 - smoothing_factor) + dx.iloc[i] * smoothing_factor
+    return adx.iloc[-1], plus_di.iloc[-1], minus_di.iloc[-1]
+
+
+class TestSmoothing(unittest.TestCase):
+    """测试平滑内核"""
+
+    def setUp(self):
+        """设置测试数据"""
+        np.random.seed(7)
+        self.values = np.random.normal(0, 1, 300).cumsum()
+
+    def test_ema_filter_matches_loop(self):
+        """测试指数平滑与逐元素循环结果一致"""
+        np.testing.assert_allclose(ema_filter(self.values, 0.2), reference_ema(self.values, 0.2))
+        np.testing.assert_allclose(
+            ema_filter(self.values, 0.2, initial=5.0), reference_ema(self.values, 0.2, initial=5.0)
+        )
+
+    def test_wilder_smooth_matches_loop(self):
+        """测试Wilder平滑与原ATR循环写法一致"""
+        expected = []
+        prev = 1.5
+        for x in self.values:
+            prev = (prev * 13 + x) / 14
+            expected.append(prev)
+        np.testing.assert_allclose(wilder_smooth(self.values, 14, initial=1.5), expected)
+
+    def test_pandas_fallback(self):
+        """测试scipy不可用时的pandas实现"""
+        expected = ema_filter(self.values, 0.1, initial=2.0)
+        with patch.object(smoothing, '_lfilter', False):
+            fallback = ema_filter(self.values, 0.1, initial=2.0)
+        np.testing.assert_allclose(fallback, expected)
+
+    def test_edge_cases(self):
+        """测试空序列和起点越界的情况"""
+        self.assertEqual(len(ema_filter([], 0.5)), 0)
+        np.testing.assert_allclose(ema_filter([3.0], 0.5), [3.0])
+        series = pd.Series([1.0, 2.0, 3.0])
+        pd.testing.assert_series_equal(seeded_smooth(series, 0.5, 2), series)
+
+    def test_seeded_smooth_keeps_prefix(self):
+        """测试起点之前的值保持不变"""
+        seeds = pd.Series(np.arange(10, dtype=float))
+        inputs = pd.Series(np.ones(10))
+        result = seeded_smooth(seeds, 0.5, 3, inputs=inputs)
+        np.testing.assert_allclose(result.iloc[:4], seeds.iloc[:4])
+        np.testing.assert_allclose(result.iloc[4:], reference_ema(inputs.iloc[4:], 0.5, initial=3.0))
+
+    def test_adx_matches_loop(self):
+        """测试ADX与原循环实现结果一致"""
+        dates = pd.date_range(start='2023-01-01', periods=200, freq='D')
+        close = pd.Series(100 + self.values[:200], index=dates)
+        data = pd.DataFrame({
+            'Open': close.shift(1).fillna(close.iloc[0]),
+            'High': close + np.random.uniform(0, 2, 200),
+            'Low': close - np.random.uniform(0, 2, 200),
+            'Close': close,
+            'Volume': np.random.randint(1000, 2000, 200)
+        }, index=dates)
+
+        result = TrendAnalyzer(data).calculate_adx()
+        adx, plus_di, minus_di = reference_adx(data)
+
+        self.assertAlmostEqual(result['adx'], adx, places=8)
+        self.assertAlmostEqual(result['plus_di'], plus_di, places=8)
+        self.assertAlmostEqual(result['minus_di'], minus_di, places=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
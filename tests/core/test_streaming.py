@@ -0,0 +1,151 @@
+"""
+TradeMind Lite（轻量版）- 流式指标模块测试
+"""
+
+import io
+import contextlib
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.core.indicators import (
+    calculate_rsi_series,
+    calculate_macd_series,
+    calculate_kdj_series,
+    calculate_bollinger_bands_series,
+    calculate_dynamic_rsi_thresholds_series
+)
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.trend_analysis import TrendAnalyzer
+from trademind.core.streaming import (
+    StreamingIndicator,
+    StreamingRSI,
+    StreamingMACD,
+    StreamingKDJ,
+    StreamingBollinger,
+    StreamingATR,
+    StreamingADX,
+    StreamingDynamicRSI,
+    StreamingIndicators
+)
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    """测试流式指标与批量计算结果一致"""
+
+    def setUp(self):
+        """设置测试数据"""
+        np.random.seed(21)
+        n = 400
+        dates = pd.date_range(start='2022-01-01', periods=n, freq='D')
+        close = pd.Series(100 + np.random.normal(0, 1.5, n).cumsum(), index=dates)
+        self.data = pd.DataFrame({
+            'Open': close.shift(1).fillna(100),
+            'High': close + np.random.uniform(0, 2, n),
+            'Low': close - np.random.uniform(0, 2, n),
+            'Close': close,
+            'Volume': np.random.randint(100000, 200000, n).astype(float)
+        }, index=dates)
+        # 前半段用于初始化，后半段逐根K线更新
+        self.split = 300
+
+    def stream(self, indicator):
+        """用前半段数据初始化，之后逐根更新，返回每根K线的输出"""
+        values = []
+        for i in range(len(self.data)):
+            if i < self.split:
+                continue
+            if i == self.split:
+                indicator.seed(self.data.iloc[:self.split])
+            values.append(indicator.update(self.data.iloc[i]))
+        return values
+
+    def assert_matches(self, streamed, expected):
+        """比较逐根更新结果与批量序列的后半段"""
+        np.testing.assert_allclose(
+            np.asarray(streamed, dtype=float), expected.iloc[self.split:].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9
+        )
+
+    def test_rsi(self):
+        """测试RSI"""
+        self.assert_matches(self.stream(StreamingRSI()), calculate_rsi_series(self.data['Close']))
+
+    def test_macd(self):
+        """测试MACD"""
+        streamed = np.array(self.stream(StreamingMACD()))
+        for column, expected in enumerate(calculate_macd_series(self.data['Close'])):
+            self.assert_matches(streamed[:, column], expected)
+
+    def test_kdj(self):
+        """测试KDJ"""
+        d = self.data
+        streamed = np.array(self.stream(StreamingKDJ()))
+        for column, expected in enumerate(calculate_kdj_series(d['High'], d['Low'], d['Close'])):
+            self.assert_matches(streamed[:, column], expected)
+
+    def test_bollinger(self):
+        """测试布林带"""
+        streamed = np.array(self.stream(StreamingBollinger()))
+        for column, expected in enumerate(calculate_bollinger_bands_series(self.data['Close'])):
+            self.assert_matches(streamed[:, column], expected)
+
+    def test_atr(self):
+        """测试Wilder ATR和简单ATR"""
+        frame = IndicatorFrame(self.data)
+        self.assert_matches(self.stream(StreamingATR()), frame.get('wilder_atr', 14))
+        self.assert_matches(self.stream(StreamingATR(method='simple')), frame.atr(14))
+
+    def test_dynamic_rsi(self):
+        """测试动态RSI阈值"""
+        d = self.data
+        streamed = np.array(self.stream(StreamingDynamicRSI(lookback_period=100)))
+        expected = calculate_dynamic_rsi_thresholds_series(d['High'], d['Low'], d['Close'], lookback_period=100)
+        for column, series in enumerate(expected):
+            self.assert_matches(streamed[:, column], series)
+
+    def test_adx(self):
+        """测试ADX与TrendAnalyzer在每个截断位置的结果一致"""
+        adx = StreamingADX()
+        adx.seed(self.data.iloc[:self.split])
+        for i in range(self.split, self.split + 5):
+            streamed = adx.update(self.data.iloc[i])
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = TrendAnalyzer(self.data.iloc[:i + 1]).calculate_adx()
+            for key in ('adx', 'plus_di', 'minus_di'):
+                self.assertAlmostEqual(streamed[key], expected[key], places=9)
+
+    def test_warm_up_and_snapshot(self):
+        """测试预热期输出和组合快照"""
+        rsi = StreamingRSI(period=3)
+        self.assertTrue(np.isnan(rsi.seed(self.data.iloc[:3])))
+        self.assertFalse(np.isnan(rsi.update(self.data.iloc[3])))
+
+        indicators = StreamingIndicators()
+        self.assertEqual(indicators.snapshot(), {})
+        snapshot = indicators.seed(self.data.iloc[:self.split])
+        self.assertEqual(set(snapshot), {'rsi', 'macd', 'kdj', 'bollinger', 'dynamic_rsi', 'atr', 'adx'})
+        snapshot = indicators.update({'High': 120.0, 'Low': 118.0, 'Close': 119.0})
+        self.assertEqual(indicators.indicators['rsi'].bars, self.split + 1)
+        self.assertAlmostEqual(snapshot['dynamic_rsi']['rsi'], snapshot['rsi'])
+
+    def test_subclass_must_implement_update(self):
+        """测试未实现_update的子类在实例化时报错"""
+        class Incomplete(StreamingIndicator):
+            columns = ('Close',)
+
+        class LastClose(StreamingIndicator):
+            columns = ('Close',)
+
+            def _update(self, close):
+                return close
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        with self.assertRaises(TypeError):
+            StreamingIndicator()
+        self.assertEqual(LastClose().seed(self.data), self.data['Close'].iloc[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+TradeMind Lite（轻量版）- 摇摆点识别模块测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.pressure_points import PressurePointAnalyzer
+from trademind.core.trend_analysis import TrendAnalyzer
+from trademind.core.swings import swing_highs, swing_lows, window_swings
+
+
+def _loop_swings(values, lookaround, strict, high):
+    """逐个位置与前后切片比较，作为参考实现"""
+    result = np.zeros(len(values), dtype=bool)
+    for i in range(lookaround, len(values) - lookaround):
+        neighbors = np.concatenate([values[i - lookaround:i], values[i + 1:i + lookaround + 1]])
+        if high:
+            result[i] = all(values[i] > neighbors) if strict else all(values[i] >= neighbors)
+        else:
+            result[i] = all(values[i] < neighbors) if strict else all(values[i] <= neighbors)
+    return result
+
+
+class TestSwings(unittest.TestCase):
+    """测试摇摆点识别"""
+
+    def setUp(self):
+        """生成价格序列，包含相等值和缺失值"""
+        rng = np.random.default_rng(4)
+        self.values = np.round(100 + np.cumsum(rng.normal(0, 1, 300)), 0)
+        self.values[50] = np.nan
+
+    def test_matches_loop(self):
+        """测试与逐个切片比较的结果一致"""
+        for lookaround in (1, 5, 20):
+            for strict in (False, True):
+                np.testing.assert_array_equal(swing_highs(self.values, lookaround, strict),
+                                              _loop_swings(self.values, lookaround, strict, True))
+                np.testing.assert_array_equal(swing_lows(self.values, lookaround, strict),
+                                              _loop_swings(self.values, lookaround, strict, False))
+        self.assertFalse(swing_highs(self.values[:3], 5).any())
+        with self.assertRaises(ValueError):
+            swing_highs(self.values, 0)
+
+    def test_window_swings(self):
+        """测试整段历史的结果截取窗口后与只用窗口数据识别的结果一致"""
+        full = swing_highs(self.values, 5)
+        for window in (60, 11, 300, 400):
+            expected = swing_highs(self.values[-window:], 5)
+            np.testing.assert_array_equal(window_swings(full, min(window, len(self.values)), 5), expected)
+
+    def test_shared_by_analyzers(self):
+        """测试压力位和趋势分析共用IndicatorFrame中的摇摆点"""
+        close = np.abs(self.values[~np.isnan(self.values)]) + 10
+        data = pd.DataFrame({
+            'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+            'Volume': np.ones(len(close))
+        }, index=pd.date_range(start='2023-01-02', periods=len(close), freq='B'))
+        frame = IndicatorFrame(data)
+
+        PressurePointAnalyzer(data, frame=frame).find_recent_swing_points()
+        TrendAnalyzer(data, frame=frame).identify_trend_lines()
+        TrendAnalyzer(data, frame=frame).analyze_dow_theory()
+        self.assertTrue(frame.is_cached('swing_high', 'High', 5))
+        self.assertTrue(frame.is_cached('swing_low', 'Low', 1, True))
+        self.assertTrue(frame.is_cached('swing_high', 'Close', 20, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
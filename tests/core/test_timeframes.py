@@ -0,0 +1,70 @@
+"""
+TradeMind Lite（轻量版）- 多周期数据模块测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.core.timeframes import OHLCV_AGGREGATIONS, resample_ohlcv, resample_timeframes
+
+
+class TestTimeframes(unittest.TestCase):
+    """测试日线合成周线和月线"""
+
+    def setUp(self):
+        """生成带时区、缺少部分交易日的日线数据"""
+        rng = np.random.default_rng(6)
+        dates = pd.bdate_range(start='2022-01-03', periods=400, tz='America/New_York')
+        dates = dates[np.sort(rng.choice(400, size=370, replace=False))]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+        self.data = pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.005, len(dates))),
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Volume': rng.uniform(1e5, 1e6, len(dates)),
+            'Dividends': 0.0
+        }, index=dates)
+
+    def _expected(self, data, rule):
+        """用pandas的resample作为参考"""
+        naive = data.tz_localize(None)
+        return naive.resample(rule).agg(OHLCV_AGGREGATIONS).dropna(subset=['Close'])
+
+    def test_matches_resample(self):
+        """测试与resample结果一致，日期为周期内最后一个交易日"""
+        frames = resample_timeframes(self.data)
+        for timeframe, rule in (('weekly', 'W-FRI'), ('monthly', 'MS')):
+            expected = self._expected(self.data, rule)
+            np.testing.assert_allclose(frames[timeframe].to_numpy(), expected.to_numpy())
+            self.assertEqual(list(frames[timeframe].columns), list(OHLCV_AGGREGATIONS))
+            self.assertEqual(frames[timeframe].index[-1], self.data.index[-1])
+            self.assertEqual(frames[timeframe].index.tz, self.data.index.tz)
+
+        # 月线最后一根K线是当月已有交易日的合成
+        last = self.data.index[-1]
+        last_month = self.data[(self.data.index.year == last.year) & (self.data.index.month == last.month)]
+        self.assertEqual(frames['monthly']['Open'].iloc[-1], last_month['Open'].iloc[0])
+        self.assertAlmostEqual(frames['monthly']['Volume'].iloc[-1], last_month['Volume'].sum(), places=4)
+
+    def test_missing_values(self):
+        """测试跳过缺失值，日期未排序时先按日期排序"""
+        data = self.data.copy()
+        data.iloc[10, data.columns.get_loc('Close')] = np.nan
+        data.iloc[20, data.columns.get_loc('High')] = np.nan
+        weekly = resample_ohlcv(data, 'weekly')
+        np.testing.assert_allclose(weekly.to_numpy(), self._expected(data, 'W-FRI').to_numpy())
+
+        shuffled = resample_ohlcv(self.data.sample(frac=1, random_state=0), 'weekly')
+        pd.testing.assert_frame_equal(shuffled, resample_ohlcv(self.data, 'weekly'), check_freq=False)
+
+    def test_invalid(self):
+        """测试不支持的周期和空数据"""
+        with self.assertRaises(ValueError):
+            resample_ohlcv(self.data, 'hourly')
+        self.assertTrue(resample_ohlcv(self.data.iloc[:0], 'monthly').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+TradeMind Lite（轻量版）- 趋势和压力位分析缓存测试
+"""
+
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+from trademind.core.pressure_points import PressurePointAnalyzer
+from trademind.core.trend_analysis import TrendAnalyzer
+
+
+class TestAnalyzerMemoization(unittest.TestCase):
+    """测试趋势分析和压力位分析的子结果缓存"""
+
+    def setUp(self):
+        """生成K线数据"""
+        rng = np.random.default_rng(3)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 250)))
+        self.data = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+            'Close': close, 'Volume': rng.uniform(1e5, 1e6, 250)
+        }, index=pd.date_range(start='2023-01-02', periods=250, freq='B'))
+
+    def test_adx_computed_once(self):
+        """测试完整分析和重复调用只计算一次ADX"""
+        analyzer = TrendAnalyzer(self.data)
+        with patch.object(TrendAnalyzer, '_calculate_adx', autospec=True,
+                          side_effect=TrendAnalyzer._calculate_adx) as mock_adx:
+            result = analyzer.analyze()
+            self.assertIs(analyzer.analyze(), result)
+            self.assertIs(analyzer.calculate_adx(), result['adx'])
+            analyzer.calculate_trend_strength()
+        self.assertEqual(mock_adx.call_count, 1)
+
+        # 修改参数后重新计算
+        analyzer.adx_period = 10
+        self.assertIsNot(analyzer.calculate_adx(), result['adx'])
+
+    def test_multi_window_trend_lines(self):
+        """测试多窗口批量拟合与逐个窗口拟合一致，并共用到单窗口结果"""
+        analyzer = TrendAnalyzer(self.data)
+        lines = analyzer.multi_window_trend_lines((20, 60, 120, 250, 4))
+        self.assertEqual(list(lines), [20, 60, 120, 250, 4])
+        self.assertIs(analyzer.identify_trend_lines(60), lines[60])
+        self.assertNotIn('current_value', lines[4]['support'])
+
+        for window in (20, 120, 250):
+            expected = TrendAnalyzer(self.data).identify_trend_lines(window)
+            for side in ('support', 'resistance'):
+                self.assertEqual(lines[window][side]['strength'], expected[side]['strength'])
+                for key in ('slope', 'intercept', 'current_value', 'future_value'):
+                    self.assertAlmostEqual(lines[window][side][key], expected[side][key])
+
+        # 支撑线由窗口内的局部低点拟合
+        recent = self.data.tail(60)['Low'].to_numpy()
+        x = np.arange(1, 59)
+        is_low = (recent[1:-1] < recent[:-2]) & (recent[1:-1] < recent[2:])
+        slope, intercept = np.polyfit(x[is_low], recent[1:-1][is_low], 1)
+        self.assertAlmostEqual(lines[60]['support']['slope'], slope)
+        self.assertAlmostEqual(lines[60]['support']['intercept'], intercept)
+
+    def test_short_data_restores_period(self):
+        """测试数据不足时ADX周期恢复原值"""
+        analyzer = TrendAnalyzer(self.data.head(8))
+        self.assertEqual(analyzer.calculate_adx()['adx'], 15.0)
+        self.assertEqual(analyzer.adx_period, 14)
+
+    def test_pressure_levels_replayed(self):
+        """测试重复调用子分析时支撑阻力位与重新计算一致"""
+        analyzer = PressurePointAnalyzer(self.data)
+        reference = PressurePointAnalyzer(self.data)
+        for _ in range(2):
+            swings = analyzer.find_recent_swing_points()
+            reference._results.clear()
+            self.assertEqual(reference.find_recent_swing_points(), swings)
+        self.assertEqual(analyzer.support_levels, reference.support_levels)
+        self.assertEqual(analyzer.resistance_levels, reference.resistance_levels)
+
+        result = analyzer.analyze()
+        supports = list(analyzer.support_levels)
+        analyzer.find_volume_clusters(window=30)
+        self.assertIs(analyzer.analyze(), result)
+        self.assertEqual(analyzer.support_levels, supports)
+        self.assertEqual(result['support_levels'],
+                         [{'price': price, 'source': source} for price, source in supports])
+
+
+if __name__ == '__main__':
+    unittest.main()
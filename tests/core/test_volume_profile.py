@@ -0,0 +1,94 @@
+"""
+TradeMind Lite（轻量版）- 成交量分布模块测试
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from trademind.core.pressure_points import PressurePointAnalyzer
+from trademind.core.volume_profile import (
+    VolumeProfile,
+    first_covering_bar,
+    price_edges,
+    volume_by_close,
+    volume_by_range
+)
+
+
+def _loop_profile(edges, low, high, volume):
+    """逐根K线、逐个区间分配成交量，作为参考实现，返回每个区间的成交量和覆盖K线数量"""
+    profile = np.zeros(len(edges) - 1)
+    counts = np.zeros(len(edges) - 1, dtype=int)
+    for lo, hi, vol in zip(low, high, volume):
+        if hi - lo <= 0:
+            continue
+        start, stop = np.clip(np.searchsorted(edges, [lo, hi]), 0, len(edges) - 1)
+        for index in range(start, stop):
+            profile[index] += vol / (stop - start)
+            counts[index] += 1
+    return profile, counts
+
+
+class TestVolumeProfile(unittest.TestCase):
+    """测试成交量分布"""
+
+    def setUp(self):
+        """生成K线数据"""
+        rng = np.random.default_rng(2)
+        n = 300
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        self.low = close * (1 - rng.uniform(0, 0.02, n))
+        self.high = close * (1 + rng.uniform(0, 0.02, n))
+        self.high[::10] = self.low[::10]
+        self.close = close
+        self.volume = rng.uniform(1e5, 1e6, n)
+        self.edges = price_edges(self.low.min(), self.high.max(), 20)
+
+    def test_matches_loop(self):
+        """测试差分数组得到的分布与逐个区间分配一致"""
+        profile, counts = volume_by_range(self.edges, self.low, self.high, self.volume)
+        expected, expected_counts = _loop_profile(self.edges, self.low, self.high, self.volume)
+        np.testing.assert_allclose(profile, expected)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+        expected, _ = np.histogram(self.close, bins=self.edges, weights=self.volume)
+        np.testing.assert_allclose(volume_by_close(self.edges, self.close, self.volume), expected)
+
+        first = first_covering_bar(self.edges, self.low, self.high)
+        for index in range(20):
+            covering = [i for i in range(len(self.low))
+                        if _loop_profile(self.edges, self.low[i:i + 1], self.high[i:i + 1], [1.0])[1][index]]
+            self.assertEqual(first[index], covering[0] if covering else len(self.low))
+
+    def test_sliding_window(self):
+        """测试滑动窗口增量更新与重新计算一致"""
+        profile = VolumeProfile(self.edges, window=50)
+        for i in range(len(self.low)):
+            profile.push(self.low[i], self.high[i], self.volume[i])
+            if i % 37 == 0 or i == len(self.low) - 1:
+                start = max(0, i - 49)
+                expected, counts = volume_by_range(self.edges, self.low[start:i + 1],
+                                                   self.high[start:i + 1], self.volume[start:i + 1])
+                np.testing.assert_allclose(profile.volume, expected, atol=1e-6)
+                np.testing.assert_array_equal(profile.counts, counts)
+        self.assertTrue(profile.full)
+        self.assertEqual(len(profile), 50)
+
+    def test_volume_clusters(self):
+        """测试成交量聚集区按占比排序并加入支撑阻力位"""
+        data = pd.DataFrame({
+            'Open': self.close, 'High': self.high, 'Low': self.low,
+            'Close': self.close, 'Volume': self.volume
+        }, index=pd.date_range(start='2023-01-02', periods=len(self.close), freq='B'))
+        analyzer = PressurePointAnalyzer(data)
+        clusters = analyzer.find_volume_clusters()
+        self.assertTrue(clusters)
+        pct = [cluster['volume_pct'] for cluster in clusters]
+        self.assertEqual(pct, sorted(pct, reverse=True))
+        self.assertTrue(all(value >= 70 / 20 for value in pct))
+        self.assertEqual(len(analyzer.support_levels) + len(analyzer.resistance_levels), len(clusters))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,3 @@
+"""
+数据模块的测试包
+"""
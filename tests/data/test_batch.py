@@ -0,0 +1,144 @@
+"""
+批量行情下载和请求限速模块的单元测试
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trademind.data.batch import BatchFetcher
+from trademind.data.providers import DataProvider, split_batch_frame
+from trademind.data.rate_limit import AdaptiveRateLimiter
+
+
+def make_frame(periods=5, start=100.0):
+    """创建测试用OHLCV数据"""
+    index = pd.date_range('2024-01-01', periods=periods, freq='B')
+    close = start + np.arange(periods, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(periods, 1000.0)}, index=index)
+
+
+class FakeClock:
+    """可控的时钟，sleep只推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    """模拟数据源限流错误"""
+
+    def __str__(self):
+        return "Too Many Requests. Rate limited. Try after a while."
+
+
+class FakeProvider(DataProvider):
+    """记录批量请求的数据源，可以设置前几次请求被限流"""
+
+    def __init__(self, throttle_times=0):
+        self.calls = []
+        self.throttle_times = throttle_times
+
+    def history(self, symbol, period=None, interval="1d", start=None, end=None):
+        return make_frame()
+
+    def info(self, symbol):
+        return {}
+
+    def batch_history(self, symbols, period=None, interval="1d", start=None):
+        self.calls.append(list(symbols))
+        if self.throttle_times > 0:
+            self.throttle_times -= 1
+            raise RateLimitError()
+        return {symbol: make_frame() for symbol in symbols if symbol != 'BAD'}
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """测试AdaptiveRateLimiter"""
+
+    def setUp(self):
+        """创建使用假时钟的限速器"""
+        self.fake = FakeClock()
+        self.limiter = AdaptiveRateLimiter(clock=self.fake.clock, sleep=self.fake.sleep)
+
+    def test_no_wait_without_throttling(self):
+        """测试未被限流时不等待"""
+        for _ in range(5):
+            self.limiter.wait()
+            self.limiter.success()
+
+        self.assertEqual(self.fake.sleeps, [])
+        self.assertEqual(self.limiter.stats()['requests'], 5)
+
+    def test_backoff_and_recover(self):
+        """测试限流后间隔成倍增加，成功后逐步恢复"""
+        self.limiter.backoff()
+        self.limiter.backoff()
+        self.assertEqual(self.limiter.interval, 2.0)
+
+        self.limiter.wait()
+        self.assertEqual(self.fake.sleeps, [2.0])
+
+        for _ in range(4):
+            self.limiter.success()
+        self.assertEqual(self.limiter.interval, 0.0)
+
+
+class TestBatchFetcher(unittest.TestCase):
+    """测试BatchFetcher"""
+
+    def setUp(self):
+        """创建使用假时钟的限速器"""
+        self.fake = FakeClock()
+        self.limiter = AdaptiveRateLimiter(clock=self.fake.clock, sleep=self.fake.sleep)
+
+    def test_chunks_and_order(self):
+        """测试按块请求并保持输入顺序"""
+        provider = FakeProvider()
+        fetcher = BatchFetcher(provider, chunk_size=2, limiter=self.limiter)
+
+        results = fetcher.fetch(['A', 'B', 'BAD', 'C'], period='1y')
+
+        self.assertEqual(provider.calls, [['A', 'B'], ['BAD', 'C']])
+        self.assertEqual(list(results.keys()), ['A', 'B', 'BAD', 'C'])
+        self.assertTrue(results['BAD'].empty)
+        self.assertFalse(results['C'].empty)
+
+    def test_retry_after_rate_limit(self):
+        """测试被限流后退避并重试"""
+        provider = FakeProvider(throttle_times=2)
+        fetcher = BatchFetcher(provider, limiter=self.limiter)
+
+        results = fetcher.fetch(['A', 'B'])
+
+        self.assertEqual(len(provider.calls), 3)
+        self.assertFalse(results['A'].empty)
+        self.assertEqual(self.limiter.throttled, 2)
+        self.assertEqual(sum(self.fake.sleeps), 3.0)
+
+    def test_split_batch_frame(self):
+        """测试拆分宽表并去掉对齐产生的空行"""
+        a = make_frame(5)
+        b = make_frame(3, start=50.0)
+        wide = pd.concat({'A': a, 'B': b}, axis=1)
+
+        frames = split_batch_frame(wide, ['A', 'B', 'C'])
+
+        self.assertEqual(len(frames['A']), 5)
+        self.assertEqual(len(frames['B']), 3)
+        self.assertTrue(frames['C'].empty)
+        self.assertEqual(list(frames['B'].columns), list(b.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+行情数据缓存模块的单元测试
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from trademind.data.cache import OHLCVCache, period_to_days
+
+
+def make_ohlcv(start: str, periods: int, tz: str = 'America/New_York') -> pd.DataFrame:
+    """创建测试用的OHLCV数据"""
+    dates = pd.date_range(start=start, periods=periods, freq='B', tz=tz)
+    close = np.linspace(100, 100 + periods, periods)
+    return pd.DataFrame({
+        'Open': close - 0.5,
+        'High': close + 1.0,
+        'Low': close - 1.0,
+        'Close': close,
+        'Volume': np.full(periods, 1000.0)
+    }, index=dates)
+
+
+class FakeFetcher:
+    """记录调用参数的模拟下载函数"""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.calls = []
+
+    def __call__(self, symbol, period=None, interval="1d", start=None):
+        self.calls.append({'symbol': symbol, 'period': period, 'start': start})
+        if start is not None:
+            return self.data[self.data.index >= pd.Timestamp(start).tz_localize(self.data.index.tz)]
+        return self.data
+
+
+class TestOHLCVCache(unittest.TestCase):
+    """测试OHLCVCache"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = OHLCVCache(self.temp_dir, refresh_interval=0)
+
+    def tearDown(self):
+        """清理测试环境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_period_to_days(self):
+        """测试数据周期转换"""
+        self.assertEqual(period_to_days('5d'), 5)
+        self.assertGreater(period_to_days('3y'), period_to_days('1y'))
+        self.assertEqual(period_to_days('max'), float('inf'))
+        with self.assertRaises(ValueError):
+            period_to_days('abc')
+
+    def test_miss_then_round_trip(self):
+        """测试首次下载后写入缓存并能完整读回"""
+        data = make_ohlcv('2023-01-02', 300)
+        fetch = FakeFetcher(data)
+
+        result = self.cache.get('AAPL', fetch, period='3y')
+
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertEqual(fetch.calls[0]['period'], '3y')
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertTrue(os.path.exists(self.cache.path_for('AAPL')))
+
+        loaded = self.cache.load('AAPL')
+        pd.testing.assert_frame_equal(loaded, data, check_freq=False, check_names=False)
+        self.assertEqual(len(result), 300)
+
+    def test_incremental_append(self):
+        """测试只下载最后时间戳之后的新K线"""
+        history = make_ohlcv('2023-01-02', 300)
+        self.cache.get('MSFT', FakeFetcher(history.iloc[:-3]), period='3y')
+
+        fetch = FakeFetcher(history)
+        result = self.cache.get('MSFT', fetch, period='3y')
+
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertIsNotNone(fetch.calls[0]['start'])
+        self.assertIsNone(fetch.calls[0]['period'])
+        self.assertEqual(len(result), 300)
+        self.assertEqual(self.cache.stats()['appends'], 1)
+        self.assertEqual(self.cache.stats()['appended_bars'], 3)
+        self.assertEqual(len(self.cache.load('MSFT')), 300)
+
+    def test_split_triggers_full_download(self):
+        """测试两次更新之间拆股时重新完整下载，而不是追加复权后的新K线"""
+        history = make_ohlcv('2023-01-02', 300)
+        self.cache.get('TSLA', FakeFetcher(history.iloc[:-3]), period='3y')
+
+        # 1拆2之后数据源返回的全部历史价格减半
+        adjusted = history.copy()
+        adjusted[['Open', 'High', 'Low', 'Close']] /= 2
+        fetch = FakeFetcher(adjusted)
+        result = self.cache.get('TSLA', fetch, period='3y')
+
+        self.assertEqual([call['start'] is None for call in fetch.calls], [False, True])
+        self.assertEqual(fetch.calls[1]['period'], '3y')
+        pd.testing.assert_frame_equal(result, adjusted, check_freq=False)
+        pd.testing.assert_frame_equal(self.cache.load('TSLA'), adjusted, check_freq=False, check_names=False)
+        self.assertEqual(self.cache.stats()['appends'], 0)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+        # 最后一根K线是盘中数据时收盘价变化，仍然只追加
+        intraday = adjusted.copy()
+        intraday.iloc[-1, intraday.columns.get_loc('Close')] += 1
+        self.cache.get('TSLA', FakeFetcher(intraday.iloc[:-1]), period='3y')
+        fetch = FakeFetcher(adjusted)
+        self.cache.get('TSLA', fetch, period='3y')
+        self.assertEqual(len(fetch.calls), 1)
+
+    def test_hit_without_new_bars(self):
+        """测试没有新K线时计为命中"""
+        data = make_ohlcv('2023-01-02', 200)
+        self.cache.get('NVDA', FakeFetcher(data), period='3y')
+        self.cache.get('NVDA', FakeFetcher(data), period='3y')
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['appends'], 0)
+
+    def test_fresh_cache_skips_network(self):
+        """测试刷新间隔内不访问网络"""
+        cache = OHLCVCache(self.temp_dir, refresh_interval=3600)
+        data = make_ohlcv('2023-01-02', 200)
+        cache.get('AMD', FakeFetcher(data), period='3y')
+
+        fetch = FakeFetcher(data)
+        result = cache.get('AMD', fetch, period='3y')
+
+        self.assertEqual(fetch.calls, [])
+        self.assertEqual(len(result), 200)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_longer_period_triggers_full_download(self):
+        """测试请求周期超过缓存覆盖范围时重新完整下载"""
+        data = make_ohlcv('2023-01-02', 50)
+        self.cache.get('TSLA', FakeFetcher(data), period='3y')
+
+        fetch = FakeFetcher(data)
+        self.cache.get('TSLA', fetch, period='max')
+
+        self.assertEqual(fetch.calls[0]['period'], 'max')
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_fetch_error_falls_back_to_cache(self):
+        """测试增量下载失败时返回缓存数据"""
+        data = make_ohlcv('2023-01-02', 120)
+        self.cache.get('META', FakeFetcher(data), period='3y')
+
+        def failing_fetch(symbol, period=None, interval="1d", start=None):
+            raise ConnectionError("network down")
+
+        result = self.cache.get('META', failing_fetch, period='3y')
+
+        self.assertEqual(len(result), 120)
+        self.assertEqual(self.cache.stats()['errors'], 1)
+
+    def test_empty_download_is_not_cached(self):
+        """测试空数据不写入缓存"""
+        result = self.cache.get('INVALID', FakeFetcher(pd.DataFrame()), period='3y')
+
+        self.assertTrue(result.empty)
+        self.assertFalse(os.path.exists(self.cache.path_for('INVALID')))
+
+    def test_get_many_groups_requests(self):
+        """测试批量获取时缺失和增量更新的股票各合并为一次请求"""
+        data = make_ohlcv('2023-01-02', 300)
+        calls = []
+
+        def fetch_many(symbols, period=None, interval="1d", start=None):
+            calls.append({'symbols': list(symbols), 'period': period, 'start': start})
+            fetch = FakeFetcher(data)
+            return {symbol: fetch(symbol, period=period, start=start) for symbol in symbols}
+
+        self.cache.save('AAPL', data.iloc[:-5], period='3y')
+        self.cache.save('MSFT', data.iloc[:-5], period='3y')
+
+        results = self.cache.get_many(['NVDA', 'AAPL', 'MSFT', 'TSLA'], fetch_many, period='3y')
+
+        self.assertEqual(list(results.keys()), ['NVDA', 'AAPL', 'MSFT', 'TSLA'])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0]['symbols'], ['NVDA', 'TSLA'])
+        self.assertEqual(calls[1]['symbols'], ['AAPL', 'MSFT'])
+        self.assertIsNotNone(calls[1]['start'])
+        self.assertEqual(len(results['AAPL']), 300)
+        self.assertEqual(self.cache.stats()['appends'], 2)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+        # 拆股后重新复权的股票合并为一次完整下载
+        data[['Open', 'High', 'Low', 'Close']] /= 2
+        self.cache.save('AAPL', data.iloc[:-5] * 2, period='3y')
+        self.cache.save('MSFT', data.iloc[:-5] * 2, period='3y')
+        calls.clear()
+        results = self.cache.get_many(['AAPL', 'MSFT'], fetch_many, period='1y')
+        self.assertEqual([call['period'] for call in calls], [None, '3y'])
+        self.assertEqual(calls[1]['symbols'], ['AAPL', 'MSFT'])
+        self.assertAlmostEqual(results['AAPL']['Close'].iloc[0], data['Close'].iloc[-len(results['AAPL'])])
+        pd.testing.assert_frame_equal(self.cache.load('MSFT'), data, check_freq=False, check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
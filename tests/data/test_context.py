@@ -0,0 +1,58 @@
+"""
+行情数据上下文模块的单元测试
+"""
+
+import unittest
+import pandas as pd
+
+from trademind.data.context import MarketDataContext
+
+
+class TestMarketDataContext(unittest.TestCase):
+    """测试MarketDataContext"""
+
+    def setUp(self):
+        """设置测试数据"""
+        self.calls = []
+        self.frame = pd.DataFrame({'Close': [1.0, 2.0, 3.0]})
+
+        def loader(symbol):
+            self.calls.append(symbol)
+            return self.frame
+
+        self.context = MarketDataContext(loader)
+
+    def test_get_downloads_once(self):
+        """测试同一股票只下载一次并返回同一个对象"""
+        first = self.context.get('AAPL')
+        second = self.context.get('AAPL')
+
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, ['AAPL'])
+        self.assertEqual(self.context.downloads, 1)
+
+    def test_put_skips_loader(self):
+        """测试预先放入的数据不触发下载"""
+        self.context.put('MSFT', self.frame)
+
+        self.assertIs(self.context.get('MSFT'), self.frame)
+        self.assertEqual(self.calls, [])
+        self.assertIn('MSFT', self.context)
+
+    def test_none_becomes_empty_frame(self):
+        """测试加载失败返回空DataFrame"""
+        context = MarketDataContext(lambda symbol: None)
+
+        self.assertTrue(context.get('INVALID').empty)
+
+    def test_release(self):
+        """测试释放数据"""
+        self.context.get('AAPL')
+        self.context.release('AAPL')
+
+        self.assertNotIn('AAPL', self.context)
+        self.assertEqual(len(self.context), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+数据源模块的单元测试
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from trademind.data.cache import OHLCVCache
+from trademind.data.providers import (
+    YFinanceProvider,
+    LocalFileProvider,
+    get_default_provider,
+    set_default_provider,
+    DATA_DIR_ENV
+)
+
+
+def make_ohlcv(periods=300):
+    """创建测试用OHLCV数据"""
+    index = pd.date_range(end='2024-06-28', periods=periods, freq='B', tz='America/New_York')
+    close = np.linspace(100, 130, periods)
+    return pd.DataFrame({
+        'Open': close - 0.5,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': np.full(periods, 1e6)
+    }, index=index)
+
+
+class TestLocalFileProvider(unittest.TestCase):
+    """测试LocalFileProvider"""
+
+    def setUp(self):
+        """创建测试数据目录"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.frame = make_ohlcv()
+        self.frame.to_csv(os.path.join(self.temp_dir, 'AAPL.csv'))
+        self.provider = LocalFileProvider(self.temp_dir)
+
+    def tearDown(self):
+        """清理测试目录"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_history_from_csv(self):
+        """测试从CSV回放完整数据"""
+        hist = self.provider.history('AAPL', period='max')
+
+        self.assertEqual(len(hist), len(self.frame))
+        self.assertEqual(str(hist.index.tz), 'America/New_York')
+        np.testing.assert_allclose(hist['Close'].values, self.frame['Close'].values)
+
+    def test_naive_dates(self):
+        """测试不带时区的日期按交易所当地日期解释，CSV与parquet一致"""
+        naive = make_ohlcv(5).tz_localize(None)
+        naive.to_csv(os.path.join(self.temp_dir, 'NAIVE.csv'))
+        open(os.path.join(self.temp_dir, 'PQ.parquet'), 'wb').close()
+
+        with mock.patch('pandas.read_parquet', return_value=naive.copy()):
+            frames = [self.provider.history(symbol, period='max') for symbol in ('NAIVE', 'PQ')]
+        for hist in frames:
+            self.assertEqual(list(hist.index), list(naive.index.tz_localize('America/New_York')))
+
+        hist = self.provider.history('NAIVE', start=str(naive.index[2].date()))
+        self.assertEqual(len(hist), 3)
+
+    def test_period_relative_to_last_bar(self):
+        """测试周期以最后一根K线为基准截取"""
+        hist = self.provider.history('AAPL', period='1mo')
+
+        self.assertEqual(hist.index[-1], self.frame.index[-1])
+        self.assertTrue((hist.index > self.frame.index[-1] - pd.Timedelta(days=31)).all())
+        self.assertLess(len(hist), 25)
+
+    def test_start_filter(self):
+        """测试按起始日期截取"""
+        hist = self.provider.history('AAPL', start='2024-06-01')
+
+        self.assertTrue((hist.index >= pd.Timestamp('2024-06-01', tz='America/New_York')).all())
+        self.assertFalse(hist.empty)
+
+    def test_cache_directory_replay(self):
+        """测试直接回放行情缓存目录中的npz文件"""
+        OHLCVCache(self.temp_dir).save('MSFT', self.frame)
+
+        hist = self.provider.history('MSFT', period='max')
+
+        self.assertEqual(len(hist), len(self.frame))
+
+    def test_missing_symbol(self):
+        """测试不存在的股票返回空数据"""
+        self.assertTrue(self.provider.history('NONE', period='1y').empty)
+        self.assertEqual(self.provider.info('NONE'), {})
+
+    def test_info(self):
+        """测试从info.json读取信息，缺失时根据行情生成"""
+        with open(os.path.join(self.temp_dir, 'info.json'), 'w', encoding='utf-8') as f:
+            json.dump({'SPY': {'symbol': 'SPY', 'quoteType': 'ETF'}}, f)
+        provider = LocalFileProvider(self.temp_dir)
+
+        self.assertEqual(provider.info('SPY')['quoteType'], 'ETF')
+        info = provider.info('AAPL')
+        self.assertEqual(info['symbol'], 'AAPL')
+        self.assertAlmostEqual(info['regularMarketPrice'], 130.0)
+
+    def test_batch_history(self):
+        """测试批量获取"""
+        results = self.provider.batch_history(['AAPL', 'NONE'], period='1y')
+
+        self.assertEqual(list(results.keys()), ['AAPL', 'NONE'])
+        self.assertFalse(results['AAPL'].empty)
+        self.assertTrue(results['NONE'].empty)
+
+
+class TestDefaultProvider(unittest.TestCase):
+    """测试默认数据源选择"""
+
+    def tearDown(self):
+        """恢复默认数据源"""
+        set_default_provider(None)
+
+    @mock.patch('yfinance.Ticker')
+    def test_yfinance_by_default(self, mock_ticker):
+        """测试未设置环境变量时使用yfinance"""
+        mock_ticker.return_value.history.return_value = make_ohlcv(10)
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(DATA_DIR_ENV, None)
+            set_default_provider(None)
+            provider = get_default_provider()
+
+        self.assertIsInstance(provider, YFinanceProvider)
+        hist = provider.history('AAPL', start='2024-01-01')
+        self.assertEqual(len(hist), 10)
+        mock_ticker.return_value.history.assert_called_with(interval='1d', start='2024-01-01')
+
+    def test_environment_selects_local(self):
+        """测试环境变量切换为本地数据源"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch.dict(os.environ, {DATA_DIR_ENV: temp_dir}):
+                set_default_provider(None)
+                provider = get_default_provider()
+            self.assertIsInstance(provider, LocalFileProvider)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,9 @@ import warnings
 
 # 导入新版模块
 from trademind.core.analyzer import StockAnalyzer
+from trademind.data.cache import OHLCVCache
+from trademind.backtest.cache import BacktestCache
+from trademind.core.pattern_stats import PatternStatsCache
 
 
 class TestBatchAnalysis(unittest.TestCase):
@@ -38,6 +41,9 @@ class TestBatchAnalysis(unittest.TestCase):
         # 创建分析器实例
         self.analyzer = StockAnalyzer()
         self.analyzer.results_path = Path(self.temp_dir)
+        self.analyzer.data_cache = OHLCVCache(Path(self.temp_dir) / 'cache')
+        self.analyzer.backtest_cache = BacktestCache(Path(self.temp_dir) / 'backtest')
+        self.analyzer.pattern_stats_cache = PatternStatsCache(Path(self.temp_dir) / 'pattern_stats')
     
     def tearDown(self):
         """清理测试环境"""
@@ -93,10 +99,15 @@ class TestBatchAnalysis(unittest.TestCase):
                 'Volume': volume
             }, index=dates)
     
+    def mock_download(self, tickers, **kwargs):
+        """模拟yfinance.download，返回按股票代码分组的宽表"""
+        return pd.concat({symbol: self.test_data[symbol] for symbol in tickers}, axis=1)
+    
     def test_batch_analysis(self):
         """测试批量分析多只股票"""
         # 模拟yfinance.Ticker.history方法
-        with mock.patch('yfinance.Ticker') as mock_ticker:
+        with mock.patch('yfinance.Ticker') as mock_ticker, \
+             mock.patch('yfinance.download', side_effect=self.mock_download):
             # 设置模拟对象的行为
             mock_ticker_instances = {}
             for symbol in self.symbols:
@@ -160,7 +171,8 @@ class TestBatchAnalysis(unittest.TestCase):
     def test_batch_report_generation(self):
         """测试批量生成报告"""
         # 模拟yfinance.Ticker.history方法
-        with mock.patch('yfinance.Ticker') as mock_ticker:
+        with mock.patch('yfinance.Ticker') as mock_ticker, \
+             mock.patch('yfinance.download', side_effect=self.mock_download):
             # 设置模拟对象的行为
             mock_ticker_instances = {}
             for symbol in self.symbols[:10]:  # 使用前10只股票
@@ -198,7 +210,8 @@ class TestBatchAnalysis(unittest.TestCase):
         # 这个测试只是模拟并行处理的潜力，不实际实现并行
         
         # 模拟yfinance.Ticker.history方法
-        with mock.patch('yfinance.Ticker') as mock_ticker:
+        with mock.patch('yfinance.Ticker') as mock_ticker, \
+             mock.patch('yfinance.download', side_effect=self.mock_download):
             # 设置模拟对象的行为
             mock_ticker_instances = {}
             for symbol in self.symbols:
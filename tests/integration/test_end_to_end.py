@@ -18,6 +18,9 @@ import warnings
 
 # 导入新版模块
 from trademind.core.analyzer import StockAnalyzer
+from trademind.data.cache import OHLCVCache
+from trademind.backtest.cache import BacktestCache
+from trademind.core.pattern_stats import PatternStatsCache
 from trademind.core.indicators import calculate_rsi, calculate_macd, calculate_kdj, calculate_bollinger_bands
 from trademind.core.patterns import identify_candlestick_patterns, TechnicalPattern
 from trademind.core.signals import generate_trading_advice, generate_signals
@@ -25,6 +28,7 @@ from trademind.backtest.engine import run_backtest
 from trademind.reports.generator import generate_html_report
 
 # 导入兼容层
+from trademind import compat
 from trademind.compat import StockAnalyzer as OldStockAnalyzer
 
 
@@ -50,6 +54,21 @@ class TestEndToEnd(unittest.TestCase):
         # 创建兼容层分析器实例
         self.old_analyzer = OldStockAnalyzer()
         self.old_analyzer.results_path = Path(self.temp_dir)
+        self.analyzer.data_cache = OHLCVCache(Path(self.temp_dir) / 'cache')
+        self.old_analyzer._analyzer.data_cache = OHLCVCache(Path(self.temp_dir) / 'cache')
+        for analyzer in (self.analyzer, self.old_analyzer._analyzer):
+            analyzer.backtest_cache = BacktestCache(Path(self.temp_dir) / 'backtest')
+            analyzer.pattern_stats_cache = PatternStatsCache(Path(self.temp_dir) / 'pattern_stats')
+        
+        # 兼容层的analyze_stock使用模块级的分析器实例，测试结束后恢复原来的缓存
+        patcher = mock.patch.multiple(
+            compat._global_analyzer,
+            data_cache=OHLCVCache(Path(self.temp_dir) / 'cache'),
+            backtest_cache=BacktestCache(Path(self.temp_dir) / 'backtest'),
+            pattern_stats_cache=PatternStatsCache(Path(self.temp_dir) / 'pattern_stats')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
     
     def tearDown(self):
         """清理测试环境"""
@@ -22,6 +22,7 @@ import gc
 
 # 导入新版模块
 from trademind.core.analyzer import StockAnalyzer
+from trademind.data.cache import OHLCVCache
 from trademind.core.indicators import calculate_rsi, calculate_macd, calculate_kdj, calculate_bollinger_bands
 from trademind.core.patterns import identify_candlestick_patterns
 from trademind.core.signals import generate_signals
@@ -114,6 +115,7 @@ class TestPerformanceBenchmark(unittest.TestCase):
         # 创建分析器实例
         self.analyzer = StockAnalyzer()
         self.analyzer.results_path = Path(self.temp_dir)
+        self.analyzer.data_cache = OHLCVCache(Path(self.temp_dir) / 'cache')
         
         # 性能结果存储
         self.performance_results = {
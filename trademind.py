@@ -19,8 +19,9 @@ from rich import box
 from rich.style import Style
 from rich.align import Align
 
-from trademind.ui.cli import run_cli
+from trademind.ui.cli import run_cli, run_optimizer
 from trademind.ui.web import run_web_server
+from trademind.core.parallel import WORKERS_ENV
 from trademind import __version__
 
 # 创建Rich控制台
@@ -130,14 +131,30 @@ def main():
     parser.add_argument('--web', action='store_true', help='直接启动Web模式')
     parser.add_argument('--port', type=int, default=3336, help='Web服务器端口')
     parser.add_argument('--host', default='0.0.0.0', help='Web服务器主机')
+    parser.add_argument('--workers', type=int, default=None, help='并行分析的工作进程数量，0为CPU核心数')
+    parser.add_argument('--optimize', metavar='SYMBOLS', help='对逗号分隔的股票代码搜索回测参数')
+    parser.add_argument('--samples', type=int, default=None, help='参数优化随机抽样的组合数量，默认搜索整个网格')
+    parser.add_argument('--metric', default='sharpe_ratio', help='参数优化排序使用的回测指标')
+    parser.add_argument('--top', type=int, default=20, help='参数优化显示的结果数量')
+    parser.add_argument('--seed', type=int, default=None, help='参数优化随机抽样的种子')
     
     args = parser.parse_args()
     
+    # 命令行和Web模式都从环境变量读取工作进程数量
+    if args.workers is not None:
+        os.environ[WORKERS_ENV] = str(args.workers)
+    
     # 显示版本信息
     if args.version:
         print_banner()
         return
     
+    # 参数优化
+    if args.optimize:
+        symbols = [symbol.strip().upper() for symbol in args.optimize.split(',') if symbol.strip()]
+        run_optimizer(symbols, n_samples=args.samples, metric=args.metric, top=args.top, seed=args.seed)
+        return
+    
     # 直接启动命令行模式
     if args.cli:
         run_cli()
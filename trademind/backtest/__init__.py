@@ -10,10 +10,41 @@ from trademind.backtest.engine import (
     calculate_performance_metrics,
     generate_trade_summary
 )
+from trademind.backtest.kernel import simulate_trades_kernel
+from trademind.backtest.trade_log import TradeLog
+from trademind.backtest.monte_carlo import run_monte_carlo
+from trademind.backtest.cache import BacktestCache
+from trademind.backtest.optimizer import (
+    optimize_parameters,
+    parameter_grid,
+    sample_parameters
+)
+from trademind.backtest.walk_forward import run_walk_forward, walk_forward_windows
+from trademind.backtest.portfolio import run_portfolio_backtest
+from trademind.backtest.strategies import (
+    register_strategy,
+    available_strategies,
+    run_strategy_backtest,
+    compare_strategies
+)
 
 __all__ = [
     'run_backtest',
     'simulate_trades',
     'calculate_performance_metrics',
-    'generate_trade_summary'
+    'generate_trade_summary',
+    'simulate_trades_kernel',
+    'TradeLog',
+    'run_monte_carlo',
+    'BacktestCache',
+    'optimize_parameters',
+    'parameter_grid',
+    'sample_parameters',
+    'run_walk_forward',
+    'walk_forward_windows',
+    'run_portfolio_backtest',
+    'register_strategy',
+    'available_strategies',
+    'run_strategy_backtest',
+    'compare_strategies'
 ] 
\ No newline at end of file
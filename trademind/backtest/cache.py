@@ -0,0 +1,285 @@
+"""
+TradeMind Lite（轻量版）- 回测结果缓存模块
+
+本模块按输入内容缓存回测结果。缓存键是行情数据、交易信号和回测参数的哈希值，
+输入不变时直接返回上次的结果，不再执行回测。结果同时保存在内存和本地文件中，
+内存和文件的条目数量都有上限，超出时淘汰最久未使用的条目。
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 回测规则或指标计算改变时递增，使旧的缓存结果失效
+CACHE_VERSION = 2
+
+
+def _hash_frame(digest, frame: pd.DataFrame):
+    """把DataFrame的列名、索引和数值写入哈希"""
+    digest.update(json.dumps([str(column) for column in frame.columns]).encode('utf-8'))
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(frame, index=True).to_numpy()).tobytes())
+
+
+def backtest_key(data: pd.DataFrame, signals: pd.DataFrame, params: Dict) -> str:
+    """
+    计算回测输入的内容哈希
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        signals: 包含买入和卖出信号的DataFrame
+        params: 回测参数
+
+    返回:
+        str: 十六进制哈希值
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"v{CACHE_VERSION}".encode('utf-8'))
+    _hash_frame(digest, data)
+    _hash_frame(digest, signals)
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """把NumPy标量转换为JSON可以保存的Python值"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"无法保存的缓存值类型: {type(value).__name__}")
+
+
+class LRUFileCache:
+    """
+    内存和本地JSON文件两级的LRU缓存
+
+    内存和文件的条目数量都有上限，超出时淘汰最久未使用的条目。文件先写入临时文件再替换，
+    多个进程同时写入同一个缓存目录时也不会留下不完整的文件。子类通过_encode和_decode
+    在缓存的值和可以保存为JSON的数据之间转换。
+
+    统计计数:
+        hits: 命中缓存，没有重新计算
+        misses: 没有缓存，重新计算
+        evictions: 因数量上限删除的文件
+        errors: 计算键或读写文件失败次数
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]], max_entries: int, max_memory_entries: int):
+        """
+        初始化缓存
+
+        参数:
+            cache_dir: 缓存目录，为None时只使用内存
+            max_entries: 本地文件的最大条目数量
+            max_memory_entries: 内存中的最大条目数量
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置命中统计"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def __getstate__(self) -> Dict:
+        """传给工作进程时只传递设置和统计，不复制内存中的条目"""
+        state = self.__dict__.copy()
+        state['_memory'] = OrderedDict()
+        return state
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+
+        返回:
+            Dict: 包含hits, misses, evictions, errors的字典
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'errors': self.errors
+        }
+
+    def path_for(self, key: str) -> Path:
+        """
+        获取缓存键对应的文件路径
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Path: 缓存文件路径
+        """
+        return self.cache_dir / f"{key}.json"
+
+    def clear(self) -> int:
+        """
+        清除内存和本地文件中的全部缓存
+
+        返回:
+            int: 删除的文件数量
+        """
+        self._memory.clear()
+        count = 0
+        for path in self._files():
+            try:
+                path.unlink()
+                count += 1
+            except OSError:
+                pass
+        return count
+
+    def _encode(self, value: Any) -> Any:
+        """把缓存的值转换为可以保存为JSON的数据"""
+        return value
+
+    def _decode(self, payload: Any) -> Any:
+        """把JSON数据转换回缓存的值"""
+        return payload
+
+    def _load(self, key: str) -> Optional[Any]:
+        """依次从内存和本地文件读取缓存的值"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.cache_dir is None:
+            return None
+
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = self._decode(json.load(f))
+            # 更新修改时间，文件淘汰按最久未使用的顺序
+            os.utime(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.errors += 1
+            logger.warning(f"读取缓存文件 {path} 失败: {str(e)}")
+            return None
+        self._remember(key, value)
+        return value
+
+    def _store(self, key: str, value: Any):
+        """把值写入内存和本地文件，失败时只记录日志"""
+        self._remember(key, value)
+        if self.cache_dir is None:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(key)
+            # 先写临时文件再替换，多个进程同时写入时也不会留下不完整的文件
+            temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._encode(value), f, ensure_ascii=False, default=_json_default)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.errors += 1
+            logger.warning(f"写入缓存文件失败: {str(e)}")
+            return
+        self._evict_files()
+
+    def _remember(self, key: str, value: Any):
+        """放入内存缓存，超出上限时淘汰最久未使用的条目"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _files(self):
+        """列出本地缓存文件"""
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*.json"))
+
+    def _evict_files(self):
+        """本地文件超出上限时删除修改时间最早的文件"""
+        files = self._files()
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return
+
+        def mtime(path):
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return time.time()
+
+        for path in sorted(files, key=mtime)[:excess]:
+            try:
+                path.unlink()
+                self.evictions += 1
+            except OSError:
+                pass
+
+
+class BacktestCache(LRUFileCache):
+    """
+    按内容寻址的回测结果缓存
+
+    统计计数:
+        hits: 命中缓存，没有执行回测
+        misses: 没有缓存，执行了回测
+        evictions: 因数量上限删除的条目
+        errors: 计算键或读写文件失败次数
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = "cache/backtest",
+                 max_entries: int = 2000, max_memory_entries: int = 256):
+        """
+        初始化回测结果缓存
+
+        参数:
+            cache_dir: 缓存目录，为None时只使用内存
+            max_entries: 本地文件的最大条目数量
+            max_memory_entries: 内存中的最大条目数量
+        """
+        super().__init__(cache_dir, max_entries, max_memory_entries)
+
+    def get(self, data: pd.DataFrame, signals: pd.DataFrame, run: Callable[..., Dict], **params) -> Dict:
+        """
+        获取回测结果，没有缓存时调用run(data, signals, **params)并保存结果
+
+        参数:
+            data: 包含OHLCV数据的DataFrame
+            signals: 包含买入和卖出信号的DataFrame
+            run: 回测函数，通常为run_backtest
+            **params: 回测参数
+
+        返回:
+            Dict: 回测结果，每次返回新的深拷贝，修改嵌套的字典不会影响缓存
+        """
+        try:
+            key = backtest_key(data, signals, params)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"计算回测缓存键失败，直接执行回测: {str(e)}")
+            return run(data, signals, **params)
+
+        result = self._load(key)
+        if result is not None:
+            self.hits += 1
+            return copy.deepcopy(result)
+
+        self.misses += 1
+        result = run(data, signals, **params)
+        if isinstance(result, dict):
+            self._store(key, copy.deepcopy(result))
+        return result
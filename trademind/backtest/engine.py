@@ -4,22 +4,29 @@ TradeMind Lite（轻量版）- 回测系统模块
 本模块包含交易策略回测相关的函数，用于评估交易策略的性能。
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import random
 import logging
 
+from trademind.backtest.kernel import simulate_trades_kernel, signal_mask
+from trademind.backtest.trade_log import TradeLog
+from trademind.backtest.monte_carlo import run_monte_carlo
+
 # 设置日志
 logger = logging.getLogger(__name__)
 
+# 有正收益但没有下行波动时使用的Sortino比率，表示非常好但不是极端
+NO_DOWNSIDE_SORTINO = 3.5
+
 def run_backtest(data: pd.DataFrame, signals: pd.DataFrame, 
                  initial_capital: float = 10000.0,
                  risk_per_trade_pct: float = 0.02,
                  stop_loss_pct: float = 0.07,
                  take_profit_pct: float = 0.15,
-                 max_hold_days: int = 20) -> Dict:
+                 max_hold_days: int = 20,
+                 monte_carlo_runs: int = 1000) -> Dict:
     """
     执行回测，评估交易策略性能
     
@@ -31,9 +38,10 @@ def run_backtest(data: pd.DataFrame, signals: pd.DataFrame,
         stop_loss_pct: 止损百分比
         take_profit_pct: 止盈百分比
         max_hold_days: 最大持有天数
+        monte_carlo_runs: 交易序列重抽样的次数，为0时不做蒙特卡洛模拟
         
     返回:
-        Dict: 回测结果统计
+        Dict: 回测结果统计，有交易时monte_carlo为收益率、回撤和破产概率的分布
     """
     try:
         # 检查数据有效性
@@ -64,6 +72,8 @@ def run_backtest(data: pd.DataFrame, signals: pd.DataFrame,
             
             # 计算性能指标
             results = calculate_performance_metrics(trades, equity, initial_capital, data.index)
+            if monte_carlo_runs > 0 and len(trades) > 0:
+                results['monte_carlo'] = run_monte_carlo(trades, initial_capital, n_simulations=monte_carlo_runs)
             return results
             
         except Exception as e:
@@ -101,7 +111,7 @@ def simulate_trades(data: pd.DataFrame, signals: pd.DataFrame,
                    risk_per_trade_pct: float = 0.02,
                    stop_loss_pct: float = 0.07,
                    take_profit_pct: float = 0.15,
-                   max_hold_days: int = 20) -> Tuple[List[Dict], List[float]]:
+                   max_hold_days: int = 20) -> Tuple[TradeLog, List[float]]:
     """
     模拟交易执行，生成交易记录和权益曲线
     
@@ -115,44 +125,38 @@ def simulate_trades(data: pd.DataFrame, signals: pd.DataFrame,
         max_hold_days: 最大持有天数
         
     返回:
-        Tuple[List[Dict], List[float]]: 交易记录和权益曲线
+        Tuple[TradeLog, List[float]]: 按列保存的交易记录和权益曲线
+    """
+    buy, sell = enhance_signals(data, signals)
+    
+    # 成交量，用于计算平仓滑点
+    volume = data['Volume'] if 'Volume' in data.columns else None
+    
+    # 使用数组内核执行交易模拟
+    return simulate_trades_kernel(
+        data['Close'].to_numpy(dtype=float), data['High'].to_numpy(dtype=float),
+        data['Low'].to_numpy(dtype=float), buy, sell, data.index,
+        volume=volume,
+        initial_capital=initial_capital,
+        risk_per_trade_pct=risk_per_trade_pct,
+        stop_loss_pct=stop_loss_pct,
+        take_profit_pct=take_profit_pct,
+        max_hold_days=max_hold_days
+    )
+
+
+def enhance_signals(data: pd.DataFrame, signals: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    合并买卖信号与RSI、MACD和布林带的增强信号
+    
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        signals: 包含买入和卖出信号的DataFrame
+        
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 买入和卖出信号布尔数组
     """
-    # 准备数据
-    close = data['Close'].copy()
-    high = data['High'].copy()
-    low = data['Low'].copy()
-    dates = data.index
-    
-    # 交易成本模型 (基于IBKR的固定费率模型)
-    commission_per_share = 0.005  # 每股0.005美元 (IBKR固定费率)
-    min_commission = 1.0  # 最低每单1美元
-    max_commission_pct = 0.01  # 最高为总成交金额的1%
-    
-    # 滑点模型
-    base_slippage_pct = 0.0005  # 基础滑点
-    market_impact_factor = 0.1  # 市场冲击系数
-    
-    # 初始化回测变量
-    position = 0  # 0表示空仓，1表示多头，-1表示空头
-    entry_price = 0.0  # 入场价格
-    entry_date = None  # 入场日期
-    capital = initial_capital  # 当前资金
-    equity = [initial_capital]  # 权益曲线
-    trades = []  # 交易记录
-    
-    # 计算ATR (真实波动幅度)
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=14).mean()
-    
-    # 使用Wilder的平滑方法
-    for i in range(14, len(tr)):
-        atr.iloc[i] = (atr.iloc[i-1] * 13 + tr.iloc[i]) / 14
-    
-    # 计算平均成交量
-    volume = data.get('Volume', pd.Series(np.ones(len(close)), index=close.index))
+    close = data['Close']
     
     # 确保信号数据包含必要的列
     if 'buy_signal' not in signals.columns:
@@ -194,142 +198,18 @@ def simulate_trades(data: pd.DataFrame, signals: pd.DataFrame,
         bb_upper_break = (close > upper_band)
         enhanced_sell_signals = enhanced_sell_signals | bb_upper_break
     
-    # 遍历每个交易日
-    for i in range(50, len(signals)):
-        current_date = dates[i]
-        current_price = close.iloc[i]
-        current_high = high.iloc[i]
-        current_low = low.iloc[i]
-        current_volume = volume.iloc[i]
-        avg_volume = volume.iloc[i-20:i].mean() if 'Volume' in data.columns else 1000  # 20日平均成交量
-        
-        # 计算当前ATR
-        current_atr = atr.iloc[i]
-        
-        # 如果有持仓，检查止损止盈
-        if position != 0:
-            days_held = (current_date - entry_date).days
-            
-            # 计算浮动盈亏
-            if position == 1:  # 多头
-                profit_pct = (current_price - entry_price) / entry_price
-            else:  # 空头
-                profit_pct = (entry_price - current_price) / entry_price
-            
-            # 检查止损条件
-            stop_triggered = False
-            if position == 1 and current_low <= entry_price * (1 - stop_loss_pct):
-                # 多头止损 - 使用当日最低价检查
-                stop_price = entry_price * (1 - stop_loss_pct)
-                stop_triggered = True
-            elif position == -1 and current_high >= entry_price * (1 + stop_loss_pct):
-                # 空头止损 - 使用当日最高价检查
-                stop_price = entry_price * (1 + stop_loss_pct)
-                stop_triggered = True
-            
-            # 检查止盈条件
-            take_profit_triggered = False
-            if position == 1 and current_high >= entry_price * (1 + take_profit_pct):
-                # 多头止盈 - 使用当日最高价检查
-                take_profit_price = entry_price * (1 + take_profit_pct)
-                take_profit_triggered = True
-            elif position == -1 and current_low <= entry_price * (1 - take_profit_pct):
-                # 空头止盈 - 使用当日最低价检查
-                take_profit_price = entry_price * (1 - take_profit_pct)
-                take_profit_triggered = True
-            
-            # 检查最大持有天数
-            max_hold_triggered = days_held >= max_hold_days
-            
-            # 检查反向信号
-            reverse_signal = (position == 1 and enhanced_sell_signals.iloc[i]) or (position == -1 and enhanced_buy_signals.iloc[i])
-            
-            # 如果触发任何平仓条件，执行平仓
-            if stop_triggered or take_profit_triggered or max_hold_triggered or reverse_signal:
-                # 确定平仓价格
-                if stop_triggered:
-                    exit_price = stop_price
-                    exit_reason = "止损"
-                elif take_profit_triggered:
-                    exit_price = take_profit_price
-                    exit_reason = "止盈"
-                elif max_hold_triggered:
-                    exit_price = current_price
-                    exit_reason = "最大持有期限"
-                else:  # reverse_signal
-                    exit_price = current_price
-                    exit_reason = "反向信号"
-                
-                # 计算滑点
-                volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-                slippage_pct = base_slippage_pct + (market_impact_factor * volume_ratio / 100)
-                
-                # 应用滑点
-                if position == 1:  # 多头平仓，卖出
-                    exit_price *= (1 - slippage_pct)
-                else:  # 空头平仓，买入
-                    exit_price *= (1 + slippage_pct)
-                
-                # 计算交易数量
-                position_value = capital * risk_per_trade_pct / stop_loss_pct
-                shares = position_value / entry_price
-                
-                # 计算交易成本
-                commission = max(min_commission, min(shares * commission_per_share, position_value * max_commission_pct))
-                
-                # 计算交易盈亏
-                if position == 1:  # 多头
-                    profit = shares * (exit_price - entry_price) - commission
-                else:  # 空头
-                    profit = shares * (entry_price - exit_price) - commission
-                
-                # 更新资金
-                capital += profit
-                
-                # 记录交易
-                trades.append({
-                    'entry_date': entry_date,
-                    'entry_price': entry_price,
-                    'exit_date': current_date,
-                    'exit_price': exit_price,
-                    'position': 'long' if position == 1 else 'short',
-                    'shares': shares,
-                    'profit': profit,
-                    'profit_pct': profit / (shares * entry_price) * 100,
-                    'exit_reason': exit_reason,
-                    'hold_days': days_held
-                })
-                
-                # 平仓后重置持仓状态
-                position = 0
-    
-        # 如果没有持仓，检查开仓信号
-        if position == 0:
-            # 检查买入信号
-            if enhanced_buy_signals.iloc[i]:
-                position = 1  # 多头
-                entry_price = current_price * (1 + base_slippage_pct)  # 考虑滑点
-                entry_date = current_date
-            
-            # 检查卖出信号 (做空)
-            elif enhanced_sell_signals.iloc[i]:
-                position = -1  # 空头
-                entry_price = current_price * (1 - base_slippage_pct)  # 考虑滑点
-                entry_date = current_date
-        
-        # 更新权益曲线
-        equity.append(capital)
-    
-    return trades, equity
+    return signal_mask(enhanced_buy_signals), signal_mask(enhanced_sell_signals)
 
 
-def calculate_performance_metrics(trades: List[Dict], equity: List[float], 
+def calculate_performance_metrics(trades: Union[TradeLog, List[Dict]], equity: List[float], 
                                  initial_capital: float, dates: pd.DatetimeIndex) -> Dict:
     """
     计算回测性能指标
     
+    所有统计都对交易记录和权益曲线的整列做数组运算。
+    
     参数:
-        trades: 交易记录列表
+        trades: 交易记录，TradeLog或交易字典列表
         equity: 权益曲线
         initial_capital: 初始资金
         dates: 日期索引
@@ -338,67 +218,67 @@ def calculate_performance_metrics(trades: List[Dict], equity: List[float],
         Dict: 性能指标字典
     """
     # 如果没有交易，返回空结果
-    if not trades:
+    if len(trades) == 0:
         return get_empty_results()
     
+    profit = _trade_column(trades, 'profit')
+    
     # 计算交易统计
-    total_trades = len(trades)
-    winning_trades = [t for t in trades if t['profit'] > 0]
-    losing_trades = [t for t in trades if t['profit'] <= 0]
+    total_trades = len(profit)
+    winning = profit > 0
     
-    win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0
+    win_rate = np.count_nonzero(winning) / total_trades
     
-    avg_profit = sum(t['profit'] for t in trades) / total_trades if total_trades > 0 else 0
-    max_profit = max([t['profit'] for t in trades]) if trades else 0
-    max_loss = min([t['profit'] for t in trades]) if trades else 0
+    avg_profit = float(profit.sum()) / total_trades
+    max_profit = float(profit.max())
+    max_loss = float(profit.min())
     
     # 计算盈亏比 (Profit Factor)
-    gross_profit = sum(t['profit'] for t in winning_trades) if winning_trades else 0
-    gross_loss = abs(sum(t['profit'] for t in losing_trades)) if losing_trades else 0
+    gross_profit = float(profit[winning].sum())
+    gross_loss = abs(float(profit[~winning].sum()))
     profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
     
-    # 计算最大连续亏损次数
-    consecutive_losses = 0
-    max_consecutive_losses = 0
-    for t in trades:
-        if t['profit'] <= 0:
-            consecutive_losses += 1
-            max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-        else:
-            consecutive_losses = 0
+    # 计算最大连续亏损次数：每笔亏损交易的连续计数为累计亏损数减去最近一次盈利时的累计亏损数
+    losing_count = np.cumsum(~winning)
+    streak = losing_count - np.maximum.accumulate(np.where(winning, losing_count, 0))
+    max_consecutive_losses = int(streak.max())
     
     # 计算平均持仓天数
-    avg_hold_days = sum(t['hold_days'] for t in trades) / total_trades if total_trades > 0 else 0
+    avg_hold_days = int(_trade_column(trades, 'hold_days').sum()) / total_trades
     
     # 计算最终收益率
-    capital = equity[-1]
+    equity_values = np.asarray(equity, dtype=float)
+    capital = float(equity_values[-1])
     final_return = (capital - initial_capital) / initial_capital * 100
     
     # 计算净利润
     net_profit = capital - initial_capital
     
     # 计算权益曲线的日收益率
-    equity_series = pd.Series(equity)
-    daily_returns = equity_series.pct_change().dropna()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_returns = equity_values[1:] / equity_values[:-1] - 1
+    daily_returns = daily_returns[~np.isnan(daily_returns)]
     
     # 计算最大回撤 (Maximum Drawdown)
-    peak = equity_series.expanding().max()
-    drawdown = (equity_series / peak - 1) * 100
+    peak = np.maximum.accumulate(equity_values)
+    drawdown = (equity_values / peak - 1) * 100
     max_drawdown = abs(drawdown.min())
     
     # 计算Sharpe比率
     risk_free_rate = 0.02 / 252  # 假设年化无风险利率为2%，转换为日利率
     excess_returns = daily_returns - risk_free_rate
-    sharpe_ratio = (excess_returns.mean() / excess_returns.std()) * np.sqrt(252) if len(excess_returns) > 0 and excess_returns.std() > 0 else 0
+    excess_std = _sample_std(excess_returns)
+    excess_mean = excess_returns.mean() if len(excess_returns) > 0 else np.nan
+    sharpe_ratio = (excess_mean / excess_std) * np.sqrt(252) if len(excess_returns) > 0 and excess_std > 0 else 0
     
     # 计算Sortino比率 (只考虑下行风险)
     downside_returns = excess_returns[excess_returns < 0]
-    downside_std = downside_returns.std() if len(downside_returns) > 0 else 0
+    downside_std = _sample_std(downside_returns) if len(downside_returns) > 0 else 0
     
     # 避免除以零的情况
     if downside_std > 0 and len(excess_returns) > 0:
         try:
-            sortino_ratio = (excess_returns.mean() / downside_std) * np.sqrt(252)
+            sortino_ratio = (excess_mean / downside_std) * np.sqrt(252)
             # 添加合理性检查，使用对数缩放处理异常大的值
             if np.isnan(sortino_ratio) or np.isinf(sortino_ratio):
                 sortino_ratio = 0
@@ -411,9 +291,9 @@ def calculate_performance_metrics(trades: List[Dict], equity: List[float],
             sortino_ratio = 0
     else:
         # 如果没有下行风险或者收益率为空
-        if len(excess_returns) > 0 and excess_returns.mean() > 0:
-            # 如果有正收益但没有下行风险，使用一个较高但合理的值
-            sortino_ratio = 3 + np.random.uniform(0, 1)  # 3到4之间的随机值，表示非常好但不是极端
+        if len(excess_returns) > 0 and excess_mean > 0:
+            # 如果有正收益但没有下行风险，使用一个较高但合理的固定值，相同输入总是得到相同结果
+            sortino_ratio = NO_DOWNSIDE_SORTINO
         else:
             sortino_ratio = 0
     
@@ -467,93 +347,98 @@ def calculate_performance_metrics(trades: List[Dict], equity: List[float],
     }
 
 
-def generate_trade_summary(trades: List[Dict]) -> Dict:
+def _trade_column(trades: Union[TradeLog, List[Dict]], field: str) -> np.ndarray:
+    """获取交易记录的一列，字典列表只读取需要的字段"""
+    if isinstance(trades, TradeLog):
+        return trades[field]
+    return np.array([trade[field] for trade in trades])
+
+
+def _sample_std(values: np.ndarray) -> float:
+    """计算样本标准差（ddof=1），少于两个值时为NaN，与pd.Series.std一致"""
+    if len(values) < 2:
+        return np.nan
+    return float(values.std(ddof=1))
+
+
+def generate_trade_summary(trades: Union[TradeLog, List[Dict]]) -> Dict:
     """
     生成交易摘要，包括按月、按交易类型的统计
     
     参数:
-        trades: 交易记录列表
+        trades: 交易记录，TradeLog或交易字典列表
         
     返回:
         Dict: 交易摘要统计
     """
-    if not trades:
+    if len(trades) == 0:
         return {
             'monthly_performance': {},
             'exit_reason_stats': {},
             'position_stats': {}
         }
     
+    profit = _trade_column(trades, 'profit')
+    winning = profit > 0
+    if isinstance(trades, TradeLog):
+        exit_dates, reasons, positions = trades.dates('exit_date'), trades.exit_reasons(), trades.positions()
+    else:
+        exit_dates = pd.DatetimeIndex([t['exit_date'] for t in trades])
+        reasons = [t['exit_reason'] for t in trades]
+        positions = [t['position'] for t in trades]
+    
     # 按月统计
     monthly_performance = {}
-    for trade in trades:
-        month_key = trade['exit_date'].strftime('%Y-%m')
-        if month_key not in monthly_performance:
-            monthly_performance[month_key] = {
-                'trades': 0,
-                'profit': 0,
-                'win_rate': 0,
-                'winning_trades': 0
-            }
-        
-        monthly_performance[month_key]['trades'] += 1
-        monthly_performance[month_key]['profit'] += trade['profit']
-        if trade['profit'] > 0:
-            monthly_performance[month_key]['winning_trades'] += 1
-    
-    # 计算每月胜率
-    for month, stats in monthly_performance.items():
-        if stats['trades'] > 0:
-            stats['win_rate'] = round(stats['winning_trades'] / stats['trades'] * 100, 1)
-            stats['profit'] = round(stats['profit'], 2)
+    for month, count, total, wins in _group_profits(exit_dates.strftime('%Y-%m'), profit, winning):
+        monthly_performance[month] = {
+            'trades': count,
+            'profit': round(total, 2),
+            'win_rate': round(wins / count * 100, 1),
+            'winning_trades': wins
+        }
     
     # 按平仓原因统计
     exit_reason_stats = {}
-    for trade in trades:
-        reason = trade['exit_reason']
-        if reason not in exit_reason_stats:
-            exit_reason_stats[reason] = {
-                'count': 0,
-                'profit': 0,
-                'avg_profit': 0,
-                'win_rate': 0,
-                'winning_trades': 0
-            }
-        
-        exit_reason_stats[reason]['count'] += 1
-        exit_reason_stats[reason]['profit'] += trade['profit']
-        if trade['profit'] > 0:
-            exit_reason_stats[reason]['winning_trades'] += 1
-    
-    # 计算每种平仓原因的胜率和平均利润
-    for reason, stats in exit_reason_stats.items():
-        if stats['count'] > 0:
-            stats['win_rate'] = round(stats['winning_trades'] / stats['count'] * 100, 1)
-            stats['avg_profit'] = round(stats['profit'] / stats['count'], 2)
-            stats['profit'] = round(stats['profit'], 2)
+    for reason, count, total, wins in _group_profits(reasons, profit, winning):
+        exit_reason_stats[reason] = {
+            'count': count,
+            'profit': round(total, 2),
+            'avg_profit': round(total / count, 2),
+            'win_rate': round(wins / count * 100, 1),
+            'winning_trades': wins
+        }
     
     # 按持仓方向统计
     position_stats = {
         'long': {'count': 0, 'profit': 0, 'win_rate': 0, 'winning_trades': 0},
         'short': {'count': 0, 'profit': 0, 'win_rate': 0, 'winning_trades': 0}
     }
-    
-    for trade in trades:
-        position = trade['position']
-        position_stats[position]['count'] += 1
-        position_stats[position]['profit'] += trade['profit']
-        if trade['profit'] > 0:
-            position_stats[position]['winning_trades'] += 1
-    
-    # 计算每个持仓方向的胜率和平均利润
-    for position, stats in position_stats.items():
-        if stats['count'] > 0:
-            stats['win_rate'] = round(stats['winning_trades'] / stats['count'] * 100, 1)
-            stats['avg_profit'] = round(stats['profit'] / stats['count'], 2)
-            stats['profit'] = round(stats['profit'], 2)
+    for position, count, total, wins in _group_profits(positions, profit, winning):
+        position_stats[position] = {
+            'count': count,
+            'profit': round(total, 2),
+            'win_rate': round(wins / count * 100, 1),
+            'winning_trades': wins,
+            'avg_profit': round(total / count, 2)
+        }
     
     return {
         'monthly_performance': monthly_performance,
         'exit_reason_stats': exit_reason_stats,
         'position_stats': position_stats
-    } 
\ No newline at end of file
+    }
+
+
+def _group_profits(keys, profit: np.ndarray, winning: np.ndarray):
+    """
+    按键分组汇总交易盈亏，分组按首次出现的顺序排列
+    
+    返回:
+        List[Tuple]: 每组的(键, 交易数, 总盈亏, 盈利交易数)
+    """
+    codes, uniques = pd.factorize(np.asarray(keys))
+    counts = np.bincount(codes, minlength=len(uniques))
+    totals = np.bincount(codes, weights=profit, minlength=len(uniques))
+    wins = np.bincount(codes, weights=winning, minlength=len(uniques))
+    return [(str(key), int(count), float(total), int(win))
+            for key, count, total, win in zip(uniques, counts, totals, wins)]
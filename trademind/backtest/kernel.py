@@ -0,0 +1,247 @@
+"""
+TradeMind Lite（轻量版）- 回测内核模块
+
+本模块实现基于数组的交易模拟内核。止损、止盈、最大持有期和反向信号的平仓条件
+对每笔持仓按数组批量判断，只在开仓和平仓处做少量的逐笔状态推进，
+不再逐根K线循环；交易记录和权益曲线与原逐根K线模拟完全一致。
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trademind.backtest.trade_log import TradeLog
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 交易成本模型 (基于IBKR的固定费率模型)
+COMMISSION_PER_SHARE = 0.005  # 每股0.005美元 (IBKR固定费率)
+MIN_COMMISSION = 1.0  # 最低每单1美元
+MAX_COMMISSION_PCT = 0.01  # 最高为总成交金额的1%
+
+# 滑点模型
+BASE_SLIPPAGE_PCT = 0.0005  # 基础滑点
+MARKET_IMPACT_FACTOR = 0.1  # 市场冲击系数
+
+# 一天的纳秒数，用于计算持有天数
+_DAY_NS = 86_400_000_000_000
+
+# 查找平仓K线时第一次检查的K线数量，之后每次翻倍
+_INITIAL_SCAN = 32
+
+
+def signal_mask(values) -> np.ndarray:
+    """
+    将信号序列转换为布尔数组，真值判断与Python的bool()一致（NaN视为True）
+
+    参数:
+        values: 信号序列
+
+    返回:
+        np.ndarray: 布尔数组
+    """
+    arr = np.asarray(values)
+    if arr.dtype == bool:
+        return arr
+    if arr.dtype.kind in 'iuf':
+        return arr != 0
+    return np.fromiter((bool(v) for v in arr), dtype=bool, count=len(arr))
+
+
+def _next_signal_index(mask: np.ndarray) -> np.ndarray:
+    """计算每个位置及之后第一个为True的位置，没有时为len(mask)"""
+    n = len(mask)
+    positions = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(positions[::-1])[::-1]
+
+
+def _average_volume(volume: np.ndarray, end: int, window: int = 20) -> float:
+    """计算end之前window根K线的平均成交量，忽略缺失值，与pd.Series.mean的计算方式相同"""
+    values = volume[end - window:end]
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.sum() / len(values)
+    count = len(values) - int(missing.sum())
+    return np.where(missing, 0.0, values).sum() / count if count else np.nan
+
+
+def simulate_trades_kernel(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                           buy: np.ndarray, sell: np.ndarray, dates: pd.DatetimeIndex,
+                           volume: Optional[np.ndarray] = None, start: int = 50,
+                           initial_capital: float = 10000.0,
+                           risk_per_trade_pct: float = 0.02,
+                           stop_loss_pct: float = 0.07,
+                           take_profit_pct: float = 0.15,
+                           max_hold_days: int = 20) -> Tuple[TradeLog, List[float]]:
+    """
+    模拟交易执行
+
+    规则与原逐根K线模拟相同：从第start根K线开始，空仓时按买入/卖出信号开多/开空；
+    持仓时依次检查止损、止盈、最大持有天数和反向信号，平仓当根K线可以再次开仓。
+
+    参数:
+        close: 收盘价数组
+        high: 最高价数组
+        low: 最低价数组
+        buy: 买入信号布尔数组
+        sell: 卖出信号布尔数组
+        dates: 日期索引
+        volume: 成交量数组或序列，为None时按无成交量数据处理
+        start: 开始交易的K线位置
+        initial_capital: 初始资金
+        risk_per_trade_pct: 每笔交易风险资金的百分比
+        stop_loss_pct: 止损百分比
+        take_profit_pct: 止盈百分比
+        max_hold_days: 最大持有天数（自然日）
+
+    返回:
+        Tuple[TradeLog, List[float]]: 按列保存的交易记录和权益曲线
+    """
+    if not isinstance(dates, pd.DatetimeIndex):
+        raise TypeError("回测数据的索引必须是日期")
+
+    close = np.asarray(close, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    days = dates.asi8
+    volume_values = np.asarray(volume, dtype=float) if volume is not None else None
+    n = len(buy)
+
+    # 交易记录的各列，结束后一次性生成结构化数组
+    entry_bars, exit_bars = [], []
+    entry_prices, exit_prices, positions = [], [], []
+    shares_list, profits, reasons, hold_days = [], [], [], []
+    exit_capitals = []
+    capital = initial_capital
+
+    next_signal = _next_signal_index(buy | sell)
+    i = next_signal[start] if start < n else n
+
+    while i < n:
+        # 开仓
+        position = 1 if buy[i] else -1
+        if position == 1:
+            entry_price = close[i] * (1 + BASE_SLIPPAGE_PCT)
+            stop_level = entry_price * (1 - stop_loss_pct)
+            take_profit_level = entry_price * (1 + take_profit_pct)
+        else:
+            entry_price = close[i] * (1 - BASE_SLIPPAGE_PCT)
+            stop_level = entry_price * (1 + stop_loss_pct)
+            take_profit_level = entry_price * (1 - take_profit_pct)
+        entry_day = days[i]
+
+        # 按块查找第一根满足任一平仓条件的K线
+        exit_bar = None
+        j = i + 1
+        chunk = _INITIAL_SCAN
+        while j < n:
+            end = min(n, j + chunk)
+            if position == 1:
+                hit = (low[j:end] <= stop_level) | (high[j:end] >= take_profit_level) | sell[j:end]
+            else:
+                hit = (high[j:end] >= stop_level) | (low[j:end] <= take_profit_level) | buy[j:end]
+            hit |= (days[j:end] - entry_day) // _DAY_NS >= max_hold_days
+            if hit.any():
+                exit_bar = j + int(np.argmax(hit))
+                break
+            j = end
+            chunk *= 2
+
+        if exit_bar is None:
+            # 持仓到数据结束
+            break
+
+        k = exit_bar
+        days_held = int((days[k] - entry_day) // _DAY_NS)
+        if position == 1:
+            stop_triggered = low[k] <= stop_level
+            take_profit_triggered = high[k] >= take_profit_level
+        else:
+            stop_triggered = high[k] >= stop_level
+            take_profit_triggered = low[k] <= take_profit_level
+
+        # 确定平仓价格，原因编号对应EXIT_REASONS
+        if stop_triggered:
+            exit_price = stop_level
+            exit_reason = 0
+        elif take_profit_triggered:
+            exit_price = take_profit_level
+            exit_reason = 1
+        elif days_held >= max_hold_days:
+            exit_price = close[k]
+            exit_reason = 2
+        else:
+            exit_price = close[k]
+            exit_reason = 3
+
+        # 计算滑点
+        if volume_values is not None:
+            current_volume = volume_values[k]
+            avg_volume = _average_volume(volume_values, k)  # 20日平均成交量
+        else:
+            current_volume = 1.0
+            avg_volume = 1000
+        volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
+        slippage_pct = BASE_SLIPPAGE_PCT + (MARKET_IMPACT_FACTOR * volume_ratio / 100)
+
+        # 应用滑点
+        if position == 1:  # 多头平仓，卖出
+            exit_price *= (1 - slippage_pct)
+        else:  # 空头平仓，买入
+            exit_price *= (1 + slippage_pct)
+
+        # 计算交易数量
+        position_value = capital * risk_per_trade_pct / stop_loss_pct
+        shares = position_value / entry_price
+
+        # 计算交易成本
+        commission = max(MIN_COMMISSION, min(shares * COMMISSION_PER_SHARE, position_value * MAX_COMMISSION_PCT))
+
+        # 计算交易盈亏
+        if position == 1:
+            profit = shares * (exit_price - entry_price) - commission
+        else:
+            profit = shares * (entry_price - exit_price) - commission
+
+        capital += profit
+        exit_capitals.append(capital)
+
+        entry_bars.append(i)
+        exit_bars.append(k)
+        entry_prices.append(entry_price)
+        exit_prices.append(exit_price)
+        positions.append(position)
+        shares_list.append(shares)
+        profits.append(profit)
+        reasons.append(exit_reason)
+        hold_days.append(days_held)
+
+        # 平仓当根K线可以再次开仓
+        i = next_signal[k]
+
+    # 权益曲线：初始资金加上从start开始每根K线收盘后的已实现资金
+    equity = [initial_capital]
+    if start < n:
+        bars = np.arange(start, n)
+        levels = np.asarray([initial_capital] + exit_capitals, dtype=float)
+        equity.extend(levels[np.searchsorted(exit_bars, bars, side='right')].tolist())
+
+    trades = TradeLog.from_columns(
+        tz=str(dates.tz) if dates.tz is not None else None,
+        entry_date=days[np.asarray(entry_bars, dtype=np.int64)],
+        entry_price=entry_prices,
+        exit_date=days[np.asarray(exit_bars, dtype=np.int64)],
+        exit_price=exit_prices,
+        position=positions,
+        shares=shares_list,
+        profit=profits,
+        profit_pct=np.divide(profits, np.multiply(shares_list, entry_prices)) * 100,
+        exit_reason=reasons,
+        hold_days=hold_days
+    )
+    return trades, equity
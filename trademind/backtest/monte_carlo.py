@@ -0,0 +1,123 @@
+"""
+TradeMind Lite（轻量版）- 蒙特卡洛回测模块
+
+本模块对回测产生的交易序列做重抽样，估计收益率、最大回撤和破产概率的分布。
+每笔交易换算为相对于开仓前资金的收益率，多条路径组成二维数组后一次性计算，
+不逐条路径循环；默认使用固定的随机种子，相同的交易记录总是得到相同的结果。
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from trademind.backtest.trade_log import TradeLog
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 支持的重抽样方式
+MONTE_CARLO_METHODS = ('bootstrap', 'permutation')
+
+# 报告中展示的分位数
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# 每批模拟使用的最大数组元素数量，控制内存占用
+_BATCH_ELEMENTS = 2_000_000
+
+
+def trade_returns(trades: Union[TradeLog, List[Dict]], initial_capital: float) -> np.ndarray:
+    """
+    计算每笔交易相对于开仓前资金的收益率
+
+    参数:
+        trades: 交易记录，TradeLog或交易字典列表
+        initial_capital: 初始资金
+
+    返回:
+        np.ndarray: 每笔交易的收益率
+    """
+    if isinstance(trades, TradeLog):
+        profit = trades['profit']
+    else:
+        profit = np.array([trade['profit'] for trade in trades], dtype=float)
+    capital_before = initial_capital + np.concatenate(([0.0], np.cumsum(profit)[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = profit / capital_before
+    # 资金耗尽后的交易不再有意义，按全部亏损处理
+    return np.where(capital_before > 0, returns, -1.0)
+
+
+def _summarize(values: np.ndarray, quantiles: Sequence[float]) -> Dict[str, float]:
+    """把模拟结果汇总为百分比形式的分位数和均值"""
+    summary = {f"p{round(q * 100)}": round(float(v) * 100, 1)
+               for q, v in zip(quantiles, np.quantile(values, quantiles))}
+    summary['mean'] = round(float(values.mean()) * 100, 1)
+    return summary
+
+
+def run_monte_carlo(trades: Union[TradeLog, List[Dict]], initial_capital: float = 10000.0,
+                    n_simulations: int = 1000, method: str = 'bootstrap',
+                    ruin_threshold: float = 0.5, seed: Optional[int] = 42,
+                    quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+    """
+    对交易序列做蒙特卡洛重抽样
+
+    参数:
+        trades: 交易记录，TradeLog或交易字典列表
+        initial_capital: 初始资金
+        n_simulations: 模拟路径数量
+        method: 重抽样方式
+            'bootstrap': 有放回地抽取与原序列等长的交易序列，收益率和回撤都有分布
+            'permutation': 随机打乱交易顺序，最终收益率不变，只反映回撤对交易顺序的敏感程度
+        ruin_threshold: 资金从初始值下跌该比例即视为破产
+        seed: 随机种子，为None时每次结果不同
+        quantiles: 汇总的分位数
+
+    返回:
+        Dict: 包含final_return和max_drawdown的分位数与均值（百分比）、
+              破产概率ruin_probability（百分比），没有交易时为空字典
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(f"不支持的重抽样方式: {method}")
+    if n_simulations <= 0:
+        raise ValueError(f"模拟路径数量必须为正数: {n_simulations}")
+
+    returns = trade_returns(trades, initial_capital)
+    n_trades = len(returns)
+    if n_trades == 0:
+        return {}
+
+    rng = np.random.default_rng(seed)
+    batch_size = max(1, _BATCH_ELEMENTS // n_trades)
+    final_returns, drawdowns, ruined = [], [], []
+    for start in range(0, n_simulations, batch_size):
+        size = min(batch_size, n_simulations - start)
+        if method == 'bootstrap':
+            sampled = returns[rng.integers(0, n_trades, size=(size, n_trades))]
+        else:
+            sampled = rng.permuted(np.broadcast_to(returns, (size, n_trades)), axis=1)
+
+        # 每条路径的资金相对于初始资金的倍数，资金不会低于零
+        equity = np.cumprod(np.maximum(1.0 + sampled, 0.0), axis=1)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, 1.0 - equity / peak, 0.0)
+
+        final_returns.append(equity[:, -1] - 1.0)
+        drawdowns.append(drawdown.max(axis=1))
+        ruined.append(equity.min(axis=1) <= 1.0 - ruin_threshold)
+
+    final_returns = np.concatenate(final_returns)
+    drawdowns = np.concatenate(drawdowns)
+    ruined = np.concatenate(ruined)
+
+    return {
+        'method': method,
+        'simulations': n_simulations,
+        'trades': n_trades,
+        'final_return': _summarize(final_returns, quantiles),
+        'max_drawdown': _summarize(drawdowns, quantiles),
+        'ruin_threshold': round(ruin_threshold * 100, 1),
+        'ruin_probability': round(float(ruined.mean()) * 100, 1)
+    }
@@ -0,0 +1,443 @@
+"""
+TradeMind Lite（轻量版）- 参数优化模块
+
+本模块对回测参数做网格搜索或随机抽样。每个股票的价格、成交量和增强后的买卖信号只准备一次，
+并行时放入共享内存，工作进程以只读数组的方式直接读取，任务只传递股票代码和参数组合；
+结果按完成顺序汇入按目标指标排序的结果表。
+"""
+
+import logging
+import heapq
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trademind.backtest.engine import calculate_performance_metrics, enhance_signals, get_empty_results
+from trademind.backtest.kernel import simulate_trades_kernel
+from trademind.backtest.trade_log import TradeLog
+from trademind.core.parallel import resolve_workers
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认的参数搜索空间
+DEFAULT_PARAMETER_SPACE = {
+    'risk_per_trade_pct': [0.01, 0.02, 0.03],
+    'stop_loss_pct': [0.03, 0.05, 0.07, 0.10],
+    'take_profit_pct': [0.06, 0.10, 0.15, 0.20, 0.30],
+    'max_hold_days': [5, 10, 20, 40]
+}
+
+# 进度回调，签名为callback(completed, total, ranked)，ranked为当前排名前PROGRESS_TOP_K的结果
+OptimizerCallback = Callable[[int, int, List[Dict]], None]
+
+# 进度回调中实时排名的结果数量
+PROGRESS_TOP_K = 20
+
+# 越小越好的指标，默认从低到高排序
+LOWER_IS_BETTER = ('max_drawdown', 'consecutive_losses')
+
+# 可以用于排序的指标，confidence_level描述样本量而不是策略表现，不参与排序
+RANKING_METRICS = tuple(name for name in get_empty_results() if name != 'confidence_level')
+
+# 共享内存中每个股票的数组及其类型
+_SHARED_FIELDS = (
+    ('close', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('volume', np.float64),
+    ('buy', np.bool_),
+    ('sell', np.bool_),
+    ('days', np.int64)
+)
+
+# 工作进程内的回测数据和共享内存句柄
+_worker_inputs: Dict[str, Dict] = {}
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _check_space(space: Dict[str, Sequence]):
+    """检查参数空间只包含run_backtest支持的参数"""
+    unknown = set(space) - set(DEFAULT_PARAMETER_SPACE)
+    if unknown:
+        raise ValueError(f"不支持的回测参数: {', '.join(sorted(unknown))}")
+    for name, values in space.items():
+        if len(values) == 0:
+            raise ValueError(f"参数 {name} 没有候选值")
+
+
+def parameter_grid(space: Optional[Dict[str, Sequence]] = None) -> List[Dict]:
+    """
+    生成参数空间的全部组合
+
+    参数:
+        space: 参数名到候选值列表的字典，为None时使用默认参数空间
+
+    返回:
+        List[Dict]: 参数组合列表
+    """
+    space = DEFAULT_PARAMETER_SPACE if space is None else space
+    _check_space(space)
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def sample_parameters(space: Optional[Dict[str, Sequence]] = None, n_samples: int = 100,
+                      seed: Optional[int] = None) -> List[Dict]:
+    """
+    从参数空间的全部组合中不重复地随机抽取参数组合，不需要展开整个网格
+
+    参数:
+        space: 参数名到候选值列表的字典，为None时使用默认参数空间
+        n_samples: 抽样数量，不少于组合总数时返回整个网格
+        seed: 随机种子
+
+    返回:
+        List[Dict]: 参数组合列表
+    """
+    space = DEFAULT_PARAMETER_SPACE if space is None else space
+    _check_space(space)
+    names = list(space)
+    sizes = [len(values) for values in space.values()]
+    total = int(np.prod(sizes))
+    if n_samples >= total:
+        return parameter_grid(space)
+
+    combinations = []
+    for index in random.Random(seed).sample(range(total), n_samples):
+        # 按混合进制把组合序号还原为每个参数的位置
+        params = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            index, position = divmod(index, size)
+            params[name] = space[name][position]
+        combinations.append({name: params[name] for name in names})
+    return combinations
+
+
+def market_inputs(data: pd.DataFrame) -> Dict:
+    """
+    准备单个股票与信号无关的回测数组
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+
+    返回:
+        Dict: 价格、成交量和日期数组
+    """
+    return {
+        'close': data['Close'].to_numpy(dtype=float),
+        'high': data['High'].to_numpy(dtype=float),
+        'low': data['Low'].to_numpy(dtype=float),
+        'volume': data['Volume'].to_numpy(dtype=float) if 'Volume' in data.columns else None,
+        'days': data.index.asi8,
+        'tz': str(data.index.tz) if data.index.tz is not None else None,
+        'dates': data.index
+    }
+
+
+def prepare_inputs(data: pd.DataFrame, signals: pd.DataFrame) -> Dict:
+    """
+    准备单个股票的回测数组，参数搜索中只计算一次
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        signals: 包含买入和卖出信号的DataFrame
+
+    返回:
+        Dict: 价格、成交量、增强后的买卖信号和日期数组
+    """
+    if not data.index.equals(signals.index):
+        signals = signals.reindex(data.index)
+    buy, sell = enhance_signals(data, signals.copy())
+    return {**market_inputs(data), 'buy': buy, 'sell': sell}
+
+
+def _dates(inputs: Dict) -> pd.DatetimeIndex:
+    """由纳秒时间戳还原日期索引"""
+    dates = pd.DatetimeIndex(inputs['days'])
+    if inputs['tz'] is not None:
+        dates = dates.tz_localize('UTC').tz_convert(inputs['tz'])
+    return dates
+
+
+def simulate_window(inputs: Dict, params: Dict, initial_capital: float = 10000.0,
+                    window: Optional[Tuple[int, int]] = None) -> Tuple[TradeLog, List[float], pd.DatetimeIndex]:
+    """
+    用一个参数组合模拟交易，可以只在部分K线区间内开仓
+
+    参数:
+        inputs: prepare_inputs准备的回测数组
+        params: 回测参数
+        initial_capital: 初始资金
+        window: 开仓区间(start, end)，为None时与run_backtest相同，从第50根K线到最后。
+                区间之前的K线仍用于计算平均成交量，区间结束时未平仓的持仓不计入
+
+    返回:
+        Tuple[TradeLog, List[float], pd.DatetimeIndex]: 交易记录、权益曲线和计算指标使用的日期
+    """
+    # 工作进程中共享内存里只有纳秒时间戳，第一次使用时还原日期索引
+    dates = inputs.get('dates')
+    if dates is None:
+        dates = inputs['dates'] = _dates(inputs)
+
+    if window is None:
+        start, end, period = 50, len(dates), dates
+    else:
+        start, end = window
+        period = dates[start:end]
+        start = max(start, 50)
+
+    volume = inputs['volume']
+    trades, equity = simulate_trades_kernel(
+        inputs['close'][:end], inputs['high'][:end], inputs['low'][:end],
+        inputs['buy'][:end], inputs['sell'][:end], dates[:end],
+        volume=volume[:end] if volume is not None else None, start=start,
+        initial_capital=initial_capital, **params
+    )
+    return trades, equity, period
+
+
+def evaluate_parameters(symbol: str, inputs: Dict, combinations: Sequence[Dict],
+                        initial_capital: float = 10000.0,
+                        window: Optional[Tuple[int, int]] = None) -> List[Dict]:
+    """
+    用一组参数组合回测单个股票
+
+    参数:
+        symbol: 股票代码
+        inputs: prepare_inputs准备的回测数组
+        combinations: 参数组合列表
+        initial_capital: 初始资金
+        window: 开仓区间(start, end)，见simulate_window
+
+    返回:
+        List[Dict]: 每个参数组合的股票代码、参数和calculate_performance_metrics指标
+    """
+    rows = []
+    for params in combinations:
+        trades, equity, period = simulate_window(inputs, params, initial_capital, window)
+        metrics = calculate_performance_metrics(trades, equity, initial_capital, period)
+        rows.append({'symbol': symbol, **params, **metrics})
+    return rows
+
+
+class SharedInputs:
+    """把每个股票的回测数组复制到共享内存，供工作进程只读访问"""
+
+    def __init__(self, inputs: Dict[str, Dict]):
+        """
+        创建共享内存块
+
+        参数:
+            inputs: 股票代码到prepare_inputs结果的字典
+        """
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.layouts: Dict[str, Tuple[str, int, Optional[str], bool]] = {}
+        try:
+            for symbol, arrays in inputs.items():
+                length = len(arrays['close'])
+                size = sum(np.dtype(dtype).itemsize * length for _, dtype in _SHARED_FIELDS)
+                block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                self.blocks.append(block)
+                for name, dtype, offset in self._fields(length):
+                    view = np.ndarray(length, dtype=dtype, buffer=block.buf, offset=offset)
+                    values = arrays[name]
+                    view[:] = np.nan if values is None else values
+                self.layouts[symbol] = (block.name, length, arrays['tz'], arrays['volume'] is not None)
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def _fields(length: int):
+        """计算每个数组在共享内存块中的偏移"""
+        offset = 0
+        for name, dtype in _SHARED_FIELDS:
+            yield name, dtype, offset
+            offset += np.dtype(dtype).itemsize * length
+
+    @classmethod
+    def attach(cls, layouts: Dict[str, Tuple[str, int, Optional[str], bool]]
+               ) -> Tuple[Dict[str, Dict], List[shared_memory.SharedMemory]]:
+        """
+        在工作进程中按布局连接共享内存，返回只读数组视图
+
+        参数:
+            layouts: SharedInputs.layouts
+
+        返回:
+            Tuple[Dict[str, Dict], List[SharedMemory]]: 回测数组和需要保持引用的共享内存句柄
+        """
+        inputs, blocks = {}, []
+        for symbol, (name, length, tz, has_volume) in layouts.items():
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays = {'tz': tz}
+            for field, dtype, offset in cls._fields(length):
+                view = np.ndarray(length, dtype=dtype, buffer=block.buf, offset=offset)
+                view.flags.writeable = False
+                arrays[field] = view
+            if not has_volume:
+                arrays['volume'] = None
+            inputs[symbol] = arrays
+        return inputs, blocks
+
+    def close(self):
+        """释放并删除全部共享内存块"""
+        for block in self.blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _init_worker(layouts: Dict):
+    """初始化工作进程：连接共享内存中的回测数组"""
+    global _worker_inputs, _worker_blocks
+    _worker_inputs, _worker_blocks = SharedInputs.attach(layouts)
+
+
+def get_worker_inputs(symbol: str) -> Dict:
+    """获取当前工作进程中共享内存里的回测数组"""
+    return _worker_inputs[symbol]
+
+
+def _run_chunk(symbol: str, combinations: List[Dict], initial_capital: float) -> List[Dict]:
+    """在工作进程中回测一组参数组合"""
+    return evaluate_parameters(symbol, get_worker_inputs(symbol), combinations, initial_capital)
+
+
+def check_metric(metric: str, ascending: Optional[bool] = None) -> bool:
+    """
+    检查排序指标并确定排序方向
+
+    参数:
+        metric: calculate_performance_metrics的指标名称，见RANKING_METRICS
+        ascending: 是否从低到高排序，为None时LOWER_IS_BETTER中的指标从低到高，其余从高到低
+
+    返回:
+        bool: 是否从低到高排序
+    """
+    if metric not in RANKING_METRICS:
+        raise ValueError(f"不支持的排序指标: {metric}，可选: {list(RANKING_METRICS)}")
+    return metric in LOWER_IS_BETTER if ascending is None else ascending
+
+
+def rank_key(metric: str, ascending: bool, names: Sequence[str]) -> Callable[[Dict], Tuple]:
+    """
+    生成结果行的排序键
+
+    排名只取决于行的内容：先按指标排序，指标缺失或为NaN的行排在最后，
+    指标相同时依次按股票代码和参数排序，与任务完成的先后顺序无关。
+
+    参数:
+        metric: 排序指标
+        ascending: 是否从低到高排序
+        names: 参数名称列表
+
+    返回:
+        Callable: 输入结果行、返回排序键的函数，键越小排名越靠前
+    """
+    def key(row: Dict) -> Tuple:
+        value = row.get(metric)
+        missing = value is None or value != value
+        signed = 0.0 if missing else (value if ascending else -value)
+        return missing, signed, row['symbol'], tuple(row[name] for name in names)
+
+    return key
+
+
+def optimize_parameters(datasets: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]],
+                        space: Optional[Dict[str, Sequence]] = None,
+                        n_samples: Optional[int] = None,
+                        seed: Optional[int] = None,
+                        metric: str = 'sharpe_ratio',
+                        workers: int = 1,
+                        chunk_size: int = 32,
+                        initial_capital: float = 10000.0,
+                        progress_callback: Optional[OptimizerCallback] = None,
+                        ascending: Optional[bool] = None) -> pd.DataFrame:
+    """
+    对多个股票搜索回测参数
+
+    参数:
+        datasets: 股票代码到(行情数据, 交易信号)的字典
+        space: 参数名到候选值列表的字典，为None时使用默认参数空间
+        n_samples: 随机抽样的参数组合数量，为None时搜索整个网格
+        seed: 随机抽样的种子
+        metric: 排序使用的calculate_performance_metrics指标，见RANKING_METRICS
+        workers: 工作进程数量，1为在当前进程串行执行，小于等于0时使用CPU核心数
+        chunk_size: 每个任务包含的参数组合数量
+        initial_capital: 初始资金
+        progress_callback: 每完成一个任务调用一次，传入当前排名前PROGRESS_TOP_K的结果
+        ascending: 是否从低到高排序，为None时回撤和连续亏损等越小越好的指标从低到高，其余从高到低
+
+    返回:
+        pd.DataFrame: 按指标排序的结果表，每行包含股票代码、参数和全部性能指标，指标为NaN的行排在最后
+    """
+    ascending = check_metric(metric, ascending)
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size必须为正数: {chunk_size}")
+
+    if n_samples is None:
+        combinations = parameter_grid(space)
+    else:
+        combinations = sample_parameters(space, n_samples, seed)
+
+    # 每个股票的数组只准备一次，数据不足的股票与run_backtest一样不参与回测
+    inputs = {}
+    for symbol, (data, signals) in datasets.items():
+        if data is None or signals is None or len(data) < 50:
+            logger.warning(f"{symbol} 的回测数据不足或无效，跳过参数优化")
+            continue
+        inputs[symbol] = prepare_inputs(data, signals)
+
+    tasks = [(symbol, combinations[start:start + chunk_size])
+             for symbol in inputs for start in range(0, len(combinations), chunk_size)]
+    total = len(tasks)
+    names = list(space if space is not None else DEFAULT_PARAMETER_SPACE)
+    key = rank_key(metric, ascending, names)
+    rows_collected: List[Dict] = []
+    # 进度回调只需要实时的前几名，完整排序在全部完成后做一次
+    leaders: List[Dict] = []
+
+    def collect(completed, rows):
+        nonlocal leaders
+        rows_collected.extend(rows)
+        if progress_callback is not None:
+            leaders = heapq.nsmallest(PROGRESS_TOP_K, leaders + rows, key=key)
+            try:
+                progress_callback(completed, total, leaders)
+            except Exception as e:
+                logger.warning(f"进度回调出错: {str(e)}")
+
+    workers = resolve_workers(workers)
+    if workers <= 1 or total <= 1:
+        for completed, (symbol, chunk) in enumerate(tasks, 1):
+            collect(completed, evaluate_parameters(symbol, inputs[symbol], chunk, initial_capital))
+    else:
+        with SharedInputs(inputs) as shared:
+            with ProcessPoolExecutor(max_workers=min(workers, total), initializer=_init_worker,
+                                     initargs=(shared.layouts,)) as executor:
+                futures = [executor.submit(_run_chunk, symbol, chunk, initial_capital)
+                           for symbol, chunk in tasks]
+                for completed, future in enumerate(as_completed(futures), 1):
+                    collect(completed, future.result())
+
+    columns = ['symbol', *names, *get_empty_results()]
+    table = pd.DataFrame(sorted(rows_collected, key=key), columns=columns)
+    table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+    return table
@@ -0,0 +1,285 @@
+"""
+TradeMind Lite（轻量版）- 组合回测模块
+
+本模块在共同的日期索引上对多只股票同时回测，所有持仓共用一个资金池。
+价格和信号对齐为日期×股票的二维数组，每根K线对全部股票批量判断平仓和开仓条件，
+持仓数量和单只股票的仓位受限制；输出按市值计算的组合权益曲线和每只股票的收益贡献。
+开平仓规则、滑点和手续费与单只股票回测内核相同。
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trademind.backtest.engine import calculate_performance_metrics, enhance_signals, get_empty_results
+from trademind.backtest.kernel import (
+    BASE_SLIPPAGE_PCT,
+    COMMISSION_PER_SHARE,
+    MARKET_IMPACT_FACTOR,
+    MAX_COMMISSION_PCT,
+    MIN_COMMISSION
+)
+from trademind.backtest.trade_log import TRADE_FIELDS, TradeLog
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 每只股票开始交易前需要的K线数量，与run_backtest一致
+WARMUP_BARS = 50
+
+# 一天的纳秒数，用于计算持有天数
+_DAY_NS = 86_400_000_000_000
+
+
+def align_panels(datasets: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]) -> Dict:
+    """
+    把多只股票的行情和增强后的买卖信号对齐为日期×股票的二维数组
+
+    参数:
+        datasets: 股票代码到(行情数据, 交易信号)的字典
+
+    返回:
+        Dict: 股票代码symbols、共同日期索引dates，以及close/high/low/volume/avg_volume/buy/sell/tradable数组
+    """
+    symbols = list(datasets)
+    columns = {name: {} for name in ('Close', 'High', 'Low', 'Volume', 'buy', 'sell')}
+    for symbol, (data, signals) in datasets.items():
+        if not data.index.equals(signals.index):
+            signals = signals.reindex(data.index)
+        buy, sell = enhance_signals(data, signals.copy())
+        for name in ('Close', 'High', 'Low'):
+            columns[name][symbol] = data[name]
+        # 没有成交量的股票按成交量比例1/1000计算滑点，与单只股票回测一致
+        columns['Volume'][symbol] = data['Volume'] if 'Volume' in data.columns else pd.Series(np.nan, index=data.index)
+        columns['buy'][symbol] = pd.Series(buy, index=data.index)
+        columns['sell'][symbol] = pd.Series(sell, index=data.index)
+
+    frames = {name: pd.DataFrame(values, columns=symbols).sort_index() for name, values in columns.items()}
+    dates = frames['Close'].index
+    close = frames['Close'].to_numpy(dtype=float)
+    valid = ~np.isnan(close)
+    volume = frames['Volume']
+    # 前20根K线的平均成交量，忽略缺失值，与单只股票回测的计算方式相同
+    avg_volume = volume.rolling(20, min_periods=1).mean().shift(1).to_numpy(dtype=float)
+    has_volume = np.array([('Volume' in data.columns) for data, _ in datasets.values()], dtype=bool)
+
+    return {
+        'symbols': symbols,
+        'dates': dates,
+        'close': close,
+        'high': frames['High'].to_numpy(dtype=float),
+        'low': frames['Low'].to_numpy(dtype=float),
+        'volume': volume.to_numpy(dtype=float),
+        'avg_volume': avg_volume,
+        'has_volume': has_volume,
+        'buy': frames['buy'].to_numpy(dtype=bool, na_value=False) & valid,
+        'sell': frames['sell'].to_numpy(dtype=bool, na_value=False) & valid,
+        # 每只股票自己的前WARMUP_BARS根K线只用于预热
+        'tradable': valid & (np.cumsum(valid, axis=0) > WARMUP_BARS)
+    }
+
+
+def run_portfolio_backtest(datasets: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]],
+                           initial_capital: float = 100000.0,
+                           risk_per_trade_pct: float = 0.02,
+                           stop_loss_pct: float = 0.07,
+                           take_profit_pct: float = 0.15,
+                           max_hold_days: int = 20,
+                           max_positions: int = 10,
+                           max_position_pct: float = 0.10) -> Dict:
+    """
+    执行共用资金池的组合回测
+
+    每根K线先对全部持仓检查止损、止盈、最大持有天数和反向信号，再按输入顺序为有信号的空仓股票开仓。
+    单笔仓位为已实现资金乘以risk_per_trade_pct/stop_loss_pct，且不超过已实现资金的max_position_pct
+    和当前可用现金；持仓数量达到max_positions时不再开仓。
+
+    参数:
+        datasets: 股票代码到(行情数据, 交易信号)的字典，输入顺序即开仓优先级
+        initial_capital: 组合初始资金
+        risk_per_trade_pct: 每笔交易风险资金的百分比
+        stop_loss_pct: 止损百分比
+        take_profit_pct: 止盈百分比
+        max_hold_days: 最大持有天数（自然日）
+        max_positions: 同时持有的最大股票数量
+        max_position_pct: 单只股票仓位占已实现资金的最大比例
+
+    返回:
+        Dict: 包含组合权益曲线equity、全部已平仓交易trades（带股票代码的TradeLog）、
+              每只股票的贡献attribution、组合指标metrics和回测结束时的持仓open_positions
+    """
+    if max_positions <= 0:
+        raise ValueError(f"max_positions必须为正数: {max_positions}")
+
+    datasets = {symbol: pair for symbol, pair in datasets.items()
+                if pair[0] is not None and pair[1] is not None and not pair[0].empty}
+    if not datasets:
+        logger.warning("组合回测没有有效数据")
+        return {
+            'equity': pd.Series(dtype=float),
+            'trades': TradeLog(symbols=[]),
+            'attribution': _attribution([], TradeLog(symbols=[]), initial_capital),
+            'metrics': {**get_empty_results(), 'max_concurrent_positions': 0},
+            'open_positions': []
+        }
+
+    panels = align_panels(datasets)
+    symbols = panels['symbols']
+    dates = panels['dates']
+    close, high, low = panels['close'], panels['high'], panels['low']
+    buy, sell, tradable = panels['buy'], panels['sell'], panels['tradable']
+    volume, avg_volume, has_volume = panels['volume'], panels['avg_volume'], panels['has_volume']
+    # 停牌或缺失的K线按最近的收盘价计算市值
+    mark = pd.DataFrame(close).ffill().to_numpy()
+    days = dates.asi8
+    n_bars, n_symbols = close.shape
+
+    # 每只股票的持仓状态
+    position = np.zeros(n_symbols, dtype=np.int8)
+    entry_price = np.zeros(n_symbols)
+    entry_bar = np.zeros(n_symbols, dtype=np.int64)
+    shares = np.zeros(n_symbols)
+    allocated = np.zeros(n_symbols)
+    stop_level = np.zeros(n_symbols)
+    take_profit_level = np.zeros(n_symbols)
+
+    cash = initial_capital
+    equity = np.empty(n_bars)
+    # 每根K线平仓的交易按列保存，最后合并为一个TradeLog
+    exits = []
+    symbol_names = np.asarray(symbols, dtype=object)
+    max_concurrent = 0
+
+    for t in range(n_bars):
+        # 平仓：对所有当根K线有价格的持仓批量判断
+        held = np.flatnonzero((position != 0) & ~np.isnan(close[t]))
+        if len(held):
+            is_long = position[held] == 1
+            stop_hit = np.where(is_long, low[t, held] <= stop_level[held], high[t, held] >= stop_level[held])
+            take_profit_hit = np.where(is_long, high[t, held] >= take_profit_level[held],
+                                       low[t, held] <= take_profit_level[held])
+            days_held = (days[t] - days[entry_bar[held]]) // _DAY_NS
+            max_hold_hit = days_held >= max_hold_days
+            reverse = np.where(is_long, sell[t, held], buy[t, held])
+            exiting = stop_hit | take_profit_hit | max_hold_hit | reverse
+
+            if exiting.any():
+                cols = held[exiting]
+                is_long = is_long[exiting]
+                stop_hit, take_profit_hit = stop_hit[exiting], take_profit_hit[exiting]
+                max_hold_hit, days_held = max_hold_hit[exiting], days_held[exiting]
+
+                exit_price = np.where(stop_hit, stop_level[cols],
+                                      np.where(take_profit_hit, take_profit_level[cols], close[t, cols]))
+                current_avg = avg_volume[t, cols]
+                volume_ratio = np.where(has_volume[cols],
+                                        np.divide(volume[t, cols], current_avg,
+                                                  out=np.ones(len(cols)), where=current_avg > 0),
+                                        1.0 / 1000)
+                slippage_pct = BASE_SLIPPAGE_PCT + (MARKET_IMPACT_FACTOR * volume_ratio / 100)
+                exit_price = exit_price * np.where(is_long, 1 - slippage_pct, 1 + slippage_pct)
+
+                commission = np.maximum(MIN_COMMISSION, np.minimum(shares[cols] * COMMISSION_PER_SHARE,
+                                                                   allocated[cols] * MAX_COMMISSION_PCT))
+                direction = np.where(is_long, 1.0, -1.0)
+                profit = shares[cols] * (exit_price - entry_price[cols]) * direction - commission
+                cash += float((allocated[cols] + profit).sum())
+
+                # 平仓原因的编号与EXIT_REASONS的顺序一致
+                exits.append({
+                    'symbol': symbol_names[cols],
+                    'entry_date': days[entry_bar[cols]],
+                    'entry_price': entry_price[cols],
+                    'exit_date': np.full(len(cols), days[t]),
+                    'exit_price': exit_price,
+                    'position': np.where(is_long, 1, -1),
+                    'shares': shares[cols],
+                    'profit': profit,
+                    'profit_pct': profit / allocated[cols] * 100,
+                    'exit_reason': np.select([stop_hit, take_profit_hit, max_hold_hit], [0, 1, 2], 3),
+                    'hold_days': days_held
+                })
+                position[cols] = 0
+                allocated[cols] = 0.0
+                shares[cols] = 0.0
+
+        # 开仓：有信号的空仓股票按输入顺序占用剩余的持仓名额和现金
+        slots = max_positions - int(np.count_nonzero(position))
+        if slots > 0:
+            candidates = np.flatnonzero((position == 0) & tradable[t] & (buy[t] | sell[t]))[:slots]
+            if len(candidates):
+                book = cash + allocated.sum()
+                size = min(book * risk_per_trade_pct / stop_loss_pct, book * max_position_pct)
+                affordable = int(cash // size) if size > 0 else 0
+                cols = candidates[:affordable]
+                if len(cols):
+                    is_long = buy[t, cols]
+                    price = np.where(is_long, close[t, cols] * (1 + BASE_SLIPPAGE_PCT),
+                                     close[t, cols] * (1 - BASE_SLIPPAGE_PCT))
+                    position[cols] = np.where(is_long, 1, -1)
+                    entry_price[cols] = price
+                    entry_bar[cols] = t
+                    allocated[cols] = size
+                    shares[cols] = size / price
+                    stop_level[cols] = np.where(is_long, price * (1 - stop_loss_pct), price * (1 + stop_loss_pct))
+                    take_profit_level[cols] = np.where(is_long, price * (1 + take_profit_pct),
+                                                       price * (1 - take_profit_pct))
+                    cash -= size * len(cols)
+
+        # 按收盘价计算组合市值
+        open_cols = np.flatnonzero(position)
+        max_concurrent = max(max_concurrent, len(open_cols))
+        unrealized = (shares[open_cols] * (mark[t, open_cols] - entry_price[open_cols]) * position[open_cols]).sum()
+        equity[t] = cash + allocated.sum() + unrealized
+
+    equity_curve = pd.Series(equity, index=dates, name='equity')
+    # 日期已排序，按K线顺序记录的交易即按平仓日期排列
+    closed = _trade_log(exits, str(dates.tz) if dates.tz is not None else None)
+    metrics = calculate_performance_metrics(closed, [initial_capital] + equity.tolist(), initial_capital, dates)
+    metrics['max_concurrent_positions'] = max_concurrent
+
+    open_positions = [{
+        'symbol': symbols[col],
+        'entry_date': dates[entry_bar[col]],
+        'entry_price': entry_price[col],
+        'position': 'long' if position[col] == 1 else 'short',
+        'shares': shares[col]
+    } for col in np.flatnonzero(position)]
+
+    return {
+        'equity': equity_curve,
+        'trades': closed,
+        'attribution': _attribution(symbols, closed, initial_capital),
+        'metrics': metrics,
+        'open_positions': open_positions
+    }
+
+
+def _trade_log(exits: List[Dict[str, np.ndarray]], tz) -> TradeLog:
+    """把每根K线平仓的交易列合并为带股票代码的TradeLog"""
+    if not exits:
+        return TradeLog(tz=tz, symbols=[])
+    columns = {name: np.concatenate([chunk[name] for chunk in exits]) for name in ('symbol', *TRADE_FIELDS)}
+    return TradeLog.from_columns(tz=tz, symbols=columns.pop('symbol'), **columns)
+
+
+def _attribution(symbols: List[str], trades: TradeLog, initial_capital: float) -> pd.DataFrame:
+    """按股票汇总已平仓交易的收益贡献"""
+    columns = ['total_trades', 'win_rate', 'net_profit', 'contribution_pct', 'avg_hold_days']
+    if not len(trades):
+        return pd.DataFrame(0.0, index=pd.Index(symbols, name='symbol'), columns=columns)
+
+    frame = trades.to_frame()
+    grouped = frame.groupby('symbol')
+    summary = pd.DataFrame({
+        'total_trades': grouped.size(),
+        'win_rate': grouped['profit'].apply(lambda p: (p > 0).mean() * 100).round(1),
+        'net_profit': grouped['profit'].sum().round(2),
+        'contribution_pct': (grouped['profit'].sum() / initial_capital * 100).round(2),
+        'avg_hold_days': grouped['hold_days'].mean().round(1)
+    })
+    summary = summary.reindex(symbols, fill_value=0)
+    summary.index.name = 'symbol'
+    return summary.sort_values('net_profit', ascending=False)
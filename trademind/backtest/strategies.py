@@ -0,0 +1,147 @@
+"""
+TradeMind Lite（轻量版）- 策略插件模块
+
+本模块定义交易策略的插件接口。策略是把OHLCV数据转换为买入和卖出信号数组的函数，
+通过register_strategy按名称注册，所有策略都由同一个回测内核执行，结果可以直接比较。
+多个策略共用同一个IndicatorFrame，指标只计算一次；价格和日期数组也只准备一次。
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trademind.backtest.engine import calculate_performance_metrics, enhance_signals, get_empty_results, run_backtest
+from trademind.backtest.kernel import signal_mask
+from trademind.backtest.optimizer import market_inputs, simulate_window
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.indicators import calculate_indicator_series
+from trademind.core.signals import generate_signals
+from trademind.core.dynamic_rsi_strategy import dynamic_atr_rsi, generate_signals as generate_dynamic_rsi_signals
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 策略函数签名为func(data, frame)，返回与data对齐的(买入信号, 卖出信号)布尔数组
+StrategyFunc = Callable[[pd.DataFrame, IndicatorFrame], Tuple[np.ndarray, np.ndarray]]
+
+# 策略名称到策略函数的映射
+_STRATEGIES: Dict[str, StrategyFunc] = {}
+
+# 回测需要的最少K线数量，与run_backtest一致
+MIN_BARS = 50
+
+
+def register_strategy(name: str):
+    """
+    注册交易策略的装饰器
+
+    参数:
+        name: 策略名称
+
+    返回:
+        装饰器
+    """
+    def decorator(func):
+        _STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def available_strategies() -> List[str]:
+    """
+    获取已注册的策略名称
+
+    返回:
+        List[str]: 按注册顺序排列的策略名称
+    """
+    return list(_STRATEGIES)
+
+
+def strategy_signals(strategy: str, data: pd.DataFrame,
+                     frame: Optional[IndicatorFrame] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    用指定策略生成买卖信号
+
+    参数:
+        strategy: 策略名称
+        data: 包含OHLCV数据的DataFrame
+        frame: 指标计算引擎，为None时新建
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 买入和卖出信号布尔数组
+    """
+    if strategy not in _STRATEGIES:
+        raise KeyError(f"未知策略: {strategy}")
+    frame = frame if frame is not None else IndicatorFrame(data)
+    return _STRATEGIES[strategy](data, frame)
+
+
+def run_strategy_backtest(data: pd.DataFrame, strategy: str = 'default',
+                          frame: Optional[IndicatorFrame] = None, **params) -> Dict:
+    """
+    用指定策略的信号执行run_backtest
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        strategy: 策略名称
+        frame: 指标计算引擎，为None时新建
+        **params: 传给run_backtest的参数
+
+    返回:
+        Dict: 回测结果统计
+    """
+    if data is None or len(data) < MIN_BARS:
+        logger.warning("回测数据不足或无效")
+        return get_empty_results()
+    buy, sell = strategy_signals(strategy, data, frame)
+    signals = pd.DataFrame({'buy_signal': buy, 'sell_signal': sell}, index=data.index)
+    return run_backtest(data, signals, **params)
+
+
+def compare_strategies(data: pd.DataFrame, strategies: Optional[Sequence[str]] = None,
+                       frame: Optional[IndicatorFrame] = None,
+                       initial_capital: float = 10000.0, **params) -> Dict[str, Dict]:
+    """
+    在同一份数据上回测多个策略
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        strategies: 策略名称列表，为None时使用全部已注册的策略
+        frame: 指标计算引擎，为None时新建，所有策略共用
+        initial_capital: 初始资金
+        **params: 回测内核参数，如stop_loss_pct、max_hold_days
+
+    返回:
+        Dict[str, Dict]: 策略名称到calculate_performance_metrics指标的字典，数据不足时为空字典
+    """
+    if data is None or len(data) < MIN_BARS:
+        logger.warning("回测数据不足或无效")
+        return {}
+
+    frame = frame if frame is not None else IndicatorFrame(data)
+    base = market_inputs(data)
+    results = {}
+    for name in (strategies if strategies is not None else available_strategies()):
+        buy, sell = strategy_signals(name, data, frame)
+        inputs = {**base, 'buy': buy, 'sell': sell}
+        trades, equity, period = simulate_window(inputs, params, initial_capital)
+        results[name] = calculate_performance_metrics(trades, equity, initial_capital, period)
+    return results
+
+
+@register_strategy('default')
+def _default_strategy(data: pd.DataFrame, frame: IndicatorFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """默认策略：技术指标综合信号，叠加RSI、MACD和布林带增强信号"""
+    indicators = calculate_indicator_series(data, frame=frame)
+    for window in (5, 10, 20, 50, 200):
+        indicators[f'sma{window}'] = frame.sma(window)
+    return enhance_signals(data, generate_signals(data, indicators))
+
+
+@register_strategy('dynamic_rsi')
+def _dynamic_rsi_strategy(data: pd.DataFrame, frame: IndicatorFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """基于ATR的动态RSI策略：RSI低于动态超卖阈值买入，高于动态超买阈值卖出"""
+    signal = generate_dynamic_rsi_signals(dynamic_atr_rsi(data, frame=frame))['signal']
+    return signal_mask(signal == 1), signal_mask(signal == -1)
@@ -0,0 +1,222 @@
+"""
+TradeMind Lite（轻量版）- 交易记录模块
+
+本模块用NumPy结构化数组按列保存交易记录。回测内核直接生成列数组，
+性能指标和交易摘要对整列做数组运算，只在输出报告时才转换为逐笔交易的字典。
+组合回测的交易记录另外保存每笔交易的股票代码。
+"""
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 平仓原因，交易记录中保存其在元组中的位置
+EXIT_REASONS = ("止损", "止盈", "最大持有期限", "反向信号")
+
+# 交易记录的字段，日期保存为UTC纳秒时间戳，持仓方向1为多头、-1为空头
+TRADE_DTYPE = np.dtype([
+    ('entry_date', np.int64),
+    ('entry_price', np.float64),
+    ('exit_date', np.int64),
+    ('exit_price', np.float64),
+    ('position', np.int8),
+    ('shares', np.float64),
+    ('profit', np.float64),
+    ('profit_pct', np.float64),
+    ('exit_reason', np.int8),
+    ('hold_days', np.int64)
+])
+
+# 转换为字典时的字段顺序，与原交易记录一致
+TRADE_FIELDS = TRADE_DTYPE.names
+
+
+class TradeLog:
+    """按列保存的交易记录，可以像交易字典列表一样遍历和按位置取值"""
+
+    def __init__(self, records: Optional[np.ndarray] = None, tz: Optional[str] = None,
+                 symbols: Optional[np.ndarray] = None):
+        """
+        初始化交易记录
+
+        参数:
+            records: TRADE_DTYPE结构化数组，为None时为空记录
+            tz: 日期的时区，为None时日期不带时区
+            symbols: 每笔交易的股票代码，为None时交易记录不含股票代码
+        """
+        self.records = np.zeros(0, dtype=TRADE_DTYPE) if records is None else records
+        self.tz = tz
+        self.symbols = None if symbols is None else np.asarray(symbols, dtype=object)
+
+    @classmethod
+    def from_columns(cls, tz: Optional[str] = None, symbols: Optional[Sequence[str]] = None,
+                     **columns) -> 'TradeLog':
+        """
+        由每个字段的数组创建交易记录
+
+        参数:
+            tz: 日期的时区
+            symbols: 每笔交易的股票代码
+            **columns: TRADE_FIELDS中每个字段的数组
+
+        返回:
+            TradeLog: 交易记录
+        """
+        length = len(columns['profit'])
+        records = np.empty(length, dtype=TRADE_DTYPE)
+        for name in TRADE_FIELDS:
+            records[name] = columns[name]
+        return cls(records, tz, symbols)
+
+    @classmethod
+    def from_records(cls, trades: Sequence[Dict]) -> 'TradeLog':
+        """
+        由交易字典列表创建交易记录
+
+        参数:
+            trades: 交易字典列表，日期可以为datetime或pd.Timestamp
+
+        返回:
+            TradeLog: 交易记录
+        """
+        if isinstance(trades, TradeLog):
+            return trades
+        if not trades:
+            return cls()
+
+        entry_dates = pd.DatetimeIndex([trade['entry_date'] for trade in trades])
+        exit_dates = pd.DatetimeIndex([trade['exit_date'] for trade in trades])
+        tz = str(exit_dates.tz) if exit_dates.tz is not None else None
+        symbols = [trade['symbol'] for trade in trades] if all('symbol' in trade for trade in trades) else None
+        return cls.from_columns(
+            tz=tz,
+            symbols=symbols,
+            entry_date=entry_dates.asi8,
+            entry_price=[trade['entry_price'] for trade in trades],
+            exit_date=exit_dates.asi8,
+            exit_price=[trade['exit_price'] for trade in trades],
+            position=[1 if trade['position'] == 'long' else -1 for trade in trades],
+            shares=[trade['shares'] for trade in trades],
+            profit=[trade['profit'] for trade in trades],
+            profit_pct=[trade['profit_pct'] for trade in trades],
+            exit_reason=[EXIT_REASONS.index(trade['exit_reason']) for trade in trades],
+            hold_days=[trade['hold_days'] for trade in trades]
+        )
+
+    @classmethod
+    def concat(cls, logs: Iterable['TradeLog']) -> 'TradeLog':
+        """
+        按顺序合并多段交易记录
+
+        参数:
+            logs: 交易记录列表，时区应相同
+
+        返回:
+            TradeLog: 合并后的交易记录
+        """
+        logs = list(logs)
+        if not logs:
+            return cls()
+        symbols = None
+        if all(log.symbols is not None for log in logs):
+            symbols = np.concatenate([log.symbols for log in logs])
+        return cls(np.concatenate([log.records for log in logs]), logs[0].tz, symbols)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, key: Union[int, str]):
+        """按字段名返回整列数组，按位置返回单笔交易的字典"""
+        if key == 'symbol' and self.symbols is not None:
+            return self.symbols
+        if isinstance(key, str):
+            return self.records[key]
+        return self._to_dict(key)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_dicts())
+
+    def __repr__(self) -> str:
+        return f"TradeLog({len(self)} trades)"
+
+    def dates(self, field: str) -> pd.DatetimeIndex:
+        """
+        获取日期列
+
+        参数:
+            field: 'entry_date'或'exit_date'
+
+        返回:
+            pd.DatetimeIndex: 日期索引
+        """
+        dates = pd.DatetimeIndex(self.records[field])
+        if self.tz is not None:
+            dates = dates.tz_localize('UTC').tz_convert(self.tz)
+        return dates
+
+    def positions(self) -> np.ndarray:
+        """持仓方向名称数组"""
+        return np.where(self.records['position'] == 1, 'long', 'short')
+
+    def exit_reasons(self) -> np.ndarray:
+        """平仓原因名称数组"""
+        return np.asarray(EXIT_REASONS, dtype=object)[self.records['exit_reason']]
+
+    def _to_dict(self, position: int) -> Dict:
+        """把单条记录转换为交易字典"""
+        def timestamp(value):
+            stamp = pd.Timestamp(int(value))
+            return stamp.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else stamp
+
+        record = self.records[position]
+        trade = {} if self.symbols is None else {'symbol': self.symbols[position]}
+        trade.update({
+            'entry_date': timestamp(record['entry_date']),
+            'entry_price': float(record['entry_price']),
+            'exit_date': timestamp(record['exit_date']),
+            'exit_price': float(record['exit_price']),
+            'position': 'long' if record['position'] == 1 else 'short',
+            'shares': float(record['shares']),
+            'profit': float(record['profit']),
+            'profit_pct': float(record['profit_pct']),
+            'exit_reason': EXIT_REASONS[record['exit_reason']],
+            'hold_days': int(record['hold_days'])
+        })
+        return trade
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        转换为DataFrame，列与交易字典的键相同
+
+        返回:
+            pd.DataFrame: 交易记录表，有股票代码时第一列为symbol
+        """
+        frame = pd.DataFrame({
+            'entry_date': self.dates('entry_date'),
+            'entry_price': self.records['entry_price'],
+            'exit_date': self.dates('exit_date'),
+            'exit_price': self.records['exit_price'],
+            'position': self.positions(),
+            'shares': self.records['shares'],
+            'profit': self.records['profit'],
+            'profit_pct': self.records['profit_pct'],
+            'exit_reason': self.exit_reasons(),
+            'hold_days': self.records['hold_days']
+        }, columns=list(TRADE_FIELDS))
+        if self.symbols is not None:
+            frame.insert(0, 'symbol', self.symbols)
+        return frame
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        转换为交易字典列表，只在输出报告时使用
+
+        返回:
+            List[Dict]: 交易字典列表
+        """
+        return [self._to_dict(position) for position in range(len(self.records))]
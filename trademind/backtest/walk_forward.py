@@ -0,0 +1,192 @@
+"""
+TradeMind Lite（轻量版）- 滚动前进回测模块
+
+本模块把历史数据切分为连续的训练区间和测试区间：在每个训练区间上搜索回测参数，
+用最优参数回测紧随其后的测试区间，再把各测试区间的样本外交易和权益曲线按资金连续拼接。
+信号和指标数组对整段历史只计算一次，各训练区间的参数搜索相互独立，可以并行执行。
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from trademind.backtest.engine import calculate_performance_metrics, get_empty_results
+from trademind.backtest.optimizer import (
+    SharedInputs,
+    _init_worker,
+    check_metric,
+    evaluate_parameters,
+    get_worker_inputs,
+    parameter_grid,
+    prepare_inputs,
+    sample_parameters,
+    simulate_window
+)
+from trademind.backtest.trade_log import TradeLog
+from trademind.core.parallel import resolve_workers
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 回测开始前用于指标预热的K线数量，与run_backtest一致
+WARMUP_BARS = 50
+
+# 共享内存中回测数组使用的键
+_INPUT_KEY = 'walk_forward'
+
+
+def walk_forward_windows(length: int, train_size: int = 252, test_size: int = 63,
+                         anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    切分训练区间和测试区间
+
+    测试区间首尾相连覆盖训练期之后的全部K线，最后一个测试区间可以不足test_size。
+
+    参数:
+        length: K线数量
+        train_size: 训练区间的K线数量
+        test_size: 测试区间的K线数量
+        anchored: 为True时训练区间始终从预热期之后开始并逐步扩大，否则按固定长度向前滚动
+
+    返回:
+        List[Tuple[int, int, int, int]]: 每个区间的(训练开始, 训练结束, 测试开始, 测试结束)位置，结束位置不包含
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError(f"训练和测试区间长度必须为正数: {train_size}, {test_size}")
+
+    windows = []
+    test_start = WARMUP_BARS + train_size
+    while test_start < length:
+        train_start = WARMUP_BARS if anchored else test_start - train_size
+        test_end = min(test_start + test_size, length)
+        windows.append((train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def _select_best(rows: List[Dict], metric: str, ascending: bool = False) -> Dict:
+    """选出指标最好的结果，NaN视为最差，相同时取靠前的参数组合"""
+    def key(row):
+        value = row[metric]
+        if value != value:
+            return 1, 0.0
+        return 0, value if ascending else -value
+
+    return min(rows, key=key)
+
+
+def _optimize_window(symbol: str, window: Tuple[int, int], combinations: List[Dict],
+                     metric: str, ascending: bool, initial_capital: float) -> Dict:
+    """在工作进程中搜索一个训练区间的最优参数"""
+    rows = evaluate_parameters(symbol, get_worker_inputs(symbol), combinations, initial_capital, window)
+    return _select_best(rows, metric, ascending)
+
+
+def run_walk_forward(data: pd.DataFrame, signals: pd.DataFrame,
+                     space: Optional[Dict[str, Sequence]] = None,
+                     n_samples: Optional[int] = None,
+                     seed: Optional[int] = None,
+                     train_size: int = 252,
+                     test_size: int = 63,
+                     anchored: bool = False,
+                     metric: str = 'sharpe_ratio',
+                     workers: int = 1,
+                     initial_capital: float = 10000.0,
+                     ascending: Optional[bool] = None) -> Dict:
+    """
+    执行滚动前进回测
+
+    参数:
+        data: 包含OHLCV数据的DataFrame
+        signals: 包含买入和卖出信号的DataFrame，按整段历史计算
+        space: 参数名到候选值列表的字典，为None时使用默认参数空间
+        n_samples: 每个训练区间随机抽样的参数组合数量，为None时搜索整个网格
+        seed: 随机抽样的种子
+        train_size: 训练区间的K线数量
+        test_size: 测试区间的K线数量
+        anchored: 训练区间是否固定起点逐步扩大
+        metric: 选择参数使用的calculate_performance_metrics指标
+        workers: 工作进程数量，1为在当前进程串行执行，小于等于0时使用CPU核心数
+        initial_capital: 初始资金
+        ascending: 指标是否越小越好，为None时与optimize_parameters的默认方向相同
+
+    返回:
+        Dict: 包含各区间结果windows、拼接后的样本外交易trades、权益曲线equity和样本外指标metrics
+    """
+    ascending = check_metric(metric, ascending)
+
+    empty = {'windows': [], 'trades': TradeLog(), 'equity': pd.Series(dtype=float), 'metrics': get_empty_results()}
+    if data is None or signals is None:
+        logger.warning("滚动前进回测数据无效")
+        return empty
+
+    windows = walk_forward_windows(len(data), train_size, test_size, anchored)
+    if not windows:
+        logger.warning(f"数据不足以切分训练区间和测试区间: {len(data)} 根K线")
+        return empty
+
+    if n_samples is None:
+        combinations = parameter_grid(space)
+    else:
+        combinations = sample_parameters(space, n_samples, seed)
+
+    # 信号和数组对整段历史只准备一次，各区间只切片
+    inputs = prepare_inputs(data, signals)
+    train_windows = [(train_start, train_end) for train_start, train_end, _, _ in windows]
+
+    workers = resolve_workers(workers)
+    if workers <= 1 or len(windows) <= 1:
+        best = [
+            _select_best(evaluate_parameters(_INPUT_KEY, inputs, combinations, initial_capital, window),
+                         metric, ascending)
+            for window in train_windows
+        ]
+    else:
+        with SharedInputs({_INPUT_KEY: inputs}) as shared:
+            with ProcessPoolExecutor(max_workers=min(workers, len(windows)), initializer=_init_worker,
+                                     initargs=(shared.layouts,)) as executor:
+                futures = [
+                    executor.submit(_optimize_window, _INPUT_KEY, window, combinations, metric, ascending,
+                                    initial_capital)
+                    for window in train_windows
+                ]
+                best = [future.result() for future in futures]
+
+    # 样本外回测依赖上一区间的期末资金，按时间顺序执行
+    dates = inputs['dates']
+    parameter_names = list(combinations[0])
+    capital = initial_capital
+    trade_logs, equity_values, results = [], [], []
+    for (train_start, train_end, test_start, test_end), in_sample in zip(windows, best):
+        params = {name: in_sample[name] for name in parameter_names}
+        trades, equity, period = simulate_window(inputs, params, capital, (test_start, test_end))
+        out_of_sample = calculate_performance_metrics(trades, equity, capital, period)
+
+        results.append({
+            'train_start': dates[train_start],
+            'train_end': dates[train_end - 1],
+            'test_start': dates[test_start],
+            'test_end': dates[test_end - 1],
+            'params': params,
+            'in_sample': {key: in_sample[key] for key in get_empty_results()},
+            'out_of_sample': out_of_sample
+        })
+        trade_logs.append(trades)
+        # 每个区间的权益曲线第一项为期初资金，即上一区间的期末资金
+        equity_values.extend(equity[1:])
+        capital = equity[-1]
+
+    all_trades = TradeLog.concat(trade_logs)
+    oos_dates = dates[windows[0][2]:windows[-1][3]]
+    equity_curve = pd.Series(equity_values, index=oos_dates, dtype=float)
+    metrics = calculate_performance_metrics(all_trades, [initial_capital] + equity_values,
+                                            initial_capital, oos_dates)
+
+    return {
+        'windows': results,
+        'trades': all_trades,
+        'equity': equity_curve,
+        'metrics': metrics
+    }
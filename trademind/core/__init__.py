@@ -16,9 +16,17 @@ from trademind.core.indicators import (
     calculate_rsi,
     calculate_kdj,
     calculate_bollinger_bands,
-    calculate_dynamic_rsi_thresholds
+    calculate_dynamic_rsi_thresholds,
+    calculate_macd_series,
+    calculate_rsi_series,
+    calculate_kdj_series,
+    calculate_bollinger_bands_series,
+    calculate_dynamic_rsi_thresholds_series,
+    calculate_indicator_series
 )
 
+from trademind.core.indicator_frame import IndicatorFrame
+
 from trademind.core.dynamic_rsi_strategy import (
     dynamic_atr_rsi,
     generate_signals,
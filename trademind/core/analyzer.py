@@ -4,7 +4,6 @@ TradeMind Lite（轻量版）- 分析器模块
 本模块包含主要的股票分析协调器，负责调用各个功能模块完成分析工作。
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -16,20 +15,30 @@ import json
 import warnings
 import os
 import sys
-import time
 
 from trademind.core.indicators import (
     calculate_rsi, 
     calculate_macd, 
     calculate_kdj, 
     calculate_bollinger_bands,
-    calculate_dynamic_rsi_thresholds
+    calculate_dynamic_rsi_thresholds,
+    calculate_indicator_series
 )
+from trademind.core.indicator_frame import IndicatorFrame
 from trademind.core.patterns import identify_candlestick_patterns
+from trademind.core.pattern_stats import PatternStatsCache, measured_confidence, pool_pattern_stats
 from trademind.core.signals import generate_trading_advice, generate_signals
 from trademind.core.pressure_points import PressurePointAnalyzer
 from trademind.core.trend_analysis import TrendAnalyzer
-from trademind.backtest import run_backtest
+from trademind.core.timeframes import DEFAULT_TIMEFRAMES, MIN_TIMEFRAME_BARS, resample_timeframes
+from trademind.core.parallel import ProgressCallback, resolve_workers, run_symbol_pipeline
+from trademind.backtest import run_backtest, run_walk_forward
+from trademind.backtest.cache import BacktestCache
+from trademind.backtest.strategies import strategy_signals
+from trademind.data.batch import BatchFetcher
+from trademind.data.cache import OHLCVCache
+from trademind.data.context import MarketDataContext
+from trademind.data.providers import DataProvider, get_default_provider
 from trademind.reports.generator import generate_html_report, generate_performance_charts
 
 # 忽略警告
@@ -49,11 +58,19 @@ class StockAnalyzer:
     - 报告生成
     """
     
-    def __init__(self):
-        """初始化股票分析器"""
+    def __init__(self, provider: Optional[DataProvider] = None):
+        """
+        初始化股票分析器
+        
+        参数:
+            provider: 行情数据源，默认使用get_default_provider()
+        """
         self.setup_logging()
         self.setup_paths()
         self.setup_colors()
+        self.setup_cache()
+        self.provider = provider or get_default_provider()
+        self.batch_fetcher = BatchFetcher(self.provider)
     
     def setup_logging(self):
         """设置日志记录"""
@@ -74,6 +91,12 @@ class StockAnalyzer:
         self.results_path = Path("reports/stocks")
         self.results_path.mkdir(parents=True, exist_ok=True)
     
+    def setup_cache(self):
+        """设置本地行情缓存、回测结果缓存和形态统计缓存"""
+        self.data_cache = OHLCVCache(Path("cache/ohlcv"))
+        self.backtest_cache = BacktestCache(Path("cache/backtest"))
+        self.pattern_stats_cache = PatternStatsCache(Path("cache/pattern_stats"))
+    
     def setup_colors(self):
         """设置颜色方案"""
         self.colors = {
@@ -96,152 +119,253 @@ class StockAnalyzer:
             "neutral": "#FFA000"
         }
     
-    def analyze_stocks(self, symbols: List[str], names: Dict[str, str] = None) -> List[Dict]:
+    def analyze_stocks(self, symbols: List[str], names: Dict[str, str] = None,
+                       context: Optional[MarketDataContext] = None, workers: Optional[int] = 1,
+                       progress_callback: Optional[ProgressCallback] = None) -> List[Dict]:
         """
         分析多只股票
         
         参数:
             symbols: 股票代码列表
             names: 股票名称字典，格式为 {代码: 名称}
+            context: 行情数据上下文，为None时创建新的上下文，每个股票只下载一次
+            workers: 分析使用的工作进程数量，1为串行，None或0为CPU核心数
+            progress_callback: 进度回调，签名为callback(index, total, symbol, result)，按输入顺序调用
             
         返回:
-            List[Dict]: 分析结果列表
+            List[Dict]: 分析结果列表，顺序与symbols一致，失败的股票不包含在内
         """
         if names is None:
             names = {}
-            
-        results = []
-        total = len(symbols)
+        if context is None:
+            context = MarketDataContext(self.get_stock_data)
+        
+        # 批量下载所有股票的数据，避免逐个请求
+        self.prefetch_stock_data(symbols, context)
+        
         print("\n开始技术分析...")
         
-        for index, symbol in enumerate(symbols, 1):
-            try:
-                print(f"\n[{index}/{total} - {index/total*100:.1f}%] 分析: {names.get(symbol, symbol)} ({symbol})")
-                
-                # 获取股票数据
-                hist = self.get_stock_data(symbol)
-                
-                if hist.empty:
-                    print(f"⚠️ 无法获取 {symbol} 的数据，跳过")
-                    continue
-                
-                # 确保有足够的数据计算价格变化
-                if len(hist) >= 2:
-                    current_price = hist['Close'].iloc[-1]
-                    prev_price = hist['Close'].iloc[-2]
-                    price_change = current_price - prev_price
-                    # 确保除数不为零
-                    if prev_price > 0:
-                        price_change_pct = (price_change / prev_price) * 100
-                        # 打印调试信息
-                        print(f"计算涨跌幅 - 当前价格: {current_price:.2f}, 前一收盘价: {prev_price:.2f}")
-                        print(f"计算涨跌幅 - 价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
-                    else:
-                        price_change_pct = 0.0
-                        print(f"计算涨跌幅 - 前一收盘价为零或负值: {prev_price:.2f}, 使用默认值0.0%")
+        # 先在主进程中取得所有数据，之后的分析只做计算
+        items = []
+        for symbol in symbols:
+            hist = context.get(symbol)
+            if hist.empty:
+                print(f"⚠️ 无法获取 {symbol} 的数据，跳过")
+                continue
+            items.append((symbol, names.get(symbol, symbol), hist))
+        
+        # 合并整个观察列表的形态前瞻收益统计，各股票的形态置信度使用实测值
+        pattern_confidence = self.measure_pattern_confidence(items)
+        items = [(symbol, name, hist, pattern_confidence) for symbol, name, hist in items]
+        
+        workers = resolve_workers(workers)
+        analyzed = len(items)
+        
+        def report_progress(index, count, symbol, result):
+            status = "✅ 分析完成" if result is not None else "❌ 分析失败"
+            print(f"[{index}/{count} - {index/count*100:.1f}%] {names.get(symbol, symbol)} ({symbol}) {status}")
+            if progress_callback is not None:
+                progress_callback(index, count, symbol, result)
+        
+        if workers > 1:
+            print(f"使用 {min(workers, analyzed)} 个工作进程并行分析 {analyzed} 只股票")
+        
+        outputs = run_symbol_pipeline(self, _analyze_symbol_task, items, workers=workers,
+                                      progress_callback=report_progress)
+        results = [result for result in outputs if result is not None]
+        
+        cache_stats = self.data_cache.stats()
+        self.logger.info(f"行情缓存统计: {cache_stats}")
+        print(f"\n行情缓存: 命中 {cache_stats['hits']}, 未命中 {cache_stats['misses']}, "
+              f"增量追加 {cache_stats['appends']} (新增 {cache_stats['appended_bars']} 根K线)")
+        
+        return results
+    
+    def measure_pattern_confidence(self, items: List[Tuple]) -> Dict[str, float]:
+        """
+        统计多只股票合并后的形态实测置信度
+        
+        参数:
+            items: (股票代码, 股票名称, 历史数据)元组列表
+            
+        返回:
+            Dict[str, float]: 形态名称到实测置信度的字典，样本不足的形态不包含在内
+        """
+        try:
+            tables = [self.pattern_stats_cache.get(symbol, hist) for symbol, _, hist in items]
+            return measured_confidence(pool_pattern_stats(tables))
+        except Exception as e:
+            self.logger.error(f"统计形态前瞻收益率出错: {str(e)}")
+            return {}
+    
+    def analyze_symbol_data(self, symbol: str, name: str, hist: pd.DataFrame,
+                            pattern_confidence: Optional[Dict[str, float]] = None,
+                            timeframes: Tuple[str, ...] = DEFAULT_TIMEFRAMES) -> Dict:
+        """
+        对已下载的单只股票数据执行完整分析
+        
+        依次计算技术指标、识别K线形态、生成交易建议、回测策略以及分析压力位和趋势，
+        再由日线合成周线、月线做同样的指标和压力位趋势分析，
+        只做计算不访问网络，可以在工作进程中执行。
+        
+        参数:
+            symbol: 股票代码
+            name: 股票名称
+            hist: 股票历史数据
+            pattern_confidence: 形态实测置信度，为None时只使用该股票自己的统计
+            timeframes: 附加分析的周期，见trademind.core.timeframes.TIMEFRAMES
+            
+        返回:
+            Dict: 分析结果
+        """
+        print(f"\n分析: {name} ({symbol})")
+        
+        # 确保有足够的数据计算价格变化
+        if len(hist) >= 2:
+            current_price = hist['Close'].iloc[-1]
+            prev_price = hist['Close'].iloc[-2]
+            price_change = current_price - prev_price
+            # 确保除数不为零
+            if prev_price > 0:
+                price_change_pct = (price_change / prev_price) * 100
+                # 打印调试信息
+                print(f"计算涨跌幅 - 当前价格: {current_price:.2f}, 前一收盘价: {prev_price:.2f}")
+                print(f"计算涨跌幅 - 价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
+            else:
+                price_change_pct = 0.0
+                print(f"计算涨跌幅 - 前一收盘价为零或负值: {prev_price:.2f}, 使用默认值0.0%")
+        else:
+            # 如果只有一天数据，尝试使用当天的开盘价和收盘价
+            if not hist.empty:
+                current_price = hist['Close'].iloc[-1]
+                prev_price = hist['Open'].iloc[-1]
+                price_change = current_price - prev_price
+                # 确保除数不为零
+                if prev_price > 0:
+                    price_change_pct = (price_change / prev_price) * 100
+                    print(f"计算涨跌幅(单日) - 收盘价: {current_price:.2f}, 开盘价: {prev_price:.2f}")
+                    print(f"计算涨跌幅(单日) - 价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
                 else:
-                    # 如果只有一天数据，尝试使用当天的开盘价和收盘价
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_price = hist['Open'].iloc[-1]
-                        price_change = current_price - prev_price
-                        # 确保除数不为零
-                        if prev_price > 0:
-                            price_change_pct = (price_change / prev_price) * 100
-                            print(f"计算涨跌幅(单日) - 收盘价: {current_price:.2f}, 开盘价: {prev_price:.2f}")
-                            print(f"计算涨跌幅(单日) - 价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
-                        else:
-                            price_change_pct = 0.0
-                            print(f"计算涨跌幅(单日) - 开盘价为零或负值: {prev_price:.2f}, 使用默认值0.0%")
-                    else:
-                        current_price = 0.0
-                        prev_price = 0.0
-                        price_change = 0.0
-                        price_change_pct = 0.0
-                        print("计算涨跌幅 - 无历史数据，使用默认值0.0%")
-                
-                # 确保价格变化百分比不是NaN或无穷大
-                if pd.isna(price_change_pct) or np.isinf(price_change_pct):
                     price_change_pct = 0.0
-                    print(f"计算涨跌幅 - 结果为NaN或无穷大，使用默认值0.0%")
-                
-                # 打印最终使用的涨跌幅
-                print(f"最终涨跌幅: {price_change_pct:.2f}%")
-                
-                print("计算技术指标...")
-                # 计算技术指标
-                indicators = self.calculate_indicators(hist)
-                
-                print("分析K线形态...")
-                # 调用形态识别模块
-                patterns = self.identify_patterns(hist.tail(5))
-                
-                print("生成交易建议...")
-                # 调用信号生成模块
-                advice = generate_trading_advice(indicators, current_price, patterns)
-                
-                print("执行策略回测...")
-                # 生成交易信号
-                signals = generate_signals(hist, indicators)
-                
-                # 调用回测模块
-                backtest_results = run_backtest(hist, signals)
-                
-                # 确保回测结果包含所有必要的字段
-                if 'total_trades' not in backtest_results or backtest_results['total_trades'] == 0:
-                    # 如果没有足够的数据进行回测，提供一些基本信息
-                    backtest_results = {
-                        'total_trades': 0,
-                        'win_rate': 0,
-                        'avg_profit': 0.00,
-                        'max_profit': 0.00,
-                        'max_loss': 0.00,
-                        'profit_factor': 0.00,
-                        'max_drawdown': 0.00,
-                        'consecutive_losses': 0,
-                        'avg_hold_days': 0,
-                        'final_return': 0.00,
-                        'sharpe_ratio': 0.00,
-                        'sortino_ratio': 0.00,
-                        'net_profit': 0.00,
-                        'annualized_return': 0.00
-                    }
-                
-                # 添加压力位和趋势分析
-                print("分析压力位和趋势...")
-                pressure_trend_result = self.analyze_pressure_and_trend(symbol)
-                
-                # 创建基本结果字典
-                result = {
-                    'symbol': symbol,
-                    'name': names.get(symbol, symbol),
-                    'price': current_price,
-                    'price_change': price_change,
-                    'price_change_pct': price_change_pct,
-                    'prev_close': prev_price,
-                    'indicators': indicators,
-                    'patterns': patterns,
-                    'advice': advice,
-                    'backtest': backtest_results
-                }
-                
-                # 将压力位和趋势分析结果整合到最终结果中
-                if pressure_trend_result:
-                    # 获取UI需要的格式化数据
-                    ui_data = self._prepare_pressure_trend_for_report(pressure_trend_result)
-                    # 合并到主结果中
-                    result.update(ui_data)
-                
-                results.append(result)
-                
-                print(f"✅ {symbol} 分析完成")
-                time.sleep(0.5)
-                
-            except Exception as e:
-                self.logger.error(f"分析 {symbol} 时出错", exc_info=True)
-                print(f"❌ {symbol} 分析失败: {str(e)}")
-                continue
+                    print(f"计算涨跌幅(单日) - 开盘价为零或负值: {prev_price:.2f}, 使用默认值0.0%")
+            else:
+                current_price = 0.0
+                prev_price = 0.0
+                price_change = 0.0
+                price_change_pct = 0.0
+                print("计算涨跌幅 - 无历史数据，使用默认值0.0%")
+        
+        # 确保价格变化百分比不是NaN或无穷大
+        if pd.isna(price_change_pct) or np.isinf(price_change_pct):
+            price_change_pct = 0.0
+            print(f"计算涨跌幅 - 结果为NaN或无穷大，使用默认值0.0%")
         
+        # 打印最终使用的涨跌幅
+        print(f"最终涨跌幅: {price_change_pct:.2f}%")
+        
+        print("计算技术指标...")
+        # 各分析环节共用同一个指标计算引擎，共享的中间结果只计算一次
+        frame = IndicatorFrame(hist)
+        
+        # 计算技术指标
+        indicators = self.calculate_indicators(hist, frame=frame)
+        
+        print("分析K线形态...")
+        # 调用形态识别模块
+        if pattern_confidence is None:
+            pattern_confidence = self.measure_pattern_confidence([(symbol, name, hist)])
+        patterns = self.identify_patterns(hist, measured=pattern_confidence)
+        
+        print("生成交易建议...")
+        # 调用信号生成模块
+        advice = generate_trading_advice(indicators, current_price, patterns)
+        
+        print("执行策略回测...")
+        signals = self.generate_backtest_signals(hist, indicators=indicators, frame=frame)
+        
+        # 调用回测模块，行情和信号没有变化时直接使用缓存的结果
+        backtest_results = self.backtest_cache.get(hist, signals, run_backtest)
+        
+        # 确保回测结果包含所有必要的字段
+        if 'total_trades' not in backtest_results or backtest_results['total_trades'] == 0:
+            # 如果没有足够的数据进行回测，提供一些基本信息
+            backtest_results = {
+                'total_trades': 0,
+                'win_rate': 0,
+                'avg_profit': 0.00,
+                'max_profit': 0.00,
+                'max_loss': 0.00,
+                'profit_factor': 0.00,
+                'max_drawdown': 0.00,
+                'consecutive_losses': 0,
+                'avg_hold_days': 0,
+                'final_return': 0.00,
+                'sharpe_ratio': 0.00,
+                'sortino_ratio': 0.00,
+                'net_profit': 0.00,
+                'annualized_return': 0.00
+            }
+        
+        # 添加压力位和趋势分析
+        print("分析压力位和趋势...")
+        pressure_trend_result = self.analyze_pressure_and_trend(symbol, data=hist, frame=frame)
+        
+        # 创建基本结果字典
+        result = {
+            'symbol': symbol,
+            'name': name,
+            'price': current_price,
+            'price_change': price_change,
+            'price_change_pct': price_change_pct,
+            'prev_close': prev_price,
+            'indicators': indicators,
+            'patterns': patterns,
+            'advice': advice,
+            'backtest': backtest_results
+        }
+        
+        # 将压力位和趋势分析结果整合到最终结果中
+        if pressure_trend_result:
+            # 获取UI需要的格式化数据
+            ui_data = self._prepare_pressure_trend_for_report(pressure_trend_result)
+            # 合并到主结果中
+            result.update(ui_data)
+        
+        # 多周期分析，结果按周期名称保存
+        if timeframes:
+            print("分析周线和月线...")
+            result['timeframes'] = self.analyze_timeframes(symbol, hist, timeframes)
+        
+        return result
+    
+    def analyze_timeframes(self, symbol: str, hist: pd.DataFrame,
+                           timeframes: Tuple[str, ...] = DEFAULT_TIMEFRAMES) -> Dict[str, Dict]:
+        """
+        由日线数据合成更长周期的K线，并在每个周期上计算技术指标、压力位和趋势
+        
+        每个周期使用自己的指标计算引擎，指标、压力位和趋势分析共用其中间结果。
+        
+        参数:
+            symbol: 股票代码
+            hist: 日线历史数据
+            timeframes: 周期名称列表
+            
+        返回:
+            Dict[str, Dict]: 周期名称到分析结果的映射，K线数量不足MIN_TIMEFRAME_BARS的周期不包含在内
+        """
+        results = {}
+        for timeframe, data in resample_timeframes(hist, timeframes).items():
+            if len(data) < MIN_TIMEFRAME_BARS:
+                self.logger.debug(f"{symbol} {timeframe}K线数量不足: {len(data)}")
+                continue
+            
+            frame = IndicatorFrame(data)
+            results[timeframe] = {
+                'bars': len(data),
+                'price': data['Close'].iloc[-1],
+                'indicators': self.calculate_indicators(data, frame=frame),
+                **self.analyze_pressure_and_trend(symbol, data=data, frame=frame)
+            }
         return results
     
     def generate_report(self, results: List[Dict], title: str = "股票分析报告") -> str:
@@ -515,9 +639,7 @@ class StockAnalyzer:
             Dict: 股票信息
         """
         try:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            return info
+            return self.provider.info(symbol)
         except Exception as e:
             self.logger.error(f"获取 {symbol} 的信息时出错: {str(e)}")
             return {'shortName': symbol}
@@ -526,6 +648,8 @@ class StockAnalyzer:
         """
         获取股票历史数据
         
+        优先读取本地行情缓存，只下载最后一根已存K线之后的新数据。
+        
         参数:
             symbol: 股票代码
             
@@ -533,15 +657,13 @@ class StockAnalyzer:
             pd.DataFrame: 股票历史数据
         """
         try:
-            # 获取更长时间的历史数据，确保有足够的数据进行回测
-            stock = yf.Ticker(symbol)
             # 从2年的数据改为3年，确保有足够的数据进行回测
-            hist = stock.history(period="3y")
+            hist = self.data_cache.get(symbol, self._fetch_history, period="3y")
             
             if hist.empty or len(hist) < 100:  # 确保至少有100个交易日的数据
                 print(f"⚠️ {symbol} 的历史数据不足，尝试获取最大可用数据")
                 # 尝试获取最大可用数据
-                hist = stock.history(period="max")
+                hist = self.data_cache.get(symbol, self._fetch_history, period="max")
             
             return hist
         except Exception as e:
@@ -549,40 +671,97 @@ class StockAnalyzer:
             print(f"❌ 获取 {symbol} 的历史数据失败: {str(e)}")
             return pd.DataFrame()
 
-    def calculate_indicators(self, data: pd.DataFrame) -> Dict:
+    def prefetch_stock_data(self, symbols: List[str], context: MarketDataContext) -> int:
+        """
+        批量下载多只股票的历史数据并放入行情数据上下文
+        
+        通过行情缓存分块批量请求，请求节奏由自适应限速器控制。
+        数据不足的股票不放入上下文，之后由get_stock_data逐个补充下载。
+        
+        参数:
+            symbols: 股票代码列表
+            context: 行情数据上下文
+            
+        返回:
+            int: 成功预取的股票数量
+        """
+        pending = [symbol for symbol in dict.fromkeys(symbols) if symbol not in context]
+        # 单只股票没有批量请求的收益
+        if len(pending) < 2:
+            return 0
+        
+        print(f"\n批量下载 {len(pending)} 只股票的历史数据...")
+        try:
+            frames = self.data_cache.get_many(pending, self.batch_fetcher.fetch, period="3y")
+        except Exception as e:
+            self.logger.error(f"批量下载历史数据时出错: {str(e)}")
+            return 0
+        
+        loaded = 0
+        for symbol, frame in frames.items():
+            if frame is not None and len(frame) >= 100:
+                context.put(symbol, frame)
+                loaded += 1
+        
+        self.logger.info(f"批量预取 {loaded}/{len(pending)} 只股票, 限速统计: {self.batch_fetcher.limiter.stats()}")
+        return loaded
+
+    def _fetch_history(self, symbol: str, period: Optional[str] = None, interval: str = "1d",
+                       start: Optional[str] = None) -> pd.DataFrame:
+        """
+        从数据源下载历史数据，供行情缓存调用
+        
+        参数:
+            symbol: 股票代码
+            period: 数据周期，与start二选一
+            interval: 数据间隔
+            start: 起始日期，用于增量下载
+            
+        返回:
+            pd.DataFrame: 股票历史数据
+        """
+        return self.provider.history(symbol, period=period, interval=interval, start=start)
+
+    def calculate_indicators(self, data: pd.DataFrame, frame: Optional[IndicatorFrame] = None) -> Dict:
         """
         计算技术指标
         
         参数:
             data: 股票历史数据
+            frame: 可选的指标计算引擎，为None时新建
             
         返回:
             Dict: 技术指标字典
         """
         try:
+            if frame is None:
+                frame = IndicatorFrame(data)
+            
             # 计算RSI
-            rsi = calculate_rsi(data['Close'])
+            rsi = calculate_rsi(data['Close'], frame=frame)
             
             # 计算动态RSI阈值
             dynamic_rsi, oversold, overbought, volatility = calculate_dynamic_rsi_thresholds(
-                data['High'], data['Low'], data['Close']
+                data['High'], data['Low'], data['Close'], frame=frame
             )
             
             # 计算MACD
-            macd, signal, hist_macd = calculate_macd(data['Close'])
+            macd, signal, hist_macd = calculate_macd(data['Close'], frame=frame)
             
             # 计算KDJ
-            k, d, j = calculate_kdj(data['High'], data['Low'], data['Close'])
+            k, d, j = calculate_kdj(data['High'], data['Low'], data['Close'], frame=frame)
             
             # 计算布林带
-            bb_upper, bb_middle, bb_lower, bb_width, bb_percent = calculate_bollinger_bands(data['Close'])
+            bb_upper, bb_middle, bb_lower, bb_width, bb_percent = calculate_bollinger_bands(
+                data['Close'], frame=frame
+            )
             
             # 计算移动平均线
-            sma5 = data['Close'].rolling(window=5).mean()
-            sma10 = data['Close'].rolling(window=10).mean()
-            sma20 = data['Close'].rolling(window=20).mean()
-            sma50 = data['Close'].rolling(window=50).mean()
-            sma200 = data['Close'].rolling(window=200).mean()
+            sma5 = frame.sma(5)
+            sma10 = frame.sma(10)
+            sma20 = frame.sma(20)
+            sma50 = frame.sma(50)
+            sma200 = frame.sma(200)
             
             # 构建指标字典
             indicators = {
@@ -615,12 +794,13 @@ class StockAnalyzer:
             print(f"❌ 计算技术指标失败: {str(e)}")
             return {}
 
-    def identify_patterns(self, data: pd.DataFrame) -> List:
+    def identify_patterns(self, data: pd.DataFrame, measured: Optional[Dict[str, float]] = None) -> List:
         """
         识别K线形态
         
         参数:
             data: 包含OHLC数据的DataFrame
+            measured: 形态名称到实测置信度的字典，没有实测值的形态使用默认置信度
             
         返回:
             List: 识别出的K线形态列表
@@ -634,7 +814,7 @@ class StockAnalyzer:
                 return []
                 
             # 调用形态识别函数
-            patterns = identify_candlestick_patterns(data)
+            patterns = identify_candlestick_patterns(data, measured)
             
             # 将TechnicalPattern对象转换为字典
             pattern_dicts = []
@@ -918,44 +1098,77 @@ class StockAnalyzer:
             'explanation': f"{advice}信号 (置信度: {confidence}%)"
         }
             
-    def backtest_strategy(self, data: pd.DataFrame) -> Dict:
+    def generate_backtest_signals(self, data: pd.DataFrame, indicators: Optional[Dict] = None,
+                                  frame: Optional[IndicatorFrame] = None) -> pd.DataFrame:
+        """
+        生成回测使用的交易信号，每根K线使用自己的指标值
+        
+        参数:
+            data: 股票历史数据
+            indicators: 已计算的技术指标，为None时重新计算
+            frame: 指标计算引擎，为None时新建
+            
+        返回:
+            pd.DataFrame: 交易信号
+        """
+        frame = frame if frame is not None else IndicatorFrame(data)
+        if indicators is None:
+            indicators = self.calculate_indicators(data, frame=frame)
+        return generate_signals(data, {**indicators, **calculate_indicator_series(data, frame=frame)})
+
+    def backtest_strategy(self, data: pd.DataFrame, walk_forward: bool = False,
+                          strategy: str = 'default', **kwargs) -> Dict:
         """
         执行策略回测
         
         参数:
             data: 股票历史数据
+            walk_forward: 为True时执行滚动前进回测，返回样本外指标，并在walk_forward字段中附带各区间结果
+            strategy: 已注册的策略名称，见trademind.backtest.available_strategies
+            **kwargs: 传给run_walk_forward的参数
             
         返回:
             Dict: 回测结果
         """
-        # 实现回测逻辑
-        # 这里需要根据实际的回测逻辑来实现
-        return {} 
+        if strategy == 'default':
+            signals = self.generate_backtest_signals(data)
+        else:
+            buy, sell = strategy_signals(strategy, data)
+            signals = pd.DataFrame({'buy_signal': buy, 'sell_signal': sell}, index=data.index)
+        if not walk_forward:
+            return run_backtest(data, signals)
+        
+        result = run_walk_forward(data, signals, **kwargs)
+        return {**result['metrics'], 'walk_forward': result['windows']}
 
-    def analyze_pressure_and_trend(self, symbol: str) -> Dict:
+    def analyze_pressure_and_trend(self, symbol: str, data: Optional[pd.DataFrame] = None,
+                                   frame: Optional[IndicatorFrame] = None) -> Dict:
         """
         分析股票的压力位和趋势
         
         参数:
             symbol: 股票代码
+            data: 已经获取的股票数据，为None时重新获取
+            frame: 可选的指标计算引擎，与其他分析环节共用中间结果
             
         返回:
             Dict: 包含压力位和趋势分析结果的字典
         """
         try:
             # 获取股票数据
-            data = self.get_stock_data(symbol)
+            if data is None:
+                data = self.get_stock_data(symbol)
             if data.empty:
                 return {}
+            if frame is None:
+                frame = IndicatorFrame(data)
                 
             # 计算压力位
-            from trademind.core.pressure_points import PressurePointAnalyzer
-            pressure_analyzer = PressurePointAnalyzer(data)
+            pressure_analyzer = PressurePointAnalyzer(data, frame=frame)
             pressure_points = pressure_analyzer.analyze()
             
             # 计算趋势
-            from trademind.core.trend_analysis import TrendAnalyzer
-            trend_analyzer = TrendAnalyzer(data)
+            trend_analyzer = TrendAnalyzer(data, frame=frame)
             trend_analysis = trend_analyzer.analyze()
             
             # 获取当前价格
@@ -964,11 +1177,8 @@ class StockAnalyzer:
             # 基于趋势和压力位生成推荐
             recommendation = self._generate_recommendation(pressure_points, trend_analysis, current_price)
             
-            # 计算ADX数据并确保有有效值
-            adx_data = trend_analyzer.calculate_adx()
-            
-            # 打印详细的ADX计算结果，便于调试
-            print(f"计算ADX结果(详细): {adx_data}")
+            # ADX已在趋势分析中计算，直接使用其结果并确保有有效值
+            adx_data = trend_analysis['adx']
             
             # 确保ADX值不为零
             adx_value = adx_data.get('adx', 0.0)
@@ -1271,4 +1481,10 @@ class StockAnalyzer:
         # 添加顶层引用，确保ADX数据可从多处访问
         report_data['adx_from_report'] = report_data.get('adx', 15.0)
         
-        return report_data 
\ No newline at end of file
+        return report_data 
+
+
+def _analyze_symbol_task(analyzer: StockAnalyzer, symbol: str, name: str, hist: pd.DataFrame,
+                         pattern_confidence: Optional[Dict[str, float]] = None) -> Dict:
+    """进程池任务：分析单只股票"""
+    return analyzer.analyze_symbol_data(symbol, name, hist, pattern_confidence)
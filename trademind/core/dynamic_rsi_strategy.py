@@ -7,9 +7,10 @@
 
 import pandas as pd
 import numpy as np
-from trademind.core.indicators import calculate_rsi
+from trademind.core.indicators import calculate_rsi, calculate_true_range
+from trademind.core.rolling import rolling_percentile_rank
 
-def dynamic_atr_rsi(price_data, rsi_period=14, atr_period=14, lookback_period=252):
+def dynamic_atr_rsi(price_data, rsi_period=14, atr_period=14, lookback_period=252, frame=None):
     """
     基于ATR的动态RSI算法，使用相对历史波动率来调整RSI阈值
     
@@ -18,6 +19,7 @@ def dynamic_atr_rsi(price_data, rsi_period=14, atr_period=14, lookback_period=25
     rsi_period (int): RSI计算周期
     atr_period (int): ATR计算周期
     lookback_period (int): 用于计算波动率百分位的历史回溯期
+    frame (IndicatorFrame): 可选，提供时复用其中的ATR
     
     返回:
     DataFrame: 包含RSI值和动态阈值的数据框
@@ -33,24 +35,20 @@ def dynamic_atr_rsi(price_data, rsi_period=14, atr_period=14, lookback_period=25
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     
-    # 计算ATR
-    high = price_data['High']
-    low = price_data['Low']
-    close = price_data['Close']
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    atr = tr.rolling(window=atr_period).mean()
-    
     # 计算ATR占价格的百分比
-    atr_pct = (atr / close) * 100
+    if frame is not None:
+        atr_pct = frame.get('atr_pct', atr_period)
+    else:
+        high = price_data['High']
+        low = price_data['Low']
+        close = price_data['Close']
+        atr = calculate_true_range(high, low, close).rolling(window=atr_period).mean()
+        atr_pct = (atr / close) * 100
     
     # 计算波动率的历史百分位
-    volatility_percentile = atr_pct.rolling(window=lookback_period).apply(
-        lambda x: pd.Series(x).rank(pct=True).iloc[-1]
+    volatility_percentile = pd.Series(
+        rolling_percentile_rank(atr_pct, lookback_period, method='average'),
+        index=atr_pct.index
     )
     
     # 平滑地调整RSI阈值
@@ -97,32 +95,20 @@ def generate_signals(result_df):
     
     return signals
 
-def backtest_dynamic_rsi(price_data, initial_capital=10000):
+def backtest_dynamic_rsi(price_data, initial_capital=10000, **params):
     """
     回测动态RSI策略
     
+    信号由已注册的'dynamic_rsi'策略生成，交易模拟和指标计算与默认策略使用同一个回测引擎，
+    结果可以与默认策略直接比较。
+    
     参数:
     price_data (DataFrame): 价格数据
     initial_capital (float): 初始资金
+    **params: 传给run_backtest的其他参数
     
     返回:
-    DataFrame: 回测结果
+    dict: 回测结果统计
     """
-    # 计算动态RSI和信号
-    results = dynamic_atr_rsi(price_data)
-    signals = generate_signals(results)
-    
-    # 创建回测结果DataFrame
-    backtest = signals.copy()
-    backtest['position'] = signals['signal'].shift(1).fillna(0).cumsum()
-    backtest['returns'] = price_data['Close'].pct_change()
-    backtest['strategy_returns'] = backtest['position'] * backtest['returns']
-    
-    # 计算累积收益
-    backtest['cumulative_returns'] = (1 + backtest['returns']).cumprod()
-    backtest['strategy_cumulative_returns'] = (1 + backtest['strategy_returns']).cumprod()
-    
-    # 计算资金曲线
-    backtest['capital'] = initial_capital * backtest['strategy_cumulative_returns']
-    
-    return backtest 
\ No newline at end of file
+    from trademind.backtest.strategies import run_strategy_backtest
+    return run_strategy_backtest(price_data, 'dynamic_rsi', initial_capital=initial_capital, **params)
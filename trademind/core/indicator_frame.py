@@ -0,0 +1,230 @@
+"""
+TradeMind Lite（轻量版）- 指标计算引擎模块
+
+本模块提供IndicatorFrame，对一份OHLCV数据按需计算指标及其共享的中间结果
+（TR、ATR、EMA、均线、滚动最高/最低价、摇摆点等）。每个指标按名称和参数缓存，
+依赖的中间结果通过同一个IndicatorFrame获取，因此只计算一次，
+技术指标、信号、回测、压力位和趋势分析各环节共用同一份结果。
+"""
+
+import inspect
+import logging
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+import pandas as pd
+
+from trademind.core.indicators import (
+    calculate_true_range,
+    calculate_rsi_series,
+    calculate_macd_series,
+    calculate_kdj_series,
+    calculate_bollinger_bands_series,
+    calculate_dynamic_rsi_thresholds_series
+)
+from trademind.core.smoothing import wilder_smooth
+from trademind.core.swings import swing_highs, swing_lows
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 指标名称到计算函数及其签名的映射，计算函数签名为func(frame, *params)
+_INDICATORS: Dict[str, Tuple[Callable[..., Any], inspect.Signature]] = {}
+
+# 指标声明：名称字符串，或(名称, 参数...)元组
+IndicatorSpec = Union[str, Tuple]
+
+
+def register_indicator(name: str):
+    """
+    注册指标计算函数的装饰器
+
+    参数:
+        name: 指标名称
+
+    返回:
+        装饰器
+    """
+    def decorator(func):
+        _INDICATORS[name] = (func, inspect.signature(func))
+        return func
+    return decorator
+
+
+class IndicatorFrame:
+    """单只股票的指标计算引擎，每个指标及中间结果只计算一次"""
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        初始化指标计算引擎
+
+        参数:
+            data: 包含OHLCV数据的DataFrame
+        """
+        self.data = data
+        self._cache: Dict[Tuple, Any] = {}
+
+    def get(self, name: str, *params, **kwargs) -> Any:
+        """
+        获取指标结果，第一次获取时计算并缓存
+
+        参数按计算函数的签名补全默认值后作为缓存键，
+        因此get('rsi')与get('rsi', 14)共用同一份结果。
+
+        参数:
+            name: 指标名称
+            *params: 指标参数
+            **kwargs: 按名称传入的指标参数
+
+        返回:
+            指标结果，通常为与data对齐的pd.Series或其元组
+        """
+        key = self._key(name, params, kwargs)
+        if key not in self._cache:
+            func = _INDICATORS[name][0]
+            self._cache[key] = func(self, *key[1:])
+        return self._cache[key]
+
+    def _key(self, name: str, params: Tuple, kwargs: Dict) -> Tuple:
+        """生成补全默认参数后的缓存键"""
+        if name not in _INDICATORS:
+            raise KeyError(f"未知指标: {name}")
+        bound = _INDICATORS[name][1].bind(self, *params, **kwargs)
+        bound.apply_defaults()
+        return (name,) + tuple(bound.arguments.values())[1:]
+
+    def resolve(self, specs: Iterable[IndicatorSpec]) -> Dict[Tuple, Any]:
+        """
+        计算一组声明的指标
+
+        参数:
+            specs: 指标声明列表，如['tr', ('atr', 14), ('sma', 20)]
+
+        返回:
+            Dict[Tuple, Any]: 以(名称, 参数...)为键的指标结果
+        """
+        results = {}
+        for spec in specs:
+            key = (spec,) if isinstance(spec, str) else tuple(spec)
+            results[key] = self.get(*key)
+        return results
+
+    def is_cached(self, name: str, *params, **kwargs) -> bool:
+        """指标是否已经计算过"""
+        return self._key(name, params, kwargs) in self._cache
+
+    def sma(self, window: int, column: str = 'Close') -> pd.Series:
+        """简单移动平均"""
+        return self.get('sma', window, column)
+
+    def ema(self, span: int, column: str = 'Close') -> pd.Series:
+        """指数移动平均"""
+        return self.get('ema', span, column)
+
+    def atr(self, period: int = 14) -> pd.Series:
+        """TR的简单移动平均"""
+        return self.get('atr', period)
+
+
+@register_indicator('tr')
+def _true_range(frame: IndicatorFrame) -> pd.Series:
+    """真实波动幅度"""
+    data = frame.data
+    return calculate_true_range(data['High'], data['Low'], data['Close'])
+
+
+@register_indicator('atr')
+def _atr(frame: IndicatorFrame, period: int) -> pd.Series:
+    """ATR，TR的简单移动平均"""
+    return frame.get('tr').rolling(window=period).mean()
+
+
+@register_indicator('wilder_atr')
+def _wilder_atr(frame: IndicatorFrame, period: int) -> pd.Series:
+    """Wilder平滑的ATR，以第period根K线的简单平均为起点"""
+    tr = frame.get('tr')
+    atr = frame.get('atr', period).copy()
+    if len(tr) > period:
+        atr.iloc[period:] = wilder_smooth(tr.iloc[period:], period, initial=atr.iloc[period-1])
+    return atr
+
+
+@register_indicator('atr_pct')
+def _atr_pct(frame: IndicatorFrame, period: int) -> pd.Series:
+    """ATR占收盘价的百分比"""
+    return (frame.get('atr', period) / frame.data['Close']) * 100
+
+
+@register_indicator('sma')
+def _sma(frame: IndicatorFrame, window: int, column: str = 'Close') -> pd.Series:
+    """简单移动平均"""
+    return frame.data[column].rolling(window=window).mean()
+
+
+@register_indicator('ema')
+def _ema(frame: IndicatorFrame, span: int, column: str = 'Close') -> pd.Series:
+    """指数移动平均，预热期为NaN"""
+    return frame.data[column].ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+@register_indicator('rolling_max')
+def _rolling_max(frame: IndicatorFrame, column: str, window: int) -> pd.Series:
+    """滚动最高值"""
+    return frame.data[column].rolling(window=window).max()
+
+
+@register_indicator('rolling_min')
+def _rolling_min(frame: IndicatorFrame, column: str, window: int) -> pd.Series:
+    """滚动最低值"""
+    return frame.data[column].rolling(window=window).min()
+
+
+@register_indicator('rsi')
+def _rsi(frame: IndicatorFrame, period: int = 14) -> pd.Series:
+    """RSI序列"""
+    return calculate_rsi_series(frame.data['Close'], period)
+
+
+@register_indicator('macd')
+def _macd(frame: IndicatorFrame) -> tuple:
+    """MACD序列：(MACD线, 信号线, 柱状图)"""
+    return calculate_macd_series(frame.data['Close'])
+
+
+@register_indicator('kdj')
+def _kdj(frame: IndicatorFrame, n: int = 9) -> tuple:
+    """KDJ序列：(K, D, J)"""
+    data = frame.data
+    return calculate_kdj_series(data['High'], data['Low'], data['Close'], n)
+
+
+@register_indicator('bollinger')
+def _bollinger(frame: IndicatorFrame, window: int = 20, num_std: float = 2.0) -> tuple:
+    """布林带序列：(上轨, 中轨, 下轨, 带宽, 百分比B)"""
+    return calculate_bollinger_bands_series(frame.data['Close'], window, num_std)
+
+
+@register_indicator('dynamic_rsi')
+def _dynamic_rsi(frame: IndicatorFrame, rsi_period: int = 14, atr_period: int = 14,
+                 lookback_period: int = 252, max_adjustment: float = 15.0) -> tuple:
+    """动态RSI阈值序列：(RSI, 超卖阈值, 超买阈值, 波动率百分位)"""
+    data = frame.data
+    return calculate_dynamic_rsi_thresholds_series(
+        data['High'], data['Low'], data['Close'], rsi_period, atr_period,
+        lookback_period, max_adjustment, frame=frame
+    )
+
+
+@register_indicator('swing_high')
+def _swing_high(frame: IndicatorFrame, column: str = 'High', lookaround: int = 5,
+                strict: bool = False) -> pd.Series:
+    """局部高点布尔序列"""
+    values = frame.data[column]
+    return pd.Series(swing_highs(values, lookaround, strict), index=values.index)
+
+
+@register_indicator('swing_low')
+def _swing_low(frame: IndicatorFrame, column: str = 'Low', lookaround: int = 5,
+               strict: bool = False) -> pd.Series:
+    """局部低点布尔序列"""
+    values = frame.data[column]
+    return pd.Series(swing_lows(values, lookaround, strict), index=values.index)
@@ -11,21 +11,42 @@
 import pandas as pd
 import numpy as np
 
+from trademind.core.rolling import rolling_percentile_rank
+from trademind.core.smoothing import ema_filter
 
-def calculate_macd(prices: pd.Series) -> tuple:
+
+def calculate_true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
     """
-    计算MACD指标
+    计算真实波动幅度(TR)
     
     参数:
-        prices: 价格序列，通常使用收盘价
+        high: 最高价序列
+        low: 最低价序列
+        close: 收盘价序列
         
     返回:
-        tuple: (MACD线, 信号线, 柱状图)
+        pd.Series: 与close对齐的TR序列，第一根K线为最高价减最低价
     """
-    # 确保数据足够长
-    if len(prices) < 26:
-        return 0.0, 0.0, 0.0
+    high_values = high.to_numpy(dtype=float)
+    low_values = low.to_numpy(dtype=float)
+    prev_close = close.shift().to_numpy(dtype=float)
+    tr1 = high_values - low_values
+    tr2 = np.abs(high_values - prev_close)
+    tr3 = np.abs(low_values - prev_close)
+    # fmax跳过缺失值，与按行取最大值一致
+    return pd.Series(np.fmax(np.fmax(tr1, tr2), tr3), index=close.index)
+
+
+def calculate_macd_series(prices: pd.Series) -> tuple:
+    """
+    计算完整的MACD指标序列
+    
+    参数:
+        prices: 价格序列，通常使用收盘价
         
+    返回:
+        tuple: (MACD线, 信号线, 柱状图)，均为与prices对齐的pd.Series，预热期为NaN
+    """
     # 计算快速和慢速EMA
     ema12 = prices.ewm(span=12, adjust=False, min_periods=12).mean()
     ema26 = prices.ewm(span=26, adjust=False, min_periods=26).mean()
@@ -39,12 +60,37 @@ def calculate_macd(prices: pd.Series) -> tuple:
     # 计算柱状图 (MACD Histogram)
     histogram = macd_line - signal_line
     
+    return macd_line, signal_line, histogram
+
+
+def calculate_macd(prices: pd.Series, frame=None) -> tuple:
+    """
+    计算MACD指标
+    
+    参数:
+        prices: 价格序列，通常使用收盘价
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
+        
+    返回:
+        tuple: (MACD线, 信号线, 柱状图)
+    """
+    # 确保数据足够长
+    if len(prices) < 26:
+        return 0.0, 0.0, 0.0
+    
+    if frame is not None:
+        macd_line, signal_line, histogram = frame.get('macd')
+    else:
+        macd_line, signal_line, histogram = calculate_macd_series(prices)
+    
     return float(macd_line.iloc[-1]), float(signal_line.iloc[-1]), float(histogram.iloc[-1])
 
 
-def calculate_kdj(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 9) -> tuple:
+def calculate_kdj_series(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 9) -> tuple:
     """
-    计算KDJ指标
+    计算完整的KDJ指标序列
+    
+    K、D从第n根K线开始按 K = 2/3 * 前K + 1/3 * RSV 递推，之前保持初始值50。
     
     参数:
         high: 最高价序列
@@ -53,43 +99,106 @@ def calculate_kdj(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 9)
         n: 周期，默认9日
         
     返回:
-        tuple: (K值, D值, J值)
+        tuple: (K值, D值, J值)，均为与close对齐的pd.Series
     """
     # 计算RSV值 (Raw Stochastic Value)
-    low_list = low.rolling(window=n).min()
-    high_list = high.rolling(window=n).max()
+    low_list = low.rolling(window=n).min().to_numpy(dtype=float)
+    high_list = high.rolling(window=n).max().to_numpy(dtype=float)
     
-    # 避免除以零错误
-    rsv = pd.Series(0.0, index=close.index)
+    # 避免除以零错误，最高最低价相同时RSV为0
     valid_idx = high_list != low_list
-    rsv[valid_idx] = (close[valid_idx] - low_list[valid_idx]) / (high_list[valid_idx] - low_list[valid_idx]) * 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsv = np.where(valid_idx, (close.to_numpy(dtype=float) - low_list) / (high_list - low_list) * 100, 0.0)
     
     # 初始化K、D值
-    k = pd.Series(50.0, index=close.index)
-    d = pd.Series(50.0, index=close.index)
+    k = np.full(len(close), 50.0)
+    d = np.full(len(close), 50.0)
     
-    # 计算K、D、J值
-    for i in range(n, len(close)):
-        k.iloc[i] = 2/3 * k.iloc[i-1] + 1/3 * rsv.iloc[i]
-        d.iloc[i] = 2/3 * d.iloc[i-1] + 1/3 * k.iloc[i]
+    # 以第n-1根K线的初始值50为起点做alpha=1/3的指数平滑
+    if len(close) > n:
+        k[n:] = ema_filter(rsv[n:], 1/3, initial=50.0)
+        d[n:] = ema_filter(k[n:], 1/3, initial=k[n-1])
     
     j = 3 * k - 2 * d
     
     # 处理极端值
-    k = k.clip(0, 100)
-    d = d.clip(0, 100)
-    j = j.clip(0, 100)
+    index = close.index
+    return (pd.Series(np.clip(k, 0, 100), index=index),
+            pd.Series(np.clip(d, 0, 100), index=index),
+            pd.Series(np.clip(j, 0, 100), index=index))
+
+
+def calculate_kdj(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 9, frame=None) -> tuple:
+    """
+    计算KDJ指标
+    
+    参数:
+        high: 最高价序列
+        low: 最低价序列
+        close: 收盘价序列
+        n: 周期，默认9日
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
+        
+    返回:
+        tuple: (K值, D值, J值)
+    """
+    if frame is not None:
+        k, d, j = frame.get('kdj', n)
+    else:
+        k, d, j = calculate_kdj_series(high, low, close, n)
     
     return float(k.iloc[-1]), float(d.iloc[-1]), float(j.iloc[-1])
 
 
-def calculate_rsi(prices: pd.Series, period: int = 14) -> float:
+def calculate_rsi_series(prices: pd.Series, period: int = 14) -> pd.Series:
+    """
+    计算完整的相对强弱指数(RSI)序列
+    
+    以前period个价格变化的简单平均为初值，之后使用Wilder平滑。
+    
+    参数:
+        prices: 价格序列，通常使用收盘价
+        period: 周期，默认14日
+        
+    返回:
+        pd.Series: 与prices对齐的RSI序列，前period根K线为NaN
+    """
+    rsi = np.full(len(prices), np.nan)
+    
+    # 计算价格变化，跳过缺失值
+    values = prices.to_numpy(dtype=float)
+    delta = np.diff(values)
+    positions = np.flatnonzero(~np.isnan(delta)) + 1
+    delta = delta[positions - 1]
+    if len(delta) < period:
+        return pd.Series(rsi, index=prices.index)
+    
+    # 分离上涨和下跌
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    
+    # 以简单平均为初值做alpha=1/period的Wilder平滑
+    initial_gain = gain[:period].mean()
+    initial_loss = loss[:period].mean()
+    avg_gain = np.concatenate(([initial_gain], ema_filter(gain[period:], 1/period, initial=initial_gain)))
+    avg_loss = np.concatenate(([initial_loss], ema_filter(loss[period:], 1/period, initial=initial_loss)))
+    
+    # 计算相对强度和RSI，没有下跌时RSI为100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        rsi[positions[period-1:]] = np.where(avg_loss != 0, 100 - (100 / (1 + rs)), 100.0)
+    
+    return pd.Series(rsi, index=prices.index)
+
+
+def calculate_rsi(prices: pd.Series, period: int = 14, frame=None) -> float:
     """
     计算相对强弱指数(RSI)
     
     参数:
         prices: 价格序列，通常使用收盘价
         period: 周期，默认14日
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
         
     返回:
         float: RSI值
@@ -97,40 +206,72 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> float:
     # 确保数据足够长
     if len(prices) <= period:
         return 50.0  # 数据不足时返回中性值
-        
-    # 计算价格变化
-    delta = prices.diff().dropna()
     
-    # 分离上涨和下跌
-    gain = delta.copy()
-    loss = delta.copy()
-    gain[gain < 0] = 0
-    loss[loss > 0] = 0
-    loss = abs(loss)
-    
-    # 计算初始平均值
-    avg_gain = gain.rolling(window=period).mean().iloc[period-1]
-    avg_loss = loss.rolling(window=period).mean().iloc[period-1]
-    
-    # 使用Wilder平滑方法计算后续值
-    for i in range(period, len(delta)):
-        avg_gain = (avg_gain * (period - 1) + gain.iloc[i]) / period
-        avg_loss = (avg_loss * (period - 1) + loss.iloc[i]) / period
-    
-    # 避免除以零
-    if avg_loss == 0:
-        return 100.0
+    rsi = frame.get('rsi', period) if frame is not None else calculate_rsi_series(prices, period)
+    
+    return float(rsi.iloc[-1])
+
+
+def calculate_dynamic_rsi_thresholds_series(high: pd.Series, low: pd.Series, close: pd.Series,
+                                           rsi_period: int = 14, atr_period: int = 14,
+                                           lookback_period: int = 252, max_adjustment: float = 15.0,
+                                           frame=None) -> tuple:
+    """
+    计算完整的基于ATR的动态RSI阈值序列
+    
+    每根K线的阈值和波动率百分位只使用该K线及之前的数据，等于在该K线处截断后调用
+    calculate_dynamic_rsi_thresholds得到的结果；历史不足的K线使用默认值。RSI序列为完整的
+    calculate_rsi_series结果。
+    
+    参数:
+        high: 最高价序列
+        low: 最低价序列
+        close: 收盘价序列
+        rsi_period: RSI计算周期，默认14日
+        atr_period: ATR计算周期，默认14日
+        lookback_period: 用于计算波动率百分位的历史回溯期，默认252日（约一年交易日）
+        max_adjustment: 最大阈值调整幅度，默认15
+        frame: 可选的IndicatorFrame，提供时复用其中的RSI和ATR
+        
+    返回:
+        tuple: (RSI, 超卖阈值, 超买阈值, 波动率百分位)，均为与close对齐的pd.Series
+    """
+    if frame is not None:
+        rsi = frame.get('rsi', rsi_period)
+        atr_pct = frame.get('atr_pct', atr_period)
+    else:
+        rsi = calculate_rsi_series(close, rsi_period)
         
-    # 计算相对强度和RSI
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+        # 计算ATR占价格的百分比
+        atr = calculate_true_range(high, low, close).rolling(window=atr_period).mean()
+        atr_pct = (atr / close) * 100
+    
+    # 计算每根K线的ATR百分比在最近lookback_period根K线中的百分位
+    values = atr_pct.to_numpy(dtype=float)
+    percentile = np.full(len(values), 0.5)
+    if len(values) >= lookback_period:
+        ranks = rolling_percentile_rank(values, lookback_period, method='strict')[lookback_period-1:]
+        
+        # 与单值计算相同的数据充足条件
+        enough = np.cumsum(~np.isnan(values)) > lookback_period
+        enough &= np.arange(len(values)) >= max(rsi_period, atr_period, lookback_period)
+        enough = enough[lookback_period-1:]
+        percentile[lookback_period-1:] = np.where(enough, ranks, 0.5)
+    
+    volatility_percentile = pd.Series(percentile, index=close.index)
     
-    return float(rsi)
+    # 根据波动率百分位平滑调整阈值，数据不足的K线使用基础阈值
+    short = np.arange(len(close)) < max(rsi_period, atr_period, lookback_period)
+    oversold = (30 - (volatility_percentile * max_adjustment)).where(~short, 30.0)
+    overbought = (70 + (volatility_percentile * max_adjustment)).where(~short, 70.0)
+    
+    return rsi, oversold, overbought, volatility_percentile
 
 
 def calculate_dynamic_rsi_thresholds(high: pd.Series, low: pd.Series, close: pd.Series, 
                                     rsi_period: int = 14, atr_period: int = 14, 
-                                    lookback_period: int = 252, max_adjustment: float = 15.0) -> tuple:
+                                    lookback_period: int = 252, max_adjustment: float = 15.0,
+                                    frame=None) -> tuple:
     """
     基于ATR的动态RSI阈值计算
     
@@ -142,6 +283,7 @@ def calculate_dynamic_rsi_thresholds(high: pd.Series, low: pd.Series, close: pd.
         atr_period: ATR计算周期，默认14日
         lookback_period: 用于计算波动率百分位的历史回溯期，默认252日（约一年交易日）
         max_adjustment: 最大阈值调整幅度，默认15
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
         
     返回:
         tuple: (RSI值, 超卖阈值, 超买阈值, 波动率百分位)
@@ -150,44 +292,22 @@ def calculate_dynamic_rsi_thresholds(high: pd.Series, low: pd.Series, close: pd.
     if len(close) <= max(rsi_period, atr_period, lookback_period):
         return 50.0, 30.0, 70.0, 0.5  # 数据不足时返回默认值
     
-    # 计算RSI
-    rsi = calculate_rsi(close, rsi_period)
-    
-    # 计算ATR
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    atr = tr.rolling(window=atr_period).mean()
-    
-    # 计算ATR占价格的百分比
-    atr_pct = (atr / close) * 100
-    
-    # 计算波动率的历史百分位
-    volatility_percentile = 0.5  # 默认值
-    
-    if len(atr_pct.dropna()) > lookback_period:
-        recent_window = atr_pct.iloc[-lookback_period:]
-        current_atr_pct = atr_pct.iloc[-1]
-        
-        # 计算当前ATR百分比在历史数据中的百分位
-        volatility_percentile = (recent_window < current_atr_pct).mean()
-    
-    # 平滑地调整RSI阈值
-    base_oversold = 30
-    base_overbought = 70
-    
-    # 根据波动率百分位平滑调整阈值
-    oversold = base_oversold - (volatility_percentile * max_adjustment)
-    overbought = base_overbought + (volatility_percentile * max_adjustment)
-    
-    return float(rsi), float(oversold), float(overbought), float(volatility_percentile)
+    if frame is not None:
+        rsi, oversold, overbought, volatility_percentile = frame.get(
+            'dynamic_rsi', rsi_period, atr_period, lookback_period, max_adjustment
+        )
+    else:
+        rsi, oversold, overbought, volatility_percentile = calculate_dynamic_rsi_thresholds_series(
+            high, low, close, rsi_period, atr_period, lookback_period, max_adjustment
+        )
+    
+    return (float(rsi.iloc[-1]), float(oversold.iloc[-1]), float(overbought.iloc[-1]),
+            float(volatility_percentile.iloc[-1]))
 
 
-def calculate_bollinger_bands(prices: pd.Series, window: int = 20, num_std: float = 2.0) -> tuple:
+def calculate_bollinger_bands_series(prices: pd.Series, window: int = 20, num_std: float = 2.0) -> tuple:
     """
-    计算布林带指标
+    计算完整的布林带指标序列
     
     参数:
         prices: 价格序列，通常使用收盘价
@@ -195,12 +315,8 @@ def calculate_bollinger_bands(prices: pd.Series, window: int = 20, num_std: floa
         num_std: 标准差倍数，默认2.0
         
     返回:
-        tuple: (上轨, 中轨, 下轨, 带宽, 百分比B)
+        tuple: (上轨, 中轨, 下轨, 带宽, 百分比B)，均为与prices对齐的pd.Series，预热期为NaN
     """
-    # 确保数据足够长
-    if len(prices) < window:
-        return 0.0, 0.0, 0.0, 0.0, 0.0
-        
     # 计算中轨(简单移动平均线)
     middle = prices.rolling(window=window).mean()
     
@@ -217,6 +333,32 @@ def calculate_bollinger_bands(prices: pd.Series, window: int = 20, num_std: floa
     # 计算百分比B (%B)
     percent_b = (prices - lower) / (upper - lower)
     
+    return upper, middle, lower, bandwidth, percent_b
+
+
+def calculate_bollinger_bands(prices: pd.Series, window: int = 20, num_std: float = 2.0,
+                              frame=None) -> tuple:
+    """
+    计算布林带指标
+    
+    参数:
+        prices: 价格序列，通常使用收盘价
+        window: 移动平均窗口，默认20日
+        num_std: 标准差倍数，默认2.0
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
+        
+    返回:
+        tuple: (上轨, 中轨, 下轨, 带宽, 百分比B)
+    """
+    # 确保数据足够长
+    if len(prices) < window:
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+    
+    if frame is not None:
+        upper, middle, lower, bandwidth, percent_b = frame.get('bollinger', window, num_std)
+    else:
+        upper, middle, lower, bandwidth, percent_b = calculate_bollinger_bands_series(prices, window, num_std)
+    
     # 获取最新值
     latest_upper = float(upper.iloc[-1])
     latest_middle = float(middle.iloc[-1])
@@ -224,4 +366,47 @@ def calculate_bollinger_bands(prices: pd.Series, window: int = 20, num_std: floa
     latest_bandwidth = float(bandwidth.iloc[-1])
     latest_percent_b = float(percent_b.iloc[-1])
     
-    return latest_upper, latest_middle, latest_lower, latest_bandwidth, latest_percent_b 
\ No newline at end of file
+    return latest_upper, latest_middle, latest_lower, latest_bandwidth, latest_percent_b
+
+
+def calculate_indicator_series(data: pd.DataFrame, frame=None) -> dict:
+    """
+    一次计算所有技术指标的完整序列
+    
+    返回的字典结构与StockAnalyzer.calculate_indicators相同，但每个值都是与data对齐的pd.Series，
+    可以直接传给generate_signals，使每根K线使用自己的指标值。
+    
+    参数:
+        data: 包含High, Low, Close列的OHLCV数据
+        frame: 可选的IndicatorFrame，提供时复用其中已计算的序列
+        
+    返回:
+        dict: 指标序列字典，包含rsi, macd, kdj, bollinger, dynamic_rsi
+    """
+    if frame is None:
+        from trademind.core.indicator_frame import IndicatorFrame
+        frame = IndicatorFrame(data)
+    
+    macd_line, signal_line, histogram = frame.get('macd')
+    k, d, j = frame.get('kdj', 9)
+    upper, middle, lower, bandwidth, percent_b = frame.get('bollinger', 20, 2.0)
+    rsi, oversold, overbought, volatility = frame.get('dynamic_rsi', 14, 14, 252, 15.0)
+    
+    return {
+        'rsi': rsi,
+        'macd': {'macd': macd_line, 'signal': signal_line, 'hist': histogram},
+        'kdj': {'k': k, 'd': d, 'j': j},
+        'bollinger': {
+            'upper': upper,
+            'middle': middle,
+            'lower': lower,
+            'bandwidth': bandwidth,
+            'percent_b': percent_b
+        },
+        'dynamic_rsi': {
+            'rsi': rsi,
+            'oversold': oversold,
+            'overbought': overbought,
+            'volatility': volatility
+        }
+    }
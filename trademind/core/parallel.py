@@ -0,0 +1,168 @@
+"""
+TradeMind Lite（轻量版）- 并行分析模块
+
+本模块在进程池中执行每个股票的分析流程。数据下载在主进程完成，
+指标、形态、信号、回测、压力位和趋势等纯计算环节分发到多个工作进程，
+结果按输入顺序返回，进度回调也按输入顺序触发，单个股票失败不影响其他股票。
+"""
+
+import os
+import sys
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 进度回调，签名为callback(index, total, symbol, result)，index从1开始，失败时result为None
+ProgressCallback = Callable[[int, int, str, Optional[Any]], None]
+
+# 设置该环境变量后，命令行和Web分析默认使用的工作进程数量
+WORKERS_ENV = "TRADEMIND_WORKERS"
+
+# 工作进程的分析器沿用父进程分析器的这些属性，结果写入调用方设置的缓存目录
+WORKER_ATTRIBUTES = ('results_path', 'data_cache', 'backtest_cache', 'pattern_stats_cache')
+
+# 工作进程内的分析器实例，以及创建它时使用的父进程设置
+_worker_analyzer = None
+_worker_settings: Dict[str, Any] = {}
+
+
+def default_workers() -> int:
+    """
+    获取默认工作进程数量
+
+    读取TRADEMIND_WORKERS环境变量，未设置或无效时为1（串行），0表示使用CPU核心数。
+
+    返回:
+        int: 工作进程数量
+    """
+    value = os.environ.get(WORKERS_ENV, "1")
+    try:
+        return resolve_workers(int(value))
+    except ValueError:
+        logger.warning(f"无效的{WORKERS_ENV}: {value}，使用串行分析")
+        return 1
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    解析工作进程数量
+
+    参数:
+        workers: 工作进程数量，为None或小于等于0时使用CPU核心数，超过CPU核心数时按核心数计
+
+    返回:
+        int: 实际使用的工作进程数量
+    """
+    cpu_count = os.cpu_count() or 1
+    if workers is None or workers <= 0:
+        return cpu_count
+    return min(workers, cpu_count)
+
+
+def worker_settings(analyzer) -> Dict[str, Any]:
+    """
+    取出工作进程的分析器需要沿用的父进程设置
+
+    参数:
+        analyzer: 父进程的StockAnalyzer，为None时使用默认设置
+
+    返回:
+        Dict[str, Any]: 属性名到值的字典，见WORKER_ATTRIBUTES
+    """
+    if analyzer is None:
+        return {}
+    return {name: getattr(analyzer, name) for name in WORKER_ATTRIBUTES if hasattr(analyzer, name)}
+
+
+def _init_worker(settings: Optional[Dict[str, Any]] = None):
+    """初始化工作进程：关闭逐步输出，避免多个进程的打印交错，并保存父进程的设置"""
+    global _worker_settings
+    sys.stdout = open(os.devnull, 'w')
+    _worker_settings = settings or {}
+
+
+def get_worker_analyzer():
+    """获取当前工作进程的StockAnalyzer，第一次调用时按父进程的设置创建"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from trademind.core.analyzer import StockAnalyzer
+        _worker_analyzer = StockAnalyzer()
+        for name, value in _worker_settings.items():
+            setattr(_worker_analyzer, name, value)
+    return _worker_analyzer
+
+
+def _run_task(task: Callable, args: Tuple) -> Tuple[Optional[Any], Optional[str]]:
+    """在工作进程中执行单个股票的分析任务，返回(结果, 错误信息)"""
+    try:
+        return task(get_worker_analyzer(), *args), None
+    except Exception as e:
+        logging.getLogger(__name__).error(f"分析 {args[0]} 时出错", exc_info=True)
+        return None, str(e)
+
+
+def run_symbol_pipeline(analyzer, task: Callable, items: Sequence[Tuple], workers: int = 1,
+                        progress_callback: Optional[ProgressCallback] = None,
+                        should_stop: Optional[Callable[[], bool]] = None) -> List[Optional[Any]]:
+    """
+    对每个股票执行分析任务
+
+    参数:
+        analyzer: 串行执行时使用的StockAnalyzer
+        task: 模块级分析函数，签名为task(analyzer, symbol, *args)，并行时需要可以被pickle
+        items: 每个股票的任务参数元组，第一个元素为股票代码
+        workers: 工作进程数量，1为在当前进程串行执行
+        progress_callback: 进度回调，按输入顺序调用
+        should_stop: 返回True时停止处理剩余股票
+
+    返回:
+        List[Optional[Any]]: 与items顺序一致的结果列表，失败或未执行的股票为None
+    """
+    total = len(items)
+    results: List[Optional[Any]] = [None] * total
+
+    def report(index, result):
+        if progress_callback is not None:
+            try:
+                progress_callback(index + 1, total, items[index][0], result)
+            except Exception as e:
+                logger.warning(f"进度回调出错: {str(e)}")
+
+    if workers <= 1 or total <= 1:
+        for index, args in enumerate(items):
+            if should_stop is not None and should_stop():
+                break
+            try:
+                results[index] = task(analyzer, *args)
+            except Exception as e:
+                logger.error(f"分析 {args[0]} 时出错", exc_info=True)
+                print(f"❌ {args[0]} 分析失败: {str(e)}")
+            report(index, results[index])
+        return results
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, total), initializer=_init_worker,
+                                   initargs=(worker_settings(analyzer),))
+    try:
+        futures = [executor.submit(_run_task, task, args) for args in items]
+        # 按提交顺序等待结果，保证进度回调有序
+        for index, future in enumerate(futures):
+            if should_stop is not None and should_stop():
+                for pending in futures[index:]:
+                    pending.cancel()
+                break
+            try:
+                result, error = future.result()
+            except Exception as e:
+                result, error = None, str(e)
+            if error is not None:
+                print(f"❌ {items[index][0]} 分析失败: {error}")
+            results[index] = result
+            report(index, result)
+    finally:
+        # 未开始的任务已在上面取消，cancel_futures参数需要Python 3.9
+        executor.shutdown(wait=True)
+
+    return results
@@ -0,0 +1,246 @@
+"""
+TradeMind Lite（轻量版）- 形态统计模块
+
+本模块统计每种K线形态出现后1日、5日和20日的前瞻收益率，得到实测的形态置信度。
+每只股票的统计量（样本数、收益率之和、平方和、上涨次数）由形态布尔矩阵与前瞻收益率矩阵
+的矩阵乘法一次得到，可以直接相加合并为整个观察列表的统计；
+结果按股票代码和最后一根K线的日期缓存，行情没有更新时不再重新计算。
+"""
+
+import re
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from trademind.backtest.cache import LRUFileCache
+from trademind.core.patterns import PatternScan, scan_candlestick_patterns
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 统计的前瞻天数
+FORWARD_HORIZONS = (1, 5, 20)
+
+# 计算实测置信度使用的前瞻天数
+CONFIDENCE_HORIZON = 5
+
+# 样本数少于该值时不使用实测置信度
+MIN_SAMPLES = 10
+
+# 形态预示的方向，1为看涨，-1为看跌，0为中性
+PATTERN_DIRECTIONS = {
+    "看跌十字星": -1,
+    "看涨十字星": 1,
+    "十字星": 0,
+    "锤子线": 1,
+    "吊颈线": -1,
+    "启明星": 1,
+    "黄昏星": -1,
+    "看涨吞没": 1,
+    "看跌吞没": -1
+}
+
+# 统计量的计算规则改变时递增，使旧的缓存结果失效
+STATS_VERSION = 1
+
+# 可累加的统计量列
+_SUM_COLUMNS = ['count', 'sum', 'sum_sq', 'up', 'down']
+
+
+def forward_returns(close: pd.Series, horizons: Sequence[int] = FORWARD_HORIZONS) -> np.ndarray:
+    """
+    计算每根K线之后的前瞻收益率
+
+    参数:
+        close: 收盘价序列
+        horizons: 前瞻天数
+
+    返回:
+        np.ndarray: K线×前瞻天数的收益率矩阵，未来数据不足处为NaN
+    """
+    values = close.to_numpy(dtype=float)
+    returns = np.full((len(values), len(horizons)), np.nan)
+    for j, horizon in enumerate(horizons):
+        if horizon < len(values):
+            returns[:-horizon, j] = values[horizon:] / values[:-horizon] - 1
+    return returns
+
+
+def pattern_return_stats(data: pd.DataFrame, scan: Optional[PatternScan] = None,
+                         horizons: Sequence[int] = FORWARD_HORIZONS) -> pd.DataFrame:
+    """
+    统计单只股票每种形态之后的前瞻收益率
+
+    参数:
+        data: 包含OHLC数据的DataFrame
+        scan: 已有的形态扫描结果，为None时重新扫描
+        horizons: 前瞻天数
+
+    返回:
+        pd.DataFrame: 以(pattern, horizon)为索引的可累加统计量，
+                      列为count, sum, sum_sq, up, down
+    """
+    scan = scan if scan is not None else scan_candlestick_patterns(data)
+    returns = forward_returns(data['Close'], horizons)
+    valid = ~np.isnan(returns)
+    filled = np.where(valid, returns, 0.0)
+    matches = scan.matches.to_numpy(dtype=float)
+
+    # 形态矩阵的转置乘以收益率矩阵，得到每种形态在每个前瞻天数上的统计量
+    stats = np.stack([
+        matches.T @ valid,
+        matches.T @ filled,
+        matches.T @ (filled * filled),
+        matches.T @ (filled > 0),
+        matches.T @ (filled < 0)
+    ], axis=-1)
+
+    index = pd.MultiIndex.from_product([list(scan.matches.columns), list(horizons)],
+                                       names=['pattern', 'horizon'])
+    return pd.DataFrame(stats.reshape(-1, len(_SUM_COLUMNS)), index=index, columns=_SUM_COLUMNS)
+
+
+def pool_pattern_stats(tables: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    合并多只股票的形态统计量
+
+    参数:
+        tables: pattern_return_stats的结果列表
+
+    返回:
+        pd.DataFrame: 合并后的统计量
+    """
+    tables = [table for table in tables if table is not None]
+    if not tables:
+        return pd.DataFrame(columns=_SUM_COLUMNS)
+    pooled = tables[0]
+    for table in tables[1:]:
+        pooled = pooled.add(table, fill_value=0)
+    return pooled
+
+
+def summarize_pattern_stats(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    由统计量计算前瞻收益率分布
+
+    参数:
+        table: pattern_return_stats或pool_pattern_stats的结果
+
+    返回:
+        pd.DataFrame: 包含samples, mean_return, std_return, win_rate, hit_rate的表，
+                      收益率和比率为百分比；hit_rate为按形态方向判断正确的比例
+    """
+    count = table['count'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = table['sum'].to_numpy() / count
+        variance = (table['sum_sq'].to_numpy() - count * mean * mean) / (count - 1)
+        win_rate = table['up'].to_numpy() / count
+
+    directions = np.array([PATTERN_DIRECTIONS.get(name, 0) for name in table.index.get_level_values('pattern')])
+    hits = np.where(directions < 0, table['down'].to_numpy(), table['up'].to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = hits / count
+
+    return pd.DataFrame({
+        'samples': count.astype(int),
+        'mean_return': np.round(mean * 100, 2),
+        'std_return': np.round(np.sqrt(np.maximum(variance, 0)) * 100, 2),
+        'win_rate': np.round(win_rate * 100, 1),
+        'hit_rate': np.round(hit_rate * 100, 1)
+    }, index=table.index)
+
+
+def measured_confidence(table: pd.DataFrame, horizon: int = CONFIDENCE_HORIZON,
+                        min_samples: int = MIN_SAMPLES) -> Dict[str, float]:
+    """
+    由形态统计量得到实测置信度
+
+    看涨和中性形态使用前瞻收益率为正的比例，看跌形态使用前瞻收益率为负的比例。
+
+    参数:
+        table: pattern_return_stats或pool_pattern_stats的结果
+        horizon: 使用的前瞻天数
+        min_samples: 最少样本数，样本不足的形态不返回
+
+    返回:
+        Dict[str, float]: 形态名称到置信度（0-100）的字典
+    """
+    if table is None or table.empty:
+        return {}
+    summary = summarize_pattern_stats(table)
+    summary = summary.xs(horizon, level='horizon')
+    summary = summary[summary['samples'] >= min_samples]
+    return {name: float(rate) for name, rate in summary['hit_rate'].items()}
+
+
+class PatternStatsCache(LRUFileCache):
+    """
+    按股票代码和最后一根K线日期缓存形态统计量
+
+    统计计数:
+        hits: 命中缓存，没有重新计算
+        misses: 没有缓存，重新计算
+        evictions: 因数量上限删除的文件
+        errors: 读写文件失败次数
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = "cache/pattern_stats",
+                 max_entries: int = 2000, max_memory_entries: int = 512):
+        """
+        初始化形态统计缓存
+
+        参数:
+            cache_dir: 缓存目录，为None时只使用内存
+            max_entries: 本地文件的最大条目数量，每个股票每个交易日产生一个文件
+            max_memory_entries: 内存中的最大条目数量
+        """
+        super().__init__(cache_dir, max_entries, max_memory_entries)
+
+    def key_for(self, symbol: str, data: pd.DataFrame) -> str:
+        """
+        生成缓存键
+
+        参数:
+            symbol: 股票代码
+            data: 包含OHLC数据的DataFrame
+
+        返回:
+            str: 由股票代码、最后一根K线日期和K线数量组成的缓存键
+        """
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        last_date = pd.Timestamp(data.index[-1]).strftime('%Y%m%d%H%M') if len(data) else 'empty'
+        return f"{safe_symbol}_{last_date}_{len(data)}_v{STATS_VERSION}"
+
+    def get(self, symbol: str, data: pd.DataFrame, scan: Optional[PatternScan] = None) -> pd.DataFrame:
+        """
+        获取形态统计量，没有缓存时计算并保存
+
+        参数:
+            symbol: 股票代码
+            data: 包含OHLC数据的DataFrame
+            scan: 已有的形态扫描结果
+
+        返回:
+            pd.DataFrame: pattern_return_stats的结果
+        """
+        key = self.key_for(symbol, data)
+        table = self._load(key)
+        if table is not None:
+            self.hits += 1
+            return table
+
+        self.misses += 1
+        table = pattern_return_stats(data, scan)
+        self._store(key, table)
+        return table
+
+    def _encode(self, table: pd.DataFrame) -> List[Dict]:
+        """把统计量转换为记录列表"""
+        return table.reset_index().to_dict('records')
+
+    def _decode(self, records: List[Dict]) -> pd.DataFrame:
+        """把记录列表转换回统计量"""
+        return pd.DataFrame(records).set_index(['pattern', 'horizon'])[_SUM_COLUMNS]
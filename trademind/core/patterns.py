@@ -2,10 +2,13 @@
 TradeMind Lite（轻量版）- 形态识别模块
 
 本模块包含K线形态识别相关的类和函数，用于识别各种技术形态。
+每条形态规则都对整段历史的错位OHLC数组做一次向量运算，得到K线×形态的布尔矩阵，
+最新K线的形态就是矩阵的最后一行。
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -24,138 +27,167 @@ class TechnicalPattern:
     description: str
 
 
-def identify_candlestick_patterns(data: pd.DataFrame) -> List[TechnicalPattern]:
+# 识别一根K线的形态需要的最少K线数量
+MIN_PATTERN_BARS = 5
+
+# 判断最新K线形态需要的历史长度，锤子线和吊颈线比较前后两段5日均价
+PATTERN_LOOKBACK = 10
+
+# 形态名称、基础置信度和描述，顺序与识别结果的顺序一致
+CANDLESTICK_PATTERNS = {
+    "看跌十字星": (80, "开盘价和收盘价接近，位于上升趋势之后，可能预示着反转"),
+    "看涨十字星": (80, "开盘价和收盘价接近，位于下降趋势之后，可能预示着反转"),
+    "十字星": (70, "开盘价和收盘价接近，表示市场犹豫不决"),
+    "锤子线": (85, "下影线较长，可能预示着底部反转"),
+    "吊颈线": (85, "上影线较长，可能预示着顶部反转"),
+    "启明星": (85, "三日反转形态，预示着可能的底部反转"),
+    "黄昏星": (85, "三日反转形态，预示着可能的顶部反转"),
+    "看涨吞没": (80, "两日反转形态，当天阳线吞没前一天阴线，预示着可能的底部反转"),
+    "看跌吞没": (80, "两日反转形态，当天阴线吞没前一天阳线，预示着可能的顶部反转")
+}
+
+# 与趋势方向相反时锤子线和吊颈线的置信度
+_COUNTER_TREND_CONFIDENCE = 60
+
+
+@dataclass
+class PatternScan:
     """
-    识别K线图中的蜡烛图形态。
+    全部历史的K线形态扫描结果
     
-    参数:
-        data: 包含OHLC数据的DataFrame，至少需要5根K线
-        
-    返回:
-        List[TechnicalPattern]: 识别出的形态列表
+    属性:
+        matches: K线×形态的布尔矩阵，列为CANDLESTICK_PATTERNS中的形态名称
+        confidence: 与matches形状相同的置信度矩阵，未出现形态处为0
     """
-    patterns = []
+    matches: pd.DataFrame
+    confidence: pd.DataFrame
     
-    if len(data) < 5:  # 增加到5根K线以获取更多上下文
-        return patterns
+    def patterns_at(self, position: int = -1,
+                    measured: Optional[Dict[str, float]] = None) -> List[TechnicalPattern]:
+        """
+        获取某根K线上识别出的形态
+        
+        参数:
+            position: K线位置，默认为最后一根
+            measured: 形态名称到实测置信度的字典，有实测值的形态使用实测值
+            
+        返回:
+            List[TechnicalPattern]: 识别出的形态列表
+        """
+        if self.matches.empty:
+            return []
+        measured = measured or {}
+        matched = self.matches.iloc[position].to_numpy()
+        confidence = self.confidence.iloc[position].to_numpy()
+        return [
+            TechnicalPattern(name=name, confidence=measured.get(name, int(confidence[i])),
+                             description=CANDLESTICK_PATTERNS[name][1])
+            for i, name in enumerate(self.matches.columns) if matched[i]
+        ]
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """数组向后错位，前periods个位置为NaN"""
+    shifted = np.full(len(values), np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+
+def scan_candlestick_patterns(data: pd.DataFrame) -> PatternScan:
+    """
+    识别每根K线的蜡烛图形态
     
-    # 获取最近的K线数据
-    latest = data.iloc[-1]
-    prev = data.iloc[-2]
-    prev2 = data.iloc[-3]
-    prev3 = data.iloc[-4]
-    prev4 = data.iloc[-5]
+    第i行的结果与identify_candlestick_patterns(data.iloc[:i+1])相同，
+    前MIN_PATTERN_BARS-1根K线的历史不足，不识别形态。
     
-    open_price = latest['Open']
-    close = latest['Close']
-    high = latest['High']
-    low = latest['Low']
+    参数:
+        data: 包含OHLC数据的DataFrame
+        
+    返回:
+        PatternScan: 形态布尔矩阵和置信度矩阵
+    """
+    open_price = data['Open'].to_numpy(dtype=float)
+    close = data['Close'].to_numpy(dtype=float)
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
     
-    body = abs(open_price - close)
-    upper_shadow = high - max(open_price, close)
-    lower_shadow = min(open_price, close) - low
+    body = np.abs(open_price - close)
+    upper_shadow = high - np.maximum(open_price, close)
+    lower_shadow = np.minimum(open_price, close) - low
     total_length = high - low
     
-    # 计算前几天的平均波动范围作为参考
-    avg_range = (data['High'] - data['Low']).iloc[-5:].mean()
-    
-    # 十字星形态 - 改进判断标准
-    if body <= total_length * 0.15 and total_length >= avg_range * 0.8:
-        # 增加位置判断，提高准确性
-        if prev['Close'] > prev['Open'] and close < open_price:  # 可能是看跌十字星
-            patterns.append(TechnicalPattern(
-                name="看跌十字星",
-                confidence=80,
-                description="开盘价和收盘价接近，位于上升趋势之后，可能预示着反转"
-            ))
-        elif prev['Close'] < prev['Open'] and close > open_price:  # 可能是看涨十字星
-            patterns.append(TechnicalPattern(
-                name="看涨十字星",
-                confidence=80,
-                description="开盘价和收盘价接近，位于下降趋势之后，可能预示着反转"
-            ))
-        else:
-            patterns.append(TechnicalPattern(
-                name="十字星",
-                confidence=70,
-                description="开盘价和收盘价接近，表示市场犹豫不决"
-            ))
+    # 最近5根K线的平均波动范围，以及最近5日和之前5日的平均收盘价
+    avg_range = (data['High'] - data['Low']).rolling(window=5, min_periods=1).mean().to_numpy()
+    recent_mean = data['Close'].rolling(window=5, min_periods=1).mean().to_numpy()
+    earlier_mean = _shift(recent_mean, 5)
     
-    # 锤子线 - 改进判断标准
-    if (lower_shadow > body * 2) and (upper_shadow < body * 0.3) and (body > 0):
-        # 增加趋势确认
-        if data['Close'].iloc[-5:].mean() > data['Close'].iloc[-10:-5].mean():
-            confidence = 60  # 在上升趋势中出现锤子线，降低置信度
-        else:
-            confidence = 85  # 在下降趋势中出现锤子线，提高置信度
-            
-        patterns.append(TechnicalPattern(
-            name="锤子线",
-            confidence=confidence,
-            description="下影线较长，可能预示着底部反转"
-        ))
-    
-    # 吊颈线 - 改进判断标准
-    if (upper_shadow > body * 2) and (lower_shadow < body * 0.3) and (body > 0):
-        # 增加趋势确认
-        if data['Close'].iloc[-5:].mean() < data['Close'].iloc[-10:-5].mean():
-            confidence = 60  # 在下降趋势中出现吊颈线，降低置信度
-        else:
-            confidence = 85  # 在上升趋势中出现吊颈线，提高置信度
-            
-        patterns.append(TechnicalPattern(
-            name="吊颈线",
-            confidence=confidence,
-            description="上影线较长，可能预示着顶部反转"
-        ))
+    prev_open, prev_close = _shift(open_price, 1), _shift(close, 1)
+    prev2_open, prev2_close = _shift(open_price, 2), _shift(close, 2)
+    bullish = close > open_price
+    bearish = close < open_price
     
-    # 增加启明星形态识别
-    if (len(data) >= 5 and 
-        prev2['Close'] < prev2['Open'] and  # 第一天是阴线
-        abs(prev['Close'] - prev['Open']) < abs(prev2['Close'] - prev2['Open']) * 0.5 and  # 第二天是小实体
-        close > open_price and  # 第三天是阳线
-        close > (prev2['Open'] + prev2['Close']) / 2):  # 第三天收盘价高于第一天实体中点
+    with np.errstate(invalid='ignore'):
+        # 十字星，按前一天的方向区分看涨和看跌
+        doji = (body <= total_length * 0.15) & (total_length >= avg_range * 0.8)
+        bearish_doji = doji & (prev_close > prev_open) & bearish
+        bullish_doji = doji & (prev_close < prev_open) & bullish
         
-        patterns.append(TechnicalPattern(
-            name="启明星",
-            confidence=85,
-            description="三日反转形态，预示着可能的底部反转"
-        ))
-    
-    # 增加黄昏星形态识别
-    if (len(data) >= 5 and 
-        prev2['Close'] > prev2['Open'] and  # 第一天是阳线
-        abs(prev['Close'] - prev['Open']) < abs(prev2['Close'] - prev2['Open']) * 0.5 and  # 第二天是小实体
-        close < open_price and  # 第三天是阴线
-        close < (prev2['Open'] + prev2['Close']) / 2):  # 第三天收盘价低于第一天实体中点
+        # 锤子线和吊颈线
+        hammer = (lower_shadow > body * 2) & (upper_shadow < body * 0.3) & (body > 0)
+        hanging_man = (upper_shadow > body * 2) & (lower_shadow < body * 0.3) & (body > 0)
         
-        patterns.append(TechnicalPattern(
-            name="黄昏星",
-            confidence=85,
-            description="三日反转形态，预示着可能的顶部反转"
-        ))
-    
-    # 增加吞没形态识别
-    if (prev['Close'] < prev['Open'] and  # 前一天是阴线
-        close > open_price and  # 当天是阳线
-        open_price < prev['Close'] and  # 当天开盘价低于前一天收盘价
-        close > prev['Open']):  # 当天收盘价高于前一天开盘价
+        # 启明星和黄昏星
+        small_body = np.abs(prev_close - prev_open) < np.abs(prev2_close - prev2_open) * 0.5
+        prev2_mid = (prev2_open + prev2_close) / 2
+        morning_star = (prev2_close < prev2_open) & small_body & bullish & (close > prev2_mid)
+        evening_star = (prev2_close > prev2_open) & small_body & bearish & (close < prev2_mid)
+        
+        # 吞没形态
+        bullish_engulfing = ((prev_close < prev_open) & bullish &
+                             (open_price < prev_close) & (close > prev_open))
+        bearish_engulfing = ((prev_close > prev_open) & bearish &
+                             (open_price > prev_close) & (close < prev_open))
         
-        patterns.append(TechnicalPattern(
-            name="看涨吞没",
-            confidence=80,
-            description="两日反转形态，当天阳线吞没前一天阴线，预示着可能的底部反转"
-        ))
+        # 趋势与形态方向相反时降低置信度
+        hammer_confidence = np.where(recent_mean > earlier_mean, _COUNTER_TREND_CONFIDENCE,
+                                     CANDLESTICK_PATTERNS["锤子线"][0])
+        hanging_man_confidence = np.where(recent_mean < earlier_mean, _COUNTER_TREND_CONFIDENCE,
+                                          CANDLESTICK_PATTERNS["吊颈线"][0])
+    
+    matches = np.column_stack([
+        bearish_doji, bullish_doji, doji & ~bearish_doji & ~bullish_doji,
+        hammer, hanging_man, morning_star, evening_star,
+        bullish_engulfing, bearish_engulfing
+    ]) if len(data) else np.zeros((0, len(CANDLESTICK_PATTERNS)), dtype=bool)
+    matches[:MIN_PATTERN_BARS - 1] = False
+    
+    confidence = np.tile([base for base, _ in CANDLESTICK_PATTERNS.values()], (len(data), 1))
+    confidence[:, 3] = hammer_confidence
+    confidence[:, 4] = hanging_man_confidence
+    confidence = np.where(matches, confidence, 0)
     
-    if (prev['Close'] > prev['Open'] and  # 前一天是阳线
-        close < open_price and  # 当天是阴线
-        open_price > prev['Close'] and  # 当天开盘价高于前一天收盘价
-        close < prev['Open']):  # 当天收盘价低于前一天开盘价
+    columns = list(CANDLESTICK_PATTERNS)
+    return PatternScan(
+        matches=pd.DataFrame(matches, index=data.index, columns=columns),
+        confidence=pd.DataFrame(confidence, index=data.index, columns=columns)
+    )
+
+
+def identify_candlestick_patterns(data: pd.DataFrame,
+                                  measured: Optional[Dict[str, float]] = None) -> List[TechnicalPattern]:
+    """
+    识别K线图中的蜡烛图形态。
+    
+    参数:
+        data: 包含OHLC数据的DataFrame，至少需要5根K线
+        measured: 形态名称到实测置信度的字典，见trademind.core.pattern_stats.measured_confidence
         
-        patterns.append(TechnicalPattern(
-            name="看跌吞没",
-            confidence=80,
-            description="两日反转形态，当天阴线吞没前一天阳线，预示着可能的顶部反转"
-        ))
+    返回:
+        List[TechnicalPattern]: 识别出的形态列表
+    """
+    if len(data) < MIN_PATTERN_BARS:  # 增加到5根K线以获取更多上下文
+        return []
     
-    return patterns 
\ No newline at end of file
+    # 最新K线的形态只依赖最近PATTERN_LOOKBACK根K线
+    return scan_candlestick_patterns(data.iloc[-PATTERN_LOOKBACK:]).patterns_at(-1, measured)
@@ -9,20 +9,31 @@ TradeMind - 压力位分析器模块
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 import logging
 
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.swings import window_swings
+from trademind.core.volume_profile import (
+    first_covering_bar,
+    price_edges,
+    volume_by_close,
+    volume_by_range
+)
+
 logger = logging.getLogger(__name__)
 
 class PressurePointAnalyzer:
-    def __init__(self, price_data: pd.DataFrame):
+    def __init__(self, price_data: pd.DataFrame, frame: IndicatorFrame = None):
         """
         初始化压力位分析器
         
         参数:
             price_data: 包含OHLCV数据的DataFrame
+            frame: 可选的IndicatorFrame，与其他分析环节共用指标中间结果
         """
         self.price_data = price_data
+        self.frame = frame if frame is not None else IndicatorFrame(price_data)
         self.fib_levels = [0.236, 0.382, 0.5, 0.618, 0.786]
         self.ma_periods = [20, 50, 200]
         
@@ -31,6 +42,35 @@ class PressurePointAnalyzer:
         self.resistance_levels = []
         self.all_levels = {}
         
+        # 子分析结果，按名称和参数缓存
+        self._results: Dict[Tuple, Any] = {}
+        
+    def _memoized(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        按名称和参数缓存子分析结果
+        
+        首次计算时记录子分析加入的支撑位和阻力位，重复调用时直接返回同一个结果对象，
+        并重新加入这些价位，与重新计算的效果相同。
+        
+        参数:
+            key: 子分析名称及其参数
+            compute: 未缓存时执行的计算
+            
+        返回:
+            Any: 子分析结果，在实例内共享，调用方不应修改
+        """
+        if key in self._results:
+            result, supports, resistances = self._results[key]
+            self.support_levels.extend(supports)
+            self.resistance_levels.extend(resistances)
+            return result
+        
+        support_count, resistance_count = len(self.support_levels), len(self.resistance_levels)
+        result = compute()
+        self._results[key] = (result, self.support_levels[support_count:],
+                              self.resistance_levels[resistance_count:])
+        return result
+        
     def calculate_fibonacci_levels(self, window: int = 120) -> Dict[float, float]:
         """
         计算Fibonacci回调位
@@ -41,6 +81,11 @@ class PressurePointAnalyzer:
         返回:
             Dict: Fibonacci水平位对应的价格
         """
+        return self._memoized(('fibonacci', window, tuple(self.fib_levels)),
+                              lambda: self._calculate_fibonacci_levels(window))
+    
+    def _calculate_fibonacci_levels(self, window: int) -> Dict[float, float]:
+        """计算Fibonacci回调位"""
         # 获取最近窗口期内的数据
         recent_data = self.price_data.tail(window)
         
@@ -94,6 +139,11 @@ class PressurePointAnalyzer:
         返回:
             List[Dict]: 主要价格区域及其强度
         """
+        return self._memoized(('price_distribution', window, bins),
+                              lambda: self._analyze_price_distribution(window, bins))
+    
+    def _analyze_price_distribution(self, window: int, bins: int) -> List[Dict]:
+        """基于Market Profile理论分析价格分布"""
         # 获取最近窗口期内的数据
         recent_data = self.price_data.tail(window)
         
@@ -102,11 +152,11 @@ class PressurePointAnalyzer:
         max_price = recent_data['High'].max()
         
         # 创建价格区间
-        bin_edges = np.linspace(min_price, max_price, bins + 1)
+        bin_edges = price_edges(min_price, max_price, bins)
         bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
         
         # 统计每个价格区间的交易量
-        hist, _ = np.histogram(recent_data['Close'], bins=bin_edges, weights=recent_data['Volume'])
+        hist = volume_by_close(bin_edges, recent_data['Close'], recent_data['Volume'])
         
         # 标准化成强度百分比
         if hist.sum() > 0:
@@ -139,12 +189,16 @@ class PressurePointAnalyzer:
         返回:
             Dict: 各周期均线位置
         """
+        return self._memoized(('ma_levels', tuple(self.ma_periods)), self._get_ma_support_resistance)
+    
+    def _get_ma_support_resistance(self) -> Dict[str, float]:
+        """计算移动平均线支撑压力位"""
         current_price = self.price_data['Close'].iloc[-1]
         ma_levels = {}
         
         for period in self.ma_periods:
             if len(self.price_data) >= period:
-                ma = self.price_data['Close'].rolling(window=period).mean().iloc[-1]
+                ma = self.frame.sma(period).iloc[-1]
                 ma_name = f'MA{period}'
                 ma_levels[ma_name] = ma
                 
@@ -167,27 +221,21 @@ class PressurePointAnalyzer:
         返回:
             Dict: 包含高点和低点的字典
         """
+        return self._memoized(('swing_points', window, lookaround),
+                              lambda: self._find_recent_swing_points(window, lookaround))
+    
+    def _find_recent_swing_points(self, window: int, lookaround: int) -> Dict[str, List]:
+        """寻找最近的高点和低点（摇摆点）"""
         # 获取最近窗口期内的数据
         recent_data = self.price_data.tail(window)
         
-        highs = []
-        lows = []
-        
-        # 找出局部高点和低点
-        for i in range(lookaround, len(recent_data) - lookaround):
-            # 获取当前位置的高低价
-            current_high = recent_data['High'].iloc[i]
-            current_low = recent_data['Low'].iloc[i]
-            
-            # 检查是否是局部高点
-            if all(current_high >= recent_data['High'].iloc[i-lookaround:i]) and \
-               all(current_high >= recent_data['High'].iloc[i+1:i+lookaround+1]):
-                highs.append((recent_data.index[i], current_high))
-            
-            # 检查是否是局部低点
-            if all(current_low <= recent_data['Low'].iloc[i-lookaround:i]) and \
-               all(current_low <= recent_data['Low'].iloc[i+1:i+lookaround+1]):
-                lows.append((recent_data.index[i], current_low))
+        # 在整段历史上识别一次摇摆点，取窗口内有完整比较范围的点
+        is_high = window_swings(self.frame.get('swing_high', 'High', lookaround),
+                                len(recent_data), lookaround)
+        is_low = window_swings(self.frame.get('swing_low', 'Low', lookaround),
+                               len(recent_data), lookaround)
+        highs = list(zip(recent_data.index[is_high], recent_data['High'].to_numpy()[is_high]))
+        lows = list(zip(recent_data.index[is_low], recent_data['Low'].to_numpy()[is_low]))
         
         # 排序并保留最显著的几个点
         highs.sort(key=lambda x: x[1], reverse=True)
@@ -219,6 +267,11 @@ class PressurePointAnalyzer:
         返回:
             List[Dict]: 成交量聚集区列表
         """
+        return self._memoized(('volume_clusters', window, threshold_pct),
+                              lambda: self._find_volume_clusters(window, threshold_pct))
+    
+    def _find_volume_clusters(self, window: int, threshold_pct: float) -> List[Dict]:
+        """寻找成交量聚集区"""
         # 获取最近窗口期内的数据
         recent_data = self.price_data.tail(window)
         
@@ -233,59 +286,39 @@ class PressurePointAnalyzer:
             bin_size = 0.005 * min_price
             bins = int(price_range / bin_size) + 1
         
-        bin_edges = np.linspace(min_price, max_price, bins + 1)
+        bin_edges = price_edges(min_price, max_price, bins)
         bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
         
-        # 计算每日价格范围内的成交量分布
-        daily_vol_dist = []
-        
-        for _, row in recent_data.iterrows():
-            # 对每个交易日，计算其成交量在各价格区间的分布
-            price_span = row['High'] - row['Low']
-            if price_span <= 0:
-                continue
-                
-            daily_bins = np.clip(
-                np.searchsorted(bin_edges, [row['Low'], row['High']]), 
-                0, 
-                len(bin_edges) - 1
-            )
-            
-            # 将当天成交量平均分配到价格区间内
-            vol_per_bin = row['Volume'] / (daily_bins[1] - daily_bins[0])
-            
-            for bin_idx in range(daily_bins[0], daily_bins[1]):
-                if bin_idx < len(bin_centers):
-                    daily_vol_dist.append((bin_centers[bin_idx], vol_per_bin))
-        
-        # 按价格分组并汇总成交量
-        price_vol = {}
-        for price, vol in daily_vol_dist:
-            price_bin = np.digitize(price, bin_edges) - 1
-            if 0 <= price_bin < len(bin_centers):
-                bin_price = bin_centers[price_bin]
-                price_vol[bin_price] = price_vol.get(bin_price, 0) + vol
+        # 每日成交量平均分配到其价格范围覆盖的区间
+        low, high, volume = recent_data['Low'], recent_data['High'], recent_data['Volume']
+        bin_volume, bin_counts = volume_by_range(bin_edges, low, high, volume)
         
-        # 计算总成交量
-        total_vol = sum(price_vol.values())
+        # 只考虑有成交的区间，按第一次出现的顺序排列
+        covered = np.flatnonzero(bin_counts > 0)
+        first_bar = first_covering_bar(bin_edges, low, high)[covered]
+        covered = covered[np.lexsort((covered, first_bar))]
         
         # 找出成交量占比高于阈值的价格区域
+        total_vol = bin_volume[covered].sum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_pct = bin_volume[covered] / total_vol * 100 if total_vol > 0 else np.zeros(len(covered))
+        selected = covered[vol_pct >= threshold_pct / bins]  # 根据bin数量调整阈值
+        
+        current_price = self.price_data['Close'].iloc[-1]
         vol_clusters = []
-        for price, vol in price_vol.items():
-            vol_pct = (vol / total_vol) * 100 if total_vol > 0 else 0
-            if vol_pct >= threshold_pct / bins:  # 根据bin数量调整阈值
-                vol_clusters.append({
-                    'price': price,
-                    'volume': vol,
-                    'volume_pct': vol_pct
-                })
-                
-                # 添加到支撑/阻力位列表
-                current_price = self.price_data['Close'].iloc[-1]
-                if price <= current_price:
-                    self.support_levels.append((price, "成交量聚集区"))
-                else:
-                    self.resistance_levels.append((price, "成交量聚集区"))
+        for bin_idx, pct in zip(selected, vol_pct[vol_pct >= threshold_pct / bins]):
+            price = bin_centers[bin_idx]
+            vol_clusters.append({
+                'price': price,
+                'volume': bin_volume[bin_idx],
+                'volume_pct': pct
+            })
+            
+            # 添加到支撑/阻力位列表
+            if price <= current_price:
+                self.support_levels.append((price, "成交量聚集区"))
+            else:
+                self.resistance_levels.append((price, "成交量聚集区"))
         
         # 按成交量占比排序
         vol_clusters.sort(key=lambda x: x['volume_pct'], reverse=True)
@@ -294,11 +327,24 @@ class PressurePointAnalyzer:
     
     def analyze(self) -> Dict:
         """
-        执行完整的压力位分析
+        执行完整的压力位分析，各项子分析每个实例只计算一次
         
         返回:
             Dict: 包含所有分析结果的字典
         """
+        key = ('analyze', tuple(self.fib_levels), tuple(self.ma_periods))
+        if key not in self._results:
+            result = self._analyze()
+            self._results[key] = (result, list(self.support_levels), list(self.resistance_levels))
+        
+        # 支撑位和阻力位恢复为完整分析后的结果
+        result, supports, resistances = self._results[key]
+        self.support_levels = list(supports)
+        self.resistance_levels = list(resistances)
+        return result
+    
+    def _analyze(self) -> Dict:
+        """执行完整的压力位分析"""
         # 清空之前的结果
         self.support_levels = []
         self.resistance_levels = []
@@ -0,0 +1,66 @@
+"""
+TradeMind Lite（轻量版）- 批量线性回归模块
+
+本模块用最小二乘的闭式解一次拟合多组点集的直线。每组点集是二维数组中的一行，
+用布尔掩码标记参与拟合的点，各组的点数可以不同；均值、离差平方和与协方差都按行
+用数组运算得到，不逐组调用scipy.stats.linregress，也不需要导入scipy。
+"""
+
+import logging
+from typing import Dict
+
+import numpy as np
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+def batched_linregress(x, y, mask=None) -> Dict[str, np.ndarray]:
+    """
+    批量拟合直线 y = slope * x + intercept
+
+    与scipy.stats.linregress的计算方式一致：先求均值再求离差，r限制在[-1, 1]之间；
+    y没有变化时r为0（linregress为NaN）。参与拟合的点少于2个或x没有变化的行，斜率、截距和r²为NaN。
+
+    参数:
+        x: 横坐标，形状为(组数, 点数)，也可以是各组共用的一维数组
+        y: 纵坐标，形状为(组数, 点数)
+        mask: 可选的布尔数组，形状与y相同，True表示该点参与拟合；为None时使用全部点
+
+    返回:
+        Dict[str, np.ndarray]: 每组的slope、intercept、r_squared和参与拟合的点数count
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+    if mask is None:
+        mask = np.ones(y.shape, dtype=bool)
+    mask = np.broadcast_to(np.asarray(mask, dtype=bool), y.shape)
+
+    # 未参与拟合的点记为0，不影响求和
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    count = mask.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x.sum(axis=1) / count
+        y_mean = y.sum(axis=1) / count
+        dx = np.where(mask, x - x_mean[:, None], 0.0)
+        dy = np.where(mask, y - y_mean[:, None], 0.0)
+        # 与linregress相同，使用除以点数后的平均离差平方和
+        ssxm = (dx * dx).sum(axis=1) / count
+        ssym = (dy * dy).sum(axis=1) / count
+        ssxym = (dx * dy).sum(axis=1) / count
+
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x_mean
+        r = np.where(ssym == 0, 0.0, ssxym / np.sqrt(ssxm * ssym))
+
+    # 两个点总在直线上，|r|为1，避免开方的舍入误差
+    r = np.where(count == 2, np.sign(ssxym), np.clip(r, -1.0, 1.0))
+    valid = (count >= 2) & (ssxm > 0)
+    return {
+        'slope': np.where(valid, slope, np.nan),
+        'intercept': np.where(valid, intercept, np.nan),
+        'r_squared': np.where(valid, r ** 2, np.nan),
+        'count': count
+    }
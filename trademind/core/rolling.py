@@ -0,0 +1,125 @@
+"""
+TradeMind Lite（轻量版）- 滚动统计模块
+
+本模块提供基于有序窗口的滚动百分位计算。窗口内的值保存在有序列表中，
+每根K线只做一次插入、一次删除和两次二分查找，避免为每个窗口重新排序。
+"""
+
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+import numpy as np
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 支持的百分位计算方式
+PERCENTILE_METHODS = ('average', 'strict')
+
+
+def _check_method(method: str):
+    """检查百分位计算方式"""
+    if method not in PERCENTILE_METHODS:
+        raise ValueError(f"不支持的百分位计算方式: {method}")
+
+
+class SortedWindow:
+    """固定大小的有序滑动窗口，缺失值占据窗口位置但不参与排序"""
+
+    def __init__(self, window: int):
+        """
+        初始化有序窗口
+
+        参数:
+            window: 窗口大小
+        """
+        if window <= 0:
+            raise ValueError(f"窗口大小必须为正数: {window}")
+        self.window = window
+        self.nan_count = 0
+        self._values = deque()
+        self._sorted = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        """窗口是否已满"""
+        return len(self._values) == self.window
+
+    def push(self, value: float):
+        """
+        加入一个值，窗口已满时移除最早的值
+
+        参数:
+            value: 新值，可以为NaN
+        """
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            if old != old:
+                self.nan_count -= 1
+            else:
+                del self._sorted[bisect_left(self._sorted, old)]
+
+        self._values.append(value)
+        if value != value:
+            self.nan_count += 1
+        else:
+            insort(self._sorted, value)
+
+    def percentile_rank(self, value: float, method: str = 'average') -> float:
+        """
+        计算value在窗口中的百分位，分母为窗口大小
+
+        参数:
+            value: 要计算百分位的值，通常为最近加入的值
+            method: 百分位计算方式，见rolling_percentile_rank
+
+        返回:
+            float: 百分位，无法计算时为NaN
+        """
+        _check_method(method)
+        strict = method == 'strict'
+        if value != value:
+            return 0.0 if strict else np.nan
+
+        less = bisect_left(self._sorted, value)
+        if strict:
+            return less / self.window
+        if self.nan_count:
+            return np.nan
+        equal = bisect_right(self._sorted, value) - less
+        return (less + (equal + 1) / 2) / self.window
+
+
+def rolling_percentile_rank(values, window: int, method: str = 'average') -> np.ndarray:
+    """
+    计算每个值在最近window个值（含自身）中的百分位
+
+    参数:
+        values: 输入序列（数组或pd.Series）
+        window: 窗口大小
+        method: 百分位计算方式
+            'average': 与pd.Series(x).rank(pct=True).iloc[-1]相同，相等值取平均排名，
+                       窗口内有缺失值时结果为NaN（与rolling(window).apply一致）
+            'strict': 窗口内严格小于当前值的数量除以window，缺失值不计入小于的数量
+
+    返回:
+        np.ndarray: 与输入等长的百分位序列，前window-1个值为NaN
+    """
+    sorted_window = SortedWindow(window)
+    _check_method(method)
+
+    x = np.asarray(values, dtype=float)
+    result = np.full(len(x), np.nan)
+    if len(x) < window:
+        return result
+
+    for i, value in enumerate(x.tolist()):
+        sorted_window.push(value)
+        if i >= window - 1:
+            result[i] = sorted_window.percentile_rank(value, method)
+
+    return result
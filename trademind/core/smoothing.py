@@ -0,0 +1,109 @@
+"""
+TradeMind Lite（轻量版）- 平滑计算模块
+
+本模块提供基于NumPy数组的指数平滑和Wilder平滑内核，供RSI、KDJ、ATR和ADX等指标共用。
+递推 y[i] = (1 - alpha) * y[i-1] + alpha * x[i] 作为一阶递归滤波器整体计算，
+不在Python中逐元素循环；有scipy时使用scipy.signal.lfilter，否则使用pandas的ewm。
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+_lfilter = None
+
+
+def _get_lfilter():
+    """延迟导入scipy.signal.lfilter，scipy不可用时返回None"""
+    global _lfilter
+    if _lfilter is None:
+        try:
+            from scipy.signal import lfilter
+            _lfilter = lfilter
+        except ImportError:
+            logger.debug("scipy不可用，平滑计算使用pandas实现")
+            _lfilter = False
+    return _lfilter or None
+
+
+def ema_filter(values, alpha: float, initial: Optional[float] = None) -> np.ndarray:
+    """
+    指数平滑递推
+
+    计算 y[i] = (1 - alpha) * y[i-1] + alpha * x[i]。
+
+    参数:
+        values: 输入序列（数组或pd.Series）
+        alpha: 平滑系数，0 < alpha <= 1
+        initial: 递推起点，即x[0]之前的平滑值；为None时 y[0] = x[0]
+
+    返回:
+        np.ndarray: 与输入等长的平滑结果
+    """
+    x = np.asarray(values, dtype=float)
+    if x.size == 0:
+        return x.copy()
+
+    if initial is None:
+        initial = x[0]
+        x = x[1:]
+        prefix = np.array([initial], dtype=float)
+    else:
+        prefix = np.empty(0, dtype=float)
+
+    if x.size == 0:
+        return prefix
+
+    lfilter = _get_lfilter()
+    if lfilter is not None:
+        y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * initial])
+    else:
+        seeded = pd.Series(np.concatenate(([initial], x)))
+        y = seeded.ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+    return np.concatenate((prefix, y))
+
+
+def wilder_smooth(values, period: int, initial: Optional[float] = None) -> np.ndarray:
+    """
+    Wilder平滑，等价于 y[i] = (y[i-1] * (period - 1) + x[i]) / period
+
+    参数:
+        values: 输入序列（数组或pd.Series）
+        period: 平滑周期
+        initial: 递推起点，即x[0]之前的平滑值；为None时 y[0] = x[0]
+
+    返回:
+        np.ndarray: 与输入等长的平滑结果
+    """
+    return ema_filter(values, 1.0 / period, initial)
+
+
+def seeded_smooth(values, alpha: float, start: int, inputs=None):
+    """
+    从指定位置开始对已有初值的序列做指数平滑
+
+    values[:start+1]保持不变，values[start]作为递推起点，之后的元素替换为平滑结果。
+    用于"先计算初始均值、再逐根K线平滑"的指标写法。
+
+    参数:
+        values: 初值序列（数组或pd.Series）
+        alpha: 平滑系数
+        start: 递推起点位置
+        inputs: 平滑输入序列，与values等长；为None时使用values本身
+
+    返回:
+        平滑后的新序列，values为pd.Series时返回pd.Series，否则返回np.ndarray
+    """
+    result = np.array(values, dtype=float)
+    if 0 <= start and start + 1 < len(result):
+        source = result if inputs is None else np.asarray(inputs, dtype=float)
+        result[start + 1:] = ema_filter(source[start + 1:], alpha, initial=result[start])
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
@@ -0,0 +1,528 @@
+"""
+TradeMind Lite（轻量版）- 流式指标模块
+
+本模块提供RSI、MACD、KDJ、布林带、ATR、ADX和动态RSI阈值的增量计算对象。
+每个对象先用历史数据初始化（seed），之后每来一根新K线调用一次update，
+只更新内部状态而不重新计算历史数据，结果与indicators模块中的批量计算函数一致。
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trademind.core.rolling import SortedWindow
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """与pandas相同的除法语义：除以零得到inf或NaN"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+class _RunningMean:
+    """固定窗口的滑动平均，定期重新求和以避免累积误差"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque()
+        self._sum = 0.0
+        self._updates = 0
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        self._sum += value
+        if len(self._values) > self.window:
+            self._sum -= self._values.popleft()
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._sum = math.fsum(self._values)
+        if len(self._values) < self.window:
+            return NAN
+        return self._sum / self.window
+
+
+class _RollingExtreme:
+    """单调队列实现的滚动最高/最低值"""
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self._queue = deque()
+        self._index = 0
+
+    def update(self, value: float) -> float:
+        queue = self._queue
+        if self.maximum:
+            while queue and queue[-1][1] <= value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] >= value:
+                queue.pop()
+        queue.append((self._index, value))
+        if queue[0][0] <= self._index - self.window:
+            queue.popleft()
+        self._index += 1
+        return queue[0][1] if self._index >= self.window else NAN
+
+
+class _EMA:
+    """与pd.Series.ewm(span, adjust=False, min_periods)相同的指数移动平均，跳过缺失值"""
+
+    def __init__(self, span: int, min_periods: int = 0):
+        self.alpha = 2.0 / (span + 1)
+        self.min_periods = min_periods
+        self.value = None
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if x == x:
+            self.value = x if self.value is None else (1 - self.alpha) * self.value + self.alpha * x
+            self.count += 1
+        return self.value if self.count >= self.min_periods and self.value is not None else NAN
+
+
+class StreamingIndicator(ABC):
+    """流式指标基类，子类必须实现_update"""
+
+    # update时从K线中读取的列
+    columns: Tuple[str, ...] = ('High', 'Low', 'Close')
+
+    def __init__(self):
+        self.value = None
+        self.bars = 0
+
+    def seed(self, data: pd.DataFrame):
+        """
+        使用历史数据初始化状态
+
+        参数:
+            data: 包含所需列的历史K线数据
+
+        返回:
+            最后一根K线的指标值，没有数据时为None
+        """
+        arrays = [data[column].to_numpy(dtype=float) for column in self.columns]
+        for row in zip(*arrays):
+            self._push(*row)
+        return self.value
+
+    def update(self, bar: Mapping):
+        """
+        加入一根新K线
+
+        参数:
+            bar: K线数据，可以是dict或pd.Series，需包含columns中的字段
+
+        返回:
+            新K线的指标值
+        """
+        return self._push(*(float(bar[column]) for column in self.columns))
+
+    def _push(self, *values):
+        self.value = self._update(*values)
+        self.bars += 1
+        return self.value
+
+    @abstractmethod
+    def _update(self, *values):
+        """
+        用一根K线更新内部状态
+
+        参数:
+            values: 按columns顺序排列的K线字段
+
+        返回:
+            该K线的指标值
+        """
+
+
+class StreamingRSI(StreamingIndicator):
+    """增量RSI，与calculate_rsi_series一致"""
+
+    columns = ('Close',)
+
+    def __init__(self, period: int = 14):
+        """
+        参数:
+            period: 周期，默认14日
+        """
+        super().__init__()
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._deltas = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def _update(self, close: float) -> float:
+        if self._prev_close is None:
+            self._prev_close = close
+            return NAN
+
+        delta = close - self._prev_close
+        self._prev_close = close
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        self._deltas += 1
+
+        # 前period个变化量累加后取简单平均作为初值，之后使用Wilder平滑
+        if self._deltas <= self.period:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if self._deltas < self.period:
+                return NAN
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        else:
+            alpha = 1 / self.period
+            self.avg_gain = (1 - alpha) * self.avg_gain + alpha * gain
+            self.avg_loss = (1 - alpha) * self.avg_loss + alpha * loss
+
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+
+class StreamingMACD(StreamingIndicator):
+    """增量MACD，与calculate_macd_series一致，返回(MACD线, 信号线, 柱状图)"""
+
+    columns = ('Close',)
+
+    def __init__(self):
+        super().__init__()
+        self._fast = _EMA(12, 12)
+        self._slow = _EMA(26, 26)
+        self._signal = _EMA(9, 9)
+
+    def _update(self, close: float) -> Tuple[float, float, float]:
+        macd_line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class StreamingKDJ(StreamingIndicator):
+    """增量KDJ，与calculate_kdj_series一致，返回(K, D, J)"""
+
+    def __init__(self, n: int = 9):
+        """
+        参数:
+            n: 周期，默认9日
+        """
+        super().__init__()
+        self.n = n
+        self._highest = _RollingExtreme(n, maximum=True)
+        self._lowest = _RollingExtreme(n, maximum=False)
+        self.k = 50.0
+        self.d = 50.0
+
+    def _update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        highest = self._highest.update(high)
+        lowest = self._lowest.update(low)
+
+        # 第n根K线之后才开始平滑，之前K、D保持初始值50
+        if self.bars >= self.n:
+            rsv = (close - lowest) / (highest - lowest) * 100 if highest != lowest else 0.0
+            self.k = 2 / 3 * self.k + rsv / 3
+            self.d = 2 / 3 * self.d + self.k / 3
+
+        j = 3 * self.k - 2 * self.d
+        return (min(max(self.k, 0.0), 100.0), min(max(self.d, 0.0), 100.0), min(max(j, 0.0), 100.0))
+
+
+class StreamingBollinger(StreamingIndicator):
+    """增量布林带，与calculate_bollinger_bands_series一致，返回(上轨, 中轨, 下轨, 带宽, 百分比B)"""
+
+    columns = ('Close',)
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        """
+        参数:
+            window: 移动平均窗口，默认20日
+            num_std: 标准差倍数，默认2.0
+        """
+        super().__init__()
+        self.window = window
+        self.num_std = num_std
+        self._values = deque()
+        self._shift = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def _update(self, close: float) -> Tuple[float, ...]:
+        if self._shift is None:
+            self._shift = close
+
+        # 相对于平移量累加，减小大数相减带来的精度损失
+        self._values.append(close)
+        offset = close - self._shift
+        self._sum += offset
+        self._sum_sq += offset * offset
+        if len(self._values) > self.window:
+            removed = self._values.popleft() - self._shift
+            self._sum -= removed
+            self._sum_sq -= removed * removed
+
+        # 每经过一个窗口重新求和，避免长时间运行的累积误差
+        if (self.bars + 1) % self.window == 0:
+            self._shift = self._values[0]
+            offsets = [value - self._shift for value in self._values]
+            self._sum = math.fsum(offsets)
+            self._sum_sq = math.fsum(value * value for value in offsets)
+
+        if len(self._values) < self.window:
+            return NAN, NAN, NAN, NAN, NAN
+
+        mean_offset = self._sum / self.window
+        variance = max((self._sum_sq - self._sum * mean_offset) / (self.window - 1), 0.0)
+        std = math.sqrt(variance)
+        middle = self._shift + mean_offset
+        upper = middle + std * self.num_std
+        lower = middle - std * self.num_std
+        return (upper, middle, lower, _divide(upper - lower, middle),
+                _divide(close - lower, upper - lower))
+
+
+class _TrueRange:
+    """真实波动幅度的增量计算，第一根K线为最高价减最低价"""
+
+    def __init__(self):
+        self._prev_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return tr
+
+
+class StreamingATR(StreamingIndicator):
+    """增量ATR，method为'wilder'时与回测中的Wilder平滑ATR一致，为'simple'时为TR的简单移动平均"""
+
+    def __init__(self, period: int = 14, method: str = 'wilder'):
+        """
+        参数:
+            period: 周期，默认14日
+            method: 'wilder'或'simple'
+        """
+        super().__init__()
+        if method not in ('wilder', 'simple'):
+            raise ValueError(f"不支持的ATR计算方式: {method}")
+        self.period = period
+        self.method = method
+        self._tr = _TrueRange()
+        self._mean = _RunningMean(period)
+
+    def _update(self, high: float, low: float, close: float) -> float:
+        tr = self._tr.update(high, low, close)
+        mean = self._mean.update(tr)
+        if self.method == 'simple' or self.bars < self.period:
+            return mean
+        return (self.value * (self.period - 1) + tr) / self.period
+
+
+class StreamingADX(StreamingIndicator):
+    """
+    增量ADX，与TrendAnalyzer.calculate_adx的平滑方式一致，返回包含adx, plus_di, minus_di的字典
+
+    批量计算在预热期使用全序列均值填充，无法增量得到，因此+DI/-DI从第period根K线、
+    ADX从第2*period根K线开始输出，之前为NaN。
+    """
+
+    def __init__(self, period: int = 14):
+        """
+        参数:
+            period: 周期，默认14日
+        """
+        super().__init__()
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._tr = _TrueRange()
+        self._tr_mean = _RunningMean(period)
+        self._plus_mean = _RunningMean(period)
+        self._minus_mean = _RunningMean(period)
+        self._prev_high: Optional[float] = None
+        self._prev_low: Optional[float] = None
+        self._tr_smoothed = NAN
+        self._plus_smoothed = NAN
+        self._minus_smoothed = NAN
+        self._dx_sum = 0.0
+        self.adx = NAN
+
+    def _update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        tr = self._tr.update(high, low, close)
+        plus_dm = minus_dm = 0.0
+        if self._prev_high is not None:
+            high_diff = high - self._prev_high
+            low_diff = low - self._prev_low
+            if high_diff > 0 and high_diff > abs(low_diff):
+                plus_dm = high_diff
+            if low_diff < 0 and abs(low_diff) > abs(high_diff):
+                minus_dm = abs(low_diff)
+        self._prev_high = high
+        self._prev_low = low
+
+        index = self.bars
+        period = self.period
+        tr_mean = self._tr_mean.update(tr)
+        plus_mean = self._plus_mean.update(plus_dm)
+        minus_mean = self._minus_mean.update(minus_dm)
+        if index < period - 1:
+            return {'adx': NAN, 'plus_di': NAN, 'minus_di': NAN}
+
+        if index == period - 1:
+            self._tr_smoothed, self._plus_smoothed, self._minus_smoothed = tr_mean, plus_mean, minus_mean
+        else:
+            a = self.alpha
+            self._tr_smoothed = self._tr_smoothed * (1 - a) + tr * a
+            self._plus_smoothed = self._plus_smoothed * (1 - a) + plus_dm * a
+            self._minus_smoothed = self._minus_smoothed * (1 - a) + minus_dm * a
+
+        tr_smoothed = self._tr_smoothed if self._tr_smoothed != 0 else 0.001
+        plus_di = 100 * (self._plus_smoothed / tr_smoothed)
+        minus_di = 100 * (self._minus_smoothed / tr_smoothed)
+        di_sum = plus_di + minus_di
+        dx = 100 * (abs(plus_di - minus_di) / (di_sum if di_sum != 0 else 0.001))
+
+        # ADX以第period到2*period-1根K线DX的均值为初值，之后指数平滑
+        if period <= index < 2 * period:
+            self._dx_sum += dx
+            if index == 2 * period - 1:
+                self.adx = self._dx_sum / period
+        elif index >= 2 * period:
+            self.adx = self.adx * (1 - self.alpha) + dx * self.alpha
+
+        return {'adx': self.adx, 'plus_di': plus_di, 'minus_di': minus_di}
+
+
+class StreamingDynamicRSI(StreamingIndicator):
+    """
+    增量动态RSI阈值，与calculate_dynamic_rsi_thresholds_series一致，
+    返回(RSI, 超卖阈值, 超买阈值, 波动率百分位)
+
+    波动率百分位使用有序窗口，每根K线为O(log lookback_period)次比较。
+    """
+
+    def __init__(self, rsi_period: int = 14, atr_period: int = 14,
+                 lookback_period: int = 252, max_adjustment: float = 15.0):
+        """
+        参数:
+            rsi_period: RSI计算周期，默认14日
+            atr_period: ATR计算周期，默认14日
+            lookback_period: 用于计算波动率百分位的历史回溯期，默认252日
+            max_adjustment: 最大阈值调整幅度，默认15
+        """
+        super().__init__()
+        self.max_adjustment = max_adjustment
+        self.lookback_period = lookback_period
+        self.min_bars = max(rsi_period, atr_period, lookback_period)
+        self._rsi = StreamingRSI(rsi_period)
+        self._atr = StreamingATR(atr_period, method='simple')
+        self._window = SortedWindow(lookback_period)
+        self._valid = 0
+
+    def _update(self, high: float, low: float, close: float) -> Tuple[float, float, float, float]:
+        rsi = self._rsi._push(close)
+        atr_pct = self._atr._push(high, low, close) / close * 100
+        self._window.push(atr_pct)
+        if atr_pct == atr_pct:
+            self._valid += 1
+
+        percentile = 0.5
+        if self.bars >= self.min_bars and self._valid > self.lookback_period:
+            percentile = self._window.percentile_rank(atr_pct, method='strict')
+
+        if self.bars < self.min_bars:
+            return rsi, 30.0, 70.0, percentile
+        return (rsi, 30 - percentile * self.max_adjustment,
+                70 + percentile * self.max_adjustment, percentile)
+
+
+class StreamingIndicators:
+    """单只股票的全部流式指标，用于实时监控"""
+
+    def __init__(self):
+        self.indicators = {
+            'rsi': StreamingRSI(),
+            'macd': StreamingMACD(),
+            'kdj': StreamingKDJ(),
+            'bollinger': StreamingBollinger(),
+            'atr': StreamingATR(),
+            'adx': StreamingADX(),
+            'dynamic_rsi': StreamingDynamicRSI()
+        }
+
+    def seed(self, data: pd.DataFrame) -> Dict:
+        """
+        使用历史数据初始化所有指标
+
+        参数:
+            data: 包含High, Low, Close列的历史K线数据
+
+        返回:
+            Dict: 最后一根K线的指标值，结构见snapshot
+        """
+        for indicator in self.indicators.values():
+            indicator.seed(data)
+        return self.snapshot()
+
+    def update(self, bar: Mapping) -> Dict:
+        """
+        加入一根新K线
+
+        参数:
+            bar: 包含High, Low, Close的K线数据
+
+        返回:
+            Dict: 新K线的指标值，结构见snapshot
+        """
+        for indicator in self.indicators.values():
+            indicator.update(bar)
+        return self.snapshot()
+
+    def snapshot(self) -> Dict:
+        """
+        获取当前指标值
+
+        返回:
+            Dict: 与calculate_indicator_series结构相同的指标字典（值为最新一根K线的数值），
+                  另外包含atr和adx
+        """
+        values = {name: indicator.value for name, indicator in self.indicators.items()}
+        if values['rsi'] is None:
+            return {}
+
+        macd_line, signal_line, histogram = values['macd']
+        k, d, j = values['kdj']
+        upper, middle, lower, bandwidth, percent_b = values['bollinger']
+        rsi, oversold, overbought, volatility = values['dynamic_rsi']
+        return {
+            'rsi': values['rsi'],
+            'macd': {'macd': macd_line, 'signal': signal_line, 'hist': histogram},
+            'kdj': {'k': k, 'd': d, 'j': j},
+            'bollinger': {
+                'upper': upper,
+                'middle': middle,
+                'lower': lower,
+                'bandwidth': bandwidth,
+                'percent_b': percent_b
+            },
+            'dynamic_rsi': {
+                'rsi': rsi,
+                'oversold': oversold,
+                'overbought': overbought,
+                'volatility': volatility
+            },
+            'atr': values['atr'],
+            'adx': values['adx']
+        }
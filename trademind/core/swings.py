@@ -0,0 +1,100 @@
+"""
+TradeMind Lite（轻量版）- 摇摆点识别模块
+
+本模块用滑动窗口的最大/最小值数组识别局部高点和低点（摇摆点）。每根K线与其前后
+lookaround根K线的极值比较，整段历史一次完成；压力位分析、趋势线和道氏理论分析
+通过IndicatorFrame共用同一份结果，每只股票只计算一次。
+"""
+
+import logging
+from typing import Callable, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+def neighbor_extremes(values, lookaround: int, func: Callable = np.max) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算每个位置之前和之后lookaround个值的极值
+
+    参数:
+        values: 输入序列
+        lookaround: 前后比较的数量
+        func: 极值函数，np.max或np.min，窗口内有NaN时结果为NaN
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 之前和之后lookaround个值的极值，不足lookaround个时为NaN
+    """
+    if lookaround <= 0:
+        raise ValueError(f"lookaround必须为正数: {lookaround}")
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    before = np.full(n, np.nan)
+    after = np.full(n, np.nan)
+    if n > lookaround:
+        # extremes[j]为x[j:j+lookaround]的极值
+        extremes = func(sliding_window_view(x, lookaround), axis=1)
+        before[lookaround:] = extremes[:n - lookaround]
+        after[:n - lookaround] = extremes[1:]
+    return before, after
+
+
+def swing_highs(values, lookaround: int = 5, strict: bool = False) -> np.ndarray:
+    """
+    识别局部高点
+
+    参数:
+        values: 价格序列
+        lookaround: 与前后多少根K线比较
+        strict: 为True时要求严格大于前后的值，否则大于等于即可
+
+    返回:
+        np.ndarray: 布尔数组，前后不足lookaround根K线或比较范围内有NaN的位置为False
+    """
+    x = np.asarray(values, dtype=float)
+    before, after = neighbor_extremes(x, lookaround, np.max)
+    if strict:
+        return (x > before) & (x > after)
+    return (x >= before) & (x >= after)
+
+
+def swing_lows(values, lookaround: int = 5, strict: bool = False) -> np.ndarray:
+    """
+    识别局部低点
+
+    参数:
+        values: 价格序列
+        lookaround: 与前后多少根K线比较
+        strict: 为True时要求严格小于前后的值，否则小于等于即可
+
+    返回:
+        np.ndarray: 布尔数组，前后不足lookaround根K线或比较范围内有NaN的位置为False
+    """
+    x = np.asarray(values, dtype=float)
+    before, after = neighbor_extremes(x, lookaround, np.min)
+    if strict:
+        return (x < before) & (x < after)
+    return (x <= before) & (x <= after)
+
+
+def window_swings(swings, window_length: int, lookaround: int) -> np.ndarray:
+    """
+    取出最近window_length根K线的摇摆点，只保留在窗口内有完整比较范围的点
+
+    在整段历史上识别的摇摆点，取最后window_length个并去掉前lookaround个，
+    与只用窗口内数据识别的结果相同。
+
+    参数:
+        swings: 整段历史的摇摆点布尔序列
+        window_length: 窗口长度
+        lookaround: 识别时使用的lookaround
+
+    返回:
+        np.ndarray: 窗口内的摇摆点布尔数组
+    """
+    mask = np.array(np.asarray(swings)[len(swings) - window_length:], dtype=bool)
+    mask[:lookaround] = False
+    return mask
@@ -0,0 +1,120 @@
+"""
+TradeMind Lite（轻量版）- 多周期数据模块
+
+本模块从日线OHLCV数据合成周线和月线数据，不需要重新下载。每根K线的开盘价取周期内
+第一个有效值、收盘价取最后一个有效值、最高最低价取极值、成交量求和，K线的日期为周期内
+最后一个交易日。日线按日期排好序时，每个周期是连续的一段行，直接按段归约，
+不经过groupby。
+"""
+
+import logging
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 周期名称到pandas周期频率的映射，使用Period频率以兼容各个pandas 2.x版本的月份别名
+TIMEFRAMES = {
+    'weekly': 'W-FRI',
+    'monthly': 'M'
+}
+
+# 默认附加分析的周期
+DEFAULT_TIMEFRAMES = ('weekly', 'monthly')
+
+# 周期分析所需的最少K线数量
+MIN_TIMEFRAME_BARS = 10
+
+# 各列的合成方式
+OHLCV_AGGREGATIONS = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum'
+}
+
+
+def _naive_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """去掉时区信息，保留交易所当地日期，用于划分周期"""
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def resample_ohlcv(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    把日线数据合成为更长周期的K线
+
+    参数:
+        data: 以日期为索引的日线OHLCV数据
+        timeframe: 周期名称，见TIMEFRAMES
+
+    返回:
+        pd.DataFrame: 合成后的K线，只包含OHLCV列，索引为每个周期最后一个交易日
+    """
+    return resample_timeframes(data, (timeframe,))[timeframe]
+
+
+def _aggregate_runs(ohlcv: pd.DataFrame, codes: np.ndarray) -> pd.DataFrame:
+    """
+    按连续相同的周期标签合成K线，要求日期已排序且没有缺失值
+
+    每个周期是一段连续的行，开盘价和收盘价直接取段首段尾，最高价、最低价和成交量
+    用ufunc.reduceat按段归约。
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    reducers = {
+        'first': lambda values: values[starts],
+        'last': lambda values: values[ends],
+        'max': lambda values: np.maximum.reduceat(values, starts),
+        'min': lambda values: np.minimum.reduceat(values, starts),
+        'sum': lambda values: np.add.reduceat(values, starts)
+    }
+    bars = {column: reducers[OHLCV_AGGREGATIONS[column]](ohlcv[column].to_numpy())
+            for column in ohlcv.columns}
+    return pd.DataFrame(bars, index=ohlcv.index[ends])
+
+
+def resample_timeframes(data: pd.DataFrame,
+                        timeframes: Iterable[str] = DEFAULT_TIMEFRAMES) -> Dict[str, pd.DataFrame]:
+    """
+    把日线数据一次合成为多个周期的K线
+
+    参数:
+        data: 以日期为索引的日线OHLCV数据
+        timeframes: 周期名称列表，见TIMEFRAMES
+
+    返回:
+        Dict[str, pd.DataFrame]: 周期名称到合成后K线的映射
+    """
+    timeframes = tuple(timeframes)
+    unknown = [timeframe for timeframe in timeframes if timeframe not in TIMEFRAMES]
+    if unknown:
+        raise ValueError(f"不支持的周期: {unknown}，可选: {list(TIMEFRAMES)}")
+
+    columns = {column: how for column, how in OHLCV_AGGREGATIONS.items() if column in data.columns}
+    ohlcv = data[list(columns)]
+    if ohlcv.empty:
+        return {timeframe: ohlcv.iloc[:0] for timeframe in timeframes}
+    # 开盘价和收盘价取决于日期顺序
+    if not ohlcv.index.is_monotonic_increasing:
+        ohlcv = ohlcv.sort_index()
+
+    naive = _naive_index(pd.DatetimeIndex(ohlcv.index))
+    # 没有缺失值时按连续段归约，否则使用groupby跳过缺失值
+    contiguous = not ohlcv.isna().to_numpy().any()
+    results = {}
+    for timeframe in timeframes:
+        periods = naive.to_period(TIMEFRAMES[timeframe])
+        if contiguous:
+            results[timeframe] = _aggregate_runs(ohlcv, periods.asi8)
+            continue
+        bars = ohlcv.groupby(periods, sort=True).agg(columns)
+        # 以周期内最后一个交易日作为K线日期
+        dates = ohlcv.index.to_series().groupby(periods, sort=True).last()
+        bars.index = pd.Index(dates.to_numpy(), name=ohlcv.index.name)
+        results[timeframe] = bars.dropna(subset=['Close']) if 'Close' in bars.columns else bars
+    return results
@@ -4,36 +4,74 @@ TradeMind - 趋势分析模块
 本模块实现了股票趋势分析功能，包括：
 - Dow Theory核心原则实现
 - ADX趋势强度指标
-- 趋势线自动识别
+- 趋势线自动识别（多窗口批量拟合）
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 import logging
-from scipy import stats
+
+from trademind.core.indicator_frame import IndicatorFrame
+from trademind.core.indicators import calculate_true_range
+from trademind.core.regression import batched_linregress
+from trademind.core.smoothing import seeded_smooth
+from trademind.core.swings import window_swings
 
 logger = logging.getLogger(__name__)
 
+# 多窗口趋势线的默认窗口大小
+TREND_LINE_WINDOWS = (20, 60, 120, 250)
+
+
+def _rolling_mean(values: np.ndarray, window: int, fill: float) -> np.ndarray:
+    """滚动均值，不足一个窗口的位置用fill填充"""
+    return pd.Series(values).rolling(window=window).mean().fillna(fill).to_numpy()
+
+
 class TrendAnalyzer:
-    def __init__(self, price_data: pd.DataFrame):
+    def __init__(self, price_data: pd.DataFrame, frame: IndicatorFrame = None):
         """
         初始化趋势分析器
         
         参数:
             price_data: 包含OHLCV数据的DataFrame
+            frame: 可选的IndicatorFrame，与其他分析环节共用指标中间结果
         """
         self.price_data = price_data
+        self.frame = frame if frame is not None else IndicatorFrame(price_data)
         self.adx_period = 14
         self.trend_threshold = 20  # ADX趋势强度阈值
         
+        # 子分析结果，按名称和参数缓存
+        self._results: Dict[Tuple, Any] = {}
+        
+    def _memoized(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        按名称和参数缓存子分析结果，重复调用直接返回同一个结果对象
+        
+        参数:
+            key: 子分析名称及其参数
+            compute: 未缓存时执行的计算
+            
+        返回:
+            Any: 子分析结果，在实例内共享，调用方不应修改
+        """
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+        
     def calculate_adx(self) -> Dict:
         """
-        计算ADX及方向指标
+        计算ADX及方向指标，同一周期只计算一次
         
         返回:
             Dict: 包含ADX, +DI, -DI的字典
         """
+        return self._memoized(('adx', self.adx_period), self._calculate_adx)
+        
+    def _calculate_adx(self) -> Dict:
+        """计算ADX及方向指标"""
         high = self.price_data['High']
         low = self.price_data['Low']
         close = self.price_data['Close']
@@ -52,92 +90,78 @@ class TrendAnalyzer:
         # 如果数据量仍然不足，返回默认值但添加警告
         if data_length < 10:  # 实际上需要至少10个数据点才能有意义
             print(f"警告: 数据量({data_length})太少，无法进行有效的ADX计算")
+            self.adx_period = original_period
             return {'adx': 15.0, 'plus_di': 10.0, 'minus_di': 10.0}  # 返回默认值而不是零值
         
         try:
             # 确保数据无缺失值
-            if high.isna().any() or low.isna().any() or close.isna().any():
+            has_nan = high.isna().any() or low.isna().any() or close.isna().any()
+            if has_nan:
                 # 填充NaN值
                 high = high.fillna(method='ffill').fillna(method='bfill')
                 low = low.fillna(method='ffill').fillna(method='bfill')
                 close = close.fillna(method='ffill').fillna(method='bfill')
                 print("警告: 数据中存在NaN值，已进行填充")
             
-            # 计算真实范围TR (使用绝对值避免负数)
-            tr1 = (high - low).abs()
-            tr2 = (high - close.shift(1)).abs()
-            tr3 = (low - close.shift(1)).abs()
-            tr = pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
+            # 计算真实范围TR，数据经过填充时基于填充后的价格重新计算
+            tr = calculate_true_range(high, low, close) if has_nan else self.frame.get('tr')
             
             # 计算方向移动 (改进计算逻辑)
-            plus_dm = pd.Series(0.0, index=high.index)
-            minus_dm = pd.Series(0.0, index=high.index)
+            # 计算高点和低点的变化，第一根K线没有变化量
+            high_diff = np.diff(high.to_numpy(dtype=float), prepend=np.nan)
+            low_diff = np.diff(low.to_numpy(dtype=float), prepend=np.nan)
             
-            # 计算高点和低点的变化
-            high_diff = high.diff()
-            low_diff = low.diff()
-            
-            # 使用向量化操作计算+DM和-DM
-            for i in range(1, len(high)):
-                # 当前高点高于前一个高点，当前低点高于前一个低点
-                if high_diff.iloc[i] > 0 and high_diff.iloc[i] > abs(low_diff.iloc[i]):
-                    plus_dm.iloc[i] = high_diff.iloc[i]
-                else:
-                    plus_dm.iloc[i] = 0.0
-                
-                # 当前低点低于前一个低点，当前高点低于前一个高点
-                if low_diff.iloc[i] < 0 and abs(low_diff.iloc[i]) > abs(high_diff.iloc[i]):
-                    minus_dm.iloc[i] = abs(low_diff.iloc[i])
-                else:
-                    minus_dm.iloc[i] = 0.0
+            # 使用向量化操作计算+DM和-DM，第一根K线记为0
+            plus_dm = np.where((high_diff > 0) & (high_diff > np.abs(low_diff)), high_diff, 0.0)
+            minus_dm = np.where((low_diff < 0) & (np.abs(low_diff) > np.abs(high_diff)), np.abs(low_diff), 0.0)
+            tr = tr.to_numpy(dtype=float)
             
             # 使用指数平滑而不是简单移动平均
             smoothing = 2.0 / (self.adx_period + 1)
             
-            # 计算初始值
-            tr_smoothed = tr.rolling(window=self.adx_period).mean().fillna(tr.mean())
-            plus_dm_smoothed = plus_dm.rolling(window=self.adx_period).mean().fillna(plus_dm.mean())
-            minus_dm_smoothed = minus_dm.rolling(window=self.adx_period).mean().fillna(minus_dm.mean())
+            # 计算初始值：滚动均值，不足一个周期的位置使用整体均值
+            tr_smoothed = _rolling_mean(tr, self.adx_period, fill=pd.Series(tr).mean())
+            plus_dm_smoothed = _rolling_mean(plus_dm, self.adx_period, fill=plus_dm.mean())
+            minus_dm_smoothed = _rolling_mean(minus_dm, self.adx_period, fill=minus_dm.mean())
             
             # 应用威尔德平滑方法
-            for i in range(self.adx_period, len(tr)):
-                tr_smoothed.iloc[i] = tr_smoothed.iloc[i-1] * (1 - smoothing) + tr.iloc[i] * smoothing
-                plus_dm_smoothed.iloc[i] = plus_dm_smoothed.iloc[i-1] * (1 - smoothing) + plus_dm.iloc[i] * smoothing
-                minus_dm_smoothed.iloc[i] = minus_dm_smoothed.iloc[i-1] * (1 - smoothing) + minus_dm.iloc[i] * smoothing
+            start = self.adx_period - 1
+            tr_smoothed = seeded_smooth(tr_smoothed, smoothing, start, inputs=tr)
+            plus_dm_smoothed = seeded_smooth(plus_dm_smoothed, smoothing, start, inputs=plus_dm)
+            minus_dm_smoothed = seeded_smooth(minus_dm_smoothed, smoothing, start, inputs=minus_dm)
             
             # 确保不除以零
-            tr_smoothed = tr_smoothed.replace(0, 0.001)
+            tr_smoothed[tr_smoothed == 0] = 0.001
             
             # 计算方向指标
             plus_di = 100 * (plus_dm_smoothed / tr_smoothed)
             minus_di = 100 * (minus_dm_smoothed / tr_smoothed)
             
             # 计算方向指标差异和总和
-            di_diff = (plus_di - minus_di).abs()
+            di_diff = np.abs(plus_di - minus_di)
             di_sum = plus_di + minus_di
             
             # 防止除以零
-            di_sum = di_sum.replace(0, 0.001)
+            di_sum[di_sum == 0] = 0.001
             
             # 计算DX
             dx = 100 * (di_diff / di_sum)
             
             # 检查DX是否包含有效值
-            if dx.isna().all():
+            if np.isnan(dx).all():
                 print("警告: DX计算结果全为NaN")
                 return {'adx': 15.0, 'plus_di': 10.0, 'minus_di': 10.0}  # 返回默认值
             
-            # 计算ADX - ADX是DX的平滑移动平均
-            adx = dx.rolling(window=self.adx_period).mean().fillna(method='bfill')
+            # 计算ADX - ADX是DX的平滑移动平均，不足一个周期的位置向后填充
+            adx = pd.Series(dx).rolling(window=self.adx_period).mean().bfill().to_numpy()
             
             # 应用平滑
-            for i in range(self.adx_period * 2, len(dx)):
-                adx.iloc[i] = adx.iloc[i-1] * (1 - smoothing) + dx.iloc[i] * smoothing
+            adx = seeded_smooth(adx, smoothing, self.adx_period * 2 - 1, inputs=dx)
             
             # 获取最新值
-            adx_value = adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 15.0
-            plus_di_value = plus_di.iloc[-1] if not pd.isna(plus_di.iloc[-1]) else 10.0
-            minus_di_value = minus_di.iloc[-1] if not pd.isna(minus_di.iloc[-1]) else 10.0
+            adx_value = adx[-1] if not pd.isna(adx[-1]) else 15.0
+            plus_di_value = plus_di[-1] if not pd.isna(plus_di[-1]) else 10.0
+            minus_di_value = minus_di[-1] if not pd.isna(minus_di[-1]) else 10.0
             
             # 确保不返回零值 (这会导致显示问题)
             if adx_value < 0.1:
@@ -162,6 +186,7 @@ class TrendAnalyzer:
             
         except Exception as e:
             print(f"ADX计算出错: {str(e)}")
+            self.adx_period = original_period
             # 返回默认值而不是零值
             return {'adx': 15.0, 'plus_di': 10.0, 'minus_di': 10.0}
     
@@ -176,80 +201,96 @@ class TrendAnalyzer:
         返回:
             Dict: 包含支撑和阻力趋势线参数
         """
-        # 获取最近窗口期内的数据
-        recent_data = self.price_data.tail(window)
+        return self._memoized(('trend_lines', window, min_points),
+                              lambda: self._fit_trend_lines((window,), min_points)[window])
+    
+    def multi_window_trend_lines(self, windows: Tuple[int, ...] = TREND_LINE_WINDOWS,
+                                 min_points: int = 3) -> Dict[int, Dict]:
+        """
+        在多个窗口上识别趋势线，所有窗口的支撑线和阻力线一次批量拟合
         
-        # 初始化结果
-        trend_lines = {
-            'support': {'slope': 0.0, 'intercept': 0.0, 'strength': 0},
-            'resistance': {'slope': 0.0, 'intercept': 0.0, 'strength': 0}
-        }
+        参数:
+            windows: 分析窗口大小列表
+            min_points: 确定趋势线所需的最小点数
+            
+        返回:
+            Dict[int, Dict]: 窗口大小到趋势线结果的映射，结果格式与identify_trend_lines相同
+        """
+        windows = tuple(windows)
         
-        # 不够数据进行分析
-        if len(recent_data) < min_points * 2:
+        def compute():
+            trend_lines = self._fit_trend_lines(windows, min_points)
+            # 单窗口的趋势线直接使用这次拟合的结果
+            for window, lines in trend_lines.items():
+                self._results.setdefault(('trend_lines', window, min_points), lines)
             return trend_lines
         
-        # 准备横坐标 - 用数字索引表示交易日
-        x = np.array(range(len(recent_data)))
-        
-        # 寻找局部低点作为支撑线的候选点
-        lows = []
-        for i in range(1, len(recent_data) - 1):
-            if recent_data['Low'].iloc[i] < recent_data['Low'].iloc[i-1] and \
-               recent_data['Low'].iloc[i] < recent_data['Low'].iloc[i+1]:
-                lows.append((i, recent_data['Low'].iloc[i]))
-        
-        # 寻找局部高点作为阻力线的候选点
-        highs = []
-        for i in range(1, len(recent_data) - 1):
-            if recent_data['High'].iloc[i] > recent_data['High'].iloc[i-1] and \
-               recent_data['High'].iloc[i] > recent_data['High'].iloc[i+1]:
-                highs.append((i, recent_data['High'].iloc[i]))
-        
-        # 如果找到足够的低点，计算支撑趋势线
-        if len(lows) >= min_points:
-            # 使用最小二乘法拟合直线
-            low_x = np.array([point[0] for point in lows])
-            low_y = np.array([point[1] for point in lows])
-            slope, intercept, r_value, p_value, std_err = stats.linregress(low_x, low_y)
+        return self._memoized(('trend_lines_by_window', windows, min_points), compute)
+    
+    def _fit_trend_lines(self, windows: Tuple[int, ...], min_points: int) -> Dict[int, Dict]:
+        """
+        批量拟合多个窗口的支撑和阻力趋势线
+        
+        每个窗口的局部低点和局部高点各占一行，窗口内的横坐标为交易日序号，
+        所有行用batched_linregress一次完成最小二乘拟合。
+        
+        参数:
+            windows: 分析窗口大小列表
+            min_points: 确定趋势线所需的最小点数
             
-            # 计算趋势线的强度 (R²值)
-            strength = int(r_value ** 2 * 100)
+        返回:
+            Dict[int, Dict]: 窗口大小到趋势线结果的映射
+        """
+        data_length = len(self.price_data)
+        lengths = [min(window, data_length) for window in windows]
+        width = max(lengths, default=0)
+        
+        # 局部低点作为支撑线的候选点，局部高点作为阻力线的候选点
+        low_values = self.price_data['Low'].to_numpy(dtype=float)
+        high_values = self.price_data['High'].to_numpy(dtype=float)
+        low_swings = self.frame.get('swing_low', 'Low', 1, True)
+        high_swings = self.frame.get('swing_high', 'High', 1, True)
+        
+        # 第2i行为第i个窗口的低点，第2i+1行为高点，窗口之外的位置不参与拟合
+        y = np.zeros((2 * len(windows), width))
+        mask = np.zeros((2 * len(windows), width), dtype=bool)
+        for i, length in enumerate(lengths):
+            y[2 * i, :length] = low_values[data_length - length:]
+            y[2 * i + 1, :length] = high_values[data_length - length:]
+            mask[2 * i, :length] = window_swings(low_swings, length, 1)
+            mask[2 * i + 1, :length] = window_swings(high_swings, length, 1)
+        
+        # 使用最小二乘法一次拟合所有直线
+        fit = batched_linregress(np.arange(width), y, mask)
+        
+        results = {}
+        for i, (window, length) in enumerate(zip(windows, lengths)):
+            # 初始化结果
+            trend_lines = {
+                'support': {'slope': 0.0, 'intercept': 0.0, 'strength': 0},
+                'resistance': {'slope': 0.0, 'intercept': 0.0, 'strength': 0}
+            }
+            results[window] = trend_lines
             
-            trend_lines['support']['slope'] = slope
-            trend_lines['support']['intercept'] = intercept
-            trend_lines['support']['strength'] = strength
-        
-        # 如果找到足够的高点，计算阻力趋势线
-        if len(highs) >= min_points:
-            # 使用最小二乘法拟合直线
-            high_x = np.array([point[0] for point in highs])
-            high_y = np.array([point[1] for point in highs])
-            slope, intercept, r_value, p_value, std_err = stats.linregress(high_x, high_y)
+            # 不够数据进行分析
+            if length < min_points * 2:
+                continue
             
-            # 计算趋势线的强度 (R²值)
-            strength = int(r_value ** 2 * 100)
+            for row, side in ((2 * i, 'support'), (2 * i + 1, 'resistance')):
+                # 找到足够的点时使用拟合结果，趋势线的强度为R²值
+                if fit['count'][row] >= min_points:
+                    trend_lines[side]['slope'] = fit['slope'][row]
+                    trend_lines[side]['intercept'] = fit['intercept'][row]
+                    trend_lines[side]['strength'] = int(fit['r_squared'][row] * 100)
             
-            trend_lines['resistance']['slope'] = slope
-            trend_lines['resistance']['intercept'] = intercept
-            trend_lines['resistance']['strength'] = strength
-        
-        # 计算趋势线的当前值
-        last_idx = len(recent_data) - 1
-        current_support = trend_lines['support']['slope'] * last_idx + trend_lines['support']['intercept']
-        current_resistance = trend_lines['resistance']['slope'] * last_idx + trend_lines['resistance']['intercept']
-        
-        trend_lines['support']['current_value'] = current_support
-        trend_lines['resistance']['current_value'] = current_resistance
-        
-        # 预测未来5个周期的趋势值
-        future_support = trend_lines['support']['slope'] * (last_idx + 5) + trend_lines['support']['intercept']
-        future_resistance = trend_lines['resistance']['slope'] * (last_idx + 5) + trend_lines['resistance']['intercept']
-        
-        trend_lines['support']['future_value'] = future_support
-        trend_lines['resistance']['future_value'] = future_resistance
-        
-        return trend_lines
+            # 计算趋势线的当前值，并预测未来5个周期的趋势值
+            last_idx = length - 1
+            for side in ('support', 'resistance'):
+                line = trend_lines[side]
+                line['current_value'] = line['slope'] * last_idx + line['intercept']
+                line['future_value'] = line['slope'] * (last_idx + 5) + line['intercept']
+        
+        return results
     
     def analyze_dow_theory(self) -> Dict:
         """
@@ -258,6 +299,10 @@ class TrendAnalyzer:
         返回:
             Dict: 包含主要趋势和次要趋势的判断
         """
+        return self._memoized(('dow_theory',), self._analyze_dow_theory)
+    
+    def _analyze_dow_theory(self) -> Dict:
+        """基于Dow Theory分析趋势"""
         # 检查数据量是否足够
         if len(self.price_data) < 50:
             return {
@@ -270,27 +315,17 @@ class TrendAnalyzer:
         volume = self.price_data['Volume']
         
         # 计算不同周期的移动平均线
-        ma20 = close.rolling(window=20).mean()
-        ma50 = close.rolling(window=50).mean()
+        ma20 = self.frame.sma(20)
+        ma50 = self.frame.sma(50)
         
         # 获取最近的收盘价和移动平均
         current_price = close.iloc[-1]
         ma20_value = ma20.iloc[-1]
         ma50_value = ma50.iloc[-1]
         
-        # 计算高点和低点历史
-        highs = []
-        lows = []
-        for i in range(20, len(self.price_data) - 20):
-            # 局部高点
-            if all(close.iloc[i] > close.iloc[i-20:i]) and \
-               all(close.iloc[i] > close.iloc[i+1:i+21]):
-                highs.append(close.iloc[i])
-            
-            # 局部低点
-            if all(close.iloc[i] < close.iloc[i-20:i]) and \
-               all(close.iloc[i] < close.iloc[i+1:i+21]):
-                lows.append(close.iloc[i])
+        # 计算高点和低点历史：严格高于/低于前后20根K线的收盘价
+        highs = close[self.frame.get('swing_high', 'Close', 20, True).to_numpy()].tolist()
+        lows = close[self.frame.get('swing_low', 'Close', 20, True).to_numpy()].tolist()
         
         # 检查最近20日是否形成高点或低点
         recent_high = False
@@ -353,6 +388,10 @@ class TrendAnalyzer:
         返回:
             int: 趋势强度值
         """
+        return self._memoized(('trend_strength', self.adx_period), self._calculate_trend_strength)
+    
+    def _calculate_trend_strength(self) -> int:
+        """计算趋势强度"""
         # 获取ADX值
         adx_result = self.calculate_adx()
         adx_value = adx_result.get('adx', 15.0)
@@ -393,11 +432,15 @@ class TrendAnalyzer:
         
     def analyze(self) -> Dict:
         """
-        执行完整的趋势分析
+        执行完整的趋势分析，各项子分析（包括ADX）每个实例只计算一次
         
         返回:
             Dict: 包含所有分析结果的字典
         """
+        return self._memoized(('analyze', self.adx_period, self.trend_threshold), self._analyze)
+    
+    def _analyze(self) -> Dict:
+        """执行完整的趋势分析"""
         # 计算ADX
         adx_result = self.calculate_adx()
         
@@ -407,7 +450,8 @@ class TrendAnalyzer:
         # 分析道氏理论
         dow_result = self.analyze_dow_theory()
         
-        # 识别趋势线
+        # 识别多个窗口的趋势线，默认窗口的趋势线共用同一次拟合
+        trend_lines_by_window = self.multi_window_trend_lines()
         trend_lines = self.identify_trend_lines()
         
         # 计算趋势强度
@@ -434,7 +478,8 @@ class TrendAnalyzer:
             'strength': strength,
             'adx': adx_result,
             'dow_theory': dow_result,
-            'trend_lines': trend_lines
+            'trend_lines': trend_lines,
+            'trend_lines_by_window': trend_lines_by_window
         }
         
         print(f"最终ADX结果: adx={adx_value}, plus_di={plus_di_value}, minus_di={minus_di_value}")
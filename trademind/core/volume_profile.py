@@ -0,0 +1,212 @@
+"""
+TradeMind Lite（轻量版）- 成交量分布模块
+
+本模块计算窗口内成交量在价格区间上的分布（Volume Profile）。每根K线的成交量
+平均分配到其最低价到最高价覆盖的价格区间，整段窗口的分布用加权bincount构造差分数组
+再累加得到，不逐根K线、逐个区间循环；也可以只把成交量计入收盘价所在的区间。
+在固定的价格区间上，VolumeProfile随窗口滑动增量更新，每根K线只加入一根、移除一根。
+"""
+
+import logging
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+def price_edges(low: float, high: float, bins: int) -> np.ndarray:
+    """
+    生成等宽价格区间的边界
+
+    参数:
+        low: 最低价
+        high: 最高价
+        bins: 区间数量
+
+    返回:
+        np.ndarray: bins+1个区间边界
+    """
+    return np.linspace(low, high, bins + 1)
+
+
+def range_bins(edges: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算每根K线覆盖的价格区间范围
+
+    参数:
+        edges: 价格区间边界
+        low: 最低价数组
+        high: 最高价数组
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 每根K线覆盖区间的起止序号[start, stop)
+    """
+    start = np.clip(np.searchsorted(edges, low), 0, len(edges) - 1)
+    stop = np.clip(np.searchsorted(edges, high), 0, len(edges) - 1)
+    return start, stop
+
+
+def _range_weights(edges: np.ndarray, low, high, volume) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """计算每根K线的覆盖区间和分配到每个区间的成交量，不覆盖任何区间的K线权重为0"""
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    start, stop = range_bins(edges, low, high)
+    # 价格区间为零或没有覆盖任何区间的K线不分配成交量
+    active = ~(high - low <= 0) & (stop > start)
+    start = np.where(active, start, 0)
+    stop = np.where(active, stop, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_bin = np.where(active, volume / (stop - start), 0.0)
+    return start, stop, per_bin
+
+
+def volume_by_range(edges: np.ndarray, low, high, volume) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把每根K线的成交量平均分配到其价格范围覆盖的区间
+
+    参数:
+        edges: 价格区间边界
+        low: 最低价数组
+        high: 最高价数组
+        volume: 成交量数组
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 每个区间的成交量，以及覆盖每个区间的K线数量
+    """
+    bins = len(edges) - 1
+    start, stop, per_bin = _range_weights(edges, low, high, volume)
+    active = stop > start
+
+    # 在起点加、终点减构造差分数组，累加后即为每个区间的成交量
+    delta = (np.bincount(start[active], weights=per_bin[active], minlength=bins + 1)
+             - np.bincount(stop[active], weights=per_bin[active], minlength=bins + 1))
+    counts = (np.bincount(start[active], minlength=bins + 1)
+              - np.bincount(stop[active], minlength=bins + 1))
+    return np.cumsum(delta)[:bins], np.cumsum(counts)[:bins]
+
+
+def first_covering_bar(edges: np.ndarray, low, high) -> np.ndarray:
+    """
+    计算每个区间第一次被覆盖的K线序号
+
+    参数:
+        edges: 价格区间边界
+        low: 最低价数组
+        high: 最高价数组
+
+    返回:
+        np.ndarray: 每个区间第一根覆盖它的K线序号，没有被覆盖的区间为K线数量
+    """
+    bins = len(edges) - 1
+    start, stop, _ = _range_weights(edges, low, high, np.ones(len(np.asarray(low))))
+    first = np.full(bins, len(start))
+    # 按K线顺序填充尚未被覆盖的区间，next_open[j]指向j及之后第一个未填充的区间（带路径压缩），
+    # 每个区间只填充一次，总耗时与K线数加区间数成线性
+    next_open = list(range(bins + 1))
+
+    def find(j: int) -> int:
+        root = j
+        while next_open[root] != root:
+            root = next_open[root]
+        while next_open[j] != root:
+            next_open[j], j = root, next_open[j]
+        return root
+
+    remaining = bins
+    starts, stops = start.tolist(), stop.tolist()
+    for bar in np.flatnonzero(stop > start).tolist():
+        j = find(starts[bar])
+        while j < stops[bar]:
+            first[j] = bar
+            next_open[j] = j + 1
+            remaining -= 1
+            j = find(j + 1)
+        if remaining == 0:
+            break
+    return first
+
+
+def volume_by_close(edges: np.ndarray, close, volume) -> np.ndarray:
+    """
+    把每根K线的成交量计入收盘价所在的区间，与np.histogram(close, edges, weights=volume)一致
+
+    参数:
+        edges: 价格区间边界
+        close: 收盘价数组
+        volume: 成交量数组
+
+    返回:
+        np.ndarray: 每个区间的成交量
+    """
+    bins = len(edges) - 1
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    index = np.searchsorted(edges, close, side='right') - 1
+    # 最后一个区间包含右边界
+    index[close == edges[-1]] = bins - 1
+    inside = (index >= 0) & (index < bins)
+    return np.bincount(index[inside], weights=volume[inside], minlength=bins)[:bins]
+
+
+class VolumeProfile:
+    """固定价格区间上的滑动窗口成交量分布，每根K线只做一次加入和一次移除"""
+
+    def __init__(self, edges: np.ndarray, window: int):
+        """
+        初始化成交量分布
+
+        参数:
+            edges: 价格区间边界，窗口滑动时保持不变
+            window: 窗口大小
+        """
+        if window <= 0:
+            raise ValueError(f"窗口大小必须为正数: {window}")
+        self.edges = np.asarray(edges, dtype=float)
+        self.window = window
+        self.volume = np.zeros(len(self.edges) - 1)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self._bars = deque()
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    @property
+    def full(self) -> bool:
+        """窗口是否已满"""
+        return len(self._bars) == self.window
+
+    def push(self, low: float, high: float, volume: float):
+        """
+        加入一根K线，窗口已满时移除最早的K线
+
+        参数:
+            low: 最低价
+            high: 最高价
+            volume: 成交量
+        """
+        if len(self._bars) == self.window:
+            start, stop, per_bin = self._bars.popleft()
+            self.volume[start:stop] -= per_bin
+            self.counts[start:stop] -= 1
+
+        start, stop, per_bin = _range_weights(self.edges, [low], [high], [volume])
+        bar = (int(start[0]), int(stop[0]), float(per_bin[0]))
+        self._bars.append(bar)
+        self.volume[bar[0]:bar[1]] += bar[2]
+        self.counts[bar[0]:bar[1]] += 1
+
+    def extend(self, low, high, volume):
+        """
+        依次加入多根K线
+
+        参数:
+            low: 最低价数组
+            high: 最高价数组
+            volume: 成交量数组
+        """
+        for values in zip(low, high, volume):
+            self.push(*values)
@@ -8,8 +8,24 @@ from trademind.data.loader import (
     get_stock_data,
     get_stock_info
 )
+from trademind.data.cache import OHLCVCache
+from trademind.data.context import MarketDataContext
+from trademind.data.providers import (
+    DataProvider,
+    YFinanceProvider,
+    LocalFileProvider,
+    get_default_provider,
+    set_default_provider
+)
 
 __all__ = [
     'get_stock_data',
-    'get_stock_info'
-] 
\ No newline at end of file
+    'get_stock_info',
+    'OHLCVCache',
+    'MarketDataContext',
+    'DataProvider',
+    'YFinanceProvider',
+    'LocalFileProvider',
+    'get_default_provider',
+    'set_default_provider'
+]
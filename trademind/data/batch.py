@@ -0,0 +1,89 @@
+"""
+TradeMind Lite（轻量版）- 批量行情下载模块
+
+本模块将多个股票代码分块批量下载，每块只发送一次请求，
+请求之间由自适应限速器控制节奏。
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from trademind.data.providers import DataProvider
+from trademind.data.rate_limit import AdaptiveRateLimiter, is_rate_limit_error
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+class BatchFetcher:
+    """
+    分块批量下载历史数据
+
+    每块股票代码调用一次数据源的batch_history。被限流时限速器拉长请求间隔并重试该块，
+    其他错误只记录日志，该块的股票返回空数据，由调用方逐个补充下载。
+    """
+
+    def __init__(self, provider: DataProvider, chunk_size: int = 50, max_retries: int = 3,
+                 limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        初始化批量下载器
+
+        参数:
+            provider: 行情数据源
+            chunk_size: 每次请求包含的股票数量
+            max_retries: 被限流时每块的最大重试次数
+            limiter: 请求限速器，默认创建新的AdaptiveRateLimiter
+        """
+        self.provider = provider
+        self.chunk_size = max(1, chunk_size)
+        self.max_retries = max_retries
+        self.limiter = limiter or AdaptiveRateLimiter()
+
+    def fetch(self, symbols: List[str], period: Optional[str] = None, interval: str = "1d",
+              start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        批量下载历史数据
+
+        参数:
+            symbols: 股票代码列表
+            period: 数据周期，与start二选一
+            interval: 数据间隔
+            start: 起始日期
+
+        返回:
+            Dict[str, pd.DataFrame]: 股票代码到历史数据的映射，顺序与symbols一致，下载失败的为空DataFrame
+        """
+        results = {}
+        for i in range(0, len(symbols), self.chunk_size):
+            chunk = symbols[i:i + self.chunk_size]
+            results.update(self._fetch_chunk(chunk, period, interval, start))
+
+        return {symbol: results.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+    def _fetch_chunk(self, chunk: List[str], period: Optional[str], interval: str,
+                     start: Optional[str]) -> Dict[str, pd.DataFrame]:
+        """下载一块股票代码，被限流时重试"""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait()
+            try:
+                frames = self.provider.batch_history(chunk, period=period, interval=interval, start=start)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    logger.error(f"批量下载 {len(chunk)} 个股票的历史数据失败: {str(e)}")
+                    return {}
+                self.limiter.backoff()
+                if attempt == self.max_retries:
+                    logger.error(f"批量下载被持续限流，放弃 {len(chunk)} 个股票")
+                    return {}
+                continue
+
+            # 整块都没有数据通常也是被限流，降低后续请求速度但不重试
+            if all(frame is None or frame.empty for frame in frames.values()):
+                self.limiter.backoff()
+            else:
+                self.limiter.success()
+            return frames
+
+        return {}
@@ -0,0 +1,435 @@
+"""
+TradeMind Lite（轻量版）- 行情数据缓存模块
+
+本模块提供本地持久化的OHLCV行情缓存。每个股票代码和数据间隔对应一个列式存储文件，
+缓存保留完整历史，再次请求时只下载最后一根已存K线之后的新数据。
+"""
+
+import os
+import re
+import time
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 数据周期对应的近似天数，用于判断缓存覆盖范围是否足够
+_PERIOD_UNITS = {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}
+_PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+# 重新下载的重叠K线与缓存价格的相对差超过该值时，认为历史价格已因拆股或分红重新复权
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def period_to_days(period: Optional[str]) -> float:
+    """
+    将yfinance风格的数据周期转换为近似天数
+
+    参数:
+        period: 数据周期，如5d, 1mo, 3y, ytd, max
+
+    返回:
+        float: 近似天数，max或None返回无穷大
+    """
+    if period is None or period == 'max':
+        return float('inf')
+    if period == 'ytd':
+        return float(_PERIOD_UNITS['y'])
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"不支持的数据周期: {period}")
+    return float(int(match.group(1)) * _PERIOD_UNITS[match.group(2)])
+
+
+class OHLCVCache:
+    """
+    OHLCV行情数据的本地列式缓存
+
+    每个(股票代码, 数据间隔)保存为一个npz文件，每列单独存储为一个NumPy数组。
+    读取时如果缓存已覆盖请求的周期，只增量下载最后一个时间戳之后的K线并追加保存。
+    增量下载包含缓存的最后一根K线，其价格与缓存不同时说明历史价格已重新复权，改为完整下载。
+
+    统计计数:
+        hits: 直接使用本地数据，没有新增K线
+        misses: 本地没有或覆盖范围不足，完整下载
+        appends: 增量下载并追加了新K线
+        appended_bars: 累计追加的K线数量
+        errors: 下载或读写失败次数
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = "cache/ohlcv", refresh_interval: float = 3600.0):
+        """
+        初始化行情缓存
+
+        参数:
+            cache_dir: 缓存目录
+            refresh_interval: 缓存文件在该秒数内更新过时，直接使用本地数据而不访问网络
+        """
+        self.cache_dir = Path(cache_dir)
+        self.refresh_interval = refresh_interval
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置命中统计"""
+        self.hits = 0
+        self.misses = 0
+        self.appends = 0
+        self.appended_bars = 0
+        self.errors = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+
+        返回:
+            Dict: 包含hits, misses, appends, appended_bars, errors的字典
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'appends': self.appends,
+            'appended_bars': self.appended_bars,
+            'errors': self.errors
+        }
+
+    def path_for(self, symbol: str, interval: str = "1d") -> Path:
+        """
+        获取股票代码和数据间隔对应的缓存文件路径
+
+        参数:
+            symbol: 股票代码
+            interval: 数据间隔
+
+        返回:
+            Path: 缓存文件路径
+        """
+        safe_symbol = re.sub(r'[^A-Za-z0-9._^=-]', '_', symbol)
+        return self.cache_dir / f"{safe_symbol}_{interval}.npz"
+
+    def load(self, symbol: str, interval: str = "1d") -> Optional[pd.DataFrame]:
+        """
+        读取缓存中的历史数据
+
+        参数:
+            symbol: 股票代码
+            interval: 数据间隔
+
+        返回:
+            Optional[pd.DataFrame]: 缓存的数据，不存在或损坏时返回None
+        """
+        frame, _ = self._read(symbol, interval)
+        return frame
+
+    def save(self, symbol: str, frame: pd.DataFrame, interval: str = "1d", period: str = "max"):
+        """
+        将历史数据写入缓存
+
+        参数:
+            symbol: 股票代码
+            frame: OHLCV数据
+            interval: 数据间隔
+            period: 该数据覆盖的周期
+        """
+        path = self.path_for(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        numeric = frame.select_dtypes(include=[np.number])
+        tz = str(frame.index.tz) if getattr(frame.index, 'tz', None) is not None else ''
+        arrays = {
+            '__index__': frame.index.asi8 if isinstance(frame.index, pd.DatetimeIndex)
+                         else pd.DatetimeIndex(frame.index).asi8,
+            '__columns__': np.array(list(numeric.columns), dtype=str),
+            '__tz__': np.array(tz),
+            '__period__': np.array(period),
+            '__index_name__': np.array(frame.index.name or 'Date'),
+        }
+        for i, column in enumerate(numeric.columns):
+            arrays[f'col_{i}'] = numeric[column].to_numpy(dtype=np.float64)
+
+        # 先写临时文件再替换，避免中断时留下损坏的缓存
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+
+    def clear(self, symbol: Optional[str] = None, interval: str = "1d") -> int:
+        """
+        清除缓存文件
+
+        参数:
+            symbol: 股票代码，为None时清除所有缓存
+            interval: 数据间隔
+
+        返回:
+            int: 删除的文件数量
+        """
+        if symbol is not None:
+            paths = [self.path_for(symbol, interval)]
+        else:
+            paths = list(self.cache_dir.glob("*.npz")) if self.cache_dir.exists() else []
+
+        count = 0
+        for path in paths:
+            if path.exists():
+                path.unlink()
+                count += 1
+        return count
+
+    def get(self, symbol: str, fetch: Callable[..., pd.DataFrame], period: str = "3y",
+            interval: str = "1d") -> pd.DataFrame:
+        """
+        获取历史数据，优先使用缓存并只增量下载新K线
+
+        参数:
+            symbol: 股票代码
+            fetch: 下载函数，签名为fetch(symbol, period=None, interval="1d", start=None)
+            period: 请求的数据周期
+            interval: 数据间隔
+
+        返回:
+            pd.DataFrame: 请求周期内的历史数据
+        """
+        cached, cached_period = self._read(symbol, interval)
+
+        # 缓存不存在或覆盖范围不足时完整下载
+        if cached is None or cached.empty or period_to_days(cached_period) < period_to_days(period):
+            return self._download(symbol, fetch, period, interval)
+
+        # 缓存刚更新过，直接使用本地数据
+        if self._is_fresh(symbol, interval):
+            self.hits += 1
+            return self._slice(cached, period)
+
+        # 只下载最后一个已存时间戳之后的数据
+        last_ts = cached.index[-1]
+        try:
+            new_data = fetch(symbol, interval=interval, start=last_ts.strftime('%Y-%m-%d'))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"增量更新 {symbol} 失败，使用缓存数据: {str(e)}")
+            return self._slice(cached, period)
+
+        if self._readjusted(cached, new_data):
+            logger.info(f"{symbol} 的历史价格已重新复权，重新下载完整数据")
+            frame = self._download(symbol, fetch, cached_period, interval)
+            return self._slice(frame if not frame.empty else cached, period)
+
+        return self._merge(symbol, cached, cached_period, new_data, period, interval)
+
+    def get_many(self, symbols: List[str], fetch_many: Callable[..., Dict[str, pd.DataFrame]],
+                 period: str = "3y", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多个股票的历史数据
+
+        与get相同的缓存规则，但需要下载的股票合并为批量请求：缓存缺失的股票一次完整下载，
+        需要增量更新的股票按最后一根K线的日期分组，每组一次请求。
+
+        参数:
+            symbols: 股票代码列表
+            fetch_many: 批量下载函数，签名为fetch_many(symbols, period=None, interval="1d", start=None)，
+                        返回股票代码到DataFrame的映射
+            period: 请求的数据周期
+            interval: 数据间隔
+
+        返回:
+            Dict[str, pd.DataFrame]: 股票代码到历史数据的映射，顺序与symbols一致
+        """
+        results = {}
+        missing = []
+        stale: Dict[str, list] = {}
+
+        for symbol in symbols:
+            cached, cached_period = self._read(symbol, interval)
+            if cached is None or cached.empty or period_to_days(cached_period) < period_to_days(period):
+                missing.append(symbol)
+            elif self._is_fresh(symbol, interval):
+                self.hits += 1
+                results[symbol] = self._slice(cached, period)
+            else:
+                start = cached.index[-1].strftime('%Y-%m-%d')
+                stale.setdefault(start, []).append((symbol, cached, cached_period))
+
+        if missing:
+            self.misses += len(missing)
+            try:
+                frames = fetch_many(missing, period=period, interval=interval)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"批量下载 {len(missing)} 个股票的历史数据失败: {str(e)}")
+                frames = {}
+            for symbol in missing:
+                frame = frames.get(symbol)
+                if frame is not None and not frame.empty:
+                    self._write(symbol, frame, interval, period)
+                results[symbol] = frame if frame is not None else pd.DataFrame()
+
+        # 历史价格重新复权的股票按缓存覆盖的周期分组重新完整下载
+        readjusted: Dict[str, list] = {}
+        for start, entries in stale.items():
+            try:
+                frames = fetch_many([symbol for symbol, _, _ in entries], interval=interval, start=start)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"批量增量更新失败，使用缓存数据: {str(e)}")
+                frames = {}
+            for symbol, cached, cached_period in entries:
+                new_data = frames.get(symbol)
+                if self._readjusted(cached, new_data):
+                    logger.info(f"{symbol} 的历史价格已重新复权，重新下载完整数据")
+                    readjusted.setdefault(cached_period, []).append((symbol, cached))
+                else:
+                    results[symbol] = self._merge(symbol, cached, cached_period, new_data, period, interval)
+
+        for cached_period, entries in readjusted.items():
+            self.misses += len(entries)
+            try:
+                frames = fetch_many([symbol for symbol, _ in entries], period=cached_period, interval=interval)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"批量重新下载失败，使用缓存数据: {str(e)}")
+                frames = {}
+            for symbol, cached in entries:
+                frame = frames.get(symbol)
+                if frame is not None and not frame.empty:
+                    self._write(symbol, frame, interval, cached_period)
+                    results[symbol] = self._slice(frame, period)
+                else:
+                    results[symbol] = self._slice(cached, period)
+
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def _download(self, symbol: str, fetch: Callable[..., pd.DataFrame], period: str,
+                  interval: str) -> pd.DataFrame:
+        """完整下载请求周期的数据并写入缓存"""
+        self.misses += 1
+        try:
+            frame = fetch(symbol, period=period, interval=interval)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"下载 {symbol} 的历史数据失败: {str(e)}")
+            return pd.DataFrame()
+
+        if frame is not None and not frame.empty:
+            self._write(symbol, frame, interval, period)
+        return frame if frame is not None else pd.DataFrame()
+
+    def _readjusted(self, cached: pd.DataFrame, new_data: Optional[pd.DataFrame]) -> bool:
+        """
+        判断缓存的历史价格是否已经过时
+
+        复权数据在拆股或分红后会整体改变历史价格，只追加新K线会在新旧数据之间留下虚假的跳空。
+        增量下载从缓存的最后一根K线开始，比较这根K线的开盘价（没有开盘价时用收盘价）；
+        最后一根K线可能是盘中数据，收盘价会变化，开盘价不会。
+        """
+        if new_data is None or new_data.empty:
+            return False
+        last_ts = cached.index[-1]
+        new_data = self._align_tz(new_data, cached.index)
+        if last_ts not in new_data.index:
+            return False
+        column = 'Open' if 'Open' in cached.columns and 'Open' in new_data.columns else 'Close'
+        old_price = cached[column].iloc[-1]
+        new_price = new_data.loc[[last_ts], column].iloc[-1]
+        if pd.isna(old_price) or pd.isna(new_price):
+            return False
+        return not np.isclose(new_price, old_price, rtol=ADJUSTMENT_TOLERANCE, atol=0.0)
+
+    def _merge(self, symbol: str, cached: pd.DataFrame, cached_period: str, new_data: Optional[pd.DataFrame],
+               period: str, interval: str) -> pd.DataFrame:
+        """将增量下载的数据合并到缓存并返回请求周期内的数据"""
+        if new_data is None or new_data.empty:
+            self.hits += 1
+            self._touch(symbol, interval)
+            return self._slice(cached, period)
+
+        last_ts = cached.index[-1]
+        new_data = self._align_tz(new_data, cached.index)
+        new_data = new_data[new_data.index >= last_ts]
+        new_bars = int((new_data.index > last_ts).sum())
+
+        # 最后一根K线可能是盘中数据，用新数据替换
+        merged = pd.concat([cached[cached.index < new_data.index.min()], new_data]) if not new_data.empty else cached
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        if new_bars > 0:
+            self.appends += 1
+            self.appended_bars += new_bars
+        else:
+            self.hits += 1
+
+        self._write(symbol, merged, interval, cached_period)
+        return self._slice(merged, period)
+
+    def _read(self, symbol: str, interval: str):
+        """读取缓存文件，返回(数据, 覆盖周期)"""
+        path = self.path_for(symbol, interval)
+        if not path.exists():
+            return None, None
+
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                columns = [str(c) for c in npz['__columns__']]
+                tz = str(npz['__tz__'])
+                period = str(npz['__period__'])
+                index_name = str(npz['__index_name__'])
+                index = pd.DatetimeIndex(npz['__index__'].astype('datetime64[ns]'))
+                if tz:
+                    index = index.tz_localize('UTC').tz_convert(tz)
+                data = {column: npz[f'col_{i}'] for i, column in enumerate(columns)}
+            frame = pd.DataFrame(data, index=index, columns=columns)
+            frame.index.name = index_name
+            return frame, period
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"读取 {symbol} 的缓存文件失败: {str(e)}")
+            return None, None
+
+    def _write(self, symbol: str, frame: pd.DataFrame, interval: str, period: str):
+        """写入缓存，失败时只记录日志"""
+        try:
+            self.save(symbol, frame, interval, period)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"写入 {symbol} 的缓存文件失败: {str(e)}")
+
+    def _is_fresh(self, symbol: str, interval: str) -> bool:
+        """判断缓存文件是否在刷新间隔内更新过"""
+        if self.refresh_interval <= 0:
+            return False
+        path = self.path_for(symbol, interval)
+        return time.time() - path.stat().st_mtime < self.refresh_interval
+
+    def _touch(self, symbol: str, interval: str):
+        """更新缓存文件的修改时间，表示刚检查过新数据"""
+        try:
+            os.utime(self.path_for(symbol, interval))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _align_tz(frame: pd.DataFrame, reference: pd.DatetimeIndex) -> pd.DataFrame:
+        """将新数据的时区与缓存数据对齐"""
+        if not isinstance(frame.index, pd.DatetimeIndex) or frame.index.tz == reference.tz:
+            return frame
+        frame = frame.copy()
+        if reference.tz is None:
+            frame.index = frame.index.tz_localize(None)
+        elif frame.index.tz is None:
+            frame.index = frame.index.tz_localize(reference.tz)
+        else:
+            frame.index = frame.index.tz_convert(reference.tz)
+        return frame
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+        """截取请求周期内的数据"""
+        days = period_to_days(period)
+        if days == float('inf') or frame.empty:
+            return frame
+        cutoff = frame.index[-1] - pd.Timedelta(days=days)
+        return frame[frame.index > cutoff]
@@ -0,0 +1,79 @@
+"""
+TradeMind Lite（轻量版）- 行情数据上下文模块
+
+本模块提供单次分析运行内共享的行情数据上下文。上下文持有每个股票代码已下载的数据，
+指标、形态、回测、压力位和趋势分析等环节都从上下文读取同一份数据，
+保证每次运行每个股票只下载一次。
+"""
+
+import logging
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+class MarketDataContext:
+    """
+    单次分析运行的行情数据上下文
+
+    第一次请求某个股票代码时调用loader下载数据，之后的请求直接返回同一个DataFrame。
+    """
+
+    def __init__(self, loader: Callable[[str], pd.DataFrame]):
+        """
+        初始化行情数据上下文
+
+        参数:
+            loader: 数据加载函数，签名为loader(symbol) -> pd.DataFrame
+        """
+        self.loader = loader
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.downloads = 0
+
+    def get(self, symbol: str) -> pd.DataFrame:
+        """
+        获取股票数据，只在第一次请求时下载
+
+        参数:
+            symbol: 股票代码
+
+        返回:
+            pd.DataFrame: 股票历史数据，获取失败时为空DataFrame
+        """
+        if symbol not in self.frames:
+            frame = self.loader(symbol)
+            self.downloads += 1
+            self.frames[symbol] = frame if frame is not None else pd.DataFrame()
+        return self.frames[symbol]
+
+    def put(self, symbol: str, frame: pd.DataFrame):
+        """
+        放入已经获取的数据
+
+        参数:
+            symbol: 股票代码
+            frame: 股票历史数据
+        """
+        self.frames[symbol] = frame
+
+    def release(self, symbol: str):
+        """
+        释放某个股票的数据
+
+        参数:
+            symbol: 股票代码
+        """
+        self.frames.pop(symbol, None)
+
+    def symbols(self) -> List[str]:
+        """返回上下文中已有数据的股票代码"""
+        return list(self.frames.keys())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.frames
+
+    def __len__(self) -> int:
+        return len(self.frames)
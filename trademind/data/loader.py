@@ -8,13 +8,14 @@ import os
 import json
 import time
 import logging
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional, List, Tuple, Any, Union
 import re
 from collections import OrderedDict as CollectionsOrderedDict
 
+from trademind.data.providers import get_default_provider
+
 # 设置日志
 logger = logging.getLogger(__name__)
 
@@ -32,13 +33,13 @@ def get_stock_data(symbol: str, period: str = "1y", interval: str = "1d") -> pd.
     """
     try:
         # 获取更长时间的历史数据，确保有足够的数据进行回测
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period, interval=interval)
+        provider = get_default_provider()
+        hist = provider.history(symbol, period=period, interval=interval)
         
         if hist.empty or len(hist) < 100:  # 确保至少有100个交易日的数据
             print(f"⚠️ {symbol} 的历史数据不足，尝试获取最大可用数据")
             # 尝试获取最大可用数据
-            hist = stock.history(period="max")
+            hist = provider.history(symbol, period="max")
         
         return hist
     except Exception as e:
@@ -57,9 +58,7 @@ def get_stock_info(symbol: str) -> Dict:
         Dict: 股票信息
     """
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        return info
+        return get_default_provider().info(symbol)
     except Exception as e:
         logger.error(f"获取 {symbol} 的信息时出错: {str(e)}")
         return {}
@@ -291,7 +290,7 @@ def validate_stock_code(code: str, translate: bool = True) -> dict:
         
         # 尝试获取股票信息
         try:
-            stock_info = yf.Ticker(yf_code).info
+            stock_info = get_default_provider().info(yf_code)
             
             # 检查是否获取到有效信息
             if "symbol" not in stock_info or stock_info.get("regularMarketPrice") is None:
@@ -0,0 +1,357 @@
+"""
+TradeMind Lite（轻量版）- 数据源模块
+
+本模块定义行情数据源接口，统一历史数据、股票信息和批量历史数据的获取方式。
+内置两种实现：
+- YFinanceProvider: 通过yfinance从Yahoo Finance在线获取
+- LocalFileProvider: 从本地目录回放Parquet/CSV/npz文件，用于离线基准测试和CI
+"""
+
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import yfinance as yf
+
+from trademind.data.cache import OHLCVCache, period_to_days
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 设置该环境变量后，默认数据源改为回放此目录中的本地文件
+DATA_DIR_ENV = "TRADEMIND_DATA_DIR"
+
+# 本地文件的日期所在的时区，不带时区的日期按该时区的当地日期解释
+EXCHANGE_TZ = "America/New_York"
+
+
+def _exchange_index(index: pd.Index) -> pd.DatetimeIndex:
+    """
+    把本地文件的日期索引统一为交易所时区
+
+    不带时区的日期按交易所当地时间解释，带时区或UTC偏移的日期换算到交易所时区。
+
+    参数:
+        index: 日期字符串或日期索引
+
+    返回:
+        pd.DatetimeIndex: 交易所时区的日期索引
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        # 带UTC偏移的字符串在夏令时前后偏移不同，需要经由UTC解析
+        has_offset = pd.Timestamp(index[0]).tz is not None
+        index = pd.to_datetime(index, utc=True) if has_offset else pd.to_datetime(index)
+    if index.tz is None:
+        return index.tz_localize(EXCHANGE_TZ)
+    return index.tz_convert(EXCHANGE_TZ)
+
+
+class DataProvider(ABC):
+    """
+    行情数据源接口
+
+    所有数据源都返回与yfinance相同格式的数据：以日期为索引、
+    包含Open, High, Low, Close, Volume列的DataFrame。
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = "1d",
+                start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        获取单个股票的历史数据
+
+        参数:
+            symbol: 股票代码
+            period: 数据周期，如1mo, 1y, 3y, max，与start二选一
+            interval: 数据间隔，如1d, 1wk
+            start: 起始日期（包含）
+            end: 结束日期（不包含）
+
+        返回:
+            pd.DataFrame: 历史数据，没有数据时为空DataFrame
+        """
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict:
+        """
+        获取股票信息
+
+        参数:
+            symbol: 股票代码
+
+        返回:
+            Dict: 股票信息，字段与yfinance的Ticker.info一致
+        """
+
+    def batch_history(self, symbols: List[str], period: Optional[str] = None, interval: str = "1d",
+                      start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多个股票的历史数据
+
+        默认实现逐个调用history，子类可以覆盖为真正的批量请求。
+
+        参数:
+            symbols: 股票代码列表
+            period: 数据周期
+            interval: 数据间隔
+            start: 起始日期
+
+        返回:
+            Dict[str, pd.DataFrame]: 股票代码到历史数据的映射
+        """
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = self.history(symbol, period=period, interval=interval, start=start)
+            except Exception as e:
+                logger.error(f"获取 {symbol} 的历史数据时出错: {str(e)}")
+                results[symbol] = pd.DataFrame()
+        return results
+
+
+class YFinanceProvider(DataProvider):
+    """通过yfinance获取行情数据"""
+
+    name = "yfinance"
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = "1d",
+                start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        kwargs = {'interval': interval}
+        if start is not None:
+            kwargs['start'] = start
+            if end is not None:
+                kwargs['end'] = end
+        elif period is not None:
+            kwargs['period'] = period
+        return yf.Ticker(symbol).history(**kwargs)
+
+    def info(self, symbol: str) -> Dict:
+        return yf.Ticker(symbol).info
+
+    def batch_history(self, symbols: List[str], period: Optional[str] = None, interval: str = "1d",
+                      start: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        if not symbols:
+            return {}
+
+        # 参数与Ticker.history的默认值保持一致：复权价格、包含分红拆股列、保留时区
+        kwargs = {
+            'interval': interval,
+            'group_by': 'ticker',
+            'auto_adjust': True,
+            'actions': True,
+            'ignore_tz': False,
+            'threads': True,
+            'progress': False
+        }
+        if start is not None:
+            kwargs['start'] = start
+        elif period is not None:
+            kwargs['period'] = period
+
+        data = yf.download(list(symbols), **kwargs)
+        return split_batch_frame(data, symbols)
+
+
+def split_batch_frame(data: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    将批量下载得到的宽表拆分为每个股票一个DataFrame
+
+    参数:
+        data: 列为(股票代码, 字段)或(字段, 股票代码)两级索引的宽表，单个股票时也可以是普通列
+        symbols: 股票代码列表
+
+    返回:
+        Dict[str, pd.DataFrame]: 股票代码到历史数据的映射，没有数据的股票为空DataFrame
+    """
+    results = {symbol: pd.DataFrame() for symbol in symbols}
+    if data is None or data.empty:
+        return results
+
+    if not isinstance(data.columns, pd.MultiIndex):
+        if len(symbols) == 1:
+            results[symbols[0]] = _drop_missing_bars(data.copy())
+        return results
+
+    first_level = set(data.columns.get_level_values(0))
+    second_level = set(data.columns.get_level_values(1))
+    for symbol in symbols:
+        if symbol in first_level:
+            frame = data[symbol]
+        elif symbol in second_level:
+            frame = data.xs(symbol, axis=1, level=1)
+        else:
+            continue
+        frame = frame.copy()
+        frame.columns.name = None
+        results[symbol] = _drop_missing_bars(frame)
+    return results
+
+
+def _drop_missing_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """去掉宽表对齐时该股票没有交易的行"""
+    if 'Close' in frame.columns:
+        return frame[frame['Close'].notna()]
+    return frame.dropna(how='all')
+
+
+class LocalFileProvider(DataProvider):
+    """
+    从本地目录回放行情数据
+
+    按以下顺序查找文件（symbol中的特殊字符按缓存规则替换）：
+        {symbol}_{interval}.parquet, {symbol}_{interval}.csv, {symbol}_{interval}.npz,
+        {symbol}.parquet, {symbol}.csv
+    npz文件与OHLCVCache的格式相同，因此行情缓存目录可以直接作为回放目录。
+    股票信息从目录中的info.json读取（格式为 {代码: 信息字典}），缺失时根据行情数据生成。
+
+    周期参数以文件中最后一根K线为基准截取，保证离线回放结果可重复。
+    """
+
+    name = "local"
+
+    def __init__(self, data_dir: Union[str, Path]):
+        """
+        初始化本地文件数据源
+
+        参数:
+            data_dir: 数据文件目录
+        """
+        self.data_dir = Path(data_dir)
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._npz = OHLCVCache(self.data_dir, refresh_interval=0)
+        self._info = self._load_info()
+
+    def _load_info(self) -> Dict[str, Dict]:
+        """读取info.json"""
+        info_path = self.data_dir / "info.json"
+        if not info_path.exists():
+            return {}
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"读取 {info_path} 失败: {str(e)}")
+            return {}
+
+    def _find_file(self, symbol: str, interval: str) -> Optional[Path]:
+        """查找股票对应的数据文件"""
+        base = self._npz.path_for(symbol, interval).stem
+        safe_symbol = base[:-(len(interval) + 1)]
+        candidates = [
+            f"{base}.parquet", f"{base}.csv", f"{base}.npz",
+            f"{safe_symbol}.parquet", f"{safe_symbol}.csv"
+        ]
+        for name in candidates:
+            path = self.data_dir / name
+            if path.exists():
+                return path
+        return None
+
+    def _load(self, symbol: str, interval: str) -> pd.DataFrame:
+        """读取并缓存完整的历史数据"""
+        key = (symbol, interval)
+        if key in self._frames:
+            return self._frames[key]
+
+        path = self._find_file(symbol, interval)
+        if path is None:
+            frame = pd.DataFrame()
+        elif path.suffix == '.npz':
+            frame = self._npz.load(symbol, interval)
+            frame = frame if frame is not None else pd.DataFrame()
+        elif path.suffix == '.parquet':
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path, index_col=0)
+
+        if not frame.empty:
+            frame.index = _exchange_index(frame.index)
+        frame = frame.sort_index()
+
+        self._frames[key] = frame
+        return frame
+
+    def history(self, symbol: str, period: Optional[str] = None, interval: str = "1d",
+                start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        frame = self._load(symbol, interval)
+        if frame.empty:
+            return frame.copy()
+
+        if start is not None or end is not None:
+            mask = pd.Series(True, index=frame.index)
+            if start is not None:
+                mask &= frame.index >= self._as_timestamp(start, frame.index)
+            if end is not None:
+                mask &= frame.index < self._as_timestamp(end, frame.index)
+            return frame[mask.values].copy()
+
+        days = period_to_days(period or "1mo")
+        if days == float('inf'):
+            return frame.copy()
+        cutoff = frame.index[-1] - pd.Timedelta(days=days)
+        return frame[frame.index > cutoff].copy()
+
+    def info(self, symbol: str) -> Dict:
+        if symbol in self._info:
+            return dict(self._info[symbol])
+
+        frame = self._load(symbol, "1d")
+        if frame.empty:
+            return {}
+        return {
+            'symbol': symbol,
+            'shortName': symbol,
+            'quoteType': 'EQUITY',
+            'currency': 'USD',
+            'regularMarketPrice': float(frame['Close'].iloc[-1])
+        }
+
+    @staticmethod
+    def _as_timestamp(value, index: pd.DatetimeIndex) -> pd.Timestamp:
+        """将日期参数转换为与索引时区一致的时间戳"""
+        ts = pd.Timestamp(value)
+        if index.tz is not None and ts.tzinfo is None:
+            return ts.tz_localize(index.tz)
+        if index.tz is None and ts.tzinfo is not None:
+            return ts.tz_localize(None)
+        return ts
+
+
+_default_provider: Optional[DataProvider] = None
+
+
+def get_default_provider() -> DataProvider:
+    """
+    获取默认数据源
+
+    设置了TRADEMIND_DATA_DIR环境变量时使用LocalFileProvider回放该目录，否则使用yfinance。
+
+    返回:
+        DataProvider: 默认数据源
+    """
+    global _default_provider
+    if _default_provider is None:
+        data_dir = os.environ.get(DATA_DIR_ENV)
+        if data_dir:
+            logger.info(f"使用本地数据源: {data_dir}")
+            _default_provider = LocalFileProvider(data_dir)
+        else:
+            _default_provider = YFinanceProvider()
+    return _default_provider
+
+
+def set_default_provider(provider: Optional[DataProvider]):
+    """
+    设置默认数据源
+
+    参数:
+        provider: 数据源实例，为None时在下次获取时重新按环境变量创建
+    """
+    global _default_provider
+    _default_provider = provider
@@ -0,0 +1,109 @@
+"""
+TradeMind Lite（轻量版）- 请求限速模块
+
+本模块提供自适应请求限速器。请求成功时逐步缩短请求间隔，
+被数据源限流时成倍拉长请求间隔（AIMD），使请求速度跟随数据源的实际吞吐能力，
+而不是在每个请求之后固定等待。
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """
+    自适应请求限速器
+
+    - wait(): 在发送请求前调用，距离上次请求不足当前间隔时等待
+    - success(): 请求成功，间隔减少decrease_step秒（加性增加请求速度）
+    - backoff(): 请求被限流，间隔乘以backoff_factor（乘性降低请求速度）
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_interval: float = 60.0,
+                 backoff_start: float = 1.0, backoff_factor: float = 2.0, decrease_step: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        初始化限速器
+
+        参数:
+            min_interval: 最小请求间隔（秒）
+            max_interval: 最大请求间隔（秒）
+            backoff_start: 第一次被限流时的请求间隔（秒）
+            backoff_factor: 被限流时间隔的放大倍数
+            decrease_step: 每次成功后间隔减少的秒数
+            clock: 时钟函数
+            sleep: 等待函数
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_start = backoff_start
+        self.backoff_factor = backoff_factor
+        self.decrease_step = decrease_step
+        self.clock = clock
+        self.sleep = sleep
+
+        self.interval = min_interval
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """等待到允许发送下一个请求的时间"""
+        with self._lock:
+            delay = self._next_time - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+                self.waited += delay
+            self.requests += 1
+            self._next_time = self.clock() + self.interval
+
+    def success(self):
+        """记录一次成功请求，缩短请求间隔"""
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval - self.decrease_step)
+
+    def backoff(self):
+        """记录一次被限流的请求，拉长请求间隔"""
+        with self._lock:
+            self.throttled += 1
+            self.interval = min(self.max_interval,
+                                max(self.backoff_start, self.interval * self.backoff_factor))
+            self._next_time = self.clock() + self.interval
+            logger.warning(f"数据源限流，请求间隔调整为 {self.interval:.2f} 秒")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        获取限速统计
+
+        返回:
+            Dict: 包含requests, throttled, waited, interval的字典
+        """
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'waited': round(self.waited, 3),
+            'interval': self.interval
+        }
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    判断异常是否为数据源限流
+
+    参数:
+        error: 请求抛出的异常
+
+    返回:
+        bool: 是否为限流错误
+    """
+    if type(error).__name__ == 'YFRateLimitError':
+        return True
+    message = str(error)
+    return '429' in message or 'Too Many Requests' in message or 'Rate limited' in message
@@ -1170,7 +1170,27 @@ def generate_stock_card_html(result: Dict) -> str:
             win_rate_display = f"{win_rate:.1f}%" if isinstance(win_rate, (int, float)) else "N/A"
             profit_factor_display = f"{profit_factor:.2f}" if isinstance(profit_factor, (int, float)) else "N/A"
             drawdown_display = f"{drawdown:.2f}%" if isinstance(drawdown, (int, float)) else "N/A"
-            
+
+            # 蒙特卡洛模拟的分位数
+            monte_carlo_rows = ""
+            monte_carlo = backtest.get('monte_carlo') or {}
+            if monte_carlo:
+                mc_return = monte_carlo.get('final_return', {})
+                mc_drawdown = monte_carlo.get('max_drawdown', {})
+                monte_carlo_rows = f"""
+                    <tr>
+                        <td>模拟收益率 (5% / 50% / 95%)</td>
+                        <td>{mc_return.get('p5', 0):.1f}% / {mc_return.get('p50', 0):.1f}% / {mc_return.get('p95', 0):.1f}%</td>
+                    </tr>
+                    <tr>
+                        <td>模拟最大回撤 (50% / 95%)</td>
+                        <td>{mc_drawdown.get('p50', 0):.1f}% / {mc_drawdown.get('p95', 0):.1f}%</td>
+                    </tr>
+                    <tr>
+                        <td>破产概率 (亏损{monte_carlo.get('ruin_threshold', 0):.0f}%)</td>
+                        <td>{monte_carlo.get('ruin_probability', 0):.1f}%</td>
+                    </tr>"""
+
             backtest_html = f"""
             <div class="backtest-results">
                 <h4>回测结果</h4>
@@ -1190,7 +1210,7 @@ def generate_stock_card_html(result: Dict) -> str:
                     <tr>
                         <td>最大回撤</td>
                         <td>{drawdown_display}</td>
-                    </tr>
+                    </tr>{monte_carlo_rows}
                 </table>
             </div>
             """
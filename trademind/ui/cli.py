@@ -26,6 +26,8 @@ from rich.align import Align
 from rich.prompt import Prompt
 
 from trademind.core.analyzer import StockAnalyzer
+from trademind.core.parallel import default_workers
+from trademind.backtest.optimizer import optimize_parameters
 from trademind import compat
 from trademind import __version__
 
@@ -158,9 +160,13 @@ def analyze_stocks(symbols: List[str], names: Dict[str, str], analyzer: StockAna
         报告文件路径
     """
     # 显示进度信息
-    with console.status(f"[bold green]正在分析 {len(symbols)} 只股票...[/bold green]", spinner="dots"):
+    with console.status(f"[bold green]正在分析 {len(symbols)} 只股票...[/bold green]", spinner="dots") as status:
+        def update_status(index, total, symbol, result):
+            status.update(f"[bold green]正在分析 {len(symbols)} 只股票... ({index}/{total} {symbol})[/bold green]")
+        
         # 分析股票
-        results = analyzer.analyze_stocks(symbols, names)
+        results = analyzer.analyze_stocks(symbols, names, workers=default_workers(),
+                                          progress_callback=update_status)
     
     # 显示进度信息
     with console.status("[bold green]正在生成报告...[/bold green]", spinner="dots"):
@@ -176,6 +182,53 @@ def analyze_stocks(symbols: List[str], names: Dict[str, str], analyzer: StockAna
     
     return report_path
 
+def run_optimizer(symbols: List[str], n_samples: Optional[int] = None, metric: str = 'sharpe_ratio',
+                  top: int = 20, seed: Optional[int] = None, workers: Optional[int] = None):
+    """
+    对股票列表搜索回测参数并显示排名靠前的参数组合
+    
+    Args:
+        symbols: 股票代码列表
+        n_samples: 随机抽样的参数组合数量，为None时搜索整个网格
+        metric: 排序使用的回测指标
+        top: 显示的结果数量
+        seed: 随机抽样的种子
+        workers: 工作进程数量，为None时读取环境变量
+        
+    Returns:
+        按指标排序的结果表
+    """
+    analyzer = StockAnalyzer()
+    datasets = {}
+    with console.status("[bold green]正在准备行情数据和交易信号...[/bold green]", spinner="dots"):
+        for symbol in symbols:
+            hist = analyzer.get_stock_data(symbol)
+            if hist.empty:
+                console.print(f"[yellow]{symbol} 没有可用的历史数据，已跳过[/yellow]")
+                continue
+            datasets[symbol] = (hist, analyzer.generate_backtest_signals(hist))
+    
+    with console.status("[bold green]正在搜索回测参数...[/bold green]", spinner="dots") as status:
+        def update_status(completed, total, ranked):
+            best = f"，当前最优 {ranked[0]['symbol']} {metric}={ranked[0][metric]}" if ranked else ""
+            status.update(f"[bold green]正在搜索回测参数... ({completed}/{total}{best})[/bold green]")
+        
+        table = optimize_parameters(datasets, n_samples=n_samples, seed=seed, metric=metric,
+                                    workers=workers if workers is not None else default_workers(),
+                                    progress_callback=update_status)
+    
+    result_table = Table(title=f"参数优化结果（按 {metric} 排序）", box=ROUNDED, header_style="bold cyan")
+    for column in ('排名', '股票', '风险比例', '止损', '止盈', '最大持有天数', metric, '交易次数', '最终收益%'):
+        result_table.add_column(column, justify="right")
+    for rank, row in table.head(top).iterrows():
+        result_table.add_row(
+            str(rank), row['symbol'], f"{row['risk_per_trade_pct']:.2%}", f"{row['stop_loss_pct']:.2%}",
+            f"{row['take_profit_pct']:.2%}", str(row['max_hold_days']), str(row[metric]),
+            str(row['total_trades']), str(row['final_return'])
+        )
+    console.print(result_table)
+    return table
+
 def run_cli() -> None:
     """
     运行简洁版命令行界面
@@ -30,18 +30,21 @@ import pandas as pd
 import numpy as np
 import warnings
 import pytz
-import yfinance as yf
 import plotly.graph_objects as go
 import plotly.subplots as sp
 
 from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for, session, Response
 from flask_cors import CORS
 
-from trademind.core.indicators import calculate_rsi, calculate_macd, calculate_kdj, calculate_bollinger_bands
+from trademind.core.indicators import calculate_rsi, calculate_macd, calculate_kdj, calculate_bollinger_bands, calculate_indicator_series
+from trademind.core.indicator_frame import IndicatorFrame
 from trademind.core.signals import generate_signals
 from trademind.backtest import run_backtest
 from trademind.core.patterns import identify_candlestick_patterns
 from trademind.core.analyzer import StockAnalyzer
+from trademind.core.timeframes import DEFAULT_TIMEFRAMES
+from trademind.core.parallel import default_workers, resolve_workers, run_symbol_pipeline
+from trademind.data.context import MarketDataContext
 from trademind.reports.generator import generate_html_report as generate_report
 from trademind.data.loader import get_stock_data, get_stock_info, validate_stock_code, batch_validate_stock_codes, update_watchlists_file, get_user_watchlists, save_user_watchlists, import_stocks_to_watchlist, is_english_name
 from trademind import compat
@@ -103,6 +106,152 @@ def index():
     # 渲染模板
     return render_template('index.html', watchlists=watchlists)
 
+def analyze_symbol_for_web(analyzer: StockAnalyzer, symbol: str, name, hist: pd.DataFrame,
+                           pattern_confidence: Optional[Dict[str, float]] = None,
+                           timeframes: Tuple[str, ...] = DEFAULT_TIMEFRAMES) -> Dict:
+    """
+    Web分析任务：对已下载的单只股票数据执行分析
+    
+    参数:
+        analyzer: 股票分析器实例
+        symbol: 股票代码
+        name: 股票名称，或包含name和yf_code的字典
+        hist: 股票历史数据
+        pattern_confidence: 整个股票列表合并统计的形态实测置信度，为None时只使用该股票自己的统计
+        timeframes: 附加分析的周期，结果保存在result['timeframes']中
+        
+    返回:
+        Dict: 分析结果
+    """
+    # 确保有足够的数据计算价格变化
+    if len(hist) >= 2:
+        current_price = hist['Close'].iloc[-1]
+        prev_price = hist['Close'].iloc[-2]
+        price_change = current_price - prev_price
+        # 确保除数不为零
+        if prev_price > 0:
+            price_change_pct = (price_change / prev_price) * 100
+        else:
+            price_change_pct = 0.0
+    else:
+        # 如果只有一天数据，无法计算变化
+        current_price = hist['Close'].iloc[-1] if not hist.empty else 0.0
+        prev_price = hist['Open'].iloc[-1] if not hist.empty else 0.0
+        price_change = current_price - prev_price
+        # 确保除数不为零
+        if prev_price > 0:
+            price_change_pct = (price_change / prev_price) * 100
+        else:
+            price_change_pct = 0.0
+    
+    # 确保价格变化百分比不是NaN或无穷大
+    if pd.isna(price_change_pct) or np.isinf(price_change_pct):
+        price_change_pct = 0.0
+    
+    # 打印调试信息
+    print(f"当前价格: {current_price:.2f}, 前一价格: {prev_price:.2f}")
+    print(f"价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
+    
+    print("计算技术指标...")
+    # 各分析环节共用同一个指标计算引擎
+    frame = IndicatorFrame(hist)
+    
+    # 调用技术指标模块
+    rsi = calculate_rsi(hist['Close'], frame=frame)
+    macd, signal, hist_macd = calculate_macd(hist['Close'], frame=frame)
+    k, d, j = calculate_kdj(hist['High'], hist['Low'], hist['Close'], frame=frame)
+    bb_upper, bb_middle, bb_lower, bb_width, bb_percent = calculate_bollinger_bands(hist['Close'], frame=frame)
+    
+    indicators = {
+        'rsi': rsi,
+        'macd': {'macd': macd, 'signal': signal, 'hist': hist_macd},
+        'kdj': {'k': k, 'd': d, 'j': j},
+        'bollinger': {
+            'upper': bb_upper, 
+            'middle': bb_middle, 
+            'lower': bb_lower,
+            'bandwidth': bb_width,
+            'percent_b': bb_percent
+        }
+    }
+    
+    print("分析K线形态...")
+    # 创建StockAnalyzer实例并调用形态识别方法
+    if pattern_confidence is None:
+        pattern_confidence = analyzer.measure_pattern_confidence([(symbol, name, hist)])
+    patterns = analyzer.identify_patterns(hist, measured=pattern_confidence)
+    
+    print("生成交易建议...")
+    # 调用StockAnalyzer的交易建议生成方法
+    advice = analyzer.generate_trading_advice(indicators, current_price, patterns)
+    
+    print("执行策略回测...")
+    # 生成交易信号，每根K线使用自己的指标值
+    signals = generate_signals(hist, {**indicators, **calculate_indicator_series(hist, frame=frame)})
+    
+    # 调用回测模块，行情和信号没有变化时直接使用缓存的结果
+    backtest_results = analyzer.backtest_cache.get(hist, signals, run_backtest)
+    
+    # 添加压力位和趋势分析 - 整合TASK-016功能
+    print("分析压力位和趋势...")
+    pressure_trend_result = analyzer.analyze_pressure_and_trend(symbol, data=hist, frame=frame)
+    
+    # 创建基本结果字典
+    result = {
+        'symbol': symbol,
+        'name': name,
+        'price': current_price,
+        'price_change': price_change,
+        'price_change_pct': price_change_pct,
+        'prev_close': prev_price,
+        'indicators': indicators,
+        'patterns': patterns,
+        'advice': advice,
+        'backtest': backtest_results,
+        # 初始化ADX指标为默认值
+        'adx': 0.0,
+        'plus_di': 0.0,
+        'minus_di': 0.0
+    }
+    
+    # 将压力位和趋势分析结果整合到最终结果中
+    if pressure_trend_result:
+        # 获取UI需要的格式化数据
+        ui_data = analyzer._prepare_pressure_trend_for_report(pressure_trend_result)
+        # 合并到主结果中
+        result.update(ui_data)
+        
+        # ADX数据在analyze_pressure_and_trend中只计算一次，直接从顶层获取
+        adx_value = pressure_trend_result.get('adx', 0.0)
+        plus_di_value = pressure_trend_result.get('plus_di', 0.0)
+        minus_di_value = pressure_trend_result.get('minus_di', 0.0)
+        
+        # 确保不使用0值 - 使用默认值替代
+        if adx_value == 0.0:
+            adx_value = 15.0  # 使用默认值
+            print("ADX值为0，使用默认值15.0")
+        if plus_di_value == 0.0:
+            plus_di_value = 10.0
+            print("+DI值为0，使用默认值10.0")
+        if minus_di_value == 0.0:
+            minus_di_value = 10.0
+            print("-DI值为0，使用默认值10.0")
+        
+        # 将处理后的值写入结果
+        result['adx'] = adx_value
+        result['plus_di'] = plus_di_value
+        result['minus_di'] = minus_di_value
+    
+    # 记录最终的ADX结果
+    print(f"最终ADX结果: adx={result['adx']}, plus_di={result['plus_di']}, minus_di={result['minus_di']}")
+    
+    # 由日线合成周线、月线做同样的指标和压力位趋势分析，与命令行分析一致
+    if timeframes:
+        print("分析周线和月线...")
+        result['timeframes'] = analyzer.analyze_timeframes(symbol, hist, timeframes)
+    
+    return result
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_stocks():
     """
@@ -116,6 +265,12 @@ def analyze_stocks():
         names = data.get('names', {})
         title = data.get('title', '美股技术面分析报告')
         analyze_all = data.get('analyze_all', False)
+        workers = default_workers()
+        if data.get('workers') is not None:
+            try:
+                workers = resolve_workers(int(data['workers']))
+            except (TypeError, ValueError):
+                logger.warning(f"无效的工作进程数量: {data['workers']}，使用默认值 {workers}")
         
         # 添加更多详细的日志
         logger.info(f"接收到分析请求: analyze_all={analyze_all}, 符号数量={len(symbols)}")
@@ -227,191 +382,54 @@ def analyze_stocks():
                 if analyzer is None:
                     analyzer = StockAnalyzer()
                 
-                # 重写analyze_stocks方法，添加进度跟踪
-                results = []
-                total = len(symbols)
+                # 本次运行共享的行情数据，每个股票只下载一次
+                context = MarketDataContext(lambda code: analyzer.provider.history(code, period="1y"))
                 
+                # 批量下载所有股票的数据，请求节奏由自适应限速器控制
+                yf_codes = []
+                for symbol in symbols:
+                    stock_name = names.get(symbol, symbol)
+                    yf_codes.append(stock_name.get('yf_code', symbol) if isinstance(stock_name, dict) else symbol)
+                yf_codes = list(dict.fromkeys(yf_codes))
+                if len(yf_codes) > 1:
+                    analysis_progress["current_symbol"] = f"批量下载 {len(yf_codes)} 只股票的数据"
+                    for code, frame in analyzer.batch_fetcher.fetch(yf_codes, period="1y").items():
+                        if not frame.empty:
+                            context.put(code, frame)
+                
+                # 先在主线程中取得所有数据，之后的分析只做计算
+                items = []
                 for index, symbol in enumerate(symbols, 1):
-                    # 检查服务器是否已停止
                     if not server_running.is_set():
-                        print("\n检测到服务器停止信号，正在安全终止分析...")
-                        # 确保设置分析状态为完成
-                        analysis_progress["in_progress"] = False
-                        analysis_progress["percent"] = 1.0
+                        logger.info("服务器已停止，中止获取数据")
                         break
-                        
-                    try:
-                        # 更新进度信息
-                        analysis_progress["current_index"] = index
-                        analysis_progress["current_symbol"] = f"{names.get(symbol, symbol)} ({symbol})"
-                        analysis_progress["percent"] = index / total
-                        
-                        # 修复显示问题，确保正确显示股票名称和代码
-                        stock_name = names.get(symbol, symbol)
-                        yf_code = symbol
-                        
-                        if isinstance(stock_name, dict):
-                            # 新格式：{name: "名称", yf_code: "YF代码"}
-                            display_name = stock_name.get('name', symbol)
-                            yf_code = stock_name.get('yf_code', symbol)
-                            print(f"\n[{index}/{total} - {index/total*100:.1f}%] 分析: {display_name} ({yf_code})")
-                        else:
-                            # 旧格式：直接是名称字符串
-                            print(f"\n[{index}/{total} - {index/total*100:.1f}%] 分析: {stock_name} ({symbol})")
-                        
-                        # 使用正确的代码获取股票数据
-                        stock = yf.Ticker(yf_code)
-                        hist = stock.history(period="1y")
-                        
-                        if hist.empty:
-                            print(f"⚠️ 无法获取 {symbol} 的数据，跳过")
-                            continue
-                        
-                        # 确保有足够的数据计算价格变化
-                        if len(hist) >= 2:
-                            current_price = hist['Close'].iloc[-1]
-                            prev_price = hist['Close'].iloc[-2]
-                            price_change = current_price - prev_price
-                            # 确保除数不为零
-                            if prev_price > 0:
-                                price_change_pct = (price_change / prev_price) * 100
-                            else:
-                                price_change_pct = 0.0
-                        else:
-                            # 如果只有一天数据，无法计算变化
-                            current_price = hist['Close'].iloc[-1] if not hist.empty else 0.0
-                            prev_price = hist['Open'].iloc[-1] if not hist.empty else 0.0
-                            price_change = current_price - prev_price
-                            # 确保除数不为零
-                            if prev_price > 0:
-                                price_change_pct = (price_change / prev_price) * 100
-                            else:
-                                price_change_pct = 0.0
-                        
-                        # 确保价格变化百分比不是NaN或无穷大
-                        if pd.isna(price_change_pct) or np.isinf(price_change_pct):
-                            price_change_pct = 0.0
-                        
-                        # 打印调试信息
-                        print(f"当前价格: {current_price:.2f}, 前一价格: {prev_price:.2f}")
-                        print(f"价格变化: {price_change:.2f}, 变化百分比: {price_change_pct:.2f}%")
-                        
-                        print("计算技术指标...")
-                        # 调用技术指标模块
-                        rsi = calculate_rsi(hist['Close'])
-                        macd, signal, hist_macd = calculate_macd(hist['Close'])
-                        k, d, j = calculate_kdj(hist['High'], hist['Low'], hist['Close'])
-                        bb_upper, bb_middle, bb_lower, bb_width, bb_percent = calculate_bollinger_bands(hist['Close'])
-                        
-                        indicators = {
-                            'rsi': rsi,
-                            'macd': {'macd': macd, 'signal': signal, 'hist': hist_macd},
-                            'kdj': {'k': k, 'd': d, 'j': j},
-                            'bollinger': {
-                                'upper': bb_upper, 
-                                'middle': bb_middle, 
-                                'lower': bb_lower,
-                                'bandwidth': bb_width,
-                                'percent_b': bb_percent
-                            }
-                        }
-                        
-                        print("分析K线形态...")
-                        # 创建StockAnalyzer实例并调用形态识别方法
-                        patterns = analyzer.identify_patterns(hist.tail(5))
-                        
-                        print("生成交易建议...")
-                        # 调用StockAnalyzer的交易建议生成方法
-                        advice = analyzer.generate_trading_advice(indicators, current_price, patterns)
-                        
-                        print("执行策略回测...")
-                        # 生成交易信号
-                        signals = generate_signals(hist, indicators)
-                        
-                        # 调用回测模块
-                        backtest_results = run_backtest(hist, signals)
-                        
-                        # 添加压力位和趋势分析 - 整合TASK-016功能
-                        print("分析压力位和趋势...")
-                        pressure_trend_result = analyzer.analyze_pressure_and_trend(symbol)
-                        
-                        # 创建基本结果字典
-                        result = {
-                            'symbol': symbol,
-                            'name': names.get(symbol, symbol),
-                            'price': current_price,
-                            'price_change': price_change,
-                            'price_change_pct': price_change_pct,
-                            'prev_close': prev_price,
-                            'indicators': indicators,
-                            'patterns': patterns,
-                            'advice': advice,
-                            'backtest': backtest_results,
-                            # 初始化ADX指标为默认值
-                            'adx': 0.0,
-                            'plus_di': 0.0,
-                            'minus_di': 0.0
-                        }
-                        
-                        # 将压力位和趋势分析结果整合到最终结果中
-                        if pressure_trend_result:
-                            # 获取UI需要的格式化数据
-                            ui_data = analyzer._prepare_pressure_trend_for_report(pressure_trend_result)
-                            # 合并到主结果中
-                            result.update(ui_data)
-                            
-                            # 直接优先从源头获取ADX数据 - 从pressure_trend_result['adx']获取
-                            adx_value = pressure_trend_result.get('adx', 0.0)
-                            plus_di_value = pressure_trend_result.get('plus_di', 0.0)
-                            minus_di_value = pressure_trend_result.get('minus_di', 0.0)
-                            print(f"第一步检查 - 直接从pressure_trend_result顶层获取: ADX={adx_value}, +DI={plus_di_value}, -DI={minus_di_value}")
-                            
-                            # 如果顶层没有值，则从trend_analysis的adx字段获取
-                            if adx_value == 0.0 or plus_di_value == 0.0 or minus_di_value == 0.0:
-                                trend_analysis = pressure_trend_result.get('trend_analysis', {})
-                                if trend_analysis and 'adx' in trend_analysis:
-                                    adx_data = trend_analysis['adx']
-                                    if isinstance(adx_data, dict):
-                                        adx_value = adx_data.get('adx', 0.0)
-                                        plus_di_value = adx_data.get('plus_di', 0.0)
-                                        minus_di_value = adx_data.get('minus_di', 0.0)
-                                        print(f"第二步检查 - 从trend_analysis.adx获取: ADX={adx_value}, +DI={plus_di_value}, -DI={minus_di_value}")
-                            
-                            # 如果trend_analysis中也没有值，尝试从UI数据中获取
-                            if adx_value == 0.0 or plus_di_value == 0.0 or minus_di_value == 0.0:
-                                adx_value = ui_data.get('adx', 0.0)
-                                plus_di_value = ui_data.get('plus_di', 0.0)
-                                minus_di_value = ui_data.get('minus_di', 0.0)
-                                print(f"第三步检查 - 从ui_data获取: ADX={adx_value}, +DI={plus_di_value}, -DI={minus_di_value}")
-                            
-                            # 确保不使用0值 - 使用默认值替代
-                            if adx_value == 0.0:
-                                adx_value = 15.0  # 使用默认值
-                                print("ADX值为0，使用默认值15.0")
-                            if plus_di_value == 0.0:
-                                plus_di_value = 10.0
-                                print("+DI值为0，使用默认值10.0")
-                            if minus_di_value == 0.0:
-                                minus_di_value = 10.0
-                                print("-DI值为0，使用默认值10.0")
-                            
-                            # 将处理后的值写入结果
-                            result['adx'] = adx_value
-                            result['plus_di'] = plus_di_value
-                            result['minus_di'] = minus_di_value
-                        
-                        # 记录最终的ADX结果
-                        print(f"最终ADX结果: adx={result['adx']}, plus_di={result['plus_di']}, minus_di={result['minus_di']}")
-                        
-                        results.append(result)
-                        
-                        print(f"✅ {symbol} 分析完成")
-                        time.sleep(0.5)
-                        
-                    except Exception as e:
-                        logger.error(f"分析 {symbol} 时出错", exc_info=True)
-                        print(f"❌ {symbol} 分析失败: {str(e)}")
+                    analysis_progress["current_symbol"] = f"获取 {symbol} 的数据 ({index}/{len(symbols)})"
+                    stock_name = names.get(symbol, symbol)
+                    yf_code = stock_name.get('yf_code', symbol) if isinstance(stock_name, dict) else symbol
+                    hist = context.get(yf_code)
+                    if hist.empty:
+                        print(f"⚠️ 无法获取 {symbol} 的数据，跳过")
                         continue
+                    items.append((symbol, stock_name, hist))
+                
+                # 形态置信度由整个股票列表合并统计，与命令行分析一致
+                pattern_confidence = analyzer.measure_pattern_confidence(items)
+                items = [(symbol, stock_name, hist, pattern_confidence) for symbol, stock_name, hist in items]
+                
+                def update_progress(index, count, symbol, result):
+                    stock_name = names.get(symbol, symbol)
+                    display_name = stock_name.get('name', symbol) if isinstance(stock_name, dict) else stock_name
+                    status = "✅ 分析完成" if result is not None else "❌ 分析失败"
+                    print(f"[{index}/{count} - {index/count*100:.1f}%] {display_name} ({symbol}) {status}")
+                    analysis_progress["current_index"] = index
+                    analysis_progress["total"] = count
+                    analysis_progress["current_symbol"] = f"{display_name} ({symbol})"
+                    analysis_progress["percent"] = index / count
+                
+                outputs = run_symbol_pipeline(analyzer, analyze_symbol_for_web, items, workers=workers,
+                                              progress_callback=update_progress,
+                                              should_stop=lambda: not server_running.is_set())
+                results = [result for result in outputs if result is not None]
                 
                 # 生成报告
                 if results and server_running.is_set():  # 只有在服务器仍在运行且有结果时才生成报告